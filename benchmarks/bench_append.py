@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Benchmark append mode: find the notes added to a large export since the
+last run, versus parsing the whole export again.
+
+Usage:
+    python benchmarks/bench_append.py [--notes N] [--new N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import make_export  # noqa: E402
+
+from notebooklm_notes2md.core.incremental import parse_new_notes, state_for_notes  # noqa: E402
+from notebooklm_notes2md.core.parser import parse_notes  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=10000)
+    parser.add_argument("--new", type=int, default=5)
+    args = parser.parse_args()
+
+    previous = make_export(args.notes - args.new, paragraphs=1)
+    current = make_export(args.notes, paragraphs=1)
+    state = state_for_notes(parse_notes(BeautifulSoup(previous, "html.parser")))
+
+    start = time.perf_counter()
+    full = parse_notes(BeautifulSoup(current, "html.parser"))
+    full_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    new_notes = parse_new_notes(current, state.tail)
+    append_time = time.perf_counter() - start
+
+    assert new_notes == full[-args.new:]
+    print(f"export: {args.notes} notes ({len(current) / 1e6:.1f} MB), {args.new} new")
+    print(f"full parse:  {full_time * 1000:9.1f} ms")
+    print(f"append mode: {append_time * 1000:9.1f} ms  ({full_time / append_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
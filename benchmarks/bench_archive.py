@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark archive output: streaming one Markdown file per note into a
+.zip or .tar.gz versus writing the files to disk and compressing them
+afterwards.
+
+Usage:
+    python benchmarks/bench_archive.py [--notes N] [--format obsidian]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import make_export  # noqa: E402
+
+from notebooklm_notes2md.core.parser import parse_notes  # noqa: E402
+from notebooklm_notes2md.exporters.archive import export_archive, note_member_name  # noqa: E402
+from notebooklm_notes2md.extractors.metadata import extract_metadata  # noqa: E402
+from notebooklm_notes2md.formatters.templates import (  # noqa: E402
+    document_context,
+    iter_note_markdown,
+    markdown_template_set,
+)
+
+ARCHIVE_FORMATS = {".zip": "zip", ".tar.gz": "gztar"}
+
+
+def write_then_compress(notes, metadata, format_type, directory, extension):
+    """The two-step baseline; returns the bytes written to disk."""
+    root = os.path.join(directory, "files")
+    os.makedirs(os.path.join(root, "notes", "notes"))
+    templates = markdown_template_set(format_type, metadata)
+    context = document_context(metadata)
+    links = []
+    for text in iter_note_markdown(notes, context, templates):
+        note = context["note"]
+        member = note_member_name(note["index"], note["title"])
+        with open(os.path.join(root, "notes", member), "w", encoding="utf-8") as f:
+            f.write(text)
+        links.append(f"- [{note['title']}]({member})\n")
+    with open(os.path.join(root, "notes", "index.md"), "w", encoding="utf-8") as f:
+        f.write(templates.frontmatter(context))
+        if context["summary"]:
+            f.write(templates.callout(context))
+        f.write(templates.heading(context))
+        f.write("".join(links))
+    written = sum(
+        os.path.getsize(os.path.join(path, name))
+        for path, _, names in os.walk(root) for name in names
+    )
+    archive = shutil.make_archive(
+        os.path.join(directory, "baseline"), ARCHIVE_FORMATS[extension], root
+    )
+    return written + os.path.getsize(archive)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=5000)
+    parser.add_argument("--format", choices=["standard", "obsidian"], default="standard")
+    args = parser.parse_args()
+
+    soup = BeautifulSoup(make_export(args.notes, paragraphs=2), "html.parser")
+    notes = parse_notes(soup)
+    metadata = extract_metadata(soup)
+    print(f"notes: {len(notes)}")
+
+    for extension in ARCHIVE_FORMATS:
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            baseline_bytes = write_then_compress(
+                notes, metadata, args.format, directory, extension
+            )
+            baseline = time.perf_counter() - start
+
+            start = time.perf_counter()
+            stats = export_archive(
+                notes, os.path.join(directory, "notes" + extension), args.format, metadata
+            )
+            streamed = time.perf_counter() - start
+
+        print(f"{extension}:")
+        print(f"  write then compress: {baseline:7.2f} s, "
+              f"{baseline_bytes / 1024 / 1024:7.2f} MiB written, {len(notes)} files created")
+        print(f"  streamed:            {streamed:7.2f} s, "
+              f"{stats.bytes_out / 1024 / 1024:7.2f} MiB written, 1 file created "
+              f"({baseline / streamed:.2f}x)")
+        print(f"  members: {stats.members}, "
+              f"{stats.bytes_in / 1024 / 1024:.2f} MiB uncompressed")
+
+
+if __name__ == "__main__":
+    main()
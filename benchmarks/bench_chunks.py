@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSONL chunk export against Markdown export of the same notes.
+
+Both write to a temporary file. The chunker cleans each note once, cuts
+it at blank lines and packs the blocks by length, so it should run at
+about the speed of formatting and writing Markdown. Raw writing of the
+chunk file's bytes is shown as the disk bound.
+
+Usage:
+    python benchmarks/bench_chunks.py [--notes N] [--tokens N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import make_export  # noqa: E402
+
+from notebooklm_notes2md.core.parser import parse_notes  # noqa: E402
+from notebooklm_notes2md.exporters.chunks import ChunkOptions, write_chunks  # noqa: E402
+from notebooklm_notes2md.formatters.standard import format_standard_markdown  # noqa: E402
+
+MIB = 1024 * 1024
+
+
+def best_of(repeat: int, function) -> float:
+    """Return the fastest of several runs, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=5000)
+    parser.add_argument("--tokens", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    notes = parse_notes(BeautifulSoup(make_export(args.notes), "html.parser"))
+    options = ChunkOptions(max_tokens=args.tokens)
+    size = sum(len(note["note"]) for note in notes) / MIB
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        chunks_path = os.path.join(temp_dir, "notes.jsonl")
+        markdown_path = os.path.join(temp_dir, "notes.md")
+        copy_path = os.path.join(temp_dir, "copy.jsonl")
+
+        def markdown() -> None:
+            with open(markdown_path, "w", encoding="utf-8") as f:
+                f.write(format_standard_markdown(notes))
+
+        count = write_chunks(chunks_path, notes, options=options)
+        with open(chunks_path, "rb") as f:
+            data = f.read()
+
+        def raw() -> None:
+            with open(copy_path, "wb") as f:
+                f.write(data)
+
+        chunked = best_of(args.repeat, lambda: write_chunks(chunks_path, notes, options=options))
+        formatted = best_of(args.repeat, markdown)
+        written = best_of(args.repeat, raw)
+
+    print(f"notes: {len(notes)} ({size:.1f} MiB of text), chunks: {count} "
+          f"of up to {args.tokens} tokens, output: {len(data) / MIB:.1f} MiB")
+    print(f"jsonl chunks: {chunked * 1000:8.1f} ms ({len(notes) / chunked:8.0f} notes/s, "
+          f"{size / chunked:6.1f} MiB/s)")
+    print(f"markdown:     {formatted * 1000:8.1f} ms ({len(notes) / formatted:8.0f} notes/s, "
+          f"{size / formatted:6.1f} MiB/s)")
+    print(f"raw write:    {written * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
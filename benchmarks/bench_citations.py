@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark cleaning note bodies with a citation index against plain
+reference stripping.
+
+The synthetic notes carry a marker per paragraph. The index splits each
+note at its markers in the cleaning pass and expands each distinct marker
+once per note; moving the positions through the whitespace fixes is the
+main cost over stripping.
+
+Usage:
+    python benchmarks/bench_citations.py [--notes N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import make_export  # noqa: E402
+
+from notebooklm_notes2md.core.parser import parse_notes  # noqa: E402
+from notebooklm_notes2md.formatters.citations import CitationIndex  # noqa: E402
+from notebooklm_notes2md.utils.text_processing import clean_text  # noqa: E402
+
+
+def best_of(repeat: int, function) -> float:
+    """Return the fastest of several runs, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = [note["note"] for note in parse_notes(BeautifulSoup(make_export(args.notes), "html.parser"))]
+
+    def strip() -> None:
+        for text in texts:
+            clean_text(text)
+
+    def index(footnotes: bool) -> None:
+        citations = CitationIndex(footnotes)
+        for text in texts:
+            citations.clean(text)
+
+    stripped = best_of(args.repeat, strip)
+    indexed = best_of(args.repeat, lambda: index(False))
+    footnoted = best_of(args.repeat, lambda: index(True))
+
+    citations = CitationIndex()
+    for text in texts:
+        citations.clean(text)
+    cited = sum(len(positions) for note in citations.notes for positions in note.values())
+    size = sum(len(text) for text in texts) / 1024
+    print(f"notes: {len(texts)} ({size:.0f} KiB), citations: {cited}")
+    print(f"strip:     {stripped * 1000:8.1f} ms")
+    print(f"index:     {indexed * 1000:8.1f} ms ({indexed / stripped:.2f}x)")
+    print(f"footnotes: {footnoted * 1000:8.1f} ms ({footnoted / stripped:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory of merging notebooks: the streamed merge versus
+parsing every notebook into memory and formatting them together.
+
+Each run happens in a fresh process so that peak RSS (``ru_maxrss``) is not
+inherited from earlier runs. The merge parses in the same process
+(``--jobs 1``) so that parsing is included in the figure. The streamed
+peak should stay flat as notebooks are added, while the in-memory peak
+grows with their combined size.
+
+Usage:
+    python benchmarks/bench_merge.py [--notebooks 2 8 16] [--notes 300]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_pdf_memory import peak_rss_mb  # noqa: E402
+from synthetic import make_export  # noqa: E402
+
+
+def write_inputs(directory: str, notebooks: int, notes: int) -> List[str]:
+    paths = []
+    for seed in range(notebooks):
+        path = os.path.join(directory, f"notebook-{seed}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(make_export(notes, seed=seed))
+        paths.append(path)
+    return paths
+
+
+def run(paths: List[str], output_path: str, streamed: bool) -> Tuple[float, float]:
+    """Merge the inputs to Markdown; runs in a child process."""
+    from bs4 import BeautifulSoup
+
+    from notebooklm_notes2md.core.parser import parse_notes
+    from notebooklm_notes2md.exporters.merge import merge_notebooks
+    from notebooklm_notes2md.extractors.metadata import extract_metadata
+    from notebooklm_notes2md.formatters.standard import format_standard_markdown
+
+    start = time.perf_counter()
+    if streamed:
+        merge_notebooks(paths, output_path, workers=1)
+    else:
+        documents = []
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                soup = BeautifulSoup(f.read(), "html.parser")
+            documents.append((extract_metadata(soup), parse_notes(soup)))
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("".join(
+                format_standard_markdown(notes, metadata) for metadata, notes in documents
+            ))
+    return peak_rss_mb(), time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notebooks", type=int, nargs="+", default=[2, 8, 16])
+    parser.add_argument("--notes", type=int, default=300)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'notebooks':>9} {'mode':>9} {'peak MiB':>9} {'seconds':>8}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for notebooks in args.notebooks:
+            paths = write_inputs(temp_dir, notebooks, args.notes)
+            for streamed in (False, True):
+                with context.Pool(1) as pool:
+                    peak, elapsed = pool.apply(
+                        run, (paths, os.path.join(temp_dir, "merged.md"), streamed)
+                    )
+                mode = "streamed" if streamed else "in-memory"
+                print(f"{notebooks:>9} {mode:>9} {peak:>9.1f} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark metadata extraction: compiled single-pass schema versus the
+previous three separate selector queries.
+
+Usage:
+    python benchmarks/bench_metadata.py [--notes N] [--repeat R]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import make_export  # noqa: E402
+
+from notebooklm_notes2md.extractors.metadata import extract_metadata  # noqa: E402
+
+
+def separate_queries(soup: BeautifulSoup) -> dict:
+    """The pre-schema implementation: one uncompiled query per field."""
+    title = soup.select_one('.source-title')
+    summary = soup.select_one('.summary .mat-body-medium p')
+    topics = [
+        t.text.strip() for t in soup.select('.key-topics-chip .key-topics-text p')
+        if t.text.strip()
+    ]
+    return {
+        "title": title.text.strip() if title else "Untitled Document",
+        "tags": topics,
+        "summary": summary.text.strip() if summary else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    soup = BeautifulSoup(make_export(args.notes), "html.parser")
+    assert separate_queries(soup)["tags"] == extract_metadata(soup)["tags"]
+
+    old = timeit.timeit(lambda: separate_queries(soup), number=args.repeat) / args.repeat
+    new = timeit.timeit(lambda: extract_metadata(soup), number=args.repeat) / args.repeat
+    print(f"notes: {args.notes}")
+    print(f"separate queries: {old * 1000:8.2f} ms")
+    print(f"compiled schema:  {new * 1000:8.2f} ms  ({old / new:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark parsing one large export split across worker processes.
+
+A synthetic export of the requested size is written to a temporary file,
+then parsed the way ``main()`` does it (whole file, one process) and with
+``parse_notes_parallel`` for each worker count. Every parallel run must
+return exactly the notes of the serial parse.
+
+Usage:
+    python benchmarks/bench_parallel_parse.py [--size-mb 500] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup  # noqa: E402
+from synthetic import make_export  # noqa: E402
+
+from notebooklm_notes2md.core.parallel_parse import parse_notes_parallel  # noqa: E402
+from notebooklm_notes2md.core.parser import parse_notes  # noqa: E402
+
+MIB = 1024 * 1024
+VIEWER_END = "</labs-tailwind-doc-viewer>"
+
+
+def write_export(path: str, size: int) -> None:
+    """Write an export of about ``size`` bytes by repeating a block of notes."""
+    html = make_export(1000)
+    body_start = html.index(">", html.index("<labs-tailwind-doc-viewer")) + 1
+    head, body = html[:body_start], html[body_start:-len(VIEWER_END)]
+    with open(path, "w", encoding="utf-8") as f:
+        written = f.write(head)
+        while written < size:
+            written += f.write(body)
+        f.write(VIEWER_END)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--skip-serial", action="store_true",
+                        help="Skip the whole-file parse, which needs several "
+                             "times the file size in memory")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "export.html")
+        write_export(path, args.size_mb * MIB)
+        size = os.path.getsize(path) / MIB
+        print(f"export: {size:.0f} MiB, cores: {os.cpu_count()}")
+
+        expected = None
+        baseline = None
+        if not args.skip_serial:
+            start = time.perf_counter()
+            with open(path, "r", encoding="utf-8") as f:
+                expected = parse_notes(BeautifulSoup(f.read(), "html.parser"))
+            baseline = time.perf_counter() - start
+            print(f"{'serial':>7}: {baseline:7.2f} s ({size / baseline:6.1f} MiB/s)")
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            notes = parse_notes_parallel(path, workers)
+            elapsed = time.perf_counter() - start
+            if expected is not None:
+                assert notes == expected
+            baseline = baseline or elapsed
+            print(f"{workers:>7}: {elapsed:7.2f} s ({size / elapsed:6.1f} MiB/s, "
+                  f"{baseline / elapsed:.2f}x), {len(notes)} notes")
+            del notes
+
+
+if __name__ == "__main__":
+    main()
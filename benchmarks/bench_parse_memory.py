@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory of note parsing, default versus low-memory traversal.
+
+Allocations are traced with tracemalloc while the HTML is parsed the way
+``main()`` does it. The peak covers building the tree and walking it; the
+steady state is what stays allocated once the notes are extracted and the
+export would start (the default mode keeps the tree alive until the end).
+
+Usage:
+    python benchmarks/bench_parse_memory.py [--notes 500 2000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from typing import Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup  # noqa: E402
+from synthetic import make_export  # noqa: E402
+
+from notebooklm_notes2md.core.parser import parse_notes  # noqa: E402
+from notebooklm_notes2md.extractors.metadata import extract_metadata  # noqa: E402
+
+MIB = 1024 * 1024
+
+
+def measure(html: str, low_memory: bool) -> Tuple[float, float, float, int]:
+    """Return peak MiB, steady-state MiB, seconds and note count."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    soup = BeautifulSoup(html, "html.parser")
+    extract_metadata(soup)
+    notes = parse_notes(soup, low_memory=low_memory)
+    if low_memory:
+        soup.decompose()
+        del soup
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    steady, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = len(notes)
+    del notes
+    if not low_memory:
+        del soup
+    gc.collect()
+    return peak / MIB, steady / MIB, elapsed, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, nargs="+", default=[500, 2000])
+    args = parser.parse_args()
+
+    print(f"{'notes':>6} {'mode':>10} {'peak MiB':>9} {'steady MiB':>11} {'seconds':>8}")
+    for notes in args.notes:
+        html = make_export(notes)
+        for low_memory in (False, True):
+            peak, steady, elapsed, count = measure(html, low_memory)
+            assert count == notes
+            mode = "low-memory" if low_memory else "default"
+            print(f"{notes:>6} {mode:>10} {peak:>9.1f} {steady:>11.1f} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
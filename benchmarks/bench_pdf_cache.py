@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark PDF export with the rendered-section cache.
+
+Compares rendering everything, a cold cache, a warm cache, and a warm
+cache where a fraction of the notes changed since the last export.
+
+Usage:
+    python benchmarks/bench_pdf_cache.py [--notes N] [--changed 0.1]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import make_export  # noqa: E402
+
+from notebooklm_notes2md.core.parser import parse_notes  # noqa: E402
+from notebooklm_notes2md.exporters.pdf import PdfOptions, export_pdf, note_markdown  # noqa: E402
+from notebooklm_notes2md.exporters.pdf_cache import SectionCache, export_pdf_cached  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=300)
+    parser.add_argument("--changed", type=float, default=0.1)
+    args = parser.parse_args()
+
+    notes = parse_notes(BeautifulSoup(make_export(args.notes), "html.parser"))
+    changed = int(len(notes) * args.changed)
+    # Notes edited in place, plus as many new notes appended at the end
+    edited = [dict(n, note=n["note"] + "\n\nEdited.") for n in notes[:changed]]
+    edited += notes[changed:] + [dict(n, note=n["note"] + "\n\nNew.") for n in notes[:changed]]
+    options = PdfOptions()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output = os.path.join(temp_dir, "out.pdf")
+        cache = SectionCache(os.path.join(temp_dir, "cache"))
+
+        runs = [
+            ("no cache", lambda: export_pdf(notes, output, options)),
+            ("cold cache", lambda: export_pdf_cached(note_markdown(notes), output, cache, options)),
+            ("warm cache", lambda: export_pdf_cached(note_markdown(notes), output, cache, options)),
+            (f"warm, {changed}+{changed} new",
+             lambda: export_pdf_cached(note_markdown(edited), output, cache, options)),
+        ]
+        baseline = None
+        for name, run in runs:
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            size = os.path.getsize(output) / 1024
+            print(f"{name:>20}: {elapsed:7.2f} s  ({baseline / elapsed:5.2f}x)  {size:8.0f} KiB")
+        print(cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark PDF throughput of the markdown_pdf engine and the direct engine.
+
+Both engines render the same parsed notes; the direct engine uses the HTML
+built while parsing, the markdown_pdf engine goes through Markdown.
+
+Usage:
+    python benchmarks/bench_pdf_engine.py [--notes N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import make_export  # noqa: E402
+
+from notebooklm_notes2md.core.parser import parse_notes  # noqa: E402
+from notebooklm_notes2md.exporters.pdf import PdfOptions, export_pdf  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    notes = parse_notes(BeautifulSoup(make_export(args.notes), "html.parser"), with_html=True)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        timings = {}
+        for engine in ("markdown", "direct"):
+            path = os.path.join(temp_dir, f"{engine}.pdf")
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                pages, _ = export_pdf(notes, path, PdfOptions(engine=engine))
+                best = min(best, time.perf_counter() - start)
+            timings[engine] = best
+            print(f"{engine:8}: {pages} pages in {best:6.2f} s "
+                  f"({len(notes) / best:7.1f} notes/s, {pages / best:7.1f} pages/s)")
+
+    print(f"speedup: {timings['markdown'] / timings['direct']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory of PDF export, single pass versus chunked.
+
+Each run happens in a fresh process so that peak RSS (``ru_maxrss``) is not
+inherited from earlier runs. The child parses the synthetic notes in small
+batches, so parsing never sets the peak; the figures are the RSS once the
+notes are loaded, the peak RSS after rendering, and the difference.
+
+Usage:
+    python benchmarks/bench_pdf_memory.py [--notes 200 800] [--chunk-size 50]
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup  # noqa: E402
+from synthetic import make_export  # noqa: E402
+
+from notebooklm_notes2md.core.parser import parse_notes  # noqa: E402
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak / 1024 if sys.platform != "darwin" else peak / (1024 * 1024)
+
+
+def load_notes(notes: int, batch: int = 50) -> List[Dict[str, str]]:
+    """Build synthetic notes without ever holding a large soup."""
+    parsed: List[Dict[str, str]] = []
+    for seed, start in enumerate(range(0, notes, batch)):
+        html = make_export(min(batch, notes - start), seed=seed)
+        parsed.extend(parse_notes(BeautifulSoup(html, "html.parser")))
+    return parsed
+
+
+def run(notes: int, chunk_size: int) -> Tuple[float, float, float, int]:
+    """Render synthetic notes to a PDF; runs in a child process."""
+    from notebooklm_notes2md.exporters.pdf import PdfOptions, export_pdf
+
+    parsed = load_notes(notes)
+    gc.collect()
+    after_parse = peak_rss_mb()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        start = time.perf_counter()
+        pages, _ = export_pdf(
+            parsed, os.path.join(temp_dir, "out.pdf"), PdfOptions(chunk_size=chunk_size)
+        )
+        elapsed = time.perf_counter() - start
+    return after_parse, peak_rss_mb(), elapsed, pages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, nargs="+", default=[200, 800])
+    parser.add_argument("--chunk-size", type=int, default=50)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'notes':>6} {'mode':>10} {'pages':>6} {'start MiB':>10} "
+          f"{'peak MiB':>9} {'render MiB':>11} {'seconds':>8}")
+    for notes in args.notes:
+        for chunk_size in (0, args.chunk_size):
+            with context.Pool(1) as pool:
+                after_parse, peak, elapsed, pages = pool.apply(run, (notes, chunk_size))
+            mode = f"chunk={chunk_size}" if chunk_size else "single"
+            print(f"{notes:>6} {mode:>10} {pages:>6} {after_parse:>10.1f} "
+                  f"{peak:>9.1f} {peak - after_parse:>11.1f} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark previews: export the first notes of a large export with --limit
+versus parsing the whole file.
+
+Usage:
+    python benchmarks/bench_preview.py [--notes N] [--limit N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import make_export  # noqa: E402
+
+from notebooklm_notes2md.core.parser import parse_notes  # noqa: E402
+from notebooklm_notes2md.core.selection import (  # noqa: E402
+    NoteSelection,
+    iter_notes_from_end,
+    select_notes,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=10000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "export.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(make_export(args.notes, paragraphs=1))
+
+        start = time.perf_counter()
+        with open(path, encoding="utf-8") as f:
+            full = parse_notes(BeautifulSoup(f.read(), "html.parser"))[:args.limit]
+        full_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        preview = list(select_notes(iter_notes_from_end(path), NoteSelection(limit=args.limit)))
+        preview_time = time.perf_counter() - start
+
+        assert preview == full
+        print(f"export: {args.notes} notes ({os.path.getsize(path) / 1e6:.1f} MB)")
+        print(f"full parse:      {full_time * 1000:9.1f} ms")
+        print(f"--limit {args.limit:<7} {preview_time * 1000:9.1f} ms  "
+              f"({full_time / preview_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cost of progress hooks on parsing and formatting.
+
+Runs the same conversion without hooks, with hooks that register no
+callback (every note is still a cancellation checkpoint) and with the
+command line progress display writing to a discarded stream.
+
+Usage:
+    python benchmarks/bench_progress.py [--notes N] [--repeat N]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from typing import Callable, List, Sequence
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import make_export  # noqa: E402
+
+from notebooklm_notes2md.core.parser import parse_notes  # noqa: E402
+from notebooklm_notes2md.core.progress import ProgressDisplay, ProgressHooks  # noqa: E402
+from notebooklm_notes2md.formatters.obsidian import format_obsidian_markdown  # noqa: E402
+
+
+def best_of(repeat: int, functions: Sequence[Callable[[], None]]) -> List[float]:
+    """Return the fastest run of each function, running them in turns."""
+    timings = [float("inf")] * len(functions)
+    for _ in range(repeat):
+        for index, function in enumerate(functions):
+            start = time.perf_counter()
+            function()
+            timings[index] = min(timings[index], time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    html = make_export(args.notes)
+    soup = BeautifulSoup(html, "html.parser")
+    notes = parse_notes(soup)
+    metadata = {"title": "Benchmark", "tags": []}
+
+    def parse(hooks) -> None:
+        # Parsing leaves the tree intact, so one soup serves every run
+        parse_notes(soup, hooks=hooks)
+
+    def format_notes(hooks) -> None:
+        format_obsidian_markdown(notes, metadata, date="2024-01-01", hooks=hooks)
+
+    print(f"notes: {len(notes)}")
+    for name, run in (("parse", parse), ("format", format_notes)):
+        bare, empty, shown = best_of(args.repeat, [
+            lambda: run(None),
+            lambda: run(ProgressHooks()),
+            lambda: run(ProgressDisplay(io.StringIO()).hooks),
+        ])
+        print(f"{name}:")
+        print(f"  no hooks:      {bare * 1000:8.1f} ms")
+        print(f"  empty hooks:   {empty * 1000:8.1f} ms ({empty / bare:.3f}x)")
+        print(f"  display:       {shown * 1000:8.1f} ms ({shown / bare:.3f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark handing parsed notes to worker processes: pickled note lists
+versus a shared memory note store.
+
+Each worker receives its share of the notes and reads every field, as a
+renderer would.
+
+Usage:
+    python benchmarks/bench_shared_notes.py [--notes N] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import make_export  # noqa: E402
+
+from notebooklm_notes2md.core.parser import parse_notes  # noqa: E402
+from notebooklm_notes2md.core.shared_notes import SharedNoteStore  # noqa: E402
+
+
+def read_pickled(notes: list) -> int:
+    return sum(len(note["title"]) + len(note["note"]) for note in notes)
+
+
+def read_shared(store: SharedNoteStore, start: int, stop: int) -> int:
+    try:
+        return sum(len(note["title"]) + len(note["note"]) for note in store[start:stop])
+    finally:
+        store.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=2000)
+    parser.add_argument("--copies", type=int, default=20,
+                        help="Repeat the parsed notes to reach a large notebook")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    parsed = parse_notes(BeautifulSoup(make_export(args.notes), "html.parser"))
+    # Distinct strings, as pickle would only send repeated ones once
+    notes = [
+        {"title": f"{note['title']} {copy}", "note": f"{note['note']} {copy}"}
+        for copy in range(args.copies) for note in parsed
+    ]
+    size = -(-len(notes) // args.workers)
+    # Each worker renders a share of the notes, or all of them (one output
+    # format per worker)
+    scenarios = {
+        "split": [(start, min(start + size, len(notes))) for start in range(0, len(notes), size)],
+        "broadcast": [(0, len(notes))] * args.workers,
+    }
+
+    with ProcessPoolExecutor(args.workers) as executor:
+        # Start the workers before timing
+        list(executor.map(abs, range(args.workers)))
+        megabytes = 0.0
+
+        for scenario, ranges in scenarios.items():
+            start = time.perf_counter()
+            pickled = sum(executor.map(read_pickled, [notes[a:b] for a, b in ranges]))
+            pickled_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with SharedNoteStore.create(notes) as store:
+                megabytes = store.nbytes / 1024 / 1024
+                shared = sum(executor.map(
+                    read_shared, [store] * len(ranges),
+                    [a for a, _ in ranges], [b for _, b in ranges],
+                ))
+            shared_time = time.perf_counter() - start
+
+            assert pickled == shared
+            print(f"{scenario:9} pickled lists: {pickled_time * 1000:8.1f} ms, "
+                  f"shared store: {shared_time * 1000:8.1f} ms "
+                  f"({pickled_time / shared_time:.2f}x)")
+
+    print(f"notes: {len(notes)} ({megabytes:.1f} MiB), workers: {args.workers}; "
+          "shared store times include the copy into shared memory")
+
+
+if __name__ == "__main__":
+    main()
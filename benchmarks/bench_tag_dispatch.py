@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark the tag handler registry of the DOM walker.
+
+Every structural element of a synthetic export is rendered to Markdown
+with the branch-per-class walker the registry replaced, with the default
+registry, and with the default registry plus extra rules for classes that
+never occur, as when support for more markup is added.
+
+Usage:
+    python benchmarks/bench_tag_dispatch.py [--notes N] [--extra-rules 10 100]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bs4 import BeautifulSoup  # noqa: E402
+from bs4.element import Tag  # noqa: E402
+from synthetic import make_export  # noqa: E402
+
+from notebooklm_notes2md.utils.html_processing import (  # noqa: E402
+    MARKDOWN_HANDLERS,
+    extract_tag_classes,
+    find_parent_element,
+    format_span_text,
+    process_div_prefix,
+)
+from notebooklm_notes2md.utils.tag_handlers import TagRegistry  # noqa: E402
+
+
+def branch_walker(tag: Any) -> str:
+    """The walker before the registry: tag name and class checks per node."""
+    if not isinstance(tag, Tag):
+        return ""
+    tag_classes = extract_tag_classes(tag)
+    if tag.name == "span":
+        return format_span_text(tag.text, tag_classes)
+    elif tag.name == "div":
+        prefix = process_div_prefix(tag_classes)
+        if prefix in ["- "]:
+            return prefix
+        texts = prefix
+        for child in getattr(tag, "children", []):
+            texts += branch_walker(child)
+        return texts
+    texts = ""
+    for child in getattr(tag, "children", []):
+        texts += branch_walker(child)
+    return texts
+
+
+def with_extra_rules(count: int) -> TagRegistry:
+    registry = TagRegistry()
+    for rule in MARKDOWN_HANDLERS.rules:
+        registry.register(*rule)
+    for index in range(count):
+        name = "span" if index % 2 else "div"
+        registry.register(name, f"unused-{index}", lambda tag, registry: "")
+    return registry
+
+
+def best_time(render: Callable[[Any], str], elements: List[Tag], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for element in elements:
+            render(element)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=1000)
+    parser.add_argument("--extra-rules", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    parent = find_parent_element(BeautifulSoup(make_export(args.notes), "html.parser"))
+    elements = [child for child in parent.children if isinstance(child, Tag)]
+    nodes = sum(1 + len(element.find_all(True)) for element in elements)
+    expected = [branch_walker(element) for element in elements]
+
+    walkers = {"branches": branch_walker, "registry": MARKDOWN_HANDLERS.render}
+    for count in args.extra_rules:
+        walkers[f"+{count} rules"] = with_extra_rules(count).render
+
+    print(f"elements: {len(elements)}, nodes: {nodes}")
+    for label, render in walkers.items():
+        assert [render(element) for element in elements] == expected
+        elapsed = best_time(render, elements, args.repeat)
+        print(f"{label:>11}: {elapsed * 1000:8.1f} ms ({elapsed / nodes * 1e9:6.0f} ns/node)")
+
+
+if __name__ == "__main__":
+    main()
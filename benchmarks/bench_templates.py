@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark Markdown formatting: compiled templates versus the hand-written
+formatters they replace, over many documents.
+
+Usage:
+    python benchmarks/bench_templates.py [--documents N] [--notes N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import make_export  # noqa: E402
+
+from notebooklm_notes2md.core.parser import parse_notes  # noqa: E402
+from notebooklm_notes2md.extractors.metadata import extract_metadata  # noqa: E402
+from notebooklm_notes2md.formatters.obsidian import format_obsidian_markdown  # noqa: E402
+from notebooklm_notes2md.formatters.templates import (  # noqa: E402
+    builtin_template_set,
+    format_template_markdown,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--notes", type=int, default=10)
+    args = parser.parse_args()
+
+    soup = BeautifulSoup(make_export(args.notes), "html.parser")
+    notes = parse_notes(soup)
+    metadata = extract_metadata(soup)
+    templates = builtin_template_set("obsidian")
+    assert format_template_markdown(notes, metadata, templates) == \
+        format_obsidian_markdown(notes, metadata)
+
+    start = time.perf_counter()
+    for _ in range(args.documents):
+        format_obsidian_markdown(notes, metadata)
+    handwritten = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.documents):
+        format_template_markdown(notes, metadata, templates)
+    templated = time.perf_counter() - start
+
+    print(f"documents: {args.documents} x {args.notes} notes")
+    print(f"hand-written formatter: {args.documents / handwritten:9.0f} docs/s")
+    print(f"compiled templates:     {args.documents / templated:9.0f} docs/s "
+          f"({handwritten / templated:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
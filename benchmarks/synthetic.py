@@ -0,0 +1,88 @@
+"""
+Synthetic NotebookLM exports for benchmarks.
+
+The generated HTML mimics the structure of a "Convert all notes to source"
+export: a metadata header followed by a ``labs-tailwind-doc-viewer`` whose
+structural elements hold headings, paragraphs, bullets, bold and code spans.
+Notes are separated by empty paragraphs.
+"""
+
+import random
+from typing import List
+
+WORDS = (
+    "market auction price volume buyer seller order overlap satisfaction "
+    "manipulation trading simulation fair daily bid ask spread liquidity "
+    "signal noise pump dump setter equilibrium cycle random"
+).split()
+
+HEADER = (
+    '<div class="source-title">Synthetic Notebook</div>'
+    '<div class="summary"><div class="mat-body-medium"><p>{summary}</p></div></div>'
+    '<div class="key-topics">{topics}</div>'
+)
+TOPIC = '<div class="key-topics-chip"><div class="key-topics-text"><p>{}</p></div></div>'
+ELEMENT = (
+    '<labs-tailwind-structural-element-view-v2 class="ng-star-inserted">'
+    '<!---->{}<!----></labs-tailwind-structural-element-view-v2>'
+)
+
+
+def _sentence(rng: random.Random, words: int = 14) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _span(text: str, classes: str = "ng-star-inserted") -> str:
+    return f'<span class="{classes}">{text}</span>'
+
+
+def _note_elements(rng: random.Random, index: int, paragraphs: int) -> List[str]:
+    elements = [
+        '<div class="paragraph heading3 ng-star-inserted">'
+        + _span(f"Note {index}: {_sentence(rng, 4)[:-1]}") + "</div>"
+    ]
+    for p in range(paragraphs):
+        spans = [
+            _span(_sentence(rng)),
+            _span(rng.choice(WORDS).title(), "bold ng-star-inserted"),
+            _span(_sentence(rng) + f" [{p + 1}, {p + 2}]"),
+        ]
+        if p % 2:
+            spans.append(_span("price = bid + ask", "code ng-star-inserted"))
+        elements.append(
+            '<div class="paragraph normal ng-star-inserted">' + "".join(spans) + "</div>"
+        )
+        elements.append(
+            '<div class="bullet ng-star-inserted"></div>'
+            '<div class="paragraph normal ng-star-inserted">'
+            + _span(_sentence(rng, 8)) + "</div>"
+        )
+    # Empty paragraph marks the end of the note
+    elements.append('<div class="paragraph normal ng-star-inserted"></div>')
+    return elements
+
+
+def make_export(notes: int, paragraphs: int = 3, seed: int = 0) -> str:
+    """
+    Build the HTML of a synthetic export.
+
+    Args:
+        notes: Number of notes
+        paragraphs: Paragraphs per note
+        seed: Random seed, so runs are reproducible; the first notes of
+            exports with the same seed are identical
+
+    Returns:
+        The HTML document
+    """
+    rng = random.Random(seed)
+    topics = "".join(TOPIC.format(" ".join(rng.sample(WORDS, 2)).title()) for _ in range(5))
+    parts = [HEADER.format(summary=_sentence(rng, 40), topics=topics)]
+    parts.append('<labs-tailwind-doc-viewer class="ng-star-inserted">')
+    for index in range(notes, 0, -1):
+        # Newer notes come first, as in NotebookLM exports. Each note has its
+        # own generator, so a larger export only adds notes at the front.
+        note_rng = random.Random(f"{seed}:{index}")
+        parts.extend(ELEMENT.format(e) for e in _note_elements(note_rng, index, paragraphs))
+    parts.append("</labs-tailwind-doc-viewer>")
+    return "".join(parts)
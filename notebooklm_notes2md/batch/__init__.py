@@ -0,0 +1,3 @@
+"""
+Batch processing of many NotebookLM exports in one run.
+"""
@@ -0,0 +1,304 @@
+"""
+Job journal for resumable batch runs.
+
+The journal is a SQLite database with one row per input file recording its
+state (pending, running, done or failed), the hash of the input that was
+converted, the output path, the number of attempts and the duration of the
+last attempt. Workers claim files one at a time inside an exclusive
+transaction, so several processes, or several hosts sharing a filesystem
+with working file locks, can run against the same journal without
+converting the same file twice.
+
+A worker that dies mid-file, e.g. killed for running out of memory, leaves
+its row running. The row can be claimed again at once if the worker ran on
+this host and its process is gone, otherwise once its lease expires; the
+attempt still counts towards the retry limit.
+"""
+
+import hashlib
+import os
+import socket
+import sqlite3
+import time
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+STATES = ("pending", "running", "done", "failed")
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_LEASE_SECONDS = 3600.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    input_path TEXT PRIMARY KEY,
+    output_path TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    input_hash TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    claimed_at REAL,
+    duration REAL,
+    error TEXT,
+    updated_at REAL
+)
+"""
+
+
+class Job(NamedTuple):
+    """A file claimed from the journal."""
+
+    input_path: str
+    output_path: str
+    attempt: int
+
+
+def file_digest(path: str) -> str:
+    """
+    Hash the contents of a file.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def default_worker_id() -> str:
+    """Identify this process as host:pid."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def worker_alive(worker: Optional[str]) -> bool:
+    """
+    Check whether a worker may still be running.
+
+    Only workers on this host can be checked; others are assumed alive.
+
+    Args:
+        worker: Worker identifier as host:pid
+
+    Returns:
+        False if the worker is known to be gone
+    """
+    host, _, pid = (worker or "").rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # The process exists but belongs to another user
+        return True
+    return True
+
+
+class BatchJournal:
+    """
+    SQLite-backed record of per-file batch state.
+
+    Args:
+        path: Path of the journal database (created if missing)
+        max_attempts: Attempts per file before it stays failed
+        lease_seconds: Time after which a running file is considered
+            abandoned and may be claimed again
+        worker: Identifier of this worker; host:pid by default
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        worker: Optional[str] = None,
+    ) -> None:
+        self.path = path
+        self.max_attempts = max(max_attempts, 1)
+        self.lease_seconds = lease_seconds
+        self.worker = worker or default_worker_id()
+        # Autocommit mode: transactions are opened explicitly where needed
+        self._db = sqlite3.connect(path, timeout=60.0, isolation_level=None)
+        self._db.execute(_SCHEMA)
+        self._db.create_function("worker_alive", 1, worker_alive)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+    def __enter__(self) -> "BatchJournal":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def register(self, jobs: Iterable[Tuple[str, str]], resume: bool = False) -> None:
+        """
+        Add files to the journal.
+
+        Without ``resume`` every file starts over as pending, except files
+        another worker is converting right now. With ``resume`` finished
+        files are kept unless their input changed since, and failed files
+        keep their attempt count.
+
+        Args:
+            jobs: (input path, output path) pairs
+            resume: Keep the state of files already in the journal
+        """
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            for input_path, output_path in jobs:
+                row = self._db.execute(
+                    "SELECT state, input_hash FROM jobs WHERE input_path = ?",
+                    (input_path,),
+                ).fetchone()
+                if row is None:
+                    self._db.execute(
+                        "INSERT INTO jobs (input_path, output_path, updated_at) VALUES (?, ?, ?)",
+                        (input_path, output_path, now),
+                    )
+                    continue
+                state, input_hash = row
+                if resume and state != "done":
+                    continue
+                if resume and state == "done" and _unchanged(input_path, input_hash, output_path):
+                    continue
+                if not resume and state == "running" and self._lease_active(input_path, now):
+                    continue
+                self._db.execute(
+                    "UPDATE jobs SET output_path = ?, state = 'pending', attempts = 0, "
+                    "error = NULL, updated_at = ? WHERE input_path = ?",
+                    (output_path, now, input_path),
+                )
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+
+    def _lease_active(self, input_path: str, now: float) -> bool:
+        row = self._db.execute(
+            "SELECT claimed_at, worker FROM jobs WHERE input_path = ?", (input_path,)
+        ).fetchone()
+        if not row or row[0] is None or row[0] <= now - self.lease_seconds:
+            return False
+        return worker_alive(row[1])
+
+    def claim(self) -> Optional[Job]:
+        """
+        Atomically take the next file to convert.
+
+        Pending files come first, then failed files with attempts left,
+        then running files whose worker is gone or whose lease expired.
+
+        Returns:
+            The claimed job, or None when no work is left
+        """
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            # Abandoned files without attempts left end up failed
+            self._db.execute(
+                "UPDATE jobs SET state = 'failed', error = 'worker stopped', updated_at = ? "
+                "WHERE state = 'running' AND attempts >= ? "
+                "AND (claimed_at < ? OR NOT worker_alive(worker))",
+                (now, self.max_attempts, now - self.lease_seconds),
+            )
+            row = self._db.execute(
+                "SELECT input_path, output_path, attempts FROM jobs "
+                "WHERE attempts < ? AND (state = 'pending' OR state = 'failed' "
+                "OR (state = 'running' AND (claimed_at < ? OR NOT worker_alive(worker)))) "
+                "ORDER BY CASE state WHEN 'pending' THEN 0 WHEN 'failed' THEN 1 ELSE 2 END, "
+                "rowid LIMIT 1",
+                (self.max_attempts, now - self.lease_seconds),
+            ).fetchone()
+            if row is not None:
+                self._db.execute(
+                    "UPDATE jobs SET state = 'running', attempts = attempts + 1, "
+                    "worker = ?, claimed_at = ?, updated_at = ? WHERE input_path = ?",
+                    (self.worker, now, now, row[0]),
+                )
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        return Job(row[0], row[1], row[2] + 1)
+
+    def complete(self, job: Job, input_hash: str, duration: float) -> None:
+        """
+        Record a converted file.
+
+        Args:
+            job: The claimed job
+            input_hash: Hash of the input that was converted
+            duration: Conversion time in seconds
+        """
+        self._db.execute(
+            "UPDATE jobs SET state = 'done', input_hash = ?, duration = ?, error = NULL, "
+            "updated_at = ? WHERE input_path = ?",
+            (input_hash, duration, time.time(), job.input_path),
+        )
+
+    def fail(self, job: Job, error: str, duration: float) -> None:
+        """
+        Record a failed attempt.
+
+        Args:
+            job: The claimed job
+            error: Description of the failure
+            duration: Time spent in seconds
+        """
+        self._db.execute(
+            "UPDATE jobs SET state = 'failed', error = ?, duration = ?, updated_at = ? "
+            "WHERE input_path = ?",
+            (error, duration, time.time(), job.input_path),
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Count files per state.
+
+        Returns:
+            Mapping of every state to its number of files
+        """
+        counts = dict.fromkeys(STATES, 0)
+        for state, count in self._db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state"):
+            counts[state] = count
+        return counts
+
+    def state(self, input_path: str) -> Optional[str]:
+        """
+        Return the state of one file, or None if it is not in the journal.
+
+        Args:
+            input_path: Input path as registered
+        """
+        row = self._db.execute(
+            "SELECT state FROM jobs WHERE input_path = ?", (input_path,)
+        ).fetchone()
+        return row[0] if row else None
+
+
+def _unchanged(input_path: str, input_hash: Optional[str], output_path: str) -> bool:
+    if not input_hash or not os.path.isfile(input_path) or not os.path.isfile(output_path):
+        return False
+    return file_digest(input_path) == input_hash
+
+
+def format_journal_counts(counts: Dict[str, int]) -> str:
+    """
+    Describe journal counts in one line.
+
+    Args:
+        counts: Files per state
+
+    Returns:
+        Human-readable summary
+    """
+    return "Journal: " + ", ".join(f"{counts[state]} {state}" for state in STATES)
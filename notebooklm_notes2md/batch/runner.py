@@ -0,0 +1,367 @@
+"""
+Batch runner converting many NotebookLM exports into one output directory
+or archive.
+"""
+
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from bs4 import BeautifulSoup
+
+from notebooklm_notes2md.batch.journal import BatchJournal, file_digest
+from notebooklm_notes2md.batch.scheduler import BatchProgress, estimate_job, run_scheduled
+from notebooklm_notes2md.cli.main import export_notes, read_input_file, reproducible_output
+from notebooklm_notes2md.core.dedup import DedupIndex, duplicate_stub
+from notebooklm_notes2md.core.parser import parse_notes
+from notebooklm_notes2md.exporters.archive import (
+    ArchiveWriter,
+    archive_extension,
+    format_archive_stats,
+    write_markdown_member,
+    write_pdf_member,
+)
+from notebooklm_notes2md.exporters.pdf import DEFAULT_PDF_OPTIONS, PdfOptions
+from notebooklm_notes2md.exporters.site import DEFAULT_SITE_OPTIONS, SiteOptions
+from notebooklm_notes2md.extractors.metadata import extract_metadata
+from notebooklm_notes2md.extractors.schema import MetadataSchema
+from notebooklm_notes2md.formatters.autolink import (
+    AutolinkConfig,
+    build_autolinker,
+    link_notes,
+)
+from notebooklm_notes2md.formatters.templates import TemplateSet
+from notebooklm_notes2md.utils.reproducible import format_source_date, resolve_source_date
+
+DUPLICATE_MODES = ("skip", "link")
+
+
+def output_path_for(input_path: str, output_dir: str, extension: str) -> str:
+    """
+    Build the output path for one input file of a batch.
+
+    Args:
+        input_path: Path to the input HTML file
+        output_dir: Directory receiving the batch output
+        extension: Output extension including the dot (".md", ".pdf" or ".html")
+
+    Returns:
+        Path of the output file
+    """
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(output_dir, stem + extension)
+
+
+def filter_duplicates(
+    notes: List[Dict[str, str]],
+    dedup: DedupIndex,
+    ref: str,
+    duplicates: str = "skip",
+) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+    """
+    Drop or link notes that were already rendered elsewhere in the archive.
+
+    The index is only looked up: the notes are registered with
+    ``dedup.add`` once their output has been written, so a failed export
+    leaves no reference to a missing file.
+
+    Args:
+        notes: Notes parsed from one input file
+        dedup: Index shared across the batch
+        ref: Reference of the output file (its name)
+        duplicates: "skip" to drop duplicates, "link" to replace them with
+            a link to the original
+
+    Returns:
+        The notes to render, and the notes to register once rendered
+    """
+    kept = []
+    new = []
+    for note in notes:
+        duplicate = dedup.find(note)
+        if duplicate is None or duplicate.ref == ref:
+            # Re-exporting the same file must not drop its own notes
+            kept.append(note)
+            new.append(note)
+        elif duplicates == "link":
+            kept.append(duplicate_stub(note, duplicate))
+    return kept, new
+
+
+def export_member(
+    archive: ArchiveWriter,
+    name: str,
+    notes: List[Dict[str, str]],
+    format_type: str = "standard",
+    metadata: Optional[Dict] = None,
+    pdf_options: PdfOptions = DEFAULT_PDF_OPTIONS,
+    templates: Optional[TemplateSet] = None,
+    autolink: Optional[AutolinkConfig] = None,
+    source_date: Optional[int] = None,
+) -> None:
+    """
+    Export the notes of one input file as a member of a batch archive.
+
+    Args:
+        archive: Open archive receiving the batch
+        name: Member name, ending in .md or .pdf
+        notes: List of note dictionaries
+        format_type: Format type for Markdown output
+        metadata: Optional metadata dictionary
+        pdf_options: Options for PDF output
+        templates: Optional compiled templates for Markdown output
+        autolink: Optional wikilink configuration for Markdown output
+        source_date: Reproducible mode: the export date, in seconds since
+            the epoch
+
+    Raises:
+        SystemExit: If the member type is not supported or writing fails
+    """
+    if source_date is not None:
+        pdf_options = pdf_options._replace(source_date=source_date)
+    try:
+        if name.lower().endswith(".pdf"):
+            write_pdf_member(archive, name, notes, pdf_options)
+        elif name.lower().endswith(".md"):
+            if autolink is not None:
+                notes = link_notes(notes, build_autolinker(autolink, metadata))
+            write_markdown_member(
+                archive, name, notes, format_type, metadata, templates,
+                format_source_date(source_date),
+            )
+        else:
+            print("Error: Archives can only hold .md and .pdf files")
+            sys.exit(1)
+    except OSError as e:
+        print(f"Error writing {name} to {archive.path}: {e}")
+        sys.exit(1)
+
+
+def convert_file(
+    input_path: str,
+    output_path: str,
+    format_type: str = "standard",
+    dedup: Optional[DedupIndex] = None,
+    duplicates: str = "skip",
+    schema: Optional[MetadataSchema] = None,
+    pdf_options: PdfOptions = DEFAULT_PDF_OPTIONS,
+    templates: Optional[TemplateSet] = None,
+    autolink: Optional[AutolinkConfig] = None,
+    site_options: SiteOptions = DEFAULT_SITE_OPTIONS,
+    archive: Optional[ArchiveWriter] = None,
+    reproducible: bool = False,
+) -> int:
+    """
+    Convert one input file as part of a batch.
+
+    Args:
+        input_path: Path to the input HTML file
+        output_path: Path of the output file, or member name in ``archive``
+        format_type: Format type for Markdown output
+        dedup: Optional duplicate index shared across the batch
+        duplicates: How duplicates are handled ("skip" or "link")
+        schema: Optional metadata schema
+        pdf_options: Options for PDF output
+        templates: Optional compiled templates for Markdown output
+        autolink: Optional wikilink configuration for Markdown output
+        site_options: Options for HTML site output
+        archive: Optional archive receiving the output instead of a file
+        reproducible: Date the output with the source date (the archive
+            time in an archive) and keep output files whose bytes did not
+            change
+
+    Returns:
+        Number of notes parsed from the input file
+    """
+    soup = BeautifulSoup(read_input_file(input_path), "html.parser")
+    metadata = extract_metadata(soup, schema)
+    with_html = output_path.lower().endswith(".html") or (
+        output_path.lower().endswith(".pdf") and pdf_options.engine == "direct"
+    )
+    notes = parse_notes(soup, with_html=with_html)
+    parsed = len(notes)
+
+    ref = os.path.basename(output_path)
+    new: List[Dict[str, str]] = []
+    if dedup is not None:
+        notes, new = filter_duplicates(notes, dedup, ref, duplicates)
+
+    if archive is not None:
+        export_member(
+            archive, output_path, notes, format_type, metadata, pdf_options,
+            templates, autolink, int(archive.mtime) if reproducible else None,
+        )
+    else:
+        export_notes(
+            notes, output_path, format_type, metadata, pdf_options, templates,
+            autolink, site_options,
+            source_date=resolve_source_date(input_path) if reproducible else None,
+        )
+    if dedup is not None:
+        # Only now is there an output for later files to link to
+        for note in new:
+            dedup.add(note, ref)
+    message = f"Successfully exported {len(notes)} notes to {output_path}"
+    if parsed > len(notes):
+        message += f" ({parsed - len(notes)} duplicates skipped)"
+    print(message)
+    return parsed
+
+
+def run_batch(
+    input_paths: Sequence[str],
+    output_dir: str,
+    extension: str = ".md",
+    format_type: str = "standard",
+    dedup: Optional[DedupIndex] = None,
+    duplicates: str = "skip",
+    schema: Optional[MetadataSchema] = None,
+    pdf_options: PdfOptions = DEFAULT_PDF_OPTIONS,
+    templates: Optional[TemplateSet] = None,
+    journal: Optional[BatchJournal] = None,
+    resume: bool = False,
+    workers: int = 1,
+    memory_budget: Optional[int] = None,
+    autolink: Optional[AutolinkConfig] = None,
+    site_options: SiteOptions = DEFAULT_SITE_OPTIONS,
+    archive: Optional[ArchiveWriter] = None,
+    reproducible: bool = False,
+) -> int:
+    """
+    Convert every input file into the output directory.
+
+    An output directory ending in .zip, .tar.gz or .tgz is an archive
+    instead: each output file is streamed into it as a member.
+
+    A failing file is reported and does not stop the batch. With a journal,
+    files are claimed from it one at a time, so finished files are skipped
+    on resume, failed files are retried up to the journal's attempt limit
+    and concurrent workers never convert the same file. With several
+    workers, files are converted in parallel, largest first, within the
+    memory budget.
+
+    Args:
+        input_paths: Paths to the input HTML files
+        output_dir: Directory, or archive path, receiving the output files
+        extension: Output extension including the dot (".md", ".pdf" or ".html")
+        format_type: Format type for Markdown output
+        dedup: Optional duplicate index shared across the batch
+        duplicates: How duplicates are handled ("skip" or "link")
+        schema: Optional metadata schema shared by all files
+        pdf_options: Options for PDF output
+        templates: Optional compiled templates for Markdown output
+        journal: Optional job journal recording per-file state
+        resume: Keep finished work recorded in the journal
+        workers: Number of worker processes
+        memory_budget: Cap on the estimated memory of files converted at
+            the same time, in bytes
+        autolink: Optional wikilink configuration for Markdown output; its
+            automata are built once and reused for every file
+        site_options: Options for HTML site output
+        archive: Archive receiving the members; set internally when
+            ``output_dir`` is an archive path
+        reproducible: Date each output with its source date (an archive
+            with the newest one) and keep outputs whose bytes did not change
+
+    Returns:
+        Number of files that failed
+
+    Raises:
+        ValueError: If several workers are combined with a duplicate index
+            or a journal, which must see the files one at a time, or an
+            archive is combined with several workers or a journal
+    """
+    if workers > 1 and (dedup is not None or journal is not None):
+        raise ValueError("parallel workers cannot share a duplicate index or a journal")
+
+    if archive_extension(output_dir):
+        if workers > 1 or journal is not None:
+            raise ValueError("an archive is written by one process and cannot be journaled")
+        mtime = None
+        if reproducible:
+            existing = [path for path in input_paths if os.path.isfile(path)]
+            mtime = max((resolve_source_date(path) for path in existing), default=0)
+        with reproducible_output(output_dir, reproducible) as path, \
+                ArchiveWriter(path, mtime) as archive:
+            failures = run_batch(
+                input_paths, "", extension, format_type, dedup, duplicates,
+                schema, pdf_options, templates, autolink=autolink,
+                site_options=site_options, archive=archive, reproducible=reproducible,
+            )
+        print(format_archive_stats(archive.stats()))
+        return failures
+
+    def convert(input_path: str, output_path: str) -> None:
+        convert_file(
+            input_path, output_path, format_type, dedup, duplicates,
+            schema, pdf_options, templates, autolink, site_options, archive,
+            reproducible,
+        )
+
+    if journal is not None:
+        return _run_journaled(input_paths, output_dir, extension, journal, resume, convert)
+
+    jobs = [
+        estimate_job(input_path, output_path_for(input_path, output_dir, extension), extension)
+        for input_path in input_paths
+    ]
+    if workers > 1:
+        return run_scheduled(
+            jobs, convert_file,
+            (
+                format_type, None, duplicates, schema, pdf_options, templates,
+                autolink, site_options, None, reproducible,
+            ),
+            workers, memory_budget,
+        )
+
+    progress = BatchProgress(jobs)
+    failures = 0
+    for job in jobs:
+        try:
+            convert(job.input_path, job.output_path)
+        except SystemExit:
+            # The export helpers report their own errors before exiting
+            print(f"Error: Failed to convert {job.input_path}")
+            failures += 1
+        except Exception as e:
+            print(f"Error: {e}")
+            print(f"Error: Failed to convert {job.input_path}")
+            failures += 1
+        print(progress.update(job))
+    return failures
+
+
+def _run_journaled(
+    input_paths: Sequence[str],
+    output_dir: str,
+    extension: str,
+    journal: BatchJournal,
+    resume: bool,
+    convert: Callable[[str, str], None],
+) -> int:
+    journal.register(
+        ((input_path, output_path_for(input_path, output_dir, extension))
+         for input_path in input_paths),
+        resume=resume,
+    )
+
+    attempted = set()
+    job = journal.claim()
+    while job is not None:
+        attempted.add(job.input_path)
+        start = time.perf_counter()
+        try:
+            input_hash = file_digest(job.input_path)
+            convert(job.input_path, job.output_path)
+        except (SystemExit, Exception) as e:
+            error = f"exit status {e.code}" if isinstance(e, SystemExit) else str(e)
+            print(f"Error: Failed to convert {job.input_path} "
+                  f"(attempt {job.attempt} of {journal.max_attempts})")
+            journal.fail(job, error, time.perf_counter() - start)
+        else:
+            journal.complete(job, input_hash, time.perf_counter() - start)
+        job = journal.claim()
+
+    return sum(1 for input_path in attempted if journal.state(input_path) == "failed")
@@ -0,0 +1,214 @@
+"""
+Size-aware scheduling of batch conversions across worker processes.
+
+The cost of a file is estimated from its size and the output type. Files
+are dispatched largest first (longest-processing-time-first), so the big
+files do not start last and leave the other workers idle at the end of
+the run. A memory budget caps the estimated memory of the files converted
+at the same time: when the next large file does not fit, a smaller one
+that fits is started instead, and a file larger than the whole budget
+only runs alone.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+MIB = 1024 * 1024
+
+# Estimated peak memory per byte of HTML: the parsed tree takes about 20
+# times the input size (see benchmarks/bench_parse_memory.py) and PDF
+# rendering keeps the Markdown and the pages on top of it
+MEMORY_PER_INPUT_BYTE = {".md": 20, ".pdf": 32}
+
+# Interpreter, libraries and fonts loaded by every job
+BASE_JOB_MEMORY = 64 * MIB
+
+# Relative conversion time per byte of HTML
+COST_PER_INPUT_BYTE = {".md": 1.0, ".pdf": 3.0}
+
+
+class FileJob(NamedTuple):
+    """One file of a batch with its estimated cost."""
+
+    input_path: str
+    output_path: str
+    size: int
+    memory: int
+    cost: float
+
+
+def estimate_job(input_path: str, output_path: str, extension: str) -> FileJob:
+    """
+    Estimate the memory and time needed to convert one file.
+
+    Args:
+        input_path: Path to the input HTML file
+        output_path: Path of the output file
+        extension: Output extension including the dot (".md" or ".pdf")
+
+    Returns:
+        The job with its estimates
+    """
+    try:
+        size = os.path.getsize(input_path)
+    except OSError:
+        size = 0
+    memory = BASE_JOB_MEMORY + size * MEMORY_PER_INPUT_BYTE.get(extension, 32)
+    cost = size * COST_PER_INPUT_BYTE.get(extension, 3.0)
+    return FileJob(input_path, output_path, size, memory, cost)
+
+
+def order_jobs(jobs: Sequence[FileJob]) -> List[FileJob]:
+    """
+    Order jobs largest first; equal costs keep their input order.
+
+    Args:
+        jobs: The jobs to order
+
+    Returns:
+        The jobs in dispatch order
+    """
+    return sorted(jobs, key=lambda job: -job.cost)
+
+
+def next_job_index(
+    pending: Sequence[FileJob],
+    memory_in_use: int,
+    memory_budget: Optional[int],
+    running: int,
+) -> Optional[int]:
+    """
+    Pick the next job to start.
+
+    Args:
+        pending: Jobs not started yet, largest first
+        memory_in_use: Estimated memory of the running jobs
+        memory_budget: Cap on the estimated memory of running jobs
+        running: Number of running jobs
+
+    Returns:
+        Index of the largest pending job that fits, or None if none fits
+        until a running job finishes
+    """
+    if not pending:
+        return None
+    if memory_budget is None or running == 0:
+        # A job larger than the budget still runs, but alone
+        return 0
+    for index, job in enumerate(pending):
+        if memory_in_use + job.memory <= memory_budget:
+            return index
+    return None
+
+
+class BatchProgress:
+    """Throughput counter for a batch run."""
+
+    def __init__(self, jobs: Sequence[FileJob]) -> None:
+        self.total_files = len(jobs)
+        self.total_bytes = sum(job.size for job in jobs)
+        self.done_files = 0
+        self.done_bytes = 0
+        self.start = time.perf_counter()
+
+    def update(self, job: FileJob) -> str:
+        """
+        Count a finished file and describe the progress.
+
+        Args:
+            job: The finished job, successful or not
+
+        Returns:
+            One line with files, bytes and throughput so far
+        """
+        self.done_files += 1
+        self.done_bytes += job.size
+        elapsed = max(time.perf_counter() - self.start, 1e-9)
+        return (
+            f"Progress: {self.done_files}/{self.total_files} files, "
+            f"{self.done_bytes / MIB:.1f}/{self.total_bytes / MIB:.1f} MiB "
+            f"({self.done_bytes / MIB / elapsed:.2f} MiB/s)"
+        )
+
+
+def _run_job(convert: Callable[..., Any], job: FileJob, args: Tuple[Any, ...]) -> bool:
+    try:
+        convert(job.input_path, job.output_path, *args)
+    except SystemExit:
+        # The export helpers report their own errors before exiting
+        return False
+    return True
+
+
+def run_scheduled(
+    jobs: Sequence[FileJob],
+    convert: Callable[..., Any],
+    convert_args: Tuple[Any, ...] = (),
+    workers: int = 1,
+    memory_budget: Optional[int] = None,
+) -> int:
+    """
+    Convert files in worker processes, largest first, within a memory budget.
+
+    Args:
+        jobs: The files to convert
+        convert: Picklable function called as
+            ``convert(input_path, output_path, *convert_args)``
+        convert_args: Further picklable arguments of ``convert``
+        workers: Number of worker processes
+        memory_budget: Cap on the estimated memory of running jobs, in bytes
+
+    Returns:
+        Number of files that failed
+    """
+    pending = order_jobs(jobs)
+    progress = BatchProgress(pending)
+    running: Dict[Future, FileJob] = {}
+    memory_in_use = 0
+    failures = 0
+
+    executor = ProcessPoolExecutor(max_workers=max(workers, 1))
+    try:
+        while pending or running:
+            while len(running) < workers:
+                index = next_job_index(pending, memory_in_use, memory_budget, len(running))
+                if index is None:
+                    break
+                job = pending.pop(index)
+                running[executor.submit(_run_job, convert, job, convert_args)] = job
+                memory_in_use += job.memory
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in finished:
+                job = running.pop(future)
+                memory_in_use -= job.memory
+                try:
+                    ok = future.result()
+                except BrokenProcessPool:
+                    # A worker died, e.g. killed for running out of memory
+                    ok, broken = False, True
+                except Exception as e:
+                    print(f"Error: {e}")
+                    ok = False
+                if not ok:
+                    print(f"Error: Failed to convert {job.input_path}")
+                    failures += 1
+                print(progress.update(job))
+
+            if broken:
+                # Jobs still running in the broken pool failed as well
+                for future, job in running.items():
+                    print(f"Error: Failed to convert {job.input_path}")
+                    failures += 1
+                    print(progress.update(job))
+                running.clear()
+                memory_in_use = 0
+                executor.shutdown(wait=False)
+                executor = ProcessPoolExecutor(max_workers=max(workers, 1))
+    finally:
+        executor.shutdown()
+    return failures
@@ -0,0 +1,255 @@
+"""
+Command-line interface for batch conversion of NotebookLM exports.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from typing import List, Optional
+
+from notebooklm_notes2md.batch.journal import (
+    DEFAULT_MAX_ATTEMPTS,
+    BatchJournal,
+    format_journal_counts,
+)
+from notebooklm_notes2md.batch.runner import DUPLICATE_MODES, run_batch
+from notebooklm_notes2md.cli.main import (
+    add_autolink_arguments,
+    add_pdf_arguments,
+    add_reproducible_arguments,
+    add_site_arguments,
+    autolink_from_args,
+    build_metadata_schema,
+    pdf_options_from_args,
+    site_options_from_args,
+    source_date_from_args,
+    templates_from_args,
+)
+from notebooklm_notes2md.core.dedup import DedupIndex
+from notebooklm_notes2md.exporters.archive import archive_extension
+from notebooklm_notes2md.utils.reproducible import SOURCE_DATE_EPOCH
+
+
+def parse_batch_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments for the batch command.
+
+    Args:
+        argv: Arguments after the "batch" command name
+
+    Returns:
+        Namespace containing the parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog="notebooklm-export batch",
+        description="Export many NotebookLM notes files into one directory.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    parser.add_argument(
+        "input_paths",
+        nargs="+",
+        help="Paths to the input HTML files containing NotebookLM notes",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        required=True,
+        help="Directory receiving one output file per input file, or a "
+             ".zip/.tar.gz archive the files are streamed into",
+    )
+
+    parser.add_argument(
+        "--to",
+        choices=["md", "pdf", "html"],
+        default="md",
+        help="Output file type",
+    )
+
+    parser.add_argument(
+        "--format",
+        type=str,
+        choices=["standard", "obsidian"],
+        default="standard",
+        help="Output format style for Markdown files",
+    )
+
+    parser.add_argument(
+        "--dedup",
+        choices=DUPLICATE_MODES,
+        default=None,
+        help="Skip notes already exported in this batch, or replace them "
+             "with a link to the original",
+    )
+
+    parser.add_argument(
+        "--near-duplicates",
+        action="store_true",
+        help="Also treat near-identical notes as duplicates (SimHash)",
+    )
+
+    parser.add_argument(
+        "--dedup-index",
+        type=str,
+        default=None,
+        help="JSON file used to remember fingerprints across batch runs; "
+             "requires --dedup",
+    )
+
+    parser.add_argument(
+        "--metadata-field",
+        action="append",
+        default=[],
+        metavar="NAME=SELECTOR",
+        help="Extract an extra metadata field; use NAME[]= to collect every "
+             "match and a trailing @ATTRIBUTE to read an attribute",
+    )
+
+    parser.add_argument(
+        "--template-dir",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Render Markdown with the frontmatter.md, callout.md, heading.md "
+             "and note.md templates in DIR (missing ones come from --format)",
+    )
+
+    parser.add_argument(
+        "--journal",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="SQLite journal recording the state of every file; workers "
+             "sharing a journal never convert the same file twice",
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip files the journal records as done and retry failed ones",
+    )
+
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=DEFAULT_MAX_ATTEMPTS,
+        metavar="N",
+        help="Attempts per file before it is left as failed in the journal",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Convert N files at a time in worker processes, largest first",
+    )
+
+    parser.add_argument(
+        "--memory-budget",
+        type=int,
+        default=None,
+        metavar="MIB",
+        help="Cap on the estimated memory of the files converted at the same "
+             "time; large files then run with fewer neighbours",
+    )
+
+    add_reproducible_arguments(parser)
+    add_autolink_arguments(parser)
+    add_pdf_arguments(parser)
+    add_site_arguments(parser)
+
+    return parser.parse_args(argv)
+
+
+def batch_main(argv: Optional[List[str]] = None) -> None:
+    """
+    Entry point for the batch command.
+
+    Args:
+        argv: Arguments after the "batch" command name
+    """
+    args = parse_batch_args(argv)
+
+    if archive_extension(args.output_dir):
+        archive_dir = os.path.dirname(args.output_dir)
+        if archive_dir and not os.path.isdir(archive_dir):
+            print(f"Error: Output directory does not exist: {archive_dir}")
+            sys.exit(1)
+        if args.to == "html":
+            print("Error: Archives can only hold .md and .pdf files")
+            sys.exit(1)
+        if args.jobs > 1 or args.journal:
+            print("Error: Archive output cannot be combined with --jobs or --journal")
+            sys.exit(1)
+    elif not os.path.isdir(args.output_dir):
+        print(f"Error: Output directory does not exist: {args.output_dir}")
+        sys.exit(1)
+
+    schema = build_metadata_schema(args.metadata_field)
+    autolink = autolink_from_args(args)
+    if args.reproducible and SOURCE_DATE_EPOCH in os.environ:
+        # Checked once here; each file is dated when it is converted
+        source_date_from_args(args, args.input_paths[0])
+
+    if args.dedup_index and not args.dedup:
+        print("Error: --dedup-index requires --dedup")
+        sys.exit(1)
+    dedup = None
+    if args.dedup:
+        dedup = DedupIndex(near_duplicates=args.near_duplicates)
+        if args.dedup_index and os.path.isfile(args.dedup_index):
+            dedup.load(args.dedup_index)
+
+    if args.jobs > 1 and args.pdf_jobs > 1:
+        print("Error: --jobs cannot be combined with --pdf-jobs")
+        sys.exit(1)
+
+    if args.jobs > 1 and (args.dedup or args.journal):
+        print("Error: --jobs cannot be combined with --dedup or --journal; "
+              "start several batch workers on one journal instead")
+        sys.exit(1)
+
+    journal = None
+    if args.resume and not args.journal:
+        print("Error: --resume requires --journal")
+        sys.exit(1)
+    if args.journal:
+        try:
+            journal = BatchJournal(args.journal, max_attempts=args.max_attempts)
+        except sqlite3.Error as e:
+            print(f"Error: Cannot open journal {args.journal}: {e}")
+            sys.exit(1)
+
+    failures = run_batch(
+        args.input_paths,
+        args.output_dir,
+        extension="." + args.to,
+        format_type=args.format,
+        dedup=dedup,
+        duplicates=args.dedup or "skip",
+        schema=schema,
+        pdf_options=pdf_options_from_args(args),
+        templates=templates_from_args(args),
+        journal=journal,
+        resume=args.resume,
+        workers=max(args.jobs, 1),
+        memory_budget=args.memory_budget * 1024 * 1024 if args.memory_budget else None,
+        autolink=autolink,
+        site_options=site_options_from_args(args),
+        reproducible=args.reproducible,
+    )
+
+    if journal is not None:
+        print(format_journal_counts(journal.counts()))
+        journal.close()
+
+    if dedup is not None and args.dedup_index:
+        dedup.save(args.dedup_index)
+
+    if failures:
+        print(f"Error: {failures} of {len(args.input_paths)} files failed")
+        sys.exit(1)
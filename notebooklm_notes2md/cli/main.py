@@ -3,18 +3,112 @@ Command-line interface for NotebookLM notes to Markdown/PDF converter.
 """
 
 import argparse
+import importlib
 import os
+import re
+import signal
 import sys
-from typing import Dict, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from bs4 import BeautifulSoup
-from markdown_pdf import MarkdownPdf, Section
 
+from notebooklm_notes2md.core.incremental import (
+    advance_state,
+    header_metadata,
+    load_append_state,
+    parse_new_notes,
+    save_append_state,
+    state_for_notes,
+)
+from notebooklm_notes2md.core.parallel_parse import parse_notes_parallel
 from notebooklm_notes2md.core.parser import parse_notes
+from notebooklm_notes2md.core.progress import (
+    ConversionCancelled,
+    ProgressDisplay,
+    ProgressHooks,
+    progress_stage,
+    total_notes,
+    track_notes,
+)
+from notebooklm_notes2md.core.selection import (
+    NoteSelection,
+    iter_notes_from_end,
+    parse_range,
+    read_header,
+    select_notes,
+)
+from notebooklm_notes2md.exporters.archive import (
+    ARCHIVE_FORMATS,
+    archive_extension,
+    export_archive,
+    format_archive_stats,
+)
+from notebooklm_notes2md.exporters.chunks import (
+    DEFAULT_CHUNK_OPTIONS,
+    ChunkOptions,
+    write_chunks,
+)
+from notebooklm_notes2md.exporters.pdf import (
+    DEFAULT_PDF_OPTIONS,
+    PDF_ENGINES,
+    PdfOptions,
+    append_notes_pdf,
+    export_pdf,
+    note_markdown,
+)
+from notebooklm_notes2md.exporters.pdf_cache import (
+    export_pdf_cached,
+    format_cache_stats,
+    open_section_cache,
+)
+from notebooklm_notes2md.exporters.site import (
+    DEFAULT_SITE_OPTIONS,
+    SiteOptions,
+    export_site,
+)
 from notebooklm_notes2md.extractors.metadata import extract_metadata
+from notebooklm_notes2md.extractors.schema import (
+    DEFAULT_METADATA_SCHEMA,
+    MetadataSchema,
+    parse_field_spec,
+)
+from notebooklm_notes2md.formatters.autolink import (
+    AutolinkConfig,
+    build_autolinker,
+    link_notes,
+    load_vault_titles,
+)
+from notebooklm_notes2md.formatters.citations import (
+    CITATION_STYLES,
+    CitationIndex,
+    citation_sidecar_path,
+    format_cited_markdown,
+)
 from notebooklm_notes2md.formatters.obsidian import format_obsidian_markdown
 from notebooklm_notes2md.formatters.standard import format_standard_markdown
-from notebooklm_notes2md.utils.text_processing import clean_text
+from notebooklm_notes2md.formatters.templates import (
+    TemplateError,
+    TemplateSet,
+    document_context,
+    format_template_markdown,
+    iter_note_markdown,
+    load_template_set,
+    markdown_template_set,
+)
+from notebooklm_notes2md.utils.reproducible import (
+    format_source_date,
+    resolve_source_date,
+    stage_output,
+)
+
+# Subcommand name -> (module, entry point taking the remaining arguments)
+SUBCOMMANDS = {
+    "batch": ("notebooklm_notes2md.cli.batch", "batch_main"),
+    "merge": ("notebooklm_notes2md.cli.merge", "merge_main"),
+    "parse": ("notebooklm_notes2md.cli.stream", "parse_main"),
+    "render": ("notebooklm_notes2md.cli.stream", "render_main"),
+}
 
 
 def parse_args() -> argparse.Namespace:
@@ -38,7 +132,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "output_path",
         type=str,
-        help="Path to the output file (must end with .pdf or .md)",
+        help="Path to the output file (must end with .pdf, .md, .html, .jsonl, "
+             ".zip or .tar.gz)",
     )
 
     parser.add_argument(
@@ -49,9 +144,404 @@ def parse_args() -> argparse.Namespace:
         help="Output format style for Markdown files",
     )
 
+    parser.add_argument(
+        "--metadata-field",
+        action="append",
+        default=[],
+        metavar="NAME=SELECTOR",
+        help="Extract an extra metadata field; use NAME[]= to collect every "
+             "match and a trailing @ATTRIBUTE to read an attribute",
+    )
+
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Export at most N notes; parsing stops once they are found",
+    )
+
+    parser.add_argument(
+        "--range",
+        type=str,
+        default=None,
+        metavar="START:STOP",
+        help="Export notes START to STOP-1, counting from 0 for the oldest "
+             "note (either bound may be omitted)",
+    )
+
+    parser.add_argument(
+        "--match",
+        type=str,
+        default=None,
+        metavar="REGEX",
+        help="Export only notes whose title matches REGEX",
+    )
+
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help="Free each part of the parsed HTML as soon as its notes are "
+             "extracted, so the whole tree is not kept during export",
+    )
+
+    parser.add_argument(
+        "--parse-jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Split the input at note elements and parse the parts in N "
+             "worker processes",
+    )
+
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help="Only parse notes added since the last --append export and "
+             "append them to the existing output file",
+    )
+
+    parser.add_argument(
+        "--template-dir",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Render Markdown with the frontmatter.md, callout.md, heading.md "
+             "and note.md templates in DIR (missing ones come from --format)",
+    )
+
+    parser.add_argument(
+        "--archive-formats",
+        type=str,
+        default="md",
+        metavar="FORMATS",
+        help="Comma-separated formats written into a .zip or .tar.gz output: "
+             "md (one file per note and an index) and/or pdf",
+    )
+
+    parser.add_argument(
+        "--citations",
+        type=str,
+        choices=CITATION_STYLES,
+        default="strip",
+        help="What to do with reference numbers such as [1, 2] in Markdown "
+             "output: remove them, turn them into footnotes, or index the "
+             "cited sources per note in the frontmatter or in a "
+             ".citations.json file next to the output",
+    )
+
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Show the notes/s, MiB/s and remaining time of each stage on "
+             "standard error; Ctrl-C then cancels cleanly, without leaving "
+             "a partial output file",
+    )
+
+    add_reproducible_arguments(parser)
+    add_autolink_arguments(parser)
+    add_pdf_arguments(parser)
+    add_site_arguments(parser)
+    add_chunk_arguments(parser)
+
     return parser.parse_args()
 
 
+def add_reproducible_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the reproducible output option to a command line parser.
+
+    Args:
+        parser: Parser receiving the option
+    """
+    parser.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="Make Markdown, PDF and archive output byte-identical for "
+             "identical input: dates come from SOURCE_DATE_EPOCH (or the "
+             "input file's modification time), and an output whose bytes "
+             "did not change is not rewritten",
+    )
+
+
+def source_date_from_args(args: argparse.Namespace, input_path: str) -> Optional[int]:
+    """
+    Return the source date of a reproducible export, if one was requested.
+
+    Args:
+        args: Parsed command line arguments
+        input_path: Input file, whose modification time is the fallback
+
+    Returns:
+        Seconds since the epoch, or None outside reproducible mode
+
+    Raises:
+        SystemExit: If SOURCE_DATE_EPOCH is invalid
+    """
+    if not args.reproducible:
+        return None
+    try:
+        return resolve_source_date(input_path)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+@contextmanager
+def reproducible_output(output_path: str, staged: bool = False) -> Iterator[str]:
+    """
+    Choose where an export writes its output.
+
+    Args:
+        output_path: Path of the output file
+        staged: Write to a staged file that replaces the output only if
+            its bytes differ, and only once the export completes
+
+    Yields:
+        The path to write to
+    """
+    if not staged:
+        yield output_path
+        return
+    with stage_output(output_path) as staged_file:
+        yield staged_file.path
+    if not staged_file.changed:
+        print(f"Unchanged, not rewritten: {output_path}")
+
+
+@contextmanager
+def cancel_on_interrupt(hooks: Optional[ProgressHooks]) -> Iterator[None]:
+    """
+    Turn the first Ctrl-C into a cancellation of the hooks.
+
+    The conversion then stops at its next checkpoint; a second Ctrl-C
+    interrupts it at once.
+
+    Args:
+        hooks: Progress hooks of the conversion; without them Ctrl-C is
+            left alone
+    """
+    if hooks is None:
+        yield
+        return
+
+    def cancel(signum: int, frame: object) -> None:
+        hooks.cancel()
+        signal.signal(signal.SIGINT, previous)
+
+    previous = signal.signal(signal.SIGINT, cancel)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGINT, previous)
+
+
+def add_autolink_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the Markdown auto-linking options to a command line parser.
+
+    Args:
+        parser: Parser receiving the options
+    """
+    parser.add_argument(
+        "--autolink",
+        action="store_true",
+        help="Turn mentions of the key topics in note bodies into "
+             "[[wikilinks]] (Markdown output only)",
+    )
+
+    parser.add_argument(
+        "--vault",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Also link mentions of the note titles of the Obsidian vault in "
+             "DIR (implies --autolink)",
+    )
+
+    parser.add_argument(
+        "--link-all",
+        action="store_true",
+        help="Link every mention of a term instead of the first one per note",
+    )
+
+
+def add_pdf_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the options controlling PDF output to a parser.
+
+    Args:
+        parser: The argument parser to extend
+    """
+    parser.add_argument(
+        "--pdf-engine",
+        choices=PDF_ENGINES,
+        default=DEFAULT_PDF_OPTIONS.engine,
+        help="Render PDFs through Markdown with markdown_pdf, or lay out "
+             "HTML built directly from the notes in a single pass",
+    )
+
+    parser.add_argument(
+        "--pdf-chunk-size",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Render N notes at a time and merge them, so peak memory does "
+             "not grow with the number of notes; the merged file is "
+             "compressed in one final save (0 renders all at once)",
+    )
+
+    parser.add_argument(
+        "--pdf-jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Render PDF chunks in N worker processes that read the parsed "
+             "notes from shared memory (one chunk per worker unless "
+             "--pdf-chunk-size is set)",
+    )
+
+    parser.add_argument(
+        "--pdf-cache",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Reuse rendered notes from this cache directory and only "
+             "render new or changed notes",
+    )
+
+    parser.add_argument(
+        "--pdf-cache-size",
+        type=int,
+        default=DEFAULT_PDF_OPTIONS.cache_max_bytes // (1024 * 1024),
+        metavar="MIB",
+        help="Size cap of the PDF cache; least recently used notes are "
+             "evicted first",
+    )
+
+
+def add_site_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the options controlling HTML site output to a parser.
+
+    Args:
+        parser: The argument parser to extend
+    """
+    parser.add_argument(
+        "--site-page-size",
+        type=int,
+        default=DEFAULT_SITE_OPTIONS.page_size,
+        metavar="N",
+        help="Notes per page shard of an .html site; the next shard is "
+             "loaded as the reader scrolls",
+    )
+
+
+def site_options_from_args(args: argparse.Namespace) -> SiteOptions:
+    """
+    Build HTML site options from parsed command line arguments.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        The site options
+
+    Raises:
+        SystemExit: If the page size is not positive
+    """
+    if args.site_page_size < 1:
+        print("Error: --site-page-size must be at least 1")
+        sys.exit(1)
+    return DEFAULT_SITE_OPTIONS._replace(page_size=args.site_page_size)
+
+
+def add_chunk_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the options controlling .jsonl chunk output to a parser.
+
+    Args:
+        parser: The argument parser to extend
+    """
+    parser.add_argument(
+        "--chunk-tokens",
+        type=int,
+        default=DEFAULT_CHUNK_OPTIONS.max_tokens,
+        metavar="N",
+        help="Token budget of each chunk of .jsonl output; notes are split "
+             "at headings and paragraphs, and at sentences when needed",
+    )
+
+
+def chunk_options_from_args(args: argparse.Namespace) -> ChunkOptions:
+    """
+    Build chunk options from parsed command line arguments.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        The chunk options
+
+    Raises:
+        SystemExit: If the token budget is not positive
+    """
+    if args.chunk_tokens < 1:
+        print("Error: --chunk-tokens must be at least 1")
+        sys.exit(1)
+    return DEFAULT_CHUNK_OPTIONS._replace(max_tokens=args.chunk_tokens)
+
+
+def archive_formats_from_args(args: argparse.Namespace) -> Tuple[str, ...]:
+    """
+    Read the formats written into archive output from the arguments.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        The formats, in the order given
+
+    Raises:
+        SystemExit: If a format is unknown
+    """
+    formats = tuple(dict.fromkeys(
+        fmt.strip().lower() for fmt in args.archive_formats.split(",") if fmt.strip()
+    ))
+    if not formats or any(fmt not in ARCHIVE_FORMATS for fmt in formats):
+        print(f"Error: --archive-formats must list {' and/or '.join(ARCHIVE_FORMATS)}")
+        sys.exit(1)
+    return formats
+
+
+def pdf_options_from_args(args: argparse.Namespace) -> PdfOptions:
+    """
+    Build PDF options from parsed command line arguments.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        The PDF options
+
+    Raises:
+        SystemExit: If the options cannot be combined
+    """
+    if args.pdf_engine == "direct" and args.pdf_cache:
+        print("Error: --pdf-cache only works with --pdf-engine markdown")
+        sys.exit(1)
+    if args.pdf_jobs > 1 and args.pdf_cache:
+        print("Error: --pdf-jobs cannot be combined with --pdf-cache")
+        sys.exit(1)
+    return DEFAULT_PDF_OPTIONS._replace(
+        chunk_size=max(args.pdf_chunk_size, 0),
+        cache_dir=args.pdf_cache,
+        cache_max_bytes=max(args.pdf_cache_size, 1) * 1024 * 1024,
+        engine=args.pdf_engine,
+        workers=max(args.pdf_jobs, 1),
+    )
+
+
 def validate_args(args: argparse.Namespace) -> None:
     """
     Validate command line arguments.
@@ -68,8 +558,10 @@ def validate_args(args: argparse.Namespace) -> None:
         sys.exit(1)
 
     # Validate output file extension
-    valid_extensions = [".pdf", ".md"]
-    output_ext = "." + args.output_path.split(".")[-1].lower()
+    valid_extensions = [".pdf", ".md", ".html", ".jsonl", ".zip", ".tar.gz", ".tgz"]
+    output_ext = archive_extension(args.output_path) or (
+        "." + args.output_path.split(".")[-1].lower()
+    )
 
     if output_ext not in valid_extensions:
         extensions_str = ", ".join(valid_extensions)
@@ -83,6 +575,191 @@ def validate_args(args: argparse.Namespace) -> None:
         sys.exit(1)
 
 
+def build_metadata_schema(field_specs: List[str]) -> MetadataSchema:
+    """
+    Build the metadata schema from command line field specifications.
+
+    Args:
+        field_specs: Values of the --metadata-field option
+
+    Returns:
+        The default schema extended with the requested fields
+
+    Raises:
+        SystemExit: If a field specification is malformed
+    """
+    if not field_specs:
+        return DEFAULT_METADATA_SCHEMA
+    try:
+        return DEFAULT_METADATA_SCHEMA.extend(
+            [parse_field_spec(spec) for spec in field_specs]
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+def templates_from_args(args: argparse.Namespace) -> Optional[TemplateSet]:
+    """
+    Load the output templates requested on the command line.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        The compiled templates, or None to use the built-in formatters
+
+    Raises:
+        SystemExit: If the templates cannot be loaded
+    """
+    if not args.template_dir:
+        return None
+    if not os.path.isdir(args.template_dir):
+        print(f"Error: Template directory does not exist: {args.template_dir}")
+        sys.exit(1)
+    try:
+        return load_template_set(args.template_dir, args.format)
+    except TemplateError as e:
+        print(f"Error: Invalid template: {e}")
+        sys.exit(1)
+
+
+def autolink_from_args(args: argparse.Namespace) -> Optional[AutolinkConfig]:
+    """
+    Build the auto-linking configuration requested on the command line.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        The configuration, or None to leave note bodies unchanged
+
+    Raises:
+        SystemExit: If the vault directory does not exist
+    """
+    if not args.autolink and not args.vault:
+        return None
+    vault_titles: Tuple[str, ...] = ()
+    if args.vault:
+        if not os.path.isdir(args.vault):
+            print(f"Error: Vault directory does not exist: {args.vault}")
+            sys.exit(1)
+        vault_titles = load_vault_titles(args.vault)
+    return AutolinkConfig(
+        topics=True, vault_titles=vault_titles, first_only=not args.link_all
+    )
+
+
+def selection_from_args(args: argparse.Namespace) -> Optional[NoteSelection]:
+    """
+    Build the note selection requested on the command line.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        The selection, or None to export every note
+
+    Raises:
+        SystemExit: If an option is malformed
+    """
+    if args.limit is None and args.range is None and args.match is None:
+        return None
+    if args.append:
+        print("Error: --append cannot be combined with --limit, --range or --match")
+        sys.exit(1)
+    if args.limit is not None and args.limit < 0:
+        print("Error: --limit must not be negative")
+        sys.exit(1)
+    try:
+        start, stop = parse_range(args.range) if args.range else (0, None)
+        match = re.compile(args.match) if args.match is not None else None
+    except re.error as e:
+        print(f"Error: Invalid --match pattern: {e}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    return NoteSelection(match, start, stop, args.limit)
+
+
+def read_selected_notes(
+    input_path: str,
+    selection: NoteSelection,
+    schema: MetadataSchema,
+    need_metadata: bool = True,
+    with_html: bool = False
+) -> Tuple[List[Dict[str, str]], Optional[Dict]]:
+    """
+    Read only the selected notes, parsing the file from the end lazily.
+
+    Args:
+        input_path: Path to the input HTML file
+        selection: Which notes to read
+        schema: Metadata schema
+        need_metadata: Extract metadata from the header; PDF output does
+            not use it
+        with_html: Also render each note as HTML
+
+    Returns:
+        The selected notes, oldest first, and the metadata (or None)
+
+    Raises:
+        SystemExit: If the file cannot be read
+    """
+    try:
+        notes = list(select_notes(
+            iter_notes_from_end(input_path, with_html=with_html), selection,
+        ))
+        metadata = None
+        if need_metadata:
+            header = BeautifulSoup(read_header(input_path), "html.parser")
+            metadata = extract_metadata(header, schema)
+    except UnicodeDecodeError:
+        print("Error: File encoding issue.")
+        print(f"Please ensure {input_path} is UTF-8 encoded.")
+        sys.exit(1)
+    except OSError as e:
+        print(f"Error reading input file: {e}")
+        sys.exit(1)
+    return notes, metadata
+
+
+def read_notes_parallel(
+    input_path: str,
+    workers: int,
+    schema: MetadataSchema,
+    with_html: bool = False
+) -> Tuple[List[Dict[str, str]], Dict]:
+    """
+    Parse all notes of the input file in worker processes.
+
+    Args:
+        input_path: Path to the input HTML file
+        workers: Number of worker processes
+        schema: Metadata schema
+        with_html: Also render each note as HTML
+
+    Returns:
+        The notes, oldest first, and the metadata
+
+    Raises:
+        SystemExit: If the file cannot be read
+    """
+    try:
+        notes = parse_notes_parallel(input_path, workers, with_html=with_html)
+        header = BeautifulSoup(read_header(input_path), "html.parser")
+        metadata = extract_metadata(header, schema)
+    except UnicodeDecodeError:
+        print("Error: File encoding issue.")
+        print(f"Please ensure {input_path} is UTF-8 encoded.")
+        sys.exit(1)
+    except OSError as e:
+        print(f"Error reading input file: {e}")
+        sys.exit(1)
+    return notes, metadata
+
+
 def read_input_file(file_path: str) -> str:
     """
     Read and return the contents of the input file.
@@ -118,25 +795,43 @@ def read_input_file(file_path: str) -> str:
         sys.exit(1)
 
 
-def export_to_pdf(notes: list, output_path: str) -> None:
+def export_to_pdf(
+    notes: Iterable[Dict[str, Any]],
+    output_path: str,
+    options: PdfOptions = DEFAULT_PDF_OPTIONS,
+    hooks: Optional[ProgressHooks] = None
+) -> None:
     """
     Export notes to a PDF file.
 
     Args:
-        notes: List of note dictionaries
+        notes: Note dictionaries, consumed in one pass
         output_path: Path to save the PDF file
+        options: PDF options; a positive chunk size bounds peak memory and
+            a cache directory enables reuse of rendered notes. With a
+            source date the file is only rewritten if its bytes change
+        hooks: Optional progress hooks; the file is then only written once
+            the whole PDF is rendered
 
     Raises:
         SystemExit: If there's an error creating the PDF
+        ConversionCancelled: If the hooks were cancelled
     """
+    staged = options.source_date is not None or hooks is not None
     try:
-        pdf = MarkdownPdf(toc_level=1, optimize=True)
-
-        for item in notes:
-            clean_content = clean_text(item["note"])
-            pdf.add_section(Section(clean_content))
-
-        pdf.save(output_path)
+        with reproducible_output(output_path, staged) as path:
+            if options.cache_dir:
+                cache = open_section_cache(options.cache_dir, options.cache_max_bytes)
+                with progress_stage(hooks, "render", total_notes(notes)):
+                    texts = note_markdown(track_notes(notes, hooks, "render"))
+                    export_pdf_cached(texts, path, cache, options)
+                    if hooks is not None:
+                        hooks.bytes_written(os.path.getsize(path))
+                print(format_cache_stats(cache.stats()))
+            else:
+                export_pdf(notes, path, options, hooks)
+    except ConversionCancelled:
+        raise
     except PermissionError:
         print(f"Error: Permission denied when writing to {output_path}")
         sys.exit(1)
@@ -146,31 +841,69 @@ def export_to_pdf(notes: list, output_path: str) -> None:
 
 
 def export_to_markdown(
-    notes: list,
+    notes: Iterable[Dict[str, Any]],
     output_path: str,
     format_type: str = "standard",
-    metadata: Optional[Dict] = None
+    metadata: Optional[Dict] = None,
+    templates: Optional[TemplateSet] = None,
+    citations: str = "strip",
+    source_date: Optional[int] = None,
+    hooks: Optional[ProgressHooks] = None
 ) -> None:
     """
     Export notes to a Markdown file.
 
     Args:
-        notes: List of note dictionaries
+        notes: Note dictionaries, consumed in one pass except by the
+            "sidecar" citation style
         output_path: Path to save the Markdown file
         format_type: Format type ("standard" or "obsidian")
         metadata: Optional metadata dictionary
+        templates: Optional compiled templates replacing the formatter
+        citations: One of ``CITATION_STYLES``; anything but "strip" keeps
+            an index of the reference numbers
+        source_date: Reproducible mode: the export date, in seconds since
+            the epoch; files are only rewritten if their bytes change
+        hooks: Optional progress hooks; the notes are all formatted before
+            the file is opened
 
     Raises:
         SystemExit: If there's an error writing the file
+        ConversionCancelled: If the hooks were cancelled
     """
     try:
-        if format_type == "obsidian" and metadata:
-            content = format_obsidian_markdown(notes, metadata)
-        else:
-            content = format_standard_markdown(notes, metadata)
+        date = format_source_date(source_date)
+        index = None
+        if citations == "sidecar":
+            # The sidecar lists the note titles after formatting
+            notes = list(notes)
+        with progress_stage(hooks, "format", total_notes(notes)):
+            if citations != "strip":
+                index = CitationIndex(footnotes=citations == "footnotes")
+                content = format_cited_markdown(
+                    notes, metadata, markdown_template_set(format_type, metadata, templates),
+                    index, in_frontmatter=citations == "frontmatter", date=date, hooks=hooks,
+                )
+            elif templates is not None:
+                content = format_template_markdown(notes, metadata, templates, date, hooks)
+            elif format_type == "obsidian" and metadata:
+                content = format_obsidian_markdown(notes, metadata, date=date, hooks=hooks)
+            else:
+                content = format_standard_markdown(notes, metadata, hooks)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(content)
+            reproducible = source_date is not None
+            with reproducible_output(output_path, reproducible) as path:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(content)
+                if hooks is not None:
+                    hooks.bytes_written(os.path.getsize(path))
+        if citations == "sidecar":
+            sidecar_path = citation_sidecar_path(output_path)
+            assert index is not None
+            with reproducible_output(sidecar_path, reproducible) as path:
+                index.write_sidecar(path, [note["title"] for note in notes], metadata)
+    except ConversionCancelled:
+        raise
     except PermissionError:
         print(f"Error: Permission denied when writing to {output_path}")
         sys.exit(1)
@@ -179,56 +912,402 @@ def export_to_markdown(
         sys.exit(1)
 
 
+def export_to_site(
+    notes: Iterable[Dict[str, str]],
+    output_path: str,
+    metadata: Optional[Dict] = None,
+    options: SiteOptions = DEFAULT_SITE_OPTIONS
+) -> None:
+    """
+    Export notes to a static HTML site.
+
+    Args:
+        notes: Note dictionaries, consumed in one pass
+        output_path: Path of the index page
+        metadata: Optional metadata dictionary
+        options: Options for site output
+
+    Raises:
+        SystemExit: If there's an error writing the site
+    """
+    try:
+        export_site(notes, output_path, metadata, options)
+    except PermissionError:
+        print(f"Error: Permission denied when writing to {output_path}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error writing HTML site: {e}")
+        sys.exit(1)
+
+
+def export_to_chunks(
+    notes: Iterable[Dict[str, str]],
+    output_path: str,
+    metadata: Optional[Dict] = None,
+    options: ChunkOptions = DEFAULT_CHUNK_OPTIONS,
+    source_date: Optional[int] = None,
+    hooks: Optional[ProgressHooks] = None
+) -> int:
+    """
+    Export notes as JSON Lines chunks for retrieval pipelines.
+
+    Args:
+        notes: Note dictionaries, consumed in one pass
+        output_path: Path of the .jsonl file
+        metadata: Optional metadata dictionary
+        options: Chunk options
+        source_date: Reproducible mode: the file is only rewritten if its
+            bytes change
+        hooks: Optional progress hooks
+
+    Returns:
+        Number of chunks written
+
+    Raises:
+        SystemExit: If there's an error writing the file
+        ConversionCancelled: If the hooks were cancelled
+    """
+    try:
+        with reproducible_output(output_path, source_date is not None) as path:
+            return write_chunks(path, notes, metadata, options, hooks)
+    except ConversionCancelled:
+        raise
+    except PermissionError:
+        print(f"Error: Permission denied when writing to {output_path}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error writing chunks: {e}")
+        sys.exit(1)
+
+
+def export_to_archive(
+    notes: Iterable[Dict[str, str]],
+    output_path: str,
+    format_type: str = "standard",
+    metadata: Optional[Dict] = None,
+    templates: Optional[TemplateSet] = None,
+    pdf_options: PdfOptions = DEFAULT_PDF_OPTIONS,
+    formats: Sequence[str] = ("md",),
+    source_date: Optional[int] = None
+) -> None:
+    """
+    Export notes into a .zip or .tar.gz archive.
+
+    Args:
+        notes: Note dictionaries
+        output_path: Path of the archive
+        format_type: Format type for Markdown output
+        metadata: Optional metadata dictionary
+        templates: Optional compiled templates for Markdown output
+        pdf_options: Options for the PDF member
+        formats: Formats to include ("md", "pdf")
+        source_date: Reproducible mode: the time of every member, in
+            seconds since the epoch; the archive is only rewritten if its
+            bytes change
+
+    Raises:
+        SystemExit: If there's an error writing the archive
+    """
+    try:
+        with reproducible_output(output_path, source_date is not None) as path:
+            stats = export_archive(
+                notes, path, format_type, metadata, templates, pdf_options, formats,
+                source_date,
+            )
+        print(format_archive_stats(stats))
+    except PermissionError:
+        print(f"Error: Permission denied when writing to {output_path}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error writing archive: {e}")
+        sys.exit(1)
+
+
 def export_notes(
     notes: list,
     output_path: str,
     format_type: str = "standard",
-    metadata: Optional[Dict] = None
+    metadata: Optional[Dict] = None,
+    pdf_options: PdfOptions = DEFAULT_PDF_OPTIONS,
+    templates: Optional[TemplateSet] = None,
+    autolink: Optional[AutolinkConfig] = None,
+    site_options: SiteOptions = DEFAULT_SITE_OPTIONS,
+    archive_formats: Sequence[str] = ("md",),
+    citations: str = "strip",
+    source_date: Optional[int] = None,
+    hooks: Optional[ProgressHooks] = None,
+    chunk_options: ChunkOptions = DEFAULT_CHUNK_OPTIONS
 ) -> None:
     """
-    Export all notes to a single PDF or Markdown file based on extension.
+    Export all notes to a PDF, Markdown, HTML site, JSONL chunks or archive
+    based on extension.
 
     Args:
         notes: List of note dictionaries
         output_path: Path to save the output file
         format_type: Format type for Markdown output
         metadata: Optional metadata dictionary
+        pdf_options: Options for PDF output
+        templates: Optional compiled templates for Markdown output
+        autolink: Optional wikilink configuration for Markdown output
+        site_options: Options for HTML site output
+        archive_formats: Formats written into .zip or .tar.gz output
+        citations: Handling of reference numbers in Markdown output
+        source_date: Reproducible mode: the date written into Markdown,
+            PDF and archive output, in seconds since the epoch; such files
+            are only rewritten if their bytes change
+        hooks: Optional progress hooks of PDF, Markdown and chunk output
+        chunk_options: Options for .jsonl chunk output
 
     Raises:
         SystemExit: If the output path doesn't have a valid extension
+        ConversionCancelled: If the hooks were cancelled
     """
+    if source_date is not None:
+        pdf_options = pdf_options._replace(source_date=source_date)
     if output_path.lower().endswith(".pdf"):
-        export_to_pdf(notes, output_path)
+        export_to_pdf(notes, output_path, pdf_options, hooks)
     elif output_path.lower().endswith(".md"):
-        export_to_markdown(notes, output_path, format_type, metadata)
+        if autolink is not None:
+            notes = link_notes(notes, build_autolinker(autolink, metadata))
+        export_to_markdown(
+            notes, output_path, format_type, metadata, templates, citations, source_date,
+            hooks,
+        )
+    elif output_path.lower().endswith(".html"):
+        export_to_site(notes, output_path, metadata, site_options)
+    elif output_path.lower().endswith(".jsonl"):
+        export_to_chunks(notes, output_path, metadata, chunk_options, source_date, hooks)
+    elif archive_extension(output_path):
+        if autolink is not None and "md" in archive_formats:
+            notes = link_notes(notes, build_autolinker(autolink, metadata))
+        export_to_archive(
+            notes, output_path, format_type, metadata, templates, pdf_options,
+            archive_formats, source_date,
+        )
     else:
-        print("Error: Output path must end with .pdf or .md")
+        print("Error: Output path must end with .pdf, .md, .html, .jsonl, .zip or .tar.gz")
         sys.exit(1)
 
 
+def append_to_output(
+    notes: List[Dict[str, str]],
+    output_path: str,
+    start_index: int,
+    format_type: str = "standard",
+    metadata: Optional[Dict] = None,
+    pdf_options: PdfOptions = DEFAULT_PDF_OPTIONS,
+    templates: Optional[TemplateSet] = None,
+    autolink: Optional[AutolinkConfig] = None
+) -> None:
+    """
+    Append notes to an existing PDF or Markdown file.
+
+    Args:
+        notes: New notes, oldest first
+        output_path: Existing output file
+        start_index: Index of the first new note in the document
+        format_type: Format type for Markdown output
+        metadata: Optional metadata dictionary
+        pdf_options: Options for PDF output
+        templates: Optional compiled templates for Markdown output
+        autolink: Optional wikilink configuration for Markdown output
+
+    Raises:
+        SystemExit: If there's an error writing the file
+    """
+    try:
+        if output_path.lower().endswith(".pdf"):
+            append_notes_pdf(notes, output_path, pdf_options)
+            return
+        if autolink is not None:
+            notes = link_notes(notes, build_autolinker(autolink, metadata))
+        templates = markdown_template_set(format_type, metadata, templates)
+        context = document_context(metadata)
+        with open(output_path, "a", encoding="utf-8") as f:
+            f.writelines(iter_note_markdown(notes, context, templates, start_index))
+    except PermissionError:
+        print(f"Error: Permission denied when writing to {output_path}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error appending to {output_path}: {e}")
+        sys.exit(1)
+
+
+def append_new_notes(
+    note_data: str,
+    args: argparse.Namespace,
+    schema: MetadataSchema,
+    autolink: Optional[AutolinkConfig] = None
+) -> bool:
+    """
+    Append the notes added since the last export, if possible.
+
+    Args:
+        note_data: The exported HTML
+        args: Parsed command line arguments
+        schema: Metadata schema
+        autolink: Optional wikilink configuration for Markdown output
+
+    Returns:
+        True if the output was brought up to date, False if a full
+        export is needed
+    """
+    state = load_append_state(args.output_path)
+    if state is None or not os.path.isfile(args.output_path):
+        return False
+
+    new_notes = parse_new_notes(note_data, state.tail)
+    if new_notes is None:
+        print("Warning: The last exported notes were not found; exporting all notes.")
+        return False
+
+    if new_notes:
+        metadata = None
+        if not args.output_path.lower().endswith(".pdf"):
+            metadata = header_metadata(note_data, schema)
+        append_to_output(
+            new_notes, args.output_path, state.notes + 1, args.format, metadata,
+            pdf_options_from_args(args), templates_from_args(args), autolink,
+        )
+        save_append_state(args.output_path, advance_state(state, new_notes))
+    print(f"Successfully appended {len(new_notes)} new notes to {args.output_path}")
+    return True
+
+
 def main() -> None:
     """
     Main entry point for the script.
 
     Parses command line arguments, reads and processes the input file,
     extracts notes from HTML, and exports to the specified format.
+    Subcommands (``batch``, ``merge``, ``parse``, ``render``) are dispatched
+    to their own parsers.
     """
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        # Imported lazily: the subcommands build on this module's exporters
+        module_name, function_name = SUBCOMMANDS[sys.argv[1]]
+        command = getattr(importlib.import_module(module_name), function_name)
+        command(sys.argv[2:])
+        return
+
     args = parse_args()
     validate_args(args)
+    autolink = autolink_from_args(args)
+    source_date = source_date_from_args(args, args.input_path)
+    if args.reproducible and args.append:
+        print("Error: --reproducible cannot be combined with --append")
+        sys.exit(1)
+    if args.citations != "strip":
+        if not args.output_path.lower().endswith(".md"):
+            print("Error: --citations only works with .md output")
+            sys.exit(1)
+        if args.append:
+            print("Error: --citations cannot be combined with --append")
+            sys.exit(1)
+        if args.citations == "frontmatter" and args.format != "obsidian" and not args.template_dir:
+            print("Error: --citations frontmatter needs --format obsidian or --template-dir")
+            sys.exit(1)
+
+    hooks = ProgressDisplay().hooks if args.progress else None
+    try:
+        with cancel_on_interrupt(hooks):
+            convert_input(args, autolink, source_date, hooks)
+    except ConversionCancelled:
+        print(f"Cancelled: {args.output_path} was not written")
+        sys.exit(1)
+
 
-    note_data = read_input_file(args.input_path)
-    soup = BeautifulSoup(note_data, "html.parser")
+def convert_input(
+    args: argparse.Namespace,
+    autolink: Optional[AutolinkConfig] = None,
+    source_date: Optional[int] = None,
+    hooks: Optional[ProgressHooks] = None
+) -> None:
+    """
+    Read the input file and export its notes as the arguments ask.
 
-    # Extract metadata (for Cycle 1 features)
-    metadata = extract_metadata(soup)
+    Args:
+        args: Parsed and validated command line arguments
+        autolink: Optional wikilink configuration for Markdown output
+        source_date: Reproducible mode: the date written into the output
+        hooks: Optional progress hooks
 
-    # Parse notes
-    notes = parse_notes(soup)
+    Raises:
+        SystemExit: If the input cannot be read or the output written
+        ConversionCancelled: If the hooks were cancelled
+    """
+    schema = build_metadata_schema(args.metadata_field)
+    output_ext = os.path.splitext(args.output_path)[1].lower()
+    # The direct PDF engine and HTML sites render the HTML built while parsing
+    writes_pdf = output_ext == ".pdf" or (
+        archive_extension(args.output_path) is not None
+        and "pdf" in archive_formats_from_args(args)
+    )
+    with_html = output_ext == ".html" or (writes_pdf and args.pdf_engine == "direct")
+
+    selection = selection_from_args(args)
+    if selection is not None:
+        notes, metadata = read_selected_notes(
+            args.input_path, selection, schema,
+            need_metadata=output_ext != ".pdf", with_html=with_html,
+        )
+        if not notes:
+            print("Warning: No notes were selected.")
+        export_notes(
+            notes, args.output_path, args.format, metadata,
+            pdf_options_from_args(args), templates_from_args(args), autolink,
+            site_options_from_args(args), archive_formats_from_args(args), args.citations,
+            source_date, hooks, chunk_options_from_args(args),
+        )
+        print(f"Successfully exported {len(notes)} notes to {args.output_path}")
+        return
+
+    if args.parse_jobs < 1:
+        print("Error: --parse-jobs must be at least 1")
+        sys.exit(1)
+    if args.parse_jobs > 1 and args.append:
+        print("Error: --parse-jobs cannot be combined with --append")
+        sys.exit(1)
+    if args.append and output_ext not in (".md", ".pdf"):
+        print("Error: --append only works with .md and .pdf output")
+        sys.exit(1)
+
+    if args.parse_jobs > 1:
+        notes, metadata = read_notes_parallel(
+            args.input_path, args.parse_jobs, schema, with_html=with_html,
+        )
+    else:
+        note_data = read_input_file(args.input_path)
+        if args.append and append_new_notes(note_data, args, schema, autolink):
+            return
+
+        soup = BeautifulSoup(note_data, "html.parser")
+        if args.low_memory:
+            # The tree holds everything needed from here on
+            del note_data
+
+        # Extract metadata (for Cycle 1 features)
+        metadata = extract_metadata(soup, schema)
+
+        notes = parse_notes(
+            soup, low_memory=args.low_memory, with_html=with_html, hooks=hooks,
+        )
+        if args.low_memory:
+            soup.decompose()
+            del soup
     if not notes:
         print("Warning: No notes were found in the input file.")
 
     # Export notes with the specified format
-    export_notes(notes, args.output_path, args.format, metadata)
+    export_notes(
+        notes, args.output_path, args.format, metadata,
+        pdf_options_from_args(args), templates_from_args(args), autolink,
+        site_options_from_args(args), archive_formats_from_args(args), args.citations,
+        source_date, hooks, chunk_options_from_args(args),
+    )
+    if args.append and notes:
+        save_append_state(args.output_path, state_for_notes(notes))
     print(f"Successfully exported {len(notes)} notes to {args.output_path}")
 
 
@@ -0,0 +1,139 @@
+"""
+Command-line interface for merging many NotebookLM exports into one file.
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from notebooklm_notes2md.cli.main import (
+    add_pdf_arguments,
+    build_metadata_schema,
+    pdf_options_from_args,
+    templates_from_args,
+)
+from notebooklm_notes2md.exporters.merge import DEFAULT_MERGE_TITLE, merge_notebooks
+
+
+def parse_merge_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments for the merge command.
+
+    Args:
+        argv: Arguments after the "merge" command name
+
+    Returns:
+        Namespace containing the parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog="notebooklm-export merge",
+        description="Merge many NotebookLM notes files into one PDF or "
+                    "Markdown file with a contents section covering all of them.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    parser.add_argument(
+        "input_paths",
+        nargs="+",
+        help="Paths to the input HTML files, in the order of the merged document",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        help="Path to the output file (must end with .pdf or .md)",
+    )
+
+    parser.add_argument(
+        "--title",
+        type=str,
+        default=DEFAULT_MERGE_TITLE,
+        help="Title of the merged document",
+    )
+
+    parser.add_argument(
+        "--format",
+        type=str,
+        choices=["standard", "obsidian"],
+        default="standard",
+        help="Output format style for Markdown files",
+    )
+
+    parser.add_argument(
+        "--metadata-field",
+        action="append",
+        default=[],
+        metavar="NAME=SELECTOR",
+        help="Extract an extra metadata field; use NAME[]= to collect every "
+             "match and a trailing @ATTRIBUTE to read an attribute",
+    )
+
+    parser.add_argument(
+        "--template-dir",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Render Markdown with the frontmatter.md, callout.md, heading.md "
+             "and note.md templates in DIR (missing ones come from --format)",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        metavar="N",
+        help="Number of worker processes parsing the inputs",
+    )
+
+    add_pdf_arguments(parser)
+
+    return parser.parse_args(argv)
+
+
+def merge_main(argv: Optional[List[str]] = None) -> None:
+    """
+    Entry point for the merge command.
+
+    Args:
+        argv: Arguments after the "merge" command name
+    """
+    args = parse_merge_args(argv)
+
+    for input_path in args.input_paths:
+        if not os.path.isfile(input_path):
+            print(f"Error: Input file not found: {input_path}")
+            sys.exit(1)
+
+    if not args.output.lower().endswith((".pdf", ".md")):
+        print("Error: Output path must end with .pdf or .md")
+        sys.exit(1)
+    output_dir = os.path.dirname(args.output)
+    if output_dir and not os.path.isdir(output_dir):
+        print(f"Error: Output directory does not exist: {output_dir}")
+        sys.exit(1)
+    if args.jobs < 1:
+        print("Error: --jobs must be at least 1")
+        sys.exit(1)
+
+    try:
+        notebooks = merge_notebooks(
+            args.input_paths,
+            args.output,
+            format_type=args.format,
+            schema=build_metadata_schema(args.metadata_field),
+            pdf_options=pdf_options_from_args(args),
+            templates=templates_from_args(args),
+            workers=args.jobs,
+            title=args.title,
+        )
+    except PermissionError:
+        print(f"Error: Permission denied when writing to {args.output}")
+        sys.exit(1)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error merging notebooks: {e}")
+        sys.exit(1)
+
+    notes = sum(len(notebook.titles) for notebook in notebooks)
+    print(f"Successfully merged {notes} notes from {len(notebooks)} notebooks into {args.output}")
@@ -0,0 +1,254 @@
+"""
+Command-line interface for the parse and render pipeline stages.
+
+``parse`` turns a NotebookLM HTML export into a note stream, and
+``render`` turns a note stream into Markdown, PDF, an HTML site or JSONL
+chunks without parsing HTML.
+"""
+
+import argparse
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+from bs4 import BeautifulSoup
+
+from notebooklm_notes2md.cli.main import (
+    add_chunk_arguments,
+    add_pdf_arguments,
+    add_site_arguments,
+    build_metadata_schema,
+    chunk_options_from_args,
+    export_to_chunks,
+    export_to_pdf,
+    export_to_site,
+    pdf_options_from_args,
+    read_input_file,
+    site_options_from_args,
+    templates_from_args,
+)
+from notebooklm_notes2md.core.parser import parse_notes
+from notebooklm_notes2md.core.stream import (
+    STREAM_EXTENSIONS,
+    NoteStreamError,
+    open_note_stream,
+    write_note_stream,
+)
+from notebooklm_notes2md.extractors.metadata import extract_metadata
+from notebooklm_notes2md.formatters.templates import (
+    TemplateSet,
+    iter_template_markdown,
+    markdown_template_set,
+)
+
+
+def parse_parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments for the parse command.
+
+    Args:
+        argv: Arguments after the "parse" command name
+
+    Returns:
+        Namespace containing the parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog="notebooklm-export parse",
+        description="Parse a NotebookLM notes file into a note stream.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    parser.add_argument(
+        "input_path",
+        type=str,
+        help="Path to the input HTML file containing NotebookLM notes",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        help="Path of the note stream (" + ", ".join(STREAM_EXTENSIONS) + ")",
+    )
+
+    parser.add_argument(
+        "--metadata-field",
+        action="append",
+        default=[],
+        metavar="NAME=SELECTOR",
+        help="Extract an extra metadata field; use NAME[]= to collect every "
+             "match and a trailing @ATTRIBUTE to read an attribute",
+    )
+
+    return parser.parse_args(argv)
+
+
+def parse_render_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments for the render command.
+
+    Args:
+        argv: Arguments after the "render" command name
+
+    Returns:
+        Namespace containing the parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog="notebooklm-export render",
+        description="Render a note stream to PDF, Markdown, an HTML site or "
+                    "JSONL chunks.",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    parser.add_argument(
+        "input_path",
+        type=str,
+        help="Path to the note stream written by the parse command",
+    )
+
+    parser.add_argument(
+        "output_path",
+        type=str,
+        help="Path to the output file (must end with .pdf, .md, .html or .jsonl)",
+    )
+
+    parser.add_argument(
+        "--format",
+        type=str,
+        choices=["standard", "obsidian"],
+        default="standard",
+        help="Output format style for Markdown files",
+    )
+
+    parser.add_argument(
+        "--template-dir",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Render Markdown with the frontmatter.md, callout.md, heading.md "
+             "and note.md templates in DIR (missing ones come from --format)",
+    )
+
+    add_pdf_arguments(parser)
+    add_site_arguments(parser)
+    add_chunk_arguments(parser)
+
+    return parser.parse_args(argv)
+
+
+def export_stream_to_markdown(
+    notes: Iterable[Dict[str, str]],
+    output_path: str,
+    format_type: str = "standard",
+    metadata: Optional[Dict[str, Any]] = None,
+    templates: Optional[TemplateSet] = None
+) -> None:
+    """
+    Write notes to a Markdown file as they are read.
+
+    The built-in formats are rendered through their template sets, which
+    produce the same output as the formatters without holding the whole
+    document in memory.
+
+    Args:
+        notes: Note dictionaries, consumed once
+        output_path: Path to save the Markdown file
+        format_type: Format type ("standard" or "obsidian")
+        metadata: Optional metadata dictionary
+        templates: Optional compiled templates replacing the format
+
+    Raises:
+        SystemExit: If there's an error writing the file
+    """
+    templates = markdown_template_set(format_type, metadata, templates)
+    try:
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.writelines(iter_template_markdown(notes, metadata, templates))
+    except NoteStreamError:
+        raise
+    except PermissionError:
+        print(f"Error: Permission denied when writing to {output_path}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error writing Markdown file: {e}")
+        sys.exit(1)
+
+
+def parse_main(argv: Optional[List[str]] = None) -> None:
+    """
+    Entry point for the parse command.
+
+    Args:
+        argv: Arguments after the "parse" command name
+    """
+    args = parse_parse_args(argv)
+
+    if not os.path.isfile(args.input_path):
+        print(f"Error: Input file not found: {args.input_path}")
+        sys.exit(1)
+
+    soup = BeautifulSoup(read_input_file(args.input_path), "html.parser")
+    metadata = extract_metadata(soup, build_metadata_schema(args.metadata_field))
+    notes = parse_notes(soup)
+    if not notes:
+        print("Warning: No notes were found in the input file.")
+
+    try:
+        count = write_note_stream(args.output, notes, metadata)
+    except NoteStreamError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except (OSError, TypeError) as e:
+        print(f"Error writing note stream: {e}")
+        sys.exit(1)
+    print(f"Successfully parsed {count} notes to {args.output}")
+
+
+def render_main(argv: Optional[List[str]] = None) -> None:
+    """
+    Entry point for the render command.
+
+    Args:
+        argv: Arguments after the "render" command name
+    """
+    args = parse_render_args(argv)
+
+    if not os.path.isfile(args.input_path):
+        print(f"Error: Input file not found: {args.input_path}")
+        sys.exit(1)
+
+    output_path = args.output_path
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension not in (".pdf", ".md", ".html", ".jsonl"):
+        print("Error: Output path must end with .pdf, .md, .html or .jsonl")
+        sys.exit(1)
+    if os.path.abspath(output_path) == os.path.abspath(args.input_path):
+        print("Error: The output path must differ from the note stream")
+        sys.exit(1)
+
+    try:
+        with open_note_stream(args.input_path) as reader:
+            if extension == ".pdf":
+                export_to_pdf(reader, output_path, pdf_options_from_args(args))
+            elif extension == ".html":
+                export_to_site(
+                    reader, output_path, reader.metadata, site_options_from_args(args)
+                )
+            elif extension == ".jsonl":
+                export_to_chunks(
+                    reader, output_path, reader.metadata, chunk_options_from_args(args)
+                )
+            else:
+                export_stream_to_markdown(
+                    reader, output_path, args.format, reader.metadata,
+                    templates_from_args(args),
+                )
+            count = reader.count
+    except NoteStreamError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    except OSError as e:
+        print(f"Error reading note stream: {e}")
+        sys.exit(1)
+
+    print(f"Successfully exported {count} notes to {output_path}")
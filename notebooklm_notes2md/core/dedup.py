@@ -0,0 +1,265 @@
+"""
+Content fingerprinting and duplicate detection for NotebookLM notes.
+
+Notes are fingerprinted after ``clean_text`` so that the same note exported
+twice hashes identically. Exact duplicates are found with a hash lookup;
+near duplicates are optionally found with SimHash signatures indexed by
+bands (pigeonhole LSH), so lookups never compare against the whole archive.
+"""
+
+import hashlib
+import json
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from notebooklm_notes2md.utils.text_processing import clean_text
+
+SIMHASH_BITS = 64
+
+_TOKEN_RE = re.compile(r"\w+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class Duplicate(NamedTuple):
+    """A previously indexed note that matches a new one."""
+
+    ref: str
+    title: str
+    exact: bool
+
+
+def normalize_note_content(text: str) -> str:
+    """
+    Normalize note text the way it will be rendered.
+
+    Args:
+        text: Raw note text
+
+    Returns:
+        Cleaned text with runs of whitespace collapsed
+    """
+    return _WHITESPACE_RE.sub(" ", clean_text(text)).strip()
+
+
+def fingerprint_text(text: str) -> str:
+    """
+    Compute the exact content fingerprint of a note's text.
+
+    Args:
+        text: Raw note text
+
+    Returns:
+        Hex digest identifying the cleaned content
+    """
+    normalized = normalize_note_content(text)
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def fingerprint_note(note: Dict[str, str]) -> str:
+    """
+    Compute the exact content fingerprint of a note dictionary.
+
+    Args:
+        note: Note dictionary with a "note" key
+
+    Returns:
+        Hex digest identifying the cleaned content
+    """
+    return fingerprint_text(note["note"])
+
+
+def simhash(text: str, bits: int = SIMHASH_BITS) -> int:
+    """
+    Compute a SimHash signature over word trigrams of the cleaned text.
+
+    Similar texts produce signatures with a small Hamming distance.
+
+    Args:
+        text: Raw note text
+        bits: Signature width in bits
+
+    Returns:
+        The signature as an integer
+    """
+    words = _TOKEN_RE.findall(normalize_note_content(text).lower())
+    if len(words) < 3:
+        shingles = [" ".join(words)] if words else []
+    else:
+        shingles = [" ".join(words[i:i + 3]) for i in range(len(words) - 2)]
+
+    weights: Dict[int, int] = {}
+    for shingle in shingles:
+        digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=bits // 8).digest()
+        value = int.from_bytes(digest, "big")
+        weights[value] = weights.get(value, 0) + 1
+
+    total = sum(weights.values())
+    signature = 0
+    for bit in range(bits):
+        mask = 1 << bit
+        ones = sum(weight for value, weight in weights.items() if value & mask)
+        if 2 * ones > total:
+            signature |= mask
+    return signature
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """
+    Count the differing bits between two signatures.
+
+    Args:
+        a: First signature
+        b: Second signature
+
+    Returns:
+        Number of differing bits
+    """
+    return bin(a ^ b).count("1")
+
+
+class DedupIndex:
+    """
+    Index of note fingerprints used to detect duplicates across exports.
+
+    Exact lookups are a single dictionary probe. When near-duplicate
+    detection is enabled, each SimHash signature is split into
+    ``max_distance + 1`` bands; any two signatures within ``max_distance``
+    bits share at least one band, so only notes in matching buckets are
+    compared.
+    """
+
+    def __init__(self, near_duplicates: bool = False, max_distance: int = 3) -> None:
+        self.near_duplicates = near_duplicates
+        self.max_distance = max_distance
+        self._exact: Dict[str, Tuple[str, str]] = {}
+        self._signatures: List[Tuple[int, str, str]] = []
+        self._band_count = max_distance + 1
+        self._band_width = -(-SIMHASH_BITS // self._band_count)
+        self._bands: List[Dict[int, List[int]]] = [
+            {} for _ in range(self._band_count)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def _band_keys(self, signature: int) -> List[int]:
+        mask = (1 << self._band_width) - 1
+        return [
+            (signature >> (band * self._band_width)) & mask
+            for band in range(self._band_count)
+        ]
+
+    def _find_near(self, signature: int) -> Optional[Tuple[str, str]]:
+        seen = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            for position in self._bands[band].get(key, ()):
+                if position in seen:
+                    continue
+                seen.add(position)
+                other, ref, title = self._signatures[position]
+                if hamming_distance(signature, other) <= self.max_distance:
+                    return ref, title
+        return None
+
+    def _add_signature(self, signature: int, ref: str, title: str) -> None:
+        position = len(self._signatures)
+        self._signatures.append((signature, ref, title))
+        for band, key in enumerate(self._band_keys(signature)):
+            self._bands[band].setdefault(key, []).append(position)
+
+    def _lookup(self, note: Dict[str, str]) -> Tuple[Optional[Duplicate], str, int]:
+        fingerprint = fingerprint_note(note)
+        match = self._exact.get(fingerprint)
+        if match:
+            return Duplicate(match[0], match[1], True), fingerprint, 0
+
+        signature = 0
+        if self.near_duplicates:
+            signature = simhash(note["note"])
+            near = self._find_near(signature)
+            if near:
+                return Duplicate(near[0], near[1], False), fingerprint, signature
+        return None, fingerprint, signature
+
+    def find(self, note: Dict[str, str]) -> Optional[Duplicate]:
+        """
+        Report the earlier note a note duplicates, without registering it.
+
+        Args:
+            note: Note dictionary with a "note" key
+
+        Returns:
+            The matching earlier note, or None if the note is new
+        """
+        return self._lookup(note)[0]
+
+    def add(self, note: Dict[str, str], ref: str) -> Optional[Duplicate]:
+        """
+        Register a note, or report the earlier note it duplicates.
+
+        Args:
+            note: Note dictionary with "title" and "note" keys
+            ref: Where the note is rendered (e.g. an output file name)
+
+        Returns:
+            The matching earlier note, or None if the note is new
+        """
+        duplicate, fingerprint, signature = self._lookup(note)
+        if duplicate is not None:
+            return duplicate
+
+        title = note.get("title", "")
+        self._exact[fingerprint] = (ref, title)
+        if self.near_duplicates:
+            self._add_signature(signature, ref, title)
+        return None
+
+    def save(self, path: str) -> None:
+        """
+        Persist the index as JSON so later exports can reuse it.
+
+        Args:
+            path: Path of the index file
+        """
+        data = {
+            "exact": self._exact,
+            "signatures": [
+                [format(signature, "x"), ref, title]
+                for signature, ref, title in self._signatures
+            ],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def load(self, path: str) -> None:
+        """
+        Merge a previously saved index into this one.
+
+        Args:
+            path: Path of the index file
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for fingerprint, (ref, title) in data.get("exact", {}).items():
+            self._exact.setdefault(fingerprint, (ref, title))
+        for signature, ref, title in data.get("signatures", []):
+            self._add_signature(int(signature, 16), ref, title)
+
+
+def duplicate_stub(note: Dict[str, str], duplicate: Duplicate) -> Dict[str, str]:
+    """
+    Replace a duplicate note with a short link to the original.
+
+    Args:
+        note: The duplicate note
+        duplicate: The earlier note it matches
+
+    Returns:
+        A note dictionary pointing to the original
+    """
+    kind = "Duplicate" if duplicate.exact else "Near duplicate"
+    text = (
+        f"## {note['title']}\n\n"
+        f"*{kind} of \"{duplicate.title}\" in [{duplicate.ref}]({duplicate.ref})*"
+    )
+    return {"title": note["title"], "note": text}
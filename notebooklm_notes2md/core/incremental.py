@@ -0,0 +1,175 @@
+"""
+Incremental ingestion of notebooks that only gained new notes.
+
+NotebookLM exports list the newest note first, so notes added since the
+last export sit at the start of the doc-viewer. Append mode remembers the
+fingerprints of the newest exported notes in a small state file next to
+the output. The next run parses a growing prefix of the HTML, walks the
+notes newest first and stops as soon as it reaches the remembered notes;
+only the notes before them are new. The prefix starts small and doubles,
+so the cost depends on the number of new notes, not on the notebook size.
+"""
+
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from bs4 import BeautifulSoup
+
+from notebooklm_notes2md.core.dedup import fingerprint_note
+from notebooklm_notes2md.core.parser import iter_notes
+from notebooklm_notes2md.extractors.metadata import extract_metadata
+from notebooklm_notes2md.extractors.schema import MetadataSchema
+from notebooklm_notes2md.utils.html_processing import find_parent_element
+
+APPEND_STATE_SUFFIX = ".append.json"
+DOC_VIEWER_TAG = "<labs-tailwind-doc-viewer"
+
+# Number of newest notes whose fingerprints must match, so a new note that
+# repeats the last one does not end the walk too early
+TAIL_LENGTH = 3
+
+# Characters of HTML parsed in the first attempt; doubled until found
+INITIAL_PREFIX_SIZE = 32 * 1024
+
+
+class AppendState(NamedTuple):
+    """
+    What append mode remembers about an output file.
+
+    Attributes:
+        tail: Fingerprints of the newest exported notes, newest first
+        notes: Number of notes in the output file
+    """
+
+    tail: List[str]
+    notes: int
+
+
+def append_state_path(output_path: str) -> str:
+    """Return the path of the state file kept next to an output file."""
+    return output_path + APPEND_STATE_SUFFIX
+
+
+def load_append_state(output_path: str) -> Optional[AppendState]:
+    """
+    Read the append state of an output file.
+
+    Args:
+        output_path: Path of the output file
+
+    Returns:
+        The state, or None if there is none or it is unreadable
+    """
+    try:
+        with open(append_state_path(output_path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        tail = [str(fingerprint) for fingerprint in data["tail"]]
+        return AppendState(tail, int(data["notes"])) if tail else None
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_append_state(output_path: str, state: AppendState) -> None:
+    """
+    Write the append state of an output file.
+
+    Args:
+        output_path: Path of the output file
+        state: The state to remember
+    """
+    with open(append_state_path(output_path), "w", encoding="utf-8") as f:
+        json.dump({"tail": state.tail, "notes": state.notes}, f)
+
+
+def state_for_notes(notes: Sequence[Dict[str, str]]) -> AppendState:
+    """
+    Build the append state after a full export.
+
+    Args:
+        notes: All exported notes, oldest first
+
+    Returns:
+        The state describing the output
+    """
+    tail = [fingerprint_note(note) for note in reversed(notes[-TAIL_LENGTH:])]
+    return AppendState(tail, len(notes))
+
+
+def advance_state(state: AppendState, new_notes: Sequence[Dict[str, str]]) -> AppendState:
+    """
+    Update the append state after appending notes.
+
+    Args:
+        state: The state before appending
+        new_notes: The appended notes, oldest first
+
+    Returns:
+        The state describing the extended output
+    """
+    newest = [fingerprint_note(note) for note in reversed(new_notes[-TAIL_LENGTH:])]
+    return AppendState((newest + state.tail)[:TAIL_LENGTH], state.notes + len(new_notes))
+
+
+def _notes_before_tail(html: str, tail: Sequence[str]) -> Optional[List[Dict[str, str]]]:
+    parent = find_parent_element(BeautifulSoup(html, "html.parser"))
+    if parent is None:
+        return None
+    seen: List[Dict[str, str]] = []
+    fingerprints: List[str] = []
+    for note in iter_notes(parent):
+        seen.append(note)
+        fingerprints.append(fingerprint_note(note))
+        if fingerprints[-len(tail):] == list(tail):
+            return seen[:-len(tail)]
+    return None
+
+
+def parse_new_notes(
+    html: str,
+    tail: Sequence[str],
+    initial_size: int = INITIAL_PREFIX_SIZE,
+) -> Optional[List[Dict[str, str]]]:
+    """
+    Parse only the notes added before the remembered newest notes.
+
+    A cut through the HTML only damages the last note of the prefix, so a
+    match is only possible once the remembered notes are complete.
+
+    Args:
+        html: The whole exported HTML
+        tail: Fingerprints of the newest exported notes, newest first
+        initial_size: Characters of the doc-viewer parsed first
+
+    Returns:
+        The new notes, oldest first, or None if the remembered notes are
+        no longer in the export (edited or deleted notes)
+    """
+    start = html.find(DOC_VIEWER_TAG)
+    if start < 0 or not tail:
+        return None
+    size = max(initial_size, 1)
+    while True:
+        end = start + size
+        new_notes = _notes_before_tail(html[start:end], tail)
+        if new_notes is not None:
+            new_notes.reverse()
+            return new_notes
+        if end >= len(html):
+            return None
+        size *= 2
+
+
+def header_metadata(html: str, schema: Optional[MetadataSchema] = None) -> Dict[str, Any]:
+    """
+    Extract metadata from the header in front of the notes only.
+
+    Args:
+        html: The whole exported HTML
+        schema: Optional metadata schema
+
+    Returns:
+        The metadata dictionary
+    """
+    start = html.find(DOC_VIEWER_TAG)
+    header = html[:start] if start >= 0 else html
+    return extract_metadata(BeautifulSoup(header, "html.parser"), schema)
@@ -0,0 +1,136 @@
+"""
+Parallel parsing of one large export in worker processes.
+
+The doc-viewer of an export is a flat list of structural elements, so it
+can be cut at the start of any of them. A byte scan over the memory-mapped
+file finds cut points that split the viewer into chunks of similar size.
+Each worker reads its byte range, parses it with BeautifulSoup and walks it
+with ``iter_note_events``; the parent feeds the events of all chunks, in
+file order, to the same ``build_notes`` step as the serial parser. Notes
+that span a cut are therefore joined exactly as in a serial parse, and the
+result is identical to ``parse_notes``.
+"""
+
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+
+from notebooklm_notes2md.core.parser import NoteEvent, build_notes, iter_note_events
+from notebooklm_notes2md.core.selection import DOC_VIEWER_TAG, ELEMENT_TAG
+from notebooklm_notes2md.utils.html_processing import find_parent_element
+
+# Chunks per worker, so a slow chunk does not leave the others idle
+CHUNKS_PER_WORKER = 4
+
+# Smaller chunks are not worth a process round trip
+MIN_CHUNK_SIZE = 1024 * 1024
+
+
+def split_points(
+    data: "bytes | mmap.mmap",
+    chunks: int,
+    min_chunk_size: int = MIN_CHUNK_SIZE,
+) -> List[Tuple[int, int]]:
+    """
+    Cut the doc-viewer of an export into byte ranges at element starts.
+
+    Args:
+        data: The whole export
+        chunks: Number of ranges wanted
+        min_chunk_size: Smallest range size worth cutting
+
+    Returns:
+        (start, stop) ranges covering the doc-viewer to the end of the
+        data; the first range starts at the doc-viewer tag, the others at
+        a structural element. Empty if there is no doc-viewer.
+    """
+    viewer = data.find(DOC_VIEWER_TAG)
+    if viewer < 0:
+        return []
+    size = max((len(data) - viewer) // max(chunks, 1), min_chunk_size, 1)
+
+    starts = [viewer]
+    target = viewer + size
+    while target < len(data):
+        cut = data.find(ELEMENT_TAG, target)
+        if cut < 0:
+            break
+        starts.append(cut)
+        target = cut + size
+    return list(zip(starts, starts[1:] + [len(data)]))
+
+
+def parse_range_events(
+    path: str,
+    start: int,
+    stop: int,
+    with_html: bool = False,
+) -> List[NoteEvent]:
+    """
+    Parse one byte range of an export into note events.
+
+    Args:
+        path: Path to the exported HTML file
+        start: Offset of the doc-viewer tag or of a structural element
+        stop: End of the range
+        with_html: Also render each element as HTML
+
+    Returns:
+        The events of the range, in document order
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        html = f.read(stop - start).decode("utf-8")
+    if not html.startswith(DOC_VIEWER_TAG.decode("ascii")):
+        html = DOC_VIEWER_TAG.decode("ascii") + ">" + html
+    parent = find_parent_element(BeautifulSoup(html, "html.parser"))
+    if parent is None:
+        return []
+    return list(iter_note_events(parent, with_html=with_html))
+
+
+def parse_notes_parallel(
+    path: str,
+    workers: int,
+    with_html: bool = False,
+    min_chunk_size: int = MIN_CHUNK_SIZE,
+) -> List[Dict[str, str]]:
+    """
+    Parse the notes of an export in worker processes.
+
+    Args:
+        path: Path to the exported HTML file
+        workers: Number of worker processes
+        with_html: Also render each note as HTML
+        min_chunk_size: Smallest chunk handed to a worker
+
+    Returns:
+        The notes, oldest first, exactly as ``parse_notes`` returns them
+    """
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            ranges = split_points(data, workers * CHUNKS_PER_WORKER, min_chunk_size)
+    if not ranges:
+        return []
+
+    if workers <= 1 or len(ranges) == 1:
+        chunks = [parse_range_events(path, start, stop, with_html) for start, stop in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(
+                parse_range_events,
+                [path] * len(ranges),
+                [start for start, _ in ranges],
+                [stop for _, stop in ranges],
+                [with_html] * len(ranges),
+            ))
+
+    notes = list(build_notes(chain.from_iterable(chunks), with_html=with_html))
+    # Reverse to maintain original order
+    notes.reverse()
+    return notes
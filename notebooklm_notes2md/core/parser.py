@@ -2,14 +2,17 @@
 Core functionality for parsing and processing NotebookLM notes.
 """
 
-from typing import Dict, List, Optional
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from bs4 import BeautifulSoup
-from bs4.element import Tag
+from bs4.element import PageElement, Tag
 
+from notebooklm_notes2md.core.progress import ProgressHooks, progress_stage
 # Import original functionality from the script
 from notebooklm_notes2md.utils.html_processing import (
     drill_into_tag,
+    drill_into_tag_html,
     extract_tag_classes,
     find_parent_element,
     format_span_text,
@@ -20,26 +23,75 @@ from notebooklm_notes2md.utils.html_processing import (
 from notebooklm_notes2md.utils.text_processing import clean_text, create_note_from_texts
 
 
-def parse_notes(soup: BeautifulSoup) -> List[Dict[str, str]]:
+def _release_children(parent: Tag) -> Iterator[PageElement]:
+    """Yield the children of a tag, removing each one once it is processed."""
+    contents = parent.contents
+    while contents:
+        child = contents[0]
+        yield child
+        if contents and contents[0] is child:
+            if isinstance(child, Tag):
+                child.decompose()
+            else:
+                child.extract()
+
+
+# Placeholder left by a bullet marker for the list item that follows it
+_BULLET_MARKER = "\0bullet"
+
+# A content element of a note: its Markdown text and, when requested, its
+# HTML; None marks a possible note boundary
+NoteEvent = Optional[Tuple[str, Optional[str]]]
+
+
+def _html_fragment(tag: Tag) -> str:
+    if "bullet" in extract_tag_classes(tag):
+        return _BULLET_MARKER
+    return drill_into_tag_html(tag)
+
+
+def _append_html(html: List[str], fragment: str) -> None:
+    if fragment != _BULLET_MARKER and html and html[-1] == _BULLET_MARKER:
+        html[-1] = f"<ul><li>{fragment}</li></ul>"
+    else:
+        html.append(fragment)
+
+
+def _finish_note(
+    texts: List[str],
+    low_memory: bool,
+    html: Optional[List[str]] = None
+) -> Dict[str, str]:
+    note = create_note_from_texts(texts)
+    if low_memory:
+        # Repeated titles ("Untitled Note", duplicated notes) share one string
+        note["title"] = sys.intern(note["title"])
+    if html is not None:
+        note["html"] = "".join(part for part in html if part != _BULLET_MARKER)
+    return note
+
+
+def iter_note_events(
+    parent: Tag,
+    low_memory: bool = False,
+    with_html: bool = False
+) -> Iterator[NoteEvent]:
     """
-    Parse the soup and extract notes as a list of dicts with title and note.
+    Yield the content elements of the notes in document order.
 
     Args:
-        soup: The BeautifulSoup object of the parsed HTML
+        parent: The element containing all notes
+        low_memory: Decompose each top-level element once it is processed
+        with_html: Also render each element as HTML
 
-    Returns:
-        List of dictionaries, each containing a note with its title
+    Yields:
+        (text, html) for each element with text, html being None unless
+        requested, and None for separators and empty elements
     """
-    notes: List[Dict[str, str]] = []
-    texts: List[str] = []
-
-    parent = find_parent_element(soup)
-    if not parent:
-        print("Could not find 'labs-tailwind-doc-viewer' in the HTML.")
-        return notes
+    children = _release_children(parent) if low_memory else parent.children
 
     # Process each structural element
-    for child in getattr(parent, "children", []):
+    for child in children:
         if not isinstance(child, Tag):
             continue
 
@@ -47,27 +99,120 @@ def parse_notes(soup: BeautifulSoup) -> List[Dict[str, str]]:
         for inner_child in inner_childs_with_split(child):
             if not isinstance(inner_child, Tag):
                 # Handle separator (empty string)
-                if inner_child == "" and texts:
-                    notes.append(create_note_from_texts(texts))
-                    texts = []
+                if inner_child == "":
+                    yield None
                 continue
 
             # Process content
             text = drill_into_tag(inner_child).strip()
-            if texts and text == "":
+            if text:
+                yield text, _html_fragment(inner_child) if with_html else None
+            else:
                 # Empty text after content signals end of a note
-                notes.append(create_note_from_texts(texts))
+                yield None
+
+
+def build_notes(
+    events: Iterable[NoteEvent],
+    low_memory: bool = False,
+    with_html: bool = False
+) -> Iterator[Dict[str, str]]:
+    """
+    Group content elements into notes.
+
+    Args:
+        events: Events from ``iter_note_events``, in document order
+        low_memory: Intern note titles
+        with_html: Join the HTML of the elements under the "html" key
+
+    Yields:
+        Dictionaries, each containing a note with its title
+    """
+    texts: List[str] = []
+    html: Optional[List[str]] = [] if with_html else None
+    for event in events:
+        if event is None:
+            if texts:
+                yield _finish_note(texts, low_memory, html)
                 texts = []
-            elif text:
-                texts.append(text)
-                texts.append("\n")
+                html = [] if with_html else None
+            continue
+        text, fragment = event
+        texts.append(text)
+        texts.append("\n")
+        if html is not None:
+            _append_html(html, fragment or "")
 
     # Add the last note if there's remaining text
     if texts:
-        notes.append(create_note_from_texts(texts))
+        yield _finish_note(texts, low_memory, html)
+
+
+def iter_notes(
+    parent: Tag,
+    low_memory: bool = False,
+    with_html: bool = False
+) -> Iterator[Dict[str, str]]:
+    """
+    Yield notes in document order, i.e. newest first.
+
+    Notes are produced as soon as their end is seen, so callers can stop
+    the walk early.
+
+    Args:
+        parent: The element containing all notes
+        low_memory: Detach and decompose each top-level element once it is
+            processed, so the tree shrinks as the walk goes on; the notes
+            are removed from the tree
+        with_html: Also render each note as HTML, under the "html" key,
+            for the direct PDF engine
+
+    Yields:
+        Dictionaries, each containing a note with its title
+    """
+    events = iter_note_events(parent, low_memory, with_html)
+    return build_notes(events, low_memory, with_html)
+
+
+def parse_notes(
+    soup: BeautifulSoup,
+    low_memory: bool = False,
+    with_html: bool = False,
+    hooks: Optional[ProgressHooks] = None
+) -> List[Dict[str, str]]:
+    """
+    Parse the soup and extract notes as a list of dicts with title and note.
+
+    Args:
+        soup: The BeautifulSoup object of the parsed HTML
+        low_memory: Decompose each top-level element of the doc-viewer as
+            soon as it is processed; the soup loses its notes, so extract
+            metadata first
+        with_html: Also render each note as HTML for the direct PDF engine
+        hooks: Optional progress hooks, told about each note as it is
+            parsed (stage "parse")
+
+    Returns:
+        List of dictionaries, each containing a note with its title
+
+    Raises:
+        ConversionCancelled: If the hooks were cancelled
+    """
+    parent = find_parent_element(soup)
+    if not parent:
+        print("Could not find 'labs-tailwind-doc-viewer' in the HTML.")
+        return []
+
+    if hooks is None:
+        notes = list(iter_notes(parent, low_memory, with_html))
+    else:
+        notes = []
+        with progress_stage(hooks, "parse"):
+            for note in iter_notes(parent, low_memory, with_html):
+                hooks.note_parsed(note)
+                notes.append(note)
 
     # Reverse to maintain original order
-    if notes:
-        notes.reverse()
+    notes.reverse()
 
     return notes
@@ -0,0 +1,281 @@
+"""
+Progress events and cancellation of conversions.
+
+``parse_notes``, the Markdown formatters, ``export_pdf`` and ``write_chunks``
+take an optional ``ProgressHooks``. A conversion goes through stages
+("parse", "format", "render", "chunk") and reports each one as it starts and ends, the notes done so
+far within it and the bytes written to the output. Every note is also a
+cancellation checkpoint: once ``cancel`` is called, from a callback or
+another thread, the next checkpoint raises ``ConversionCancelled``.
+
+Without hooks the converters skip all of this: ``track_notes`` hands back
+the notes unchanged and ``progress_stage`` is a no-op context, so the
+cost is one comparison per call rather than per note.
+"""
+
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sized,
+    TextIO,
+)
+
+MIB = 1024 * 1024
+
+# Seconds between two refreshes of the progress line on a terminal
+DISPLAY_INTERVAL = 0.2
+
+
+class ConversionCancelled(Exception):
+    """Raised at the first checkpoint after a conversion was cancelled."""
+
+
+class ProgressHooks:
+    """
+    Callbacks receiving the progress events of a conversion.
+
+    Every callback is optional and runs in the converting thread, so it
+    should return quickly.
+
+    Args:
+        on_note_parsed: Called with each note as soon as it is parsed
+        on_stage_start: Called with the stage name and the number of notes
+            it will process, None when unknown
+        on_stage_end: Called with the stage name when it finishes
+        on_notes_done: Called with the stage name and the number of notes
+            it has finished so far
+        on_bytes_written: Called with the number of bytes just added to
+            the output
+    """
+
+    def __init__(
+        self,
+        on_note_parsed: Optional[Callable[[Dict[str, str]], None]] = None,
+        on_stage_start: Optional[Callable[[str, Optional[int]], None]] = None,
+        on_stage_end: Optional[Callable[[str], None]] = None,
+        on_notes_done: Optional[Callable[[str, int], None]] = None,
+        on_bytes_written: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        self.on_note_parsed = on_note_parsed
+        self.on_stage_start = on_stage_start
+        self.on_stage_end = on_stage_end
+        self.on_notes_done = on_notes_done
+        self.on_bytes_written = on_bytes_written
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Ask the conversion to stop at its next checkpoint."""
+        self.cancelled = True
+
+    def check_cancelled(self) -> None:
+        """
+        Stop the conversion if it was cancelled.
+
+        Raises:
+            ConversionCancelled: If ``cancel`` was called
+        """
+        if self.cancelled:
+            raise ConversionCancelled("Conversion cancelled")
+
+    def stage_start(self, stage: str, total: Optional[int] = None) -> None:
+        """Report the start of a stage."""
+        self.check_cancelled()
+        if self.on_stage_start is not None:
+            self.on_stage_start(stage, total)
+
+    def stage_end(self, stage: str) -> None:
+        """Report the end of a stage."""
+        if self.on_stage_end is not None:
+            self.on_stage_end(stage)
+
+    def note_parsed(self, note: Dict[str, str]) -> None:
+        """Report a parsed note; a cancellation checkpoint."""
+        self.check_cancelled()
+        if self.on_note_parsed is not None:
+            self.on_note_parsed(note)
+
+    def notes_done(self, stage: str, done: int) -> None:
+        """Report the notes finished so far in a stage; a cancellation checkpoint."""
+        self.check_cancelled()
+        if self.on_notes_done is not None:
+            self.on_notes_done(stage, done)
+
+    def bytes_written(self, count: int) -> None:
+        """Report bytes added to the output."""
+        if self.on_bytes_written is not None and count > 0:
+            self.on_bytes_written(count)
+
+
+def progress_stage(
+    hooks: Optional[ProgressHooks],
+    stage: str,
+    total: Optional[int] = None
+) -> ContextManager[None]:
+    """
+    Report a stage around a block.
+
+    The end is only reported when the block completes.
+
+    Args:
+        hooks: Progress hooks, or None
+        stage: Stage name
+        total: Number of notes the stage will process, if known
+
+    Returns:
+        A context manager
+    """
+    if hooks is None:
+        return nullcontext()
+    return _stage(hooks, stage, total)
+
+
+@contextmanager
+def _stage(hooks: ProgressHooks, stage: str, total: Optional[int]) -> Iterator[None]:
+    hooks.stage_start(stage, total)
+    yield
+    hooks.stage_end(stage)
+
+
+def track_notes(
+    notes: Iterable[Dict[str, Any]],
+    hooks: Optional[ProgressHooks],
+    stage: str
+) -> Iterable[Dict[str, Any]]:
+    """
+    Report each note of a stage as done once the next one is requested.
+
+    Args:
+        notes: Note dictionaries
+        hooks: Progress hooks; without them the notes are returned as they are
+        stage: Stage name
+
+    Returns:
+        The same notes
+    """
+    if hooks is None:
+        return notes
+    return _track(notes, hooks, stage)
+
+
+def _track(
+    notes: Iterable[Dict[str, Any]],
+    hooks: ProgressHooks,
+    stage: str
+) -> Iterator[Dict[str, Any]]:
+    hooks.check_cancelled()
+    done = 0
+    for note in notes:
+        yield note
+        done += 1
+        hooks.notes_done(stage, done)
+
+
+def total_notes(notes: Iterable[Any]) -> Optional[int]:
+    """Return the number of notes if it is known without consuming them."""
+    return len(notes) if isinstance(notes, Sized) else None
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds + 0.5), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class ProgressDisplay:
+    """
+    Progress line of the command line interface.
+
+    On a terminal the line of the current stage is refreshed in place at
+    most every ``DISPLAY_INTERVAL`` seconds; elsewhere one line is printed
+    per finished stage. Use ``hooks`` as the progress hooks of a conversion.
+
+    Args:
+        stream: Where the progress is written; standard error by default
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        self.stream = stream or sys.stderr
+        self.live = self.stream.isatty()
+        self.hooks = ProgressHooks(
+            on_note_parsed=self._note_parsed,
+            on_stage_start=self._stage_start,
+            on_stage_end=self._stage_end,
+            on_notes_done=self._notes_done,
+            on_bytes_written=self._bytes_written,
+        )
+        self.stage = ""
+        self.total: Optional[int] = None
+        self.done = 0
+        self.written = 0
+        self.stage_began = self.shown = time.perf_counter()
+
+    def line(self, now: Optional[float] = None) -> str:
+        """
+        Describe the progress of the current stage.
+
+        Args:
+            now: Current ``time.perf_counter()`` value
+
+        Returns:
+            The stage, its notes and notes/s, the bytes written and MiB/s,
+            and the remaining time when the number of notes is known
+        """
+        now = time.perf_counter() if now is None else now
+        elapsed = max(now - self.stage_began, 1e-9)
+        rate = self.done / elapsed
+        notes = f"{self.done}/{self.total}" if self.total is not None else str(self.done)
+        line = f"{self.stage}: {notes} notes ({rate:.1f} notes/s)"
+        if self.written:
+            line += (
+                f", {self.written / MIB:.1f} MiB written "
+                f"({self.written / MIB / elapsed:.2f} MiB/s)"
+            )
+        if self.total is not None and self.done < self.total and rate > 0:
+            line += f", ETA {_format_duration((self.total - self.done) / rate)}"
+        return line
+
+    def _show(self, final: bool = False) -> None:
+        now = time.perf_counter()
+        if final:
+            if self.live:
+                self.stream.write("\r" + self.line(now) + "\x1b[K\n")
+            else:
+                self.stream.write(self.line(now) + "\n")
+        elif self.live and now - self.shown >= DISPLAY_INTERVAL:
+            self.stream.write("\r" + self.line(now) + "\x1b[K")
+        else:
+            return
+        self.shown = now
+        self.stream.flush()
+
+    def _stage_start(self, stage: str, total: Optional[int]) -> None:
+        self.stage = stage
+        self.total = total
+        self.done = 0
+        self.written = 0
+        self.stage_began = time.perf_counter()
+
+    def _stage_end(self, stage: str) -> None:
+        self._show(final=True)
+
+    def _note_parsed(self, note: Dict[str, str]) -> None:
+        self.done += 1
+        self._show()
+
+    def _notes_done(self, stage: str, done: int) -> None:
+        self.done = done
+        self._show()
+
+    def _bytes_written(self, count: int) -> None:
+        self.written += count
+        self._show()
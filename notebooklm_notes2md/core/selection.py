@@ -0,0 +1,179 @@
+"""
+Lazy selection of notes for previews and partial exports.
+
+Notes are exported oldest first, and the oldest notes sit at the end of
+the HTML. To produce the first notes without parsing the whole export, the
+file is read from the end: a growing tail is cut at the first structural
+element, parsed, and its notes are yielded oldest first. The note at the
+cut may be incomplete, so it is only used once the tail reaches the start
+of the doc-viewer. The tail doubles until the consumer stops asking for
+notes, so the work depends on the notes requested, not on the file size.
+"""
+
+import itertools
+import os
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Pattern, Tuple
+
+from bs4 import BeautifulSoup
+
+from notebooklm_notes2md.core.parser import iter_notes
+from notebooklm_notes2md.utils.html_processing import find_parent_element
+
+DOC_VIEWER_TAG = b"<labs-tailwind-doc-viewer"
+ELEMENT_TAG = b"<labs-tailwind-structural-element-view"
+
+# Bytes read from the end of the file in the first attempt; doubled until
+# enough notes are found
+INITIAL_TAIL_SIZE = 64 * 1024
+
+
+class NoteSelection(NamedTuple):
+    """
+    Which notes to export, applied in this order.
+
+    Attributes:
+        match: Keep only notes whose title matches this pattern
+        start: Index of the first selected note (0 is the oldest)
+        stop: Index after the last selected note (None for all)
+        limit: Export at most this many notes
+    """
+
+    match: Optional[Pattern[str]] = None
+    start: int = 0
+    stop: Optional[int] = None
+    limit: Optional[int] = None
+
+
+def parse_range(spec: str) -> Tuple[int, Optional[int]]:
+    """
+    Parse a note range such as ``10:20``, ``:5`` or ``100:``.
+
+    Args:
+        spec: Start and stop indices separated by a colon
+
+    Returns:
+        The start index and the stop index (None when open-ended)
+
+    Raises:
+        ValueError: If the range is malformed
+    """
+    start_text, sep, stop_text = spec.partition(":")
+    try:
+        if not sep:
+            raise ValueError
+        start = int(start_text) if start_text.strip() else 0
+        stop = int(stop_text) if stop_text.strip() else None
+    except ValueError:
+        raise ValueError(f"Invalid range '{spec}', expected START:STOP") from None
+    if start < 0 or (stop is not None and stop < start):
+        raise ValueError(f"Invalid range '{spec}', expected 0 <= START <= STOP")
+    return start, stop
+
+
+def select_notes(
+    notes: Iterable[Dict[str, str]],
+    selection: NoteSelection,
+) -> Iterator[Dict[str, str]]:
+    """
+    Lazily apply a selection to notes.
+
+    Args:
+        notes: Notes, oldest first
+        selection: The selection
+
+    Yields:
+        The selected notes; the input is not consumed further than needed
+    """
+    iterator: Iterable[Dict[str, str]] = notes
+    if selection.match is not None:
+        pattern = selection.match
+        iterator = (note for note in iterator if pattern.search(note["title"]))
+    if selection.start or selection.stop is not None:
+        iterator = itertools.islice(iterator, selection.start, selection.stop)
+    if selection.limit is not None:
+        iterator = itertools.islice(iterator, selection.limit)
+    return iter(iterator)
+
+
+def _read_tail(path: str, size: int) -> Tuple[bytes, bool]:
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+        start = max(file_size - size, 0)
+        f.seek(start)
+        return f.read(), start == 0
+
+
+def _tail_notes(
+    data: bytes,
+    whole_file: bool,
+    with_html: bool = False
+) -> Tuple[List[Dict[str, str]], bool]:
+    viewer = data.rfind(DOC_VIEWER_TAG)
+    if viewer >= 0:
+        cut, complete = viewer, True
+    else:
+        cut, complete = data.find(ELEMENT_TAG), whole_file
+        if cut < 0:
+            return [], whole_file
+
+    html = data[cut:].decode("utf-8")
+    if viewer < 0:
+        html = DOC_VIEWER_TAG.decode("ascii") + ">" + html
+    parent = find_parent_element(BeautifulSoup(html, "html.parser"))
+    notes = list(iter_notes(parent, with_html=with_html)) if parent is not None else []
+    if not complete and notes:
+        # The newest note of the tail may have started before the cut
+        notes.pop(0)
+    notes.reverse()
+    return notes, complete
+
+
+def iter_notes_from_end(
+    path: str,
+    initial_size: int = INITIAL_TAIL_SIZE,
+    with_html: bool = False,
+) -> Iterator[Dict[str, str]]:
+    """
+    Yield the notes of an export oldest first, reading the file from the end.
+
+    Args:
+        path: Path to the exported HTML file
+        initial_size: Bytes read in the first attempt
+        with_html: Also render each note as HTML, as ``parse_notes`` does
+
+    Yields:
+        Note dictionaries, oldest first, exactly as ``parse_notes`` orders
+        them
+    """
+    size = max(initial_size, 1)
+    emitted = 0
+    while True:
+        data, whole_file = _read_tail(path, size)
+        notes, complete = _tail_notes(data, whole_file, with_html)
+        yield from notes[emitted:]
+        emitted = max(emitted, len(notes))
+        if complete or whole_file:
+            return
+        size *= 2
+
+
+def read_header(path: str, block_size: int = 64 * 1024) -> str:
+    """
+    Read the start of an export up to the doc-viewer, i.e. the metadata.
+
+    Args:
+        path: Path to the exported HTML file
+        block_size: Bytes read at a time
+
+    Returns:
+        The HTML in front of the notes (the whole file if there are none)
+    """
+    data = b""
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            data += block
+            start = data.find(DOC_VIEWER_TAG)
+            if start >= 0:
+                return data[:start].decode("utf-8")
+    return data.decode("utf-8")
@@ -0,0 +1,226 @@
+"""
+Parsed notes in shared memory, for handing them to worker processes.
+
+Sending a list of note dictionaries to a worker pickles every note string.
+A ``SharedNoteStore`` keeps the strings of all notes in one UTF-8 buffer in
+a ``multiprocessing.shared_memory`` block, indexed by an offsets table.
+Pickling a store only sends the block name: the worker attaches to the
+block and reads notes through ``SharedNote`` views, which decode a field
+only when it is accessed. Views are read-only mappings, so the formatters
+and exporters accept them wherever they accept note dictionaries.
+
+Block layout: a header (magic, note count, length of the field names), the
+field names separated by NUL bytes, the offsets table holding
+``count * len(fields) + 1`` unsigned 64-bit boundaries, then the UTF-8 data.
+"""
+
+import struct
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+from itertools import accumulate
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union, overload
+
+MAGIC = b"NLMNOTES"
+_HEADER = struct.Struct("<8sQQ")
+_OFFSET_SIZE = 8
+
+
+def _aligned(size: int) -> int:
+    return (size + _OFFSET_SIZE - 1) // _OFFSET_SIZE * _OFFSET_SIZE
+
+
+def _attach_untracked(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Before Python 3.13, attaching registers the block with the resource
+    # tracker of this process, which unlinks it when the process exits even
+    # though the creating process still uses it
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedNote(Mapping):
+    """
+    Read-only view of one note of a ``SharedNoteStore``.
+
+    Fields are decoded from the shared buffer each time they are read.
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "SharedNoteStore", index: int) -> None:
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key: str) -> str:
+        field = self._store._field_index.get(key)
+        if field is None:
+            raise KeyError(key)
+        return self._store._read(self._index, field)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store.fields)
+
+    def __len__(self) -> int:
+        return len(self._store.fields)
+
+    def __repr__(self) -> str:
+        return f"SharedNote({dict(self)!r})"
+
+
+class SharedNoteStore(Sequence):
+    """
+    Notes stored in one shared memory block.
+
+    Create a store with ``SharedNoteStore.create`` in the parsing process
+    and pass it to workers as an argument: it is pickled as its block name
+    and attached on the other side. The creating process owns the block
+    and unlinks it when it closes the store.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool = False) -> None:
+        self._shm: Optional[shared_memory.SharedMemory] = shm
+        self.owner = owner
+
+        buf = shm.buf
+        assert buf is not None, "the shared memory block is closed"
+        magic, count, names_size = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            shm.close()
+            raise ValueError(f"Shared memory block {shm.name} does not hold notes")
+        names_start = _HEADER.size
+        names = bytes(buf[names_start:names_start + names_size]).decode("utf-8")
+        self.fields: Tuple[str, ...] = tuple(names.split("\0")) if names else ()
+        self._field_index = {name: index for index, name in enumerate(self.fields)}
+        self._count: int = count
+
+        offsets_start = _aligned(names_start + names_size)
+        offsets_end = offsets_start + (count * len(self.fields) + 1) * _OFFSET_SIZE
+        self._offsets = buf[offsets_start:offsets_end].cast("Q")
+        self._data = buf[offsets_end:offsets_end + self._offsets[-1]]
+
+    @classmethod
+    def create(
+        cls,
+        notes: Iterable[Dict[str, str]],
+        fields: Optional[Sequence[str]] = None,
+    ) -> "SharedNoteStore":
+        """
+        Copy notes into a new shared memory block.
+
+        Args:
+            notes: Note dictionaries
+            fields: Keys to store; by default the keys that all notes
+                have, in the order of the first note
+
+        Returns:
+            The store, owning the block
+
+        Raises:
+            ValueError: If a note lacks one of the fields
+        """
+        notes = list(notes)
+        if fields is None:
+            fields = tuple(notes[0]) if notes else ("title", "note")
+            fields = tuple(field for field in fields if all(field in note for note in notes))
+        encoded: List[bytes] = []
+        for index, note in enumerate(notes):
+            for field in fields:
+                if field not in note:
+                    raise ValueError(f"Note {index} has no '{field}' field")
+                encoded.append(note[field].encode("utf-8"))
+
+        names = "\0".join(fields).encode("utf-8")
+        offsets = array("Q", accumulate((len(value) for value in encoded), initial=0))
+        data = b"".join(encoded)
+        del encoded
+        offsets_start = _aligned(_HEADER.size + len(names))
+        data_start = offsets_start + len(offsets) * _OFFSET_SIZE
+
+        shm = shared_memory.SharedMemory(create=True, size=max(data_start + len(data), 1))
+        buf = shm.buf
+        assert buf is not None
+        try:
+            _HEADER.pack_into(buf, 0, MAGIC, len(notes), len(names))
+            buf[_HEADER.size:_HEADER.size + len(names)] = names
+            buf[offsets_start:data_start] = memoryview(offsets).cast("B")
+            buf[data_start:data_start + len(data)] = data
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedNoteStore":
+        """
+        Attach to a store created by another process.
+
+        Args:
+            name: Name of the shared memory block
+
+        Returns:
+            The store; close it when done, the owner unlinks the block
+        """
+        return cls(_attach_untracked(name))
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block."""
+        assert self._shm is not None, "the store is closed"
+        return self._shm.name
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the UTF-8 data of all notes."""
+        return self._offsets[-1]
+
+    def _read(self, index: int, field: int) -> str:
+        position = index * len(self.fields) + field
+        start, end = self._offsets[position], self._offsets[position + 1]
+        return str(self._data[start:end], "utf-8")
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> SharedNote: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[SharedNote]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[SharedNote, List[SharedNote]]:
+        if isinstance(index, slice):
+            return [SharedNote(self, i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("note index out of range")
+        return SharedNote(self, index)
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str]]:
+        # Only the block name crosses the process boundary
+        return (SharedNoteStore.attach, (self.name,))
+
+    def close(self) -> None:
+        """Detach from the block; views of this store become unusable."""
+        if self._shm is None:
+            return
+        self._offsets.release()
+        self._data.release()
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self) -> "SharedNoteStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
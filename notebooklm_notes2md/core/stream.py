@@ -0,0 +1,193 @@
+"""
+Note stream: an intermediate record format between parsing and rendering.
+
+A note stream holds the output of ``extract_metadata`` and ``parse_notes``
+so that parsing and rendering can run as separate pipeline stages. The
+first record is a header carrying the format version and the document
+metadata; every following record is one note (``title`` and ``note``).
+
+Two encodings are supported, chosen by file extension:
+
+- ``.jsonl``: one compact JSON object per line
+- ``.msgpack``: consecutive MessagePack objects (requires ``msgpack``)
+
+Readers decode one record at a time, so a stream is never loaded whole.
+"""
+
+import json
+import os
+from typing import IO, Any, Dict, Iterable, Iterator, Optional
+
+try:
+    import msgpack  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+STREAM_FORMAT = "notebooklm-notes"
+STREAM_VERSION = 1
+STREAM_EXTENSIONS = {".jsonl": "jsonl", ".msgpack": "msgpack"}
+
+
+class NoteStreamError(ValueError):
+    """Raised when a note stream cannot be written or read."""
+
+
+def stream_encoding(path: str) -> str:
+    """
+    Determine the encoding of a note stream from its file extension.
+
+    Args:
+        path: Path of the note stream
+
+    Returns:
+        "jsonl" or "msgpack"
+
+    Raises:
+        NoteStreamError: If the extension is unknown or msgpack is missing
+    """
+    extension = os.path.splitext(path)[1].lower()
+    encoding = STREAM_EXTENSIONS.get(extension)
+    if encoding is None:
+        extensions = ", ".join(STREAM_EXTENSIONS)
+        raise NoteStreamError(f"Note stream must end with one of: {extensions}")
+    if encoding == "msgpack" and msgpack is None:
+        raise NoteStreamError(
+            "MessagePack streams require the msgpack package (pip install msgpack)"
+        )
+    return encoding
+
+
+def is_note_stream(path: str) -> bool:
+    """
+    Check whether a path names a note stream by its extension.
+
+    Args:
+        path: File path
+
+    Returns:
+        True for .jsonl and .msgpack files
+    """
+    return os.path.splitext(path)[1].lower() in STREAM_EXTENSIONS
+
+
+def _header(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"format": STREAM_FORMAT, "version": STREAM_VERSION, "metadata": metadata}
+
+
+def write_note_stream(
+    path: str,
+    notes: Iterable[Dict[str, str]],
+    metadata: Optional[Dict[str, Any]] = None,
+) -> int:
+    """
+    Write metadata and notes to a note stream.
+
+    Args:
+        path: Output path (.jsonl or .msgpack)
+        notes: Note dictionaries with "title" and "note"
+        metadata: Optional metadata dictionary
+
+    Returns:
+        Number of notes written
+
+    Raises:
+        NoteStreamError: If the encoding is unsupported
+    """
+    encoding = stream_encoding(path)
+    count = 0
+    if encoding == "msgpack":
+        packer = msgpack.Packer(use_bin_type=True)
+        with open(path, "wb") as f:
+            f.write(packer.pack(_header(metadata)))
+            for note in notes:
+                f.write(packer.pack({"title": note["title"], "note": note["note"]}))
+                count += 1
+        return count
+
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        dump = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        f.write(dump(_header(metadata)) + "\n")
+        for note in notes:
+            f.write(dump({"title": note["title"], "note": note["note"]}) + "\n")
+            count += 1
+    return count
+
+
+class NoteStreamReader:
+    """
+    Lazy reader of a note stream.
+
+    The header is read on opening and exposed as ``metadata``; iterating
+    the reader decodes the notes one record at a time. ``count`` holds the
+    number of notes read so far.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.count = 0
+        self._encoding = stream_encoding(path)
+        self._file: IO[Any]
+        if self._encoding == "msgpack":
+            self._file = open(path, "rb")
+            self._records: Iterator[Any] = iter(msgpack.Unpacker(self._file, raw=False))
+        else:
+            self._file = open(path, "r", encoding="utf-8")
+            self._records = self._json_records()
+
+        try:
+            header = next(self._records, None)
+        except ValueError as e:
+            self.close()
+            raise NoteStreamError(f"{path}: invalid header: {e}") from e
+        if not isinstance(header, dict) or header.get("format") != STREAM_FORMAT:
+            self.close()
+            raise NoteStreamError(f"{path}: not a note stream")
+        if header.get("version") != STREAM_VERSION:
+            self.close()
+            raise NoteStreamError(
+                f"{path}: unsupported note stream version {header.get('version')}"
+            )
+        self.metadata: Optional[Dict[str, Any]] = header.get("metadata")
+
+    def _json_records(self) -> Iterator[Any]:
+        for line in self._file:
+            if line.strip():
+                yield json.loads(line)
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        try:
+            for record in self._records:
+                if not isinstance(record, dict) or "note" not in record:
+                    raise NoteStreamError(f"{self.path}: invalid note record")
+                self.count += 1
+                yield {"title": record.get("title", "Untitled Note"), "note": record["note"]}
+        except ValueError as e:
+            if isinstance(e, NoteStreamError):
+                raise
+            raise NoteStreamError(f"{self.path}: invalid note record: {e}") from e
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        self._file.close()
+
+    def __enter__(self) -> "NoteStreamReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def open_note_stream(path: str) -> NoteStreamReader:
+    """
+    Open a note stream for lazy reading.
+
+    Args:
+        path: Path of the note stream
+
+    Returns:
+        The reader, usable as a context manager
+
+    Raises:
+        NoteStreamError: If the file is not a readable note stream
+    """
+    return NoteStreamReader(path)
@@ -0,0 +1,3 @@
+"""
+Exporters writing formatted NotebookLM notes to output files.
+"""
@@ -0,0 +1,432 @@
+"""
+Streaming archive output (.zip, .tar.gz).
+
+Exports with many files (one Markdown file per note, or one file per input
+in a batch) can be written straight into an archive instead of being
+written to disk and compressed afterwards. Members are compressed as they
+are produced and the archive file is written strictly sequentially, so no
+temporary files are created and each byte is written once.
+
+Zip members are streamed without knowing their size. Tar headers carry the
+size of a member, so a tar member is collected in memory before it is
+added; notes are small, PDFs are the size of the document.
+"""
+
+import gzip
+import io
+import os
+import re
+import tarfile
+import time
+import zipfile
+from contextlib import contextmanager
+from typing import (
+    IO,
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+    cast,
+)
+
+from notebooklm_notes2md.exporters.pdf import DEFAULT_PDF_OPTIONS, PdfOptions, pdf_engine
+from notebooklm_notes2md.formatters.templates import (
+    TemplateSet,
+    document_context,
+    iter_note_markdown,
+    iter_template_markdown,
+    markdown_template_set,
+)
+from notebooklm_notes2md.utils.reproducible import format_source_date
+
+ARCHIVE_EXTENSIONS = (".zip", ".tar.gz", ".tgz")
+ARCHIVE_FORMATS = ("md", "pdf")
+
+# Characters kept in member file names derived from note titles
+_SLUG_RE = re.compile(r"[^\w]+")
+_SLUG_LENGTH = 60
+
+_ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+def archive_extension(path: str) -> Optional[str]:
+    """
+    Return the archive extension of a path.
+
+    Args:
+        path: Output path
+
+    Returns:
+        ".zip", ".tar.gz" or ".tgz", or None if the path is not an archive
+    """
+    lower = path.lower()
+    for extension in ARCHIVE_EXTENSIONS:
+        if lower.endswith(extension):
+            return extension
+    return None
+
+
+def archive_stem(path: str) -> str:
+    """
+    Return the file name of an archive without its extension.
+
+    Args:
+        path: Archive path
+
+    Returns:
+        The name, e.g. "notes" for "out/notes.tar.gz"
+    """
+    name = os.path.basename(path)
+    extension = archive_extension(name)
+    return name[:-len(extension)] if extension else os.path.splitext(name)[0]
+
+
+def note_member_name(index: int, title: str) -> str:
+    """
+    Build the member name of one note of a per-note export.
+
+    Args:
+        index: Note number, starting at 1
+        title: Note title
+
+    Returns:
+        A name such as "notes/0001-market-simulation.md"
+    """
+    slug = _SLUG_RE.sub("-", title.lower()).strip("-_")[:_SLUG_LENGTH].rstrip("-_")
+    return f"notes/{index:04d}-{slug or 'note'}.md"
+
+
+class ArchiveStats(NamedTuple):
+    """
+    Byte counts of a written archive.
+
+    Attributes:
+        members: Number of members
+        bytes_in: Uncompressed size of all members
+        bytes_out: Size of the archive file
+    """
+
+    members: int
+    bytes_in: int
+    bytes_out: int
+
+
+def format_archive_stats(stats: ArchiveStats) -> str:
+    """
+    Describe archive byte counts in one line.
+
+    Args:
+        stats: Byte counts
+
+    Returns:
+        A human-readable summary
+    """
+    ratio = stats.bytes_out / stats.bytes_in if stats.bytes_in else 1.0
+    return (
+        f"Archive: {stats.members} files, {stats.bytes_in / 1024:.1f} KiB "
+        f"compressed to {stats.bytes_out / 1024:.1f} KiB ({ratio:.0%})"
+    )
+
+
+class _CountingFile:
+    """
+    Write-only file counting the bytes written through it.
+
+    It has no ``seek``, so zipfile and tarfile write it sequentially.
+    """
+
+    def __init__(self, raw: Any) -> None:
+        self.raw = raw
+        self.count = 0
+
+    def write(self, data: bytes) -> int:
+        self.count += len(data)
+        return self.raw.write(data)
+
+    def flush(self) -> None:
+        self.raw.flush()
+
+
+class _MemberStream:
+    """
+    Write-only stream of one member, counting uncompressed bytes.
+
+    PyMuPDF asks for the position and seeks to it while saving, so ``tell``
+    and ``seek`` are supported as long as every write happens at the end.
+    """
+
+    def __init__(self, raw: Any) -> None:
+        self.raw = raw
+        self.count = 0
+        self._position = 0
+
+    def write(self, data: Union[bytes, str]) -> int:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if self._position != self.count:
+            raise io.UnsupportedOperation("archive members can only be appended to")
+        self.raw.write(data)
+        self.count += len(data)
+        self._position = self.count
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: self.count}[whence]
+        self._position = base + offset
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+
+class ArchiveWriter:
+    """
+    Writes members into a .zip or .tar.gz file as they are produced.
+
+    Use as a context manager; members are added with ``open`` (a stream)
+    or ``write`` (a whole text or byte string).
+    """
+
+    def __init__(self, path: str, mtime: Optional[float] = None) -> None:
+        """
+        Create the archive file.
+
+        Args:
+            path: Output path ending in .zip, .tar.gz or .tgz
+            mtime: Modification time recorded for every member; now by
+                default
+
+        Raises:
+            ValueError: If the path has no archive extension
+            OSError: If the file cannot be created
+        """
+        extension = archive_extension(path)
+        if extension is None:
+            raise ValueError(f"Not an archive path: {path}")
+        self.path = path
+        self.mtime = time.time() if mtime is None else mtime
+        self.members = 0
+        self.bytes_in = 0
+        self._raw = open(path, "wb")
+        self._file = _CountingFile(self._raw)
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tar: Optional[tarfile.TarFile] = None
+        self._gzip: Optional[gzip.GzipFile] = None
+        if extension == ".zip":
+            # zipfile only writes and flushes the counting file
+            self._zip = zipfile.ZipFile(cast(IO[bytes], self._file), "w", zipfile.ZIP_DEFLATED)
+        else:
+            # Compressed here rather than by tarfile ("w|gz"), which stamps
+            # the current time into the gzip header
+            self._gzip = gzip.GzipFile(
+                filename="", mode="wb", fileobj=self._file, mtime=int(self.mtime)
+            )
+            self._tar = tarfile.open(fileobj=self._gzip, mode="w|")
+
+    @contextmanager
+    def open(self, name: str, large: bool = False) -> Iterator[_MemberStream]:
+        """
+        Open a member for writing.
+
+        Args:
+            name: Member name, with "/" separating directories
+            large: The member may exceed 2 GiB, so zip64 fields are
+                written for it
+
+        Yields:
+            A stream accepting bytes or text (encoded as UTF-8)
+        """
+        if self._zip is not None:
+            # Zip timestamps have no time zone and start in 1980
+            date_time = max(time.gmtime(self.mtime)[:6], _ZIP_EPOCH)
+            zip_info = zipfile.ZipInfo(name, date_time)
+            zip_info.compress_type = zipfile.ZIP_DEFLATED
+            zip_info.external_attr = 0o644 << 16
+            with self._zip.open(zip_info, "w", force_zip64=large) as raw:
+                stream = _MemberStream(raw)
+                yield stream
+        else:
+            assert self._tar is not None
+            buffer = io.BytesIO()
+            stream = _MemberStream(buffer)
+            yield stream
+            tar_info = tarfile.TarInfo(name)
+            tar_info.size = stream.count
+            tar_info.mtime = int(self.mtime)
+            tar_info.mode = 0o644
+            buffer.seek(0)
+            self._tar.addfile(tar_info, buffer)
+        self.members += 1
+        self.bytes_in += stream.count
+
+    def write(self, name: str, data: Union[bytes, str]) -> None:
+        """
+        Add a member from a string.
+
+        Args:
+            name: Member name
+            data: Member content; text is encoded as UTF-8
+        """
+        with self.open(name) as stream:
+            stream.write(data)
+
+    def close(self) -> ArchiveStats:
+        """
+        Finish the archive and close the file.
+
+        Returns:
+            The byte counts of the archive
+        """
+        if self._raw.closed:
+            return self.stats()
+        try:
+            if self._zip is not None:
+                self._zip.close()
+            else:
+                assert self._tar is not None and self._gzip is not None
+                self._tar.close()
+                self._gzip.close()
+        finally:
+            self._raw.close()
+        return self.stats()
+
+    def stats(self) -> ArchiveStats:
+        """Return the byte counts of the members written so far."""
+        return ArchiveStats(self.members, self.bytes_in, self._file.count)
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def write_markdown_member(
+    archive: ArchiveWriter,
+    name: str,
+    notes: Iterable[Dict[str, str]],
+    format_type: str = "standard",
+    metadata: Optional[Dict[str, Any]] = None,
+    templates: Optional[TemplateSet] = None,
+    date: Optional[str] = None
+) -> None:
+    """
+    Write a whole Markdown document as one member, part by part.
+
+    Args:
+        archive: Open archive
+        name: Member name
+        notes: Note dictionaries, consumed lazily
+        format_type: Format type ("standard" or "obsidian")
+        metadata: Optional metadata dictionary
+        templates: Optional compiled templates replacing the formatter
+        date: Export date; today by default
+    """
+    templates = markdown_template_set(format_type, metadata, templates)
+    with archive.open(name) as stream:
+        for part in iter_template_markdown(notes, metadata, templates, date):
+            stream.write(part)
+
+
+def write_pdf_member(
+    archive: ArchiveWriter,
+    name: str,
+    notes: Iterable[Dict[str, Any]],
+    options: PdfOptions = DEFAULT_PDF_OPTIONS
+) -> int:
+    """
+    Render notes to a PDF member in a single pass.
+
+    Chunking, the section cache and worker processes need a PDF file on
+    disk to append to, so they are not used here.
+
+    Args:
+        archive: Open archive
+        name: Member name
+        notes: Note dictionaries
+        options: PDF options; the engine, paper size, outline depth and
+            optimisation apply
+
+    Returns:
+        The page count
+    """
+    texts, render = pdf_engine(notes, options)
+    with archive.open(name, large=True) as stream:
+        # The stream supports the tell/seek/write calls PyMuPDF makes
+        pages, _ = render(texts, cast(BinaryIO, stream), options)
+    return pages
+
+
+def export_archive(
+    notes: Iterable[Dict[str, Any]],
+    output_path: str,
+    format_type: str = "standard",
+    metadata: Optional[Dict[str, Any]] = None,
+    templates: Optional[TemplateSet] = None,
+    pdf_options: PdfOptions = DEFAULT_PDF_OPTIONS,
+    formats: Sequence[str] = ("md",),
+    mtime: Optional[float] = None
+) -> ArchiveStats:
+    """
+    Export notes into an archive, one Markdown file per note.
+
+    With "md", each note becomes ``<stem>/notes/NNNN-title.md`` and
+    ``<stem>/index.md`` holds the frontmatter, the summary, the title and
+    links to the notes. With "pdf", the whole document is added as
+    ``<stem>/<stem>.pdf``.
+
+    Args:
+        notes: Note dictionaries; consumed once unless both formats are
+            written
+        output_path: Path ending in .zip, .tar.gz or .tgz
+        format_type: Format type for Markdown output
+        metadata: Optional metadata dictionary
+        templates: Optional compiled templates for Markdown output
+        pdf_options: Options for the PDF member
+        formats: Formats to include ("md", "pdf")
+        mtime: Modification time of the members, also the export date
+            in the index; now by default
+
+    Returns:
+        The byte counts of the archive
+
+    Raises:
+        ValueError: If a format is unknown or the path is not an archive
+        OSError: If the archive cannot be written
+    """
+    unknown = [fmt for fmt in formats if fmt not in ARCHIVE_FORMATS]
+    if unknown or not formats:
+        raise ValueError(f"Archive formats must be among {', '.join(ARCHIVE_FORMATS)}")
+    if len(formats) > 1:
+        notes = list(notes)
+    stem = archive_stem(output_path)
+
+    with ArchiveWriter(output_path, mtime) as archive:
+        if "md" in formats:
+            templates = markdown_template_set(format_type, metadata, templates)
+            context = document_context(metadata, format_source_date(mtime))
+            links: List[str] = []
+            for text in iter_note_markdown(notes, context, templates):
+                # The note being rendered is in the context
+                note = context["note"]
+                member = note_member_name(note["index"], note["title"])
+                archive.write(f"{stem}/{member}", text)
+                links.append(f"- [{note['title']}]({member})\n")
+            with archive.open(f"{stem}/index.md") as stream:
+                stream.write(templates.frontmatter(context))
+                if context["summary"]:
+                    stream.write(templates.callout(context))
+                stream.write(templates.heading(context))
+                stream.write("".join(links))
+        if "pdf" in formats:
+            write_pdf_member(archive, f"{stem}/{stem}.pdf", notes, pdf_options)
+    return archive.stats()
@@ -0,0 +1,296 @@
+"""
+Chunked JSONL export for retrieval pipelines.
+
+Each note is cleaned like the Markdown output and split into chunks that
+fit a token budget. The parser already separates headings and paragraphs
+(see ``process_div_prefix``) with blank lines, so the cleaned text is cut
+at those boundaries and consecutive blocks are packed until the budget is
+reached. A heading always starts a new chunk. A block larger than the
+budget is split at sentence ends, and a sentence larger than the budget
+at spaces.
+
+Reference markers are kept through cleaning so that every chunk carries
+the source ids cited in its own text; they are removed from the chunk
+text afterwards.
+
+Tokens are estimated from the text length by default, which costs a
+``len`` per block; an exact tokenizer can be plugged in through
+``ChunkOptions.count_tokens``. Notes are consumed lazily and records are
+encoded and written in batches, so a note stream of any size is chunked
+in constant memory.
+"""
+
+import json
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from notebooklm_notes2md.core.progress import ProgressHooks, track_notes
+from notebooklm_notes2md.formatters.citations import expand_marker
+from notebooklm_notes2md.utils.text_processing import clean_text, split_references
+
+# Characters per token of English text, as a tokenizer-free estimate
+CHARS_PER_TOKEN = 4
+
+# Records encoded before each write
+WRITE_BATCH = 1024
+
+# Whitespace after a sentence end or after the reference marker following
+# it, unless another marker follows
+_SENTENCE_END = re.compile(r"(?<=[.!?\]])\s+(?!\[\s*\d)")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens of a text from its length.
+
+    Args:
+        text: Any text
+
+    Returns:
+        The length divided by ``CHARS_PER_TOKEN``, rounded up
+    """
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+class ChunkOptions(NamedTuple):
+    """
+    Options controlling chunked output.
+
+    Attributes:
+        max_tokens: Token budget of a chunk; only a single word longer than
+            the budget exceeds it
+        count_tokens: Counts the tokens of a text; ``estimate_tokens`` by
+            default
+    """
+
+    max_tokens: int = 512
+    count_tokens: Callable[[str], int] = estimate_tokens
+
+
+DEFAULT_CHUNK_OPTIONS = ChunkOptions()
+
+
+class NoteChunk(NamedTuple):
+    """
+    One chunk of a note.
+
+    Attributes:
+        text: Chunk text without reference markers
+        heading: The heading of the section the chunk starts in, or None
+        citations: Source ids cited in the chunk, ascending
+        tokens: Token count of the chunk blocks
+    """
+
+    text: str
+    heading: Optional[str]
+    citations: Tuple[int, ...]
+    tokens: int
+
+
+# A piece of a note: its text without markers, its source ids, whether it
+# starts a paragraph, and its tokens
+_Piece = Tuple[str, Tuple[int, ...], bool, int]
+
+
+def _strip_markers(text: str) -> Tuple[str, Tuple[int, ...]]:
+    if "[" not in text:
+        return text, ()
+    parts = split_references(text)
+    if len(parts) == 1:
+        return text, ()
+    ids: Set[int] = set()
+    for marker in parts[1::2]:
+        ids.update(expand_marker(marker))
+    # A marker takes the spaces before it along
+    texts = [part.rstrip(" \t") for part in parts[:-1:2]]
+    texts.append(parts[-1])
+    return "".join(texts), tuple(ids)
+
+
+def _split_words(sentence: str, options: ChunkOptions) -> Iterator[Tuple[str, int]]:
+    count = options.count_tokens
+    words: List[str] = []
+    tokens = 0
+    for word in sentence.split():
+        word_tokens = count(word)
+        if words and tokens + word_tokens > options.max_tokens:
+            yield " ".join(words), tokens
+            words, tokens = [], 0
+        words.append(word)
+        tokens += word_tokens
+    if words:
+        yield " ".join(words), tokens
+
+
+def _pieces(block: str, options: ChunkOptions) -> Iterator[_Piece]:
+    text, ids = _strip_markers(block)
+    tokens = options.count_tokens(text)
+    if tokens <= options.max_tokens:
+        yield text, ids, True, tokens
+        return
+    # Split the block with its markers, so each sentence keeps its sources
+    first = True
+    for sentence in _SENTENCE_END.split(block):
+        text, ids = _strip_markers(sentence)
+        tokens = options.count_tokens(text)
+        if tokens <= options.max_tokens:
+            yield text, ids, first, tokens
+        else:
+            for words, word_tokens in _split_words(text, options):
+                yield words, ids, first, word_tokens
+                first = False
+        first = False
+
+
+def chunk_note(text: str, options: ChunkOptions = DEFAULT_CHUNK_OPTIONS) -> List[NoteChunk]:
+    """
+    Clean a note and split it into chunks.
+
+    Args:
+        text: Raw note text
+        options: Chunk options
+
+    Returns:
+        The chunks in note order; none for an empty note
+    """
+    # Markers are kept so that each chunk can read its own
+    cleaned = clean_text(text, "".join)
+    budget = options.max_tokens
+
+    chunks: List[NoteChunk] = []
+    parts: List[str] = []
+    ids: Set[int] = set()
+    tokens = 0
+    heading: Optional[str] = None
+    chunk_heading: Optional[str] = None
+
+    def flush() -> None:
+        chunks.append(NoteChunk("".join(parts), chunk_heading, tuple(sorted(ids)), tokens))
+        parts.clear()
+        ids.clear()
+
+    for block in cleaned.split("\n\n"):
+        block = block.strip()
+        if not block:
+            continue
+        if block.startswith("#"):
+            if parts:
+                flush()
+                tokens = 0
+            heading = _strip_markers(block.lstrip("#"))[0].strip()
+        for piece, piece_ids, starts_block, piece_tokens in _pieces(block, options):
+            if parts and tokens + piece_tokens > budget:
+                flush()
+                tokens = 0
+            if not parts:
+                chunk_heading = heading
+            elif starts_block:
+                parts.append("\n\n")
+            else:
+                parts.append(" ")
+            parts.append(piece)
+            ids.update(piece_ids)
+            tokens += piece_tokens
+    if parts:
+        flush()
+    return chunks
+
+
+def iter_chunk_records(
+    notes: Iterable[Dict[str, str]],
+    metadata: Optional[Dict[str, Any]] = None,
+    options: ChunkOptions = DEFAULT_CHUNK_OPTIONS
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the chunk records of notes, consuming the notes lazily.
+
+    Args:
+        notes: Note dictionaries, oldest first
+        metadata: Optional metadata, for the document title and tags
+        options: Chunk options
+
+    Yields:
+        One dictionary per chunk: its id ("<note>-<chunk>"), the document
+        title and tags, the note number (from 1), note title and section
+        heading, the chunk number within the note (from 0), the cited
+        source ids, the token count and the text
+    """
+    metadata = metadata or {}
+    document = metadata.get("title")
+    tags = list(metadata.get("tags") or [])
+    for number, note in enumerate(notes, 1):
+        for index, chunk in enumerate(chunk_note(note["note"], options)):
+            yield {
+                "id": f"{number}-{index}",
+                "document": document,
+                "tags": tags,
+                "note": number,
+                "title": note["title"],
+                "heading": chunk.heading,
+                "chunk": index,
+                "citations": list(chunk.citations),
+                "tokens": chunk.tokens,
+                "text": chunk.text,
+            }
+
+
+def write_chunks(
+    path: str,
+    notes: Iterable[Dict[str, str]],
+    metadata: Optional[Dict[str, Any]] = None,
+    options: ChunkOptions = DEFAULT_CHUNK_OPTIONS,
+    hooks: Optional[ProgressHooks] = None
+) -> int:
+    """
+    Write the chunks of notes as JSON Lines, one chunk per line.
+
+    Args:
+        path: Output path
+        notes: Note dictionaries, oldest first, consumed once
+        metadata: Optional metadata, for the document title and tags
+        options: Chunk options
+        hooks: Optional progress hooks, told about each chunked note (stage
+            "chunk") and each written batch
+
+    Returns:
+        Number of chunks written
+
+    Raises:
+        ValueError: If the token budget is not positive
+        ConversionCancelled: If the hooks were cancelled
+    """
+    if options.max_tokens < 1:
+        raise ValueError("The chunk token budget must be at least 1")
+    dump = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    records = iter_chunk_records(track_notes(notes, hooks, "chunk"), metadata, options)
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        batch: List[str] = []
+        for record in records:
+            batch.append(dump(record))
+            if len(batch) == WRITE_BATCH:
+                count += _write_batch(f, batch, hooks)
+                batch = []
+        if batch:
+            count += _write_batch(f, batch, hooks)
+    return count
+
+
+def _write_batch(f: Any, batch: List[str], hooks: Optional[ProgressHooks]) -> int:
+    batch.append("")
+    data = "\n".join(batch)
+    f.write(data)
+    if hooks is not None:
+        hooks.bytes_written(len(data.encode("utf-8")))
+    return len(batch) - 1
@@ -0,0 +1,307 @@
+"""
+Merge many NotebookLM exports into one Markdown or PDF document.
+
+Inputs are parsed in worker processes, each into a note stream in a
+temporary directory; only the metadata and note titles come back to the
+parent. The contents (every notebook with its note titles) are written
+first, then the notebooks are read back from their streams one at a time,
+in input order. Parsing holds one notebook per worker and rendering holds
+at most one notebook, so memory follows the largest notebook rather than
+the combined size.
+
+The merged document has a heading per notebook, so the PDF outline and
+the Markdown contents cover every notebook and its notes.
+"""
+
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from bs4 import BeautifulSoup
+
+from notebooklm_notes2md.core.parser import parse_notes
+from notebooklm_notes2md.core.stream import open_note_stream, write_note_stream
+from notebooklm_notes2md.exporters.pdf import (
+    DEFAULT_PDF_OPTIONS,
+    PdfOptions,
+    pdf_engine,
+    render_pdf_parts,
+)
+from notebooklm_notes2md.extractors.metadata import extract_metadata
+from notebooklm_notes2md.extractors.schema import MetadataSchema
+from notebooklm_notes2md.formatters.templates import (
+    TemplateSet,
+    document_context,
+    iter_note_markdown,
+    markdown_template_set,
+)
+
+DEFAULT_MERGE_TITLE = "Merged Notebooks"
+
+# Characters dropped from heading anchors, as GitHub does
+_ANCHOR_DROP_RE = re.compile(r"[^\w\- ]")
+
+
+class Notebook(NamedTuple):
+    """
+    One parsed input of a merge.
+
+    Attributes:
+        input_path: Path of the NotebookLM export
+        stream_path: Note stream holding its notes
+        metadata: Output of ``extract_metadata``
+        titles: Note titles, oldest first
+    """
+
+    input_path: str
+    stream_path: str
+    metadata: Dict[str, Any]
+    titles: List[str]
+
+
+def _parse_notebook(
+    input_path: str,
+    stream_path: str,
+    schema: Optional[MetadataSchema]
+) -> Tuple[Dict[str, Any], List[str]]:
+    # Runs in a worker: only the metadata and titles go back to the parent
+    with open(input_path, "r", encoding="utf-8") as f:
+        soup = BeautifulSoup(f.read(), "html.parser")
+    metadata = extract_metadata(soup, schema)
+    notes = parse_notes(soup)
+    write_note_stream(stream_path, notes, metadata)
+    return metadata, [note["title"] for note in notes]
+
+
+def parse_notebooks(
+    input_paths: Sequence[str],
+    stream_dir: str,
+    schema: Optional[MetadataSchema] = None,
+    workers: int = 1
+) -> List[Notebook]:
+    """
+    Parse exports into note streams, in parallel when ``workers`` > 1.
+
+    Args:
+        input_paths: Paths of the NotebookLM exports
+        stream_dir: Directory receiving one note stream per input
+        schema: Optional metadata schema
+        workers: Number of worker processes
+
+    Returns:
+        The parsed notebooks, in input order
+
+    Raises:
+        OSError: If an input cannot be read or a stream written
+    """
+    stream_paths = [
+        os.path.join(stream_dir, f"{index:05d}.jsonl") for index in range(len(input_paths))
+    ]
+    schemas = [schema] * len(input_paths)
+    workers = min(workers, len(input_paths))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_parse_notebook, input_paths, stream_paths, schemas))
+    else:
+        results = list(map(_parse_notebook, input_paths, stream_paths, schemas))
+    return [
+        Notebook(input_path, stream_path, metadata, titles)
+        for input_path, stream_path, (metadata, titles) in zip(input_paths, stream_paths, results)
+    ]
+
+
+def merged_metadata(
+    notebooks: Sequence[Notebook],
+    title: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Build the metadata of the merged document.
+
+    Args:
+        notebooks: Parsed notebooks
+        title: Title of the merged document
+
+    Returns:
+        Metadata with the title and the tags of all notebooks, each once
+    """
+    tags = dict.fromkeys(
+        tag for notebook in notebooks for tag in notebook.metadata.get("tags") or []
+    )
+    return {"title": title or DEFAULT_MERGE_TITLE, "tags": list(tags), "date": None}
+
+
+def heading_anchor(text: str, seen: Dict[str, int]) -> str:
+    """
+    Return the link anchor of a Markdown heading.
+
+    Args:
+        text: Heading text
+        seen: Anchors used so far in the document, updated in place
+
+    Returns:
+        The anchor, with a numeric suffix when it repeats
+    """
+    anchor = _ANCHOR_DROP_RE.sub("", text.strip().lower()).replace(" ", "-")
+    count = seen.get(anchor, 0)
+    seen[anchor] = count + 1
+    return f"{anchor}-{count}" if count else anchor
+
+
+def contents_markdown(
+    notebooks: Sequence[Notebook],
+    title: str,
+    links: bool = True
+) -> str:
+    """
+    Render the contents of a merged document.
+
+    Args:
+        notebooks: Parsed notebooks
+        title: Title of the merged document, whose heading comes first
+        links: Link notebook entries to their headings
+
+    Returns:
+        A "Contents" section listing each notebook and its note titles
+    """
+    seen: Dict[str, int] = {}
+    heading_anchor(title, seen)
+    heading_anchor("Contents", seen)
+    lines = ["## Contents", ""]
+    for notebook in notebooks:
+        name = notebook.metadata.get("title") or "Untitled Document"
+        count = len(notebook.titles)
+        entry = f"[{name}](#{heading_anchor(name, seen)})" if links else name
+        lines.append(f"- {entry} ({count} note{'s' if count != 1 else ''})")
+        lines.extend(f"  - {note_title}" for note_title in notebook.titles)
+    return "\n".join(lines) + "\n\n"
+
+
+def iter_merged_markdown(
+    notebooks: Sequence[Notebook],
+    format_type: str = "standard",
+    title: Optional[str] = None,
+    templates: Optional[TemplateSet] = None
+) -> Iterator[str]:
+    """
+    Render a merged Markdown document piece by piece.
+
+    The document starts with the frontmatter and heading of the merged
+    metadata and the contents; each notebook follows with its heading,
+    summary callout and notes, read lazily from its stream.
+
+    Args:
+        notebooks: Parsed notebooks
+        format_type: Format type ("standard" or "obsidian")
+        title: Title of the merged document
+        templates: Optional compiled templates replacing the formatter
+
+    Yields:
+        Consecutive parts of the Markdown document
+    """
+    metadata = merged_metadata(notebooks, title)
+    templates = markdown_template_set(format_type, metadata, templates)
+    context = document_context(metadata)
+    yield templates.frontmatter(context)
+    yield templates.heading(context)
+    yield contents_markdown(notebooks, metadata["title"])
+
+    for notebook in notebooks:
+        context = document_context(notebook.metadata, context["date"])
+        yield templates.heading(context)
+        if context["summary"]:
+            yield templates.callout(context)
+        with open_note_stream(notebook.stream_path) as reader:
+            yield from iter_note_markdown(reader, context, templates)
+
+
+def _notebook_notes(
+    notebook: Notebook,
+    reader: Iterable[Dict[str, str]]
+) -> Iterator[Dict[str, str]]:
+    # The notebook heading is a note of its own, so both PDF engines draw it
+    name = notebook.metadata.get("title") or "Untitled Document"
+    yield {"title": name, "note": f"# {name}\n"}
+    yield from reader
+
+
+def iter_merged_pdf_parts(
+    notebooks: Sequence[Notebook],
+    options: PdfOptions = DEFAULT_PDF_OPTIONS,
+    title: Optional[str] = None
+) -> Iterator[List[str]]:
+    """
+    Yield the sections of a merged PDF, one list per notebook.
+
+    The first part holds the title and the contents; each notebook part
+    holds its heading and notes and is built only when requested.
+
+    Args:
+        notebooks: Parsed notebooks
+        options: PDF options, for the engine
+        title: Title of the merged document
+
+    Yields:
+        Section texts of each part, in the engine's input format
+    """
+    title = title or DEFAULT_MERGE_TITLE
+    front = {"title": title, "note": f"# {title}\n\n" + contents_markdown(notebooks, title, False)}
+    yield list(pdf_engine([front], options)[0])
+    for notebook in notebooks:
+        with open_note_stream(notebook.stream_path) as reader:
+            yield list(pdf_engine(_notebook_notes(notebook, reader), options)[0])
+
+
+def merge_notebooks(
+    input_paths: Sequence[str],
+    output_path: str,
+    format_type: str = "standard",
+    schema: Optional[MetadataSchema] = None,
+    pdf_options: PdfOptions = DEFAULT_PDF_OPTIONS,
+    templates: Optional[TemplateSet] = None,
+    workers: int = 1,
+    title: Optional[str] = None
+) -> List[Notebook]:
+    """
+    Merge NotebookLM exports into one Markdown or PDF file.
+
+    Args:
+        input_paths: Paths of the NotebookLM exports, in document order
+        output_path: Output path ending in .md or .pdf
+        format_type: Format type for Markdown output
+        schema: Optional metadata schema
+        pdf_options: Options for PDF output; the engine, paper size and
+            optimisation apply, and the outline goes at least two levels
+            deep
+        templates: Optional compiled templates for Markdown output
+        workers: Number of processes parsing the inputs
+        title: Title of the merged document
+
+    Returns:
+        The merged notebooks
+
+    Raises:
+        ValueError: If the output path is not .md or .pdf
+        OSError: If an input cannot be read or the output written
+    """
+    is_pdf = output_path.lower().endswith(".pdf")
+    if not is_pdf and not output_path.lower().endswith(".md"):
+        raise ValueError("Merged output must end with .pdf or .md")
+
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    with tempfile.TemporaryDirectory(dir=output_dir) as stream_dir:
+        notebooks = parse_notebooks(input_paths, stream_dir, schema, workers)
+        if is_pdf:
+            # Notebooks are level 1 in the outline and their notes level 2
+            pdf_options = pdf_options._replace(toc_level=max(pdf_options.toc_level, 2))
+            # Only the renderer of the engine is needed here
+            _, render = pdf_engine((), pdf_options)
+            render_pdf_parts(
+                iter_merged_pdf_parts(notebooks, pdf_options, title),
+                output_path, pdf_options, render,
+            )
+        else:
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.writelines(iter_merged_markdown(notebooks, format_type, title, templates))
+    return notebooks
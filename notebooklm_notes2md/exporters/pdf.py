@@ -0,0 +1,557 @@
+"""
+PDF rendering for NotebookLM notes.
+
+Notes are rendered with markdown_pdf. Besides the single-pass rendering
+used by default, a chunked mode renders a fixed number of notes at a time
+to temporary PDFs and appends them to the output file, so peak memory
+depends on the chunk size rather than on the number of notes. Chunks can
+also be rendered in worker processes, which read the parsed notes from
+shared memory instead of receiving pickled copies. The direct engine (see
+``pdf_direct``) can replace markdown_pdf in every mode.
+"""
+
+import math
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+import pymupdf
+from markdown_pdf import MarkdownPdf, Section
+
+from notebooklm_notes2md.core.progress import (
+    ConversionCancelled,
+    ProgressHooks,
+    progress_stage,
+    total_notes,
+    track_notes,
+)
+from notebooklm_notes2md.core.shared_notes import SharedNoteStore
+from notebooklm_notes2md.utils.text_processing import clean_text
+
+# (level, title, page, top) entries as produced by markdown_pdf
+TocEntry = Tuple[int, str, int, float]
+
+PDF_ENGINES = ("markdown", "direct")
+
+# Keep the existing encryption when saving incrementally; read through
+# getattr because pymupdf's type stubs do not declare the constant
+PDF_ENCRYPT_KEEP = getattr(pymupdf, "PDF_ENCRYPT_KEEP", 0)
+
+
+class PdfOptions(NamedTuple):
+    """
+    Options controlling PDF output.
+
+    Attributes:
+        toc_level: Deepest heading level listed in the PDF outline
+        optimize: Compress and garbage-collect the PDF when saving
+        paper_size: Paper size name understood by PyMuPDF
+        chunk_size: Render this many notes at a time (0 renders all at once)
+        cache_dir: Directory of the rendered-section cache (None disables it)
+        cache_max_bytes: Size cap of the rendered-section cache
+        engine: "markdown" renders through markdown_pdf, "direct" lays out
+            the HTML of the notes in one Story
+        workers: Render chunks in this many worker processes
+        source_date: Creation and modification time (seconds since the
+            epoch) written into the PDF metadata; the time the renderer was
+            loaded by default
+    """
+
+    toc_level: int = 1
+    optimize: bool = True
+    paper_size: str = "A4"
+    chunk_size: int = 0
+    cache_dir: Optional[str] = None
+    cache_max_bytes: int = 256 * 1024 * 1024
+    engine: str = "markdown"
+    workers: int = 1
+    source_date: Optional[int] = None
+
+
+DEFAULT_PDF_OPTIONS = PdfOptions()
+
+# Where a renderer saves the PDF: a path or a binary stream
+PdfTarget = Union[str, BinaryIO]
+
+# Renders section texts to a PDF file: (texts, output_path, options)
+Renderer = Callable[[Iterable[str], PdfTarget, PdfOptions], Tuple[int, List[TocEntry]]]
+
+
+def pdf_metadata(options: PdfOptions = DEFAULT_PDF_OPTIONS) -> Dict[str, Any]:
+    """
+    Return the document metadata written into rendered PDFs.
+
+    Args:
+        options: PDF options, for the source date
+
+    Returns:
+        The markdown_pdf metadata, dated ``options.source_date`` when set
+    """
+    metadata = dict(MarkdownPdf.meta)
+    if options.source_date is not None:
+        date = time.strftime("D:%Y%m%d%H%M%SZ", time.gmtime(options.source_date))
+        metadata.update(creationDate=date, modDate=date)
+    return metadata
+
+
+def note_markdown(notes: Iterable[Mapping[str, str]]) -> Iterator[str]:
+    """
+    Yield the cleaned Markdown of each note.
+
+    Args:
+        notes: Note dictionaries
+
+    Yields:
+        Cleaned note text
+    """
+    for note in notes:
+        yield clean_text(note["note"])
+
+
+def render_pdf(
+    texts: Iterable[str],
+    output_path: PdfTarget,
+    options: PdfOptions = DEFAULT_PDF_OPTIONS,
+) -> Tuple[int, List[TocEntry]]:
+    """
+    Render Markdown texts into one PDF file in a single pass.
+
+    Args:
+        texts: Markdown text of each section
+        output_path: Path or binary stream to save the PDF to
+        options: PDF options
+
+    Returns:
+        The page count and the outline entries of the written file
+    """
+    pdf = MarkdownPdf(toc_level=options.toc_level, optimize=options.optimize)
+    pdf.meta = pdf_metadata(options)
+    for text in texts:
+        pdf.add_section(Section(text, paper_size=options.paper_size))
+    # Annotated as a path, but handed on to PyMuPDF, which takes streams too
+    pdf.save(cast(str, output_path))
+    return pdf.page_num, list(pdf.toc)
+
+
+def iter_chunks(texts: Iterable[str], size: int) -> Iterator[List[str]]:
+    """
+    Split texts into lists of at most ``size`` items.
+
+    Args:
+        texts: Texts to split
+        size: Maximum chunk length
+
+    Yields:
+        Consecutive chunks
+    """
+    iterator = iter(texts)
+    chunk = list(islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
+
+def save_incremental(
+    doc: pymupdf.Document,
+    output_path: str,
+    options: PdfOptions = DEFAULT_PDF_OPTIONS,
+) -> None:
+    """
+    Save the changes to an open PDF at the end of its file.
+
+    Args:
+        doc: Document opened from ``output_path``
+        output_path: The file of the document
+        options: PDF options; with a source date no random file ID is
+            added, so the bytes only depend on the content
+    """
+    doc.save(
+        output_path, incremental=True, encryption=PDF_ENCRYPT_KEEP,
+        no_new_id=options.source_date is not None,
+    )
+
+
+def append_pdf(
+    output_path: str,
+    part_path: str,
+    options: PdfOptions = DEFAULT_PDF_OPTIONS,
+) -> None:
+    """
+    Append the pages of one PDF to another with an incremental save.
+
+    Only the new objects are written, so the pages already in the output
+    file are never loaded back into memory.
+
+    Args:
+        output_path: PDF file receiving the pages
+        part_path: PDF file whose pages are appended
+        options: PDF options
+    """
+    with pymupdf.open(output_path) as doc, pymupdf.open(part_path) as part:
+        doc.insert_pdf(part)
+        save_incremental(doc, output_path, options)
+
+
+def write_toc(
+    output_path: str,
+    toc: Sequence[TocEntry],
+    options: PdfOptions = DEFAULT_PDF_OPTIONS,
+) -> None:
+    """
+    Replace the outline of a PDF file with an incremental save.
+
+    Args:
+        output_path: PDF file to update
+        toc: Outline entries with absolute page numbers
+        options: PDF options
+    """
+    with pymupdf.open(output_path) as doc:
+        doc.set_toc([list(entry) for entry in toc])
+        save_incremental(doc, output_path, options)
+
+
+def compact_pdf(output_path: str) -> None:
+    """
+    Rewrite a PDF built with incremental saves in one optimized save.
+
+    Incremental saves only add objects at the end of the file, so the
+    objects they replace are neither collected nor compressed.
+
+    Args:
+        output_path: PDF file to rewrite in place
+    """
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    fd, temp_path = tempfile.mkstemp(suffix=".pdf", dir=output_dir)
+    os.close(fd)
+    try:
+        with pymupdf.open(output_path) as doc:
+            # Garbage-collects and deflates; no random file ID is added
+            doc.ez_save(temp_path)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def _report_growth(hooks: ProgressHooks, output_path: str, written: int) -> int:
+    # Reports the bytes added to the output since it had ``written`` bytes
+    size = os.path.getsize(output_path)
+    hooks.bytes_written(size - written)
+    return size
+
+
+def read_toc(doc: pymupdf.Document, page_offset: int = 0) -> List[TocEntry]:
+    """
+    Read the outline of an open PDF as markdown_pdf-style entries.
+
+    Args:
+        doc: The open document
+        page_offset: Pages added to every entry
+
+    Returns:
+        Outline entries with shifted page numbers
+    """
+    toc: List[TocEntry] = []
+    for lvl, title, page, dest in doc.get_toc(simple=False):
+        top = dest["to"].y if isinstance(dest, dict) and "to" in dest else 0.0
+        toc.append((lvl, title, page + page_offset, top))
+    return toc
+
+
+def render_pdf_chunked(
+    texts: Iterable[str],
+    output_path: str,
+    options: PdfOptions = DEFAULT_PDF_OPTIONS,
+    render: Optional[Renderer] = None,
+    hooks: Optional[ProgressHooks] = None,
+) -> Tuple[int, List[TocEntry]]:
+    """
+    Render Markdown texts chunk by chunk into one PDF file.
+
+    Each chunk of ``options.chunk_size`` sections is rendered to a temporary
+    PDF, appended to the output and released before the next one. Every
+    chunk embeds its own font subsets, so larger chunks give smaller files.
+
+    Args:
+        texts: Markdown text of each section
+        output_path: Path to save the PDF file
+        options: PDF options; ``chunk_size`` must be positive
+        render: Function rendering one chunk (``render_pdf`` by default)
+        hooks: Optional progress hooks, told about the bytes of each chunk,
+            or of the whole file once rewritten with ``options.optimize``
+
+    Returns:
+        The page count and the outline entries of the written file
+    """
+    size = max(options.chunk_size, 1)
+    return render_pdf_parts(iter_chunks(texts, size), output_path, options, render, hooks)
+
+
+def render_pdf_parts(
+    parts: Iterable[List[str]],
+    output_path: str,
+    options: PdfOptions = DEFAULT_PDF_OPTIONS,
+    render: Optional[Renderer] = None,
+    hooks: Optional[ProgressHooks] = None,
+) -> Tuple[int, List[TocEntry]]:
+    """
+    Render groups of sections one after the other into one PDF file.
+
+    Each part is rendered to a temporary PDF, appended to the output and
+    released before the next one is drawn from ``parts``. The outline is
+    built incrementally by shifting each part's entries by the pages
+    already written, and is written once at the end. With
+    ``options.optimize`` the file is then rewritten in one optimized save,
+    which loads it once.
+
+    Args:
+        parts: Lists of section texts, consumed lazily
+        output_path: Path to save the PDF file
+        options: PDF options
+        render: Function rendering one part (``render_pdf`` by default)
+        hooks: Optional progress hooks, told about the bytes of each part,
+            or of the whole file once rewritten with ``options.optimize``
+
+    Returns:
+        The page count and the outline entries of the written file
+    """
+    render = render or render_pdf
+    toc: List[TocEntry] = []
+    pages = 0
+    written = 0
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+
+    with tempfile.TemporaryDirectory(dir=output_dir) as temp_dir:
+        part_path = os.path.join(temp_dir, "part.pdf")
+        for index, part in enumerate(parts):
+            target = output_path if index == 0 else part_path
+            part_pages, part_toc = render(part, target, options)
+            toc.extend((lvl, title, page + pages, top) for lvl, title, page, top in part_toc)
+            if index:
+                append_pdf(output_path, part_path, options)
+            pages += part_pages
+            if hooks is not None and not options.optimize:
+                written = _report_growth(hooks, output_path, written)
+
+    if pages == 0:
+        result = render([], output_path, options)
+    else:
+        if options.toc_level > 0:
+            write_toc(output_path, toc, options)
+        if options.optimize:
+            compact_pdf(output_path)
+        result = pages, toc
+    if hooks is not None:
+        _report_growth(hooks, output_path, written)
+    return result
+
+
+def pdf_engine(
+    notes: Iterable[Mapping[str, Any]],
+    options: PdfOptions = DEFAULT_PDF_OPTIONS,
+) -> Tuple[Iterator[str], Renderer]:
+    """
+    Select the section texts and the renderer of the configured engine.
+
+    Args:
+        notes: Note dictionaries
+        options: PDF options
+
+    Returns:
+        The lazily converted section texts and the function rendering them
+    """
+    if options.engine == "direct":
+        # Imported lazily: the direct engine builds on this module's options
+        from notebooklm_notes2md.exporters.pdf_direct import note_html, render_pdf_direct
+        return note_html(notes), render_pdf_direct
+    return note_markdown(notes), render_pdf
+
+
+def _render_shared_chunk(
+    store: SharedNoteStore,
+    start: int,
+    stop: int,
+    part_path: str,
+    options: PdfOptions,
+) -> Tuple[int, List[TocEntry]]:
+    # Runs in a worker process, on views of the notes in shared memory
+    try:
+        texts, render = pdf_engine(store[start:stop], options)
+        return render(texts, part_path, options)
+    finally:
+        store.close()
+
+
+def render_pdf_parallel(
+    notes: Sequence[Dict[str, Any]],
+    output_path: str,
+    options: PdfOptions = DEFAULT_PDF_OPTIONS,
+    hooks: Optional[ProgressHooks] = None,
+) -> Tuple[int, List[TocEntry]]:
+    """
+    Render chunks of notes in worker processes and merge them in order.
+
+    The notes are copied once into a ``SharedNoteStore``; each worker gets
+    the store name and a note range, so no note is pickled. Chunks are
+    appended to the output as soon as they and their predecessors are done;
+    with ``options.optimize`` the merged file is rewritten in one optimized
+    save.
+
+    Args:
+        notes: Note dictionaries
+        output_path: Path to save the PDF file
+        options: PDF options; ``workers`` processes render chunks of
+            ``chunk_size`` notes (by default one chunk per worker)
+        hooks: Optional progress hooks, told about each merged chunk; once
+            cancelled, chunks not started yet are dropped
+
+    Returns:
+        The page count and the outline entries of the written file
+    """
+    if not notes:
+        texts, render = pdf_engine([], options)
+        result = render(texts, output_path, options)
+        if hooks is not None:
+            _report_growth(hooks, output_path, 0)
+        return result
+
+    size = options.chunk_size or math.ceil(len(notes) / options.workers)
+    ranges = [(start, min(start + size, len(notes))) for start in range(0, len(notes), size)]
+    toc: List[TocEntry] = []
+    pages = 0
+    written = 0
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    # The merged file shrinks when rewritten, so its size is reported then
+    compact = options.optimize and len(ranges) > 1
+
+    with tempfile.TemporaryDirectory(dir=output_dir) as temp_dir, \
+            SharedNoteStore.create(notes) as store, \
+            ProcessPoolExecutor(max_workers=options.workers) as executor:
+        part_paths = [os.path.join(temp_dir, f"part{index}.pdf") for index in range(len(ranges))]
+        results = executor.map(
+            _render_shared_chunk,
+            [store] * len(ranges),
+            [start for start, _ in ranges],
+            [stop for _, stop in ranges],
+            part_paths,
+            [options] * len(ranges),
+        )
+        try:
+            for index, (part_pages, part_toc) in enumerate(results):
+                if index == 0:
+                    os.replace(part_paths[0], output_path)
+                else:
+                    append_pdf(output_path, part_paths[index], options)
+                    os.remove(part_paths[index])
+                toc.extend((lvl, title, page + pages, top) for lvl, title, page, top in part_toc)
+                pages += part_pages
+                if hooks is not None:
+                    if not compact:
+                        written = _report_growth(hooks, output_path, written)
+                    hooks.notes_done("render", ranges[index][1])
+        except ConversionCancelled:
+            # Leaving the executor would otherwise render every queued chunk
+            executor.shutdown(cancel_futures=True)
+            raise
+
+    if len(ranges) > 1:
+        if options.toc_level > 0:
+            write_toc(output_path, toc, options)
+        if compact:
+            compact_pdf(output_path)
+        if hooks is not None:
+            _report_growth(hooks, output_path, written)
+    return pages, toc
+
+
+def export_pdf(
+    notes: Iterable[Dict[str, Any]],
+    output_path: str,
+    options: PdfOptions = DEFAULT_PDF_OPTIONS,
+    hooks: Optional[ProgressHooks] = None,
+) -> Tuple[int, List[TocEntry]]:
+    """
+    Render notes to a PDF file, chunked when ``options.chunk_size`` is set
+    and in worker processes when ``options.workers`` is above one.
+
+    Args:
+        notes: Note dictionaries
+        output_path: Path to save the PDF file
+        options: PDF options
+        hooks: Optional progress hooks; the "render" stage counts the notes
+            converted for the renderer (the chunks merged, with workers)
+            and the bytes written
+
+    Returns:
+        The page count and the outline entries of the written file
+
+    Raises:
+        ConversionCancelled: If the hooks were cancelled; the file may then
+            hold the pages rendered so far
+    """
+    if options.workers > 1:
+        note_list = list(notes)
+        with progress_stage(hooks, "render", len(note_list)):
+            return render_pdf_parallel(note_list, output_path, options, hooks)
+    with progress_stage(hooks, "render", total_notes(notes)):
+        texts, render = pdf_engine(track_notes(notes, hooks, "render"), options)
+        if options.chunk_size > 0:
+            return render_pdf_chunked(texts, output_path, options, render, hooks)
+        result = render(texts, output_path, options)
+        if hooks is not None:
+            _report_growth(hooks, output_path, 0)
+        return result
+
+
+def append_notes_pdf(
+    notes: Iterable[Dict[str, Any]],
+    output_path: str,
+    options: PdfOptions = DEFAULT_PDF_OPTIONS,
+) -> Tuple[int, List[TocEntry]]:
+    """
+    Render notes and append them to an existing PDF file.
+
+    The existing pages are kept as they are; the new pages and outline
+    entries are added with incremental saves.
+
+    Args:
+        notes: Note dictionaries to append
+        output_path: Existing PDF file
+        options: PDF options
+
+    Returns:
+        The page count and the outline entries of the extended file
+    """
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    with pymupdf.open(output_path) as doc:
+        pages = doc.page_count
+        toc = read_toc(doc)
+
+    with tempfile.TemporaryDirectory(dir=output_dir) as temp_dir:
+        part_path = os.path.join(temp_dir, "part.pdf")
+        texts, render = pdf_engine(notes, options)
+        part_pages, part_toc = render(texts, part_path, options)
+        append_pdf(output_path, part_path, options)
+
+    toc.extend((lvl, title, page + pages, top) for lvl, title, page, top in part_toc)
+    if options.toc_level > 0 and part_toc:
+        write_toc(output_path, toc, options)
+    return pages + part_pages, toc
@@ -0,0 +1,338 @@
+"""
+Content-addressed cache of rendered PDF sections.
+
+Each note is rendered on pages of its own, so rendered output only depends
+on the cleaned Markdown and the PDF options. Standalone PDFs carry their
+own fonts, which makes one file per note more expensive to merge than to
+render, so notes are cached in small groups. Group boundaries are chosen
+from the notes' content hashes (content-defined chunking), so adding or
+editing a note only invalidates the group around it. Groups are stored on
+disk under the hash of their notes and the options, reused across exports
+and re-runs, and evicted least-recently-used first past a size cap.
+"""
+
+import hashlib
+import os
+import shutil
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import markdown_pdf
+import pymupdf
+
+from notebooklm_notes2md.exporters.pdf import (
+    DEFAULT_PDF_OPTIONS,
+    PdfOptions,
+    TocEntry,
+    read_toc,
+    render_pdf,
+    save_incremental,
+    write_toc,
+)
+
+DEFAULT_CACHE_MAX_BYTES = DEFAULT_PDF_OPTIONS.cache_max_bytes
+
+# Average number of notes per cached group when no chunk size is given
+DEFAULT_GROUP_SIZE = 32
+
+
+class CacheStats(NamedTuple):
+    """Counters of a section cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    notes_reused: int
+    notes_rendered: int
+
+
+def section_key(text: str, options: PdfOptions) -> str:
+    """
+    Compute the content key of one rendered note.
+
+    Only the options that change how a section looks are part of the key;
+    the renderer versions are included so upgrades invalidate old entries.
+
+    Args:
+        text: Cleaned Markdown of the note
+        options: PDF options
+
+    Returns:
+        Hex digest identifying the rendered note
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    settings: Tuple[Any, ...] = (
+        getattr(markdown_pdf, "__version__", ""),
+        pymupdf.VersionBind,
+        options.toc_level,
+        options.optimize,
+        options.paper_size,
+    )
+    if options.source_date is not None:
+        # The metadata dates are part of the rendered bytes
+        settings += (options.source_date,)
+    digest.update(repr(settings).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def group_key(section_keys: Sequence[str]) -> str:
+    """
+    Compute the key of a group of rendered notes.
+
+    Args:
+        section_keys: Keys of the notes in the group, in order
+
+    Returns:
+        Hex digest identifying the group
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    for key in section_keys:
+        digest.update(key.encode("ascii"))
+    return digest.hexdigest()
+
+
+def iter_groups(
+    texts: Iterable[str],
+    options: PdfOptions,
+    average_size: int = DEFAULT_GROUP_SIZE,
+) -> Iterator[Tuple[List[str], List[str]]]:
+    """
+    Split notes into content-defined groups.
+
+    A group ends after a note whose key falls on a boundary (about one note
+    in ``average_size``) or once it holds four times the average, so the
+    same run of notes is grouped the same way wherever it appears.
+
+    Args:
+        texts: Cleaned Markdown of each note
+        options: PDF options
+        average_size: Average number of notes per group
+
+    Yields:
+        The texts and section keys of each group
+    """
+    average_size = max(average_size, 1)
+    group: List[str] = []
+    keys: List[str] = []
+    for text in texts:
+        key = section_key(text, options)
+        group.append(text)
+        keys.append(key)
+        if int(key[:8], 16) % average_size == 0 or len(group) >= 4 * average_size:
+            yield group, keys
+            group, keys = [], []
+    if group:
+        yield group, keys
+
+
+class SectionCache:
+    """
+    Size-capped on-disk store of rendered PDF groups.
+
+    Recency survives restarts through file modification times, which are
+    refreshed on every hit.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.notes_reused = 0
+        self.notes_rendered = 0
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    def path(self, key: str) -> str:
+        """Return the file path of an entry."""
+        return os.path.join(self.directory, key[:2], key + ".pdf")
+
+    def _scan(self) -> None:
+        found: List[Tuple[float, str, int]] = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".pdf"):
+                    stat = entry.stat()
+                    found.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._bytes += size
+
+    def stats(self) -> CacheStats:
+        """Return the cache counters."""
+        return CacheStats(
+            self.hits, self.misses, self.evictions, len(self._entries), self._bytes,
+            self.notes_reused, self.notes_rendered,
+        )
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Return the path of a cached entry and mark it as recently used.
+
+        Args:
+            key: Entry key
+
+        Returns:
+            The file path, or None if the entry is not cached
+        """
+        if key not in self._entries:
+            return None
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            # Removed behind our back, e.g. by another process evicting it
+            self._bytes -= self._entries.pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return path
+
+    def store(self, key: str, source_path: str) -> str:
+        """
+        Move a rendered file into the cache, evicting old entries if needed.
+
+        Args:
+            key: Entry key
+            source_path: Rendered file; it is moved, not copied
+
+        Returns:
+            The file path of the new entry
+        """
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(source_path, path)
+
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)
+        size = os.path.getsize(path)
+        self._entries[key] = size
+        self._bytes += size
+        self._evict(keep=key)
+        return path
+
+    def _evict(self, keep: str) -> None:
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = next(iter(self._entries.items()))
+            if key == keep:
+                break
+            del self._entries[key]
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
+
+    def group(self, texts: Sequence[str], keys: Sequence[str], options: PdfOptions) -> str:
+        """
+        Return the rendered PDF of a group of notes, rendering it on a miss.
+
+        Args:
+            texts: Cleaned Markdown of the notes in the group
+            keys: Section keys of the notes
+            options: PDF options
+
+        Returns:
+            The file path of the rendered group
+        """
+        key = group_key(keys)
+        path = self.lookup(key)
+        if path is not None:
+            self.hits += 1
+            self.notes_reused += len(texts)
+            return path
+        self.misses += 1
+        self.notes_rendered += len(texts)
+        temp_path = os.path.join(self.directory, f".{key}.{os.getpid()}.tmp")
+        render_pdf(texts, temp_path, options)
+        return self.store(key, temp_path)
+
+
+@lru_cache(maxsize=8)
+def open_section_cache(directory: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> SectionCache:
+    """
+    Open a section cache, reusing the instance for the same settings.
+
+    Args:
+        directory: Cache directory
+        max_bytes: Size cap in bytes
+
+    Returns:
+        The section cache
+    """
+    return SectionCache(directory, max_bytes)
+
+
+def export_pdf_cached(
+    texts: Iterable[str],
+    output_path: str,
+    cache: SectionCache,
+    options: PdfOptions = DEFAULT_PDF_OPTIONS,
+) -> Tuple[int, List[TocEntry]]:
+    """
+    Assemble a PDF from cached groups, rendering only new or changed notes.
+
+    The first group is copied to the output and later groups are appended
+    with incremental saves, so memory stays bounded by one group. A positive
+    ``options.chunk_size`` sets the average group size.
+
+    Args:
+        texts: Cleaned Markdown of each note
+        output_path: Path to save the PDF file
+        cache: The section cache
+        options: PDF options
+
+    Returns:
+        The page count and the outline entries of the written file
+    """
+    average_size = options.chunk_size if options.chunk_size > 0 else DEFAULT_GROUP_SIZE
+    toc: List[TocEntry] = []
+    pages = 0
+
+    for index, (group, keys) in enumerate(iter_groups(texts, options, average_size)):
+        group_path = cache.group(group, keys, options)
+        if index == 0:
+            shutil.copyfile(group_path, output_path)
+            with pymupdf.open(output_path) as doc:
+                toc.extend(read_toc(doc, 0))
+                pages = doc.page_count
+            continue
+        with pymupdf.open(output_path) as doc, pymupdf.open(group_path) as part:
+            toc.extend(read_toc(part, pages))
+            doc.insert_pdf(part)
+            save_incremental(doc, output_path, options)
+            pages += part.page_count
+
+    if pages == 0:
+        return render_pdf([], output_path, options)
+    if options.toc_level > 0 and toc:
+        write_toc(output_path, toc, options)
+    return pages, toc
+
+
+def format_cache_stats(stats: CacheStats) -> str:
+    """
+    Describe cache counters in one line.
+
+    Args:
+        stats: Cache counters
+
+    Returns:
+        Human-readable summary
+    """
+    return (
+        f"PDF section cache: {stats.notes_reused} notes reused, "
+        f"{stats.notes_rendered} rendered ({stats.hits} hits, {stats.misses} misses, "
+        f"{stats.evictions} evictions, {stats.entries} entries, "
+        f"{stats.bytes / (1024 * 1024):.1f} MiB)"
+    )
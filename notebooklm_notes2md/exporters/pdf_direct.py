@@ -0,0 +1,122 @@
+"""
+Direct PDF engine rendering notes from HTML in a single PyMuPDF Story.
+
+The default engine turns each note into Markdown, converts it back to HTML
+with markdown-it and lays it out in a Story of its own. The direct engine
+uses the HTML built while walking the DOM (``parse_notes(with_html=True)``),
+so neither the Markdown round trip nor the ``clean_text`` fixes are needed.
+All notes go into one document styled by one stylesheet, which is parsed
+once, and every page is laid out from the same Story. Each note starts a
+new page, as with the default engine.
+
+Notes without HTML, e.g. read back from a note stream, are converted from
+their Markdown, with any HTML in the text escaped.
+"""
+
+import io
+from typing import Any, Iterable, Iterator, List, Mapping, Tuple
+
+import pymupdf
+from markdown_it import MarkdownIt
+
+from notebooklm_notes2md.exporters.pdf import (
+    DEFAULT_PDF_OPTIONS,
+    PdfOptions,
+    PdfTarget,
+    TocEntry,
+    pdf_metadata,
+)
+from notebooklm_notes2md.utils.text_processing import clean_text
+
+# Every note is a <section>; all but the first start on a new page
+NOTE_CSS = "section + section { page-break-before: always; }"
+
+# Page margins, as used by markdown_pdf sections
+PAGE_BORDERS = (36, 36, -36, -36)
+
+# Note text is never markup: raw HTML in it is escaped, not passed through
+_MARKDOWN = MarkdownIt("commonmark", {"html": False}).enable("table")
+
+
+def render_note_html(note: Mapping[str, Any]) -> str:
+    """
+    Return the HTML of one note.
+
+    Args:
+        note: Note dictionary, with an "html" key when parsed for this
+            engine
+
+    Returns:
+        HTML fragment of the note
+    """
+    html = note.get("html")
+    if html is None:
+        html = _MARKDOWN.render(clean_text(note["note"]))
+    return html
+
+
+def note_html(notes: Iterable[Mapping[str, Any]]) -> Iterator[str]:
+    """
+    Yield the HTML of each note.
+
+    Args:
+        notes: Note dictionaries, with an "html" key when parsed for this
+            engine
+
+    Yields:
+        HTML fragment of each note
+    """
+    for note in notes:
+        yield render_note_html(note)
+
+
+def render_pdf_direct(
+    htmls: Iterable[str],
+    output_path: PdfTarget,
+    options: PdfOptions = DEFAULT_PDF_OPTIONS,
+) -> Tuple[int, List[TocEntry]]:
+    """
+    Lay out HTML notes into one PDF file from a single Story.
+
+    Args:
+        htmls: HTML fragment of each note
+        output_path: Path or binary stream to save the PDF to
+        options: PDF options
+
+    Returns:
+        The page count and the outline entries of the written file
+    """
+    body = "".join(f"<section>{html}</section>" for html in htmls)
+    story = pymupdf.Story(html=body, user_css=NOTE_CSS)
+    rect = pymupdf.paper_rect(options.paper_size)
+    where = rect + PAGE_BORDERS
+
+    toc: List[TocEntry] = []
+    pages = 0
+
+    def record(position: Any) -> None:
+        # Called for every element placed on the current page
+        if position.open_close & 1 and 0 < position.heading <= options.toc_level:
+            toc.append((position.heading, position.text, pages, position.rect[1]))
+
+    buffer = io.BytesIO()
+    writer = pymupdf.DocumentWriter(buffer)
+    more = True
+    while more:
+        pages += 1
+        device = writer.begin_page(rect)
+        more, _ = story.place(where)
+        story.element_positions(record)
+        story.draw(device)
+        writer.end_page()
+    writer.close()
+
+    with pymupdf.open("pdf", buffer.getvalue()) as doc:
+        doc.set_metadata(pdf_metadata(options))
+        if options.toc_level > 0:
+            doc.set_toc([list(entry) for entry in toc])
+        if options.optimize:
+            doc.ez_save(output_path)
+        else:
+            doc.save(output_path)
+    return pages, toc
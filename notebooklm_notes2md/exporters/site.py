@@ -0,0 +1,375 @@
+"""
+Static HTML site export for large notebooks.
+
+A single Markdown or PDF file with thousands of notes makes viewers stall.
+The site export writes a small index page and splits the notes into page
+shards of a fixed size in a directory next to it (``notes.html`` and
+``notes_files/``). The index page loads the first shard at once and the
+next ones as the reader scrolls. A compact search index of the note titles
+and of the notes mentioning each key topic is built on the way and loaded
+the first time the search box is used.
+
+Shards and the search index are JavaScript files that pass their JSON
+payload to the index page, so the site also works when opened from disk,
+where browsers block ``fetch``. Notes are consumed in one pass and only the
+HTML of the current shard is kept, so memory does not grow with the note
+bodies; the search index holds the titles and the postings lists.
+"""
+
+import glob
+import html
+import json
+import os
+import re
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from notebooklm_notes2md.exporters.pdf_direct import render_note_html
+from notebooklm_notes2md.formatters.autolink import term_matcher
+from notebooklm_notes2md.utils.text_processing import clean_text
+
+SITE_ASSETS_SUFFIX = "_files"
+SEARCH_INDEX_FILE = "search.js"
+SEARCH_INDEX_VERSION = 1
+
+# Title words, matched the same way by the search script
+_TOKEN_RE = re.compile(r"\w+")
+
+_PLACEHOLDER_RE = re.compile(r"\{\{(title|summary|tags|config)\}\}")
+
+
+class SiteOptions(NamedTuple):
+    """
+    Options controlling HTML site output.
+
+    Attributes:
+        page_size: Notes per page shard
+    """
+
+    page_size: int = 100
+
+
+DEFAULT_SITE_OPTIONS = SiteOptions()
+
+
+def site_assets_dir(output_path: str) -> str:
+    """
+    Return the directory holding the shards of a site.
+
+    Args:
+        output_path: Path of the index page
+
+    Returns:
+        The index path without its extension, followed by "_files"
+    """
+    return os.path.splitext(output_path)[0] + SITE_ASSETS_SUFFIX
+
+
+def page_file_name(page: int) -> str:
+    """
+    Return the file name of a page shard.
+
+    Args:
+        page: Page number, starting at 1
+
+    Returns:
+        The file name, e.g. "page-0001.js"
+    """
+    return f"page-{page:04d}.js"
+
+
+def _script(callback: str, payload: Any) -> str:
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return f"{callback}({data});\n"
+
+
+class SearchIndexBuilder:
+    """
+    Builds the search index one note at a time.
+
+    The index maps each lower-case title word, and each key topic, to the
+    ascending numbers of the notes that contain it. Topics are found in the
+    cleaned note text with the cached Aho-Corasick automaton of the topic
+    links.
+    """
+
+    def __init__(self, tags: Sequence[str] = ()) -> None:
+        self.titles: List[str] = []
+        self.terms: Dict[str, List[int]] = {}
+        self.tags = tuple(tags)
+        self.tag_notes: List[List[int]] = [[] for _ in self.tags]
+        self._matcher = term_matcher(self.tags) if self.tags else None
+
+    def add(self, title: str, text: str) -> int:
+        """
+        Add a note to the index.
+
+        Args:
+            title: Note title
+            text: Cleaned note text
+
+        Returns:
+            The number of the note
+        """
+        number = len(self.titles)
+        self.titles.append(title)
+        for word in dict.fromkeys(_TOKEN_RE.findall(title.lower())):
+            self.terms.setdefault(word, []).append(number)
+        if self._matcher is not None:
+            for index in sorted({index for _, _, index in self._matcher.find(text)}):
+                self.tag_notes[index].append(number)
+        return number
+
+    def to_dict(self, page_size: int) -> Dict[str, Any]:
+        """
+        Return the index as a JSON-serializable dictionary.
+
+        Args:
+            page_size: Notes per page shard, to locate notes
+
+        Returns:
+            The index
+        """
+        return {
+            "version": SEARCH_INDEX_VERSION,
+            "pageSize": page_size,
+            "titles": self.titles,
+            "terms": self.terms,
+            "tags": dict(zip(self.tags, self.tag_notes)),
+        }
+
+
+class _ShardWriter:
+    """Collects the HTML of the notes of one page and writes it out."""
+
+    def __init__(self, directory: str, page_size: int) -> None:
+        self.directory = directory
+        self.page_size = page_size
+        self.pages = 0
+        self._sections: List[str] = []
+
+    def add(self, number: int, title: str, body: str) -> None:
+        self._sections.append(
+            f'<section class="note" id="note-{number}" aria-label="{html.escape(title)}">'
+            f"{body}</section>"
+        )
+        if len(self._sections) >= self.page_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._sections:
+            return
+        self.pages += 1
+        path = os.path.join(self.directory, page_file_name(self.pages))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(_script("notesPage", [self.pages, self._sections]))
+        self._sections = []
+
+
+def export_site(
+    notes: Iterable[Dict[str, Any]],
+    output_path: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    options: SiteOptions = DEFAULT_SITE_OPTIONS
+) -> int:
+    """
+    Export notes as a static HTML site in one pass.
+
+    Args:
+        notes: Note dictionaries, consumed lazily; notes parsed with
+            ``with_html`` keep the HTML built from the DOM, others are
+            rendered from their Markdown with any HTML in it escaped
+        output_path: Path of the index page (.html); shards go to the
+            directory given by ``site_assets_dir``
+        metadata: Optional metadata dictionary, for the page header and
+            the topic index
+        options: Site options
+
+    Returns:
+        Number of notes written
+
+    Raises:
+        ValueError: If the page size is not positive
+        OSError: If the files cannot be written
+    """
+    if options.page_size < 1:
+        raise ValueError("The page size must be at least 1")
+    metadata = metadata or {}
+    directory = site_assets_dir(output_path)
+    os.makedirs(directory, exist_ok=True)
+    # Shards of a previous, longer export would never be loaded
+    for stale in glob.glob(os.path.join(directory, "page-*.js")):
+        os.remove(stale)
+
+    index = SearchIndexBuilder(metadata.get("tags") or ())
+    shards = _ShardWriter(directory, options.page_size)
+    for note in notes:
+        number = index.add(note["title"], clean_text(note["note"]))
+        shards.add(number, note["title"], render_note_html(note))
+    shards.flush()
+
+    with open(os.path.join(directory, SEARCH_INDEX_FILE), "w", encoding="utf-8") as f:
+        f.write(_script("notesSearchIndex", index.to_dict(options.page_size)))
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(index_page(metadata, os.path.basename(directory), shards.pages))
+    return len(index.titles)
+
+
+def index_page(metadata: Dict[str, Any], assets: str, pages: int) -> str:
+    """
+    Render the index page of a site.
+
+    Args:
+        metadata: Metadata dictionary
+        assets: Name of the shard directory, relative to the page
+        pages: Number of page shards
+
+    Returns:
+        The HTML document
+    """
+    title = html.escape(metadata.get("title") or "Notes")
+    summary = metadata.get("summary")
+    tags = "".join(
+        f'<button type="button" class="tag" data-tag="{html.escape(tag)}">'
+        f'{html.escape(tag)}</button>'
+        for tag in metadata.get("tags") or ()
+    )
+    values = {
+        "title": title,
+        "summary": f"<p>{html.escape(summary)}</p>" if summary else "",
+        "tags": tags,
+        # Escaped so that a "</script>" in a path cannot end the script
+        "config": json.dumps({"assets": assets + "/", "pages": pages}).replace("<", "\\u003c"),
+    }
+    return _PLACEHOLDER_RE.sub(lambda match: values[match.group(1)], INDEX_TEMPLATE)
+
+
+INDEX_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{{title}}</title>
+<style>
+body {
+  font-family: system-ui, sans-serif; line-height: 1.5;
+  margin: 0 auto; max-width: 48rem; padding: 0 1rem;
+}
+header { border-bottom: 1px solid #ddd; padding-bottom: 1rem; }
+.note { border-bottom: 1px solid #eee; padding: 1rem 0; }
+.tag {
+  border: 1px solid #ccc; border-radius: 1rem; background: #f6f6f6;
+  margin: 0 .25rem .25rem 0; cursor: pointer;
+}
+#search { box-sizing: border-box; width: 100%; padding: .5rem; font-size: 1rem; }
+#results li { cursor: pointer; color: #0645ad; }
+code { background: #f3f3f3; padding: 0 .2rem; }
+</style>
+</head>
+<body>
+<header>
+<h1>{{title}}</h1>
+{{summary}}
+<div id="tags">{{tags}}</div>
+<input id="search" type="search" placeholder="Search note titles" autocomplete="off">
+<ol id="results"></ol>
+</header>
+<main id="notes"></main>
+<div id="more" aria-hidden="true"></div>
+<script>
+(function () {
+  var config = {{config}};
+  var main = document.getElementById("notes");
+  var more = document.getElementById("more");
+  var loaded = 0, loading = false, waiting = [], index = null;
+
+  function load(src) {
+    var script = document.createElement("script");
+    script.src = config.assets + src;
+    document.body.appendChild(script);
+  }
+
+  function loadNext(then) {
+    if (then) waiting.push(then);
+    if (loading || loaded >= config.pages) return;
+    loading = true;
+    load("page-" + String(loaded + 1).padStart(4, "0") + ".js");
+  }
+
+  window.notesPage = function (page, sections) {
+    main.insertAdjacentHTML("beforeend", sections.join(""));
+    loaded = page;
+    loading = false;
+    var callbacks = waiting;
+    waiting = [];
+    callbacks.forEach(function (callback) { callback(); });
+  };
+
+  new IntersectionObserver(function (entries) {
+    if (entries[0].isIntersecting) loadNext();
+  }, { rootMargin: "800px" }).observe(more);
+
+  function show(number) {
+    var note = document.getElementById("note-" + number);
+    if (note) note.scrollIntoView();
+    else if (loaded < config.pages) loadNext(function () { show(number); });
+  }
+
+  var search = document.getElementById("search");
+  var results = document.getElementById("results");
+  var indexWaiting = null;
+
+  function withIndex(callback) {
+    if (index !== null) return callback();
+    if (indexWaiting === null) {
+      indexWaiting = [];
+      load("search.js");
+    }
+    indexWaiting.push(callback);
+  }
+
+  window.notesSearchIndex = function (data) {
+    index = data;
+    indexWaiting.forEach(function (callback) { callback(); });
+  };
+
+  function matches(query) {
+    var found = null;
+    (query.toLowerCase().match(/[\\p{L}\\p{N}_]+/gu) || []).forEach(function (word) {
+      var notes = {};
+      Object.keys(index.terms).forEach(function (term) {
+        if (term.indexOf(word) === 0) index.terms[term].forEach(function (n) { notes[n] = true; });
+      });
+      found = found === null ? notes : Object.keys(found).reduce(function (both, n) {
+        if (notes[n]) both[n] = true;
+        return both;
+      }, {});
+    });
+    return Object.keys(found || {}).map(Number).sort(function (a, b) { return a - b; });
+  }
+
+  function list(numbers) {
+    results.innerHTML = "";
+    numbers.slice(0, 50).forEach(function (number) {
+      var item = document.createElement("li");
+      item.textContent = index.titles[number];
+      item.onclick = function () { show(number); };
+      results.appendChild(item);
+    });
+  }
+
+  search.addEventListener("input", function () {
+    withIndex(function () { list(search.value ? matches(search.value) : []); });
+  });
+
+  Array.prototype.forEach.call(document.querySelectorAll(".tag"), function (button) {
+    button.onclick = function () {
+      withIndex(function () { list(index.tags[button.dataset.tag] || []); });
+    };
+  });
+
+  loadNext();
+})();
+</script>
+</body>
+</html>
+"""
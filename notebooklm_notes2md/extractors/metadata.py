@@ -2,12 +2,22 @@
 Metadata extractors for NotebookLM notes.
 
 This module contains functions for extracting metadata from NotebookLM HTML.
+The selectors live in the declarative schema of ``extractors.schema``.
 """
 
 from typing import Any, Dict, List, Optional
 
 from bs4 import BeautifulSoup
-from bs4.element import Tag
+
+from notebooklm_notes2md.extractors.schema import (
+    DEFAULT_METADATA_SCHEMA,
+    MetadataSchema,
+    compile_selector,
+    field_value,
+)
+
+# Keys always present in the metadata dictionary
+STANDARD_METADATA_KEYS = ("title", "tags", "date")
 
 
 def extract_document_title(soup: BeautifulSoup) -> str:
@@ -20,10 +30,10 @@ def extract_document_title(soup: BeautifulSoup) -> str:
     Returns:
         The document title or a default title if not found
     """
-    title_element = soup.select_one('.source-title')
-    if title_element and title_element.text:
-        return title_element.text.strip()
-    return "Untitled Document"
+    field = DEFAULT_METADATA_SCHEMA.field("title")
+    title_element = compile_selector(field.selector).select_one(soup)
+    title = field_value(title_element, field) if title_element else None
+    return title or "Untitled Document"
 
 
 def extract_summary(soup: BeautifulSoup) -> Optional[str]:
@@ -36,9 +46,10 @@ def extract_summary(soup: BeautifulSoup) -> Optional[str]:
     Returns:
         The document summary or None if not found
     """
-    summary_element = soup.select_one('.summary .mat-body-medium p')
-    if summary_element and summary_element.text:
-        return summary_element.text.strip()
+    field = DEFAULT_METADATA_SCHEMA.field("summary")
+    summary_element = compile_selector(field.selector).select_one(soup)
+    if summary_element:
+        return field_value(summary_element, field)
     return None
 
 
@@ -52,34 +63,43 @@ def extract_key_topics(soup: BeautifulSoup) -> List[str]:
     Returns:
         List of key topics or empty list if none found
     """
+    field = DEFAULT_METADATA_SCHEMA.field("tags")
     topics = []
-    topic_elements = soup.select('.key-topics-chip .key-topics-text p')
-
-    for topic in topic_elements:
-        if topic.text.strip():
-            topics.append(topic.text.strip())
+    for topic in compile_selector(field.selector).select(soup):
+        value = field_value(topic, field)
+        if value is not None:
+            topics.append(value)
 
     return topics
 
 
-def extract_metadata(soup: BeautifulSoup) -> Dict[str, Any]:
+def extract_metadata(
+    soup: BeautifulSoup,
+    schema: Optional[MetadataSchema] = None
+) -> Dict[str, Any]:
     """
     Extract all available metadata from the NotebookLM HTML.
 
+    All fields of the schema are extracted in one pass over the tree.
+
     Args:
         soup: BeautifulSoup object containing the parsed HTML
+        schema: Optional schema; defaults to title, summary and key topics
 
     Returns:
-        Dictionary containing all extracted metadata
+        Dictionary containing all extracted metadata. Title, tags and date
+        are always present; other fields only when found.
     """
-    metadata = {
-        "title": extract_document_title(soup),
-        "tags": extract_key_topics(soup),
+    values = (schema or DEFAULT_METADATA_SCHEMA).extract(soup)
+
+    metadata: Dict[str, Any] = {
+        "title": values.pop("title", None) or "Untitled Document",
+        "tags": values.pop("tags", None) or [],
         "date": None,  # Will be filled in by the formatter
     }
 
-    summary = extract_summary(soup)
-    if summary:
-        metadata["summary"] = summary
+    for key, value in values.items():
+        if value:
+            metadata[key] = value
 
     return metadata
@@ -0,0 +1,259 @@
+"""
+Declarative metadata schema for NotebookLM HTML.
+
+Each metadata field is described by a CSS selector, a cardinality and an
+optional post-processing step. Selectors are compiled once and cached, and
+a schema extracts all of its fields in a single walk over the tree.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+
+import soupsieve
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+# Rightmost compound selector, e.g. "p" in ".summary .mat-body-medium p"
+_LAST_COMPOUND_RE = re.compile(r"([\w\-]*)((?:\.[\w\-]+)*)\s*$")
+
+
+class MetadataField(NamedTuple):
+    """
+    Description of one metadata field.
+
+    Attributes:
+        name: Key of the field in the metadata dictionary
+        selector: CSS selector of the element(s) holding the value
+        many: Collect every match instead of the first one
+        attribute: Read this attribute instead of the element text
+        postprocess: Called on each stripped, non-empty value
+    """
+
+    name: str
+    selector: str
+    many: bool = False
+    attribute: Optional[str] = None
+    postprocess: Optional[Callable[[str], Any]] = None
+
+
+@lru_cache(maxsize=256)
+def compile_selector(selector: str) -> Any:
+    """
+    Compile a CSS selector once and reuse it afterwards.
+
+    Args:
+        selector: CSS selector string
+
+    Returns:
+        The compiled soupsieve selector
+    """
+    return soupsieve.compile(selector)
+
+
+@lru_cache(maxsize=256)
+def selector_prefilter(selector: str) -> Tuple[Optional[str], FrozenSet[str]]:
+    """
+    Derive a cheap pre-check from the rightmost part of a selector.
+
+    An element can only match if it has the tag name and all classes of
+    the selector's last compound, so the full match is skipped otherwise.
+    Selectors too complex for the pre-check return no constraints.
+
+    Args:
+        selector: CSS selector string
+
+    Returns:
+        The required tag name (or None) and the required classes
+    """
+    if "," in selector:
+        return None, frozenset()
+    match = _LAST_COMPOUND_RE.search(selector)
+    if not match or not match.group(0).strip():
+        return None, frozenset()
+    # A combinator or attribute selector right before would not be captured
+    start = match.start()
+    if start and not selector[start - 1].isspace():
+        return None, frozenset()
+    name = match.group(1) or None
+    classes = frozenset(c for c in match.group(2).split(".") if c)
+    return name, classes
+
+
+class _CompiledField:
+    """A field together with its compiled selector and pre-check."""
+
+    __slots__ = ("field", "matcher", "name", "classes")
+
+    def __init__(self, field: MetadataField) -> None:
+        self.field = field
+        self.matcher = compile_selector(field.selector)
+        self.name, self.classes = selector_prefilter(field.selector)
+
+    def accepts(self, tag: Tag, classes: FrozenSet[str]) -> bool:
+        if self.name is not None and tag.name != self.name:
+            return False
+        if not self.classes <= classes:
+            return False
+        return bool(self.matcher.match(tag))
+
+
+def field_value(tag: Tag, field: MetadataField) -> Any:
+    """
+    Read the value of a field from a matching element.
+
+    Args:
+        tag: The matching element
+        field: The field description
+
+    Returns:
+        The processed value, or None if the element holds nothing
+    """
+    if field.attribute:
+        raw = tag.get(field.attribute)
+        if isinstance(raw, (list, tuple)):
+            raw = " ".join(raw)
+        text = (raw or "").strip()
+    else:
+        text = tag.text.strip() if tag.text else ""
+    if not text:
+        return None
+    if field.postprocess:
+        return field.postprocess(text)
+    return text
+
+
+class MetadataSchema:
+    """
+    A set of metadata fields extracted together in one tree walk.
+    """
+
+    def __init__(self, fields: Sequence[MetadataField]) -> None:
+        self.fields: Tuple[MetadataField, ...] = tuple(fields)
+        self._compiled = [_CompiledField(field) for field in self.fields]
+
+    def extend(self, fields: Sequence[MetadataField]) -> "MetadataSchema":
+        """
+        Create a schema with extra fields; fields with the same name replace
+        the existing ones.
+
+        Args:
+            fields: Fields to add
+
+        Returns:
+            The new schema
+        """
+        names = {field.name for field in fields}
+        kept = [field for field in self.fields if field.name not in names]
+        return MetadataSchema(kept + list(fields))
+
+    def field(self, name: str) -> MetadataField:
+        """
+        Look up a field by name.
+
+        Args:
+            name: Name of the field
+
+        Returns:
+            The field description
+
+        Raises:
+            KeyError: If the schema has no such field
+        """
+        for field in self.fields:
+            if field.name == name:
+                return field
+        raise KeyError(name)
+
+    def extract(self, soup: BeautifulSoup) -> Dict[str, Any]:
+        """
+        Extract every field in a single pass over the tree.
+
+        Single-valued fields keep the first match in document order; the
+        walk stops early once all fields are single-valued and found.
+
+        Args:
+            soup: BeautifulSoup object containing the parsed HTML
+
+        Returns:
+            Dictionary mapping each field name to its value, a list of
+            values for multi-valued fields, or None when nothing matched
+        """
+        values: Dict[str, Any] = {}
+        pending: List[_CompiledField] = []
+        for compiled in self._compiled:
+            values[compiled.field.name] = [] if compiled.field.many else None
+            pending.append(compiled)
+
+        for tag in soup.descendants:
+            if not isinstance(tag, Tag):
+                continue
+            raw_classes = tag.get("class")
+            classes = frozenset(raw_classes) if isinstance(raw_classes, list) else frozenset()
+            finished = False
+            for compiled in pending:
+                if not compiled.accepts(tag, classes):
+                    continue
+                value = field_value(tag, compiled.field)
+                if value is None:
+                    continue
+                if compiled.field.many:
+                    values[compiled.field.name].append(value)
+                else:
+                    values[compiled.field.name] = value
+                    finished = True
+            if finished:
+                pending = [c for c in pending if c.field.many or values[c.field.name] is None]
+                if not pending:
+                    break
+
+        return values
+
+
+DEFAULT_METADATA_SCHEMA = MetadataSchema([
+    MetadataField("title", ".source-title"),
+    MetadataField("summary", ".summary .mat-body-medium p"),
+    MetadataField("tags", ".key-topics-chip .key-topics-text p", many=True),
+])
+
+
+def parse_field_spec(spec: str) -> MetadataField:
+    """
+    Parse a field given on the command line.
+
+    The format is ``NAME=SELECTOR``; ``NAME[]=SELECTOR`` collects every
+    match, and a trailing ``@ATTRIBUTE`` reads an attribute instead of text,
+    e.g. ``sources[]=a.source-link@href``.
+
+    Args:
+        spec: The field specification
+
+    Returns:
+        The field description
+
+    Raises:
+        ValueError: If the specification or its selector is malformed
+    """
+    name, sep, selector = spec.partition("=")
+    name = name.strip()
+    if not sep or not name or not selector.strip():
+        raise ValueError(f"Invalid metadata field '{spec}', expected NAME=SELECTOR")
+
+    many = name.endswith("[]")
+    if many:
+        name = name[:-2]
+
+    attribute = None
+    if "@" in selector:
+        selector, attribute = selector.rsplit("@", 1)
+        attribute = attribute.strip() or None
+
+    selector = selector.strip()
+    try:
+        # Cached, so the schema reuses the compiled selector
+        compile_selector(selector)
+    except soupsieve.SelectorSyntaxError as e:
+        reason = str(e).splitlines()[0]
+        raise ValueError(f"Invalid selector in metadata field '{spec}': {reason}") from e
+
+    return MetadataField(name, selector, many=many, attribute=attribute)
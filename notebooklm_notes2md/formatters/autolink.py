@@ -0,0 +1,293 @@
+"""
+Automatic Obsidian wikilinks for topic and note-title mentions.
+
+Mentions of the document's key topics, and optionally of the note titles
+of an Obsidian vault, are turned into ``[[wikilinks]]``. All terms are
+compiled into an Aho-Corasick automaton that finds every mention in one
+pass over the text, however many terms there are. Automata are cached by
+their term list, so a batch builds the vault automaton once.
+
+Matching ignores case and only accepts whole words. The longest mention
+starting first wins, and by default only the first mention of a term in a
+note is linked. Code spans, fenced code blocks, existing wikilinks,
+reference markers and heading lines are left untouched.
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from notebooklm_notes2md.utils.text_processing import REFERENCE_PATTERN
+
+# Regions of a note that must not be rewritten
+_PROTECTED_RE = re.compile(
+    r"```.*?```"            # fenced code blocks
+    r"|`[^`\n]*`"           # code spans, as produced by format_span_text
+    r"|\[\[.*?\]\]"         # existing wikilinks
+    rf"|{REFERENCE_PATTERN.pattern}"  # reference markers, removed or indexed later
+    r"|^[ \t]*#[^\n]*$",    # headings
+    re.DOTALL | re.MULTILINE,
+)
+
+
+class AutolinkConfig(NamedTuple):
+    """
+    What to link, as chosen on the command line.
+
+    Attributes:
+        topics: Link mentions of the document's key topics
+        vault_titles: Note titles of the target vault to link as well
+        first_only: Link only the first mention of each term per note
+    """
+
+    topics: bool = True
+    vault_titles: Tuple[str, ...] = ()
+    first_only: bool = True
+
+
+def _lower(text: str) -> str:
+    # Lower-case without changing the length, so offsets stay valid
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class TermMatcher:
+    """
+    Aho-Corasick automaton over a list of terms.
+
+    Args:
+        terms: Terms to find; the first spelling of terms that only differ
+            in case is kept as the link target
+    """
+
+    def __init__(self, terms: Iterable[str]) -> None:
+        self.terms: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (length, term index) of every term ending there
+        self._out: List[List[Tuple[int, int]]] = [[]]
+
+        seen = set()
+        for term in terms:
+            term = term.strip()
+            key = _lower(term)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            self._add(key, len(self.terms))
+            self.terms.append(term)
+        self._build_failure_links()
+
+    def _add(self, key: str, index: int) -> None:
+        state = 0
+        for char in key:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        self._out[state].append((len(key), index))
+
+    def _build_failure_links(self) -> None:
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def find(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        Find every whole-word mention of the terms in one pass.
+
+        Args:
+            text: Text to search
+
+        Returns:
+            (start, end, term index) of each mention, possibly overlapping
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        lowered = _lower(text)
+        size = len(text)
+        matches = []
+        state = 0
+        for position, char in enumerate(lowered):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not out[state]:
+                continue
+            end = position + 1
+            if end < size and _is_word_char(text[end]):
+                continue
+            for length, index in out[state]:
+                start = end - length
+                if start == 0 or not _is_word_char(text[start - 1]):
+                    matches.append((start, end, index))
+        return matches
+
+
+@lru_cache(maxsize=64)
+def term_matcher(terms: Tuple[str, ...]) -> TermMatcher:
+    """
+    Build an automaton once per term list and reuse it afterwards.
+
+    Args:
+        terms: Terms to find
+
+    Returns:
+        The cached automaton
+    """
+    return TermMatcher(terms)
+
+
+def _select(matches: List[Tuple[int, int, str]]) -> List[Tuple[int, int, str]]:
+    # Leftmost, then longest, without overlaps
+    matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+    selected = []
+    last_end = 0
+    for start, end, target in matches:
+        if start >= last_end:
+            selected.append((start, end, target))
+            last_end = end
+    return selected
+
+
+def _wikilink(target: str, mention: str) -> str:
+    if mention == target:
+        return f"[[{target}]]"
+    return f"[[{target}|{mention}]]"
+
+
+class AutoLinker:
+    """
+    Rewrites term mentions in Markdown as wikilinks.
+
+    Args:
+        matchers: Automata whose terms are linked; earlier ones win when
+            the same mention matches several
+        first_only: Link only the first mention of each term per text
+    """
+
+    def __init__(self, matchers: Sequence[TermMatcher], first_only: bool = True) -> None:
+        self.matchers = [matcher for matcher in matchers if len(matcher)]
+        self.first_only = first_only
+
+    def _find(self, text: str) -> List[Tuple[int, int, str]]:
+        found: Dict[Tuple[int, int], str] = {}
+        for matcher in self.matchers:
+            for start, end, index in matcher.find(text):
+                found.setdefault((start, end), matcher.terms[index])
+        return [(start, end, target) for (start, end), target in found.items()]
+
+    def link(self, text: str) -> str:
+        """
+        Link the mentions in a Markdown text.
+
+        Args:
+            text: Markdown text
+
+        Returns:
+            The text with mentions replaced by wikilinks
+        """
+        if not self.matchers:
+            return text
+        linked: Set[str] = set()
+        parts = []
+        position = 0
+        for protected in _PROTECTED_RE.finditer(text):
+            parts.append(self._link_segment(text[position:protected.start()], linked))
+            parts.append(protected.group(0))
+            position = protected.end()
+        parts.append(self._link_segment(text[position:], linked))
+        return "".join(parts)
+
+    def _link_segment(self, segment: str, linked: Set[str]) -> str:
+        if not segment:
+            return segment
+        result = []
+        position = 0
+        for start, end, target in _select(self._find(segment)):
+            key = target.lower()
+            if self.first_only and key in linked:
+                continue
+            linked.add(key)
+            result.append(segment[position:start])
+            result.append(_wikilink(target, segment[start:end]))
+            position = end
+        result.append(segment[position:])
+        return "".join(result)
+
+
+def build_autolinker(
+    config: AutolinkConfig,
+    metadata: Optional[Dict] = None,
+) -> AutoLinker:
+    """
+    Build the linker of one document from cached automata.
+
+    Args:
+        config: What to link
+        metadata: Metadata of the document, for its key topics
+
+    Returns:
+        The linker
+    """
+    matchers = []
+    if config.topics and metadata and metadata.get("tags"):
+        matchers.append(term_matcher(tuple(metadata["tags"])))
+    if config.vault_titles:
+        matchers.append(term_matcher(config.vault_titles))
+    return AutoLinker(matchers, config.first_only)
+
+
+def link_notes(notes: Iterable[Dict[str, str]], linker: AutoLinker) -> List[Dict[str, str]]:
+    """
+    Link the mentions in the body of each note.
+
+    Args:
+        notes: Note dictionaries
+        linker: The linker
+
+    Returns:
+        New note dictionaries with linked note text
+    """
+    return [dict(note, note=linker.link(note["note"])) for note in notes]
+
+
+def load_vault_titles(vault_dir: str) -> Tuple[str, ...]:
+    """
+    Collect the note titles of an Obsidian vault (Markdown file names).
+
+    Hidden directories such as ``.obsidian`` and ``.trash`` are skipped.
+
+    Args:
+        vault_dir: Root directory of the vault
+
+    Returns:
+        The titles, sorted for a stable cache key
+    """
+    titles = set()
+    for root, dirs, files in os.walk(vault_dir):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in files:
+            if name.lower().endswith(".md"):
+                titles.add(name[:-3])
+    return tuple(sorted(titles))
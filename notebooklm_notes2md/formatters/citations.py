@@ -0,0 +1,251 @@
+"""
+Citation index built from NotebookLM reference markers.
+
+NotebookLM marks the sources of a sentence with reference numbers such as
+``[1, 2]`` or ``[3-5]``, numbered per note. By default ``clean_text``
+removes them; a ``CitationIndex`` reads them in the same pass instead,
+through the ``references`` hook of ``clean_text``, and records for each
+note which source ids are cited and where. Positions are character
+offsets into the cleaned note as exported: where a removed marker was, or
+where its footnote references start.
+
+The text is split at the markers once per note. Markers are expanded
+(ranges) and deduplicated once and memoized, so a marker recurring across
+notes costs a dictionary lookup.
+The index can be written as Markdown footnotes, as a frontmatter field or
+as a JSON file next to the output.
+"""
+
+import json
+import os
+from functools import lru_cache
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from notebooklm_notes2md.core.progress import ProgressHooks, track_notes
+from notebooklm_notes2md.formatters.templates import (
+    TemplateSet,
+    document_context,
+    iter_note_markdown,
+)
+from notebooklm_notes2md.utils.text_processing import clean_text
+
+CITATION_STYLES = ("strip", "footnotes", "frontmatter", "sidecar")
+
+# Wider ranges are taken for typos and kept as their two ends
+MAX_CITATION_RANGE = 1000
+
+# Sources of one note: source id -> positions, both ascending
+NoteCitations = Dict[int, List[int]]
+
+
+@lru_cache(maxsize=4096)
+def expand_marker(marker: str) -> Tuple[int, ...]:
+    """
+    Return the source ids of a reference marker.
+
+    Results are memoized: the same few markers recur across notes.
+
+    Args:
+        marker: A marker such as ``"[1, 3-5]"``
+
+    Returns:
+        The ids in ascending order, each once
+    """
+    ids: Set[int] = set()
+    for item in marker.strip("[] \t\n").split(","):
+        first, _, last = item.partition("-")
+        start = int(first)
+        end = int(last) if last else start
+        if start > end:
+            start, end = end, start
+        if end - start > MAX_CITATION_RANGE:
+            ids.update((start, end))
+        else:
+            ids.update(range(start, end + 1))
+    return tuple(sorted(ids))
+
+
+def citation_sidecar_path(output_path: str) -> str:
+    """
+    Return the path of the citation index written next to an output.
+
+    Args:
+        output_path: Path of the exported Markdown file
+
+    Returns:
+        The output path with ``.citations.json`` replacing its extension
+    """
+    return os.path.splitext(output_path)[0] + ".citations.json"
+
+
+class CitationIndex:
+    """
+    Per-note index of cited source ids, filled while notes are cleaned.
+
+    Pass ``clean`` wherever ``clean_text`` cleans note bodies, once per
+    note in document order; note numbers start at ``start``.
+
+    Args:
+        footnotes: Replace the markers with footnote references and add
+            the footnote definitions at the end of each note, instead of
+            removing them
+        start: Number of the first note
+    """
+
+    def __init__(self, footnotes: bool = False, start: int = 1) -> None:
+        self.footnotes = footnotes
+        self.start = start
+        self.notes: List[NoteCitations] = []
+
+    def clean(self, text: str) -> str:
+        """
+        Clean a note body like ``clean_text``, indexing its citations.
+
+        Args:
+            text: Raw note text
+
+        Returns:
+            The cleaned text, with footnotes if requested
+        """
+        markers: List[str] = []
+        offsets: List[int] = []
+        cleaned = clean_text(
+            text, lambda parts: self._join(parts, markers, offsets), offsets
+        )
+        citations: NoteCitations = {}
+        for marker, position in zip(markers, offsets):
+            for source in expand_marker(marker):
+                positions = citations.get(source)
+                if positions is None:
+                    citations[source] = [position]
+                elif positions[-1] != position:
+                    positions.append(position)
+        self.notes.append({source: citations[source] for source in sorted(citations)})
+        return cleaned
+
+    def _join(self, parts: List[str], markers: List[str], offsets: List[int]) -> str:
+        if len(parts) == 1:
+            return parts[0]
+
+        markers.extend(parts[1::2])
+        if not self.footnotes:
+            # Each marker is at the end of the text before it
+            offsets.extend(accumulate(map(len, parts[:-1:2])))
+            return "".join(parts[::2])
+
+        number = self.start + len(self.notes)
+        references = {
+            marker: "".join(f"[^{number}-{source}]" for source in expand_marker(marker))
+            for marker in set(markers)
+        }
+        parts[1::2] = [references[marker] for marker in markers]
+        # Each footnote reference starts at the end of the text before it
+        offsets.extend(accumulate(map(len, parts[:-1])))
+        del offsets[1::2]
+        sources = sorted({source for marker in references for source in expand_marker(marker)})
+        definitions = "\n".join(
+            f"[^{number}-{source}]: Source {source}" for source in sources
+        )
+        return "".join(parts).rstrip("\n") + "\n\n" + definitions
+
+    def entries(self, titles: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        List the notes that cite sources.
+
+        Args:
+            titles: Optional note titles, in the order the notes were cleaned
+
+        Returns:
+            One dictionary per citing note with its number, its title when
+            known and its sources (source id -> positions)
+        """
+        entries = []
+        for offset, citations in enumerate(self.notes):
+            if not citations:
+                continue
+            entry: Dict[str, Any] = {"note": self.start + offset}
+            if titles is not None:
+                entry["title"] = titles[offset]
+            entry["sources"] = {str(source): positions for source, positions in citations.items()}
+            entries.append(entry)
+        return entries
+
+    def frontmatter_field(self) -> Dict[str, Any]:
+        """
+        Return the index as an extra frontmatter field.
+
+        The value is a JSON object, which YAML reads as a flow mapping:
+        note number -> source id -> positions.
+
+        Returns:
+            A field in the form of ``extra_frontmatter_fields`` entries
+        """
+        value = {
+            str(entry["note"]): entry["sources"] for entry in self.entries()
+        }
+        return {"name": "citations", "value": json.dumps(value), "entries": []}
+
+    def write_sidecar(
+        self,
+        path: str,
+        titles: Optional[Sequence[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Write the index as a JSON file.
+
+        Args:
+            path: Path of the JSON file
+            titles: Optional note titles, in the order the notes were cleaned
+            metadata: Optional metadata, for the document title
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+        document = {
+            "title": (metadata or {}).get("title"),
+            "notes": self.entries(titles),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+
+
+def format_cited_markdown(
+    notes: Iterable[Dict[str, str]],
+    metadata: Optional[Dict[str, Any]],
+    templates: TemplateSet,
+    index: CitationIndex,
+    in_frontmatter: bool = False,
+    date: Optional[str] = None,
+    hooks: Optional[ProgressHooks] = None
+) -> str:
+    """
+    Format notes as Markdown with templates, indexing their citations.
+
+    The notes are rendered before the frontmatter so that the index is
+    complete when ``in_frontmatter`` adds it as a ``citations`` field.
+
+    Args:
+        notes: Note dictionaries
+        metadata: Optional metadata dictionary
+        templates: The compiled template set
+        index: Empty citation index, filled while the notes are cleaned
+        in_frontmatter: Add the index to the frontmatter
+        date: Export date; today by default
+        hooks: Optional progress hooks, told about each formatted note
+
+    Returns:
+        The formatted Markdown as a string
+    """
+    context = document_context(metadata, date)
+    tracked = track_notes(notes, hooks, "format")
+    body = list(iter_note_markdown(tracked, context, templates, index.start, index.clean))
+    if in_frontmatter:
+        context["extra_fields"] = context["extra_fields"] + [index.frontmatter_field()]
+    head = [templates.frontmatter(context)]
+    if context["summary"]:
+        head.append(templates.callout(context))
+    head.append(templates.heading(context))
+    return "".join(head + body)
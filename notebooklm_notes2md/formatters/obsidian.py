@@ -3,18 +3,63 @@ Obsidian-compatible Markdown formatter for NotebookLM notes.
 """
 
 import datetime
+import json
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
+from notebooklm_notes2md.core.progress import ProgressHooks, track_notes
+from notebooklm_notes2md.formatters.tags import DEFAULT_TAG_NORMALIZER, TagNormalizer
 from notebooklm_notes2md.utils.text_processing import clean_text
 
+# Metadata keys rendered by dedicated code rather than as extra fields
+RESERVED_METADATA_KEYS = frozenset({"title", "tags", "date", "summary"})
 
-def format_yaml_frontmatter(metadata: Dict[str, Any]) -> str:
+
+def extra_frontmatter_fields(metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Collect user-defined metadata fields for the frontmatter.
+
+    Only strings and non-empty lists of strings are kept; values are
+    quoted as JSON strings, which YAML reads as double-quoted scalars.
+
+    Args:
+        metadata: Dictionary of metadata extracted from the document
+
+    Returns:
+        One dictionary per field with its name and either a quoted value
+        or a list of quoted entries
+    """
+    fields: List[Dict[str, Any]] = []
+    for key, value in metadata.items():
+        if key in RESERVED_METADATA_KEYS:
+            continue
+        if isinstance(value, str):
+            fields.append({
+                "name": key,
+                "value": json.dumps(value, ensure_ascii=False),
+                "entries": [],
+            })
+        elif isinstance(value, list) and value and all(isinstance(v, str) for v in value):
+            fields.append({
+                "name": key,
+                "value": None,
+                "entries": [json.dumps(v, ensure_ascii=False) for v in value],
+            })
+    return fields
+
+
+def format_yaml_frontmatter(
+    metadata: Dict[str, Any],
+    tag_normalizer: Optional[TagNormalizer] = None,
+    date: Optional[str] = None
+) -> str:
     """
     Create YAML frontmatter for Obsidian markdown from metadata.
 
     Args:
         metadata: Dictionary of metadata extracted from the document
+        tag_normalizer: Optional tag normalizer; the shared one by default
+        date: Export date (YYYY-MM-DD); today by default
 
     Returns:
         YAML frontmatter as a string
@@ -28,22 +73,23 @@ def format_yaml_frontmatter(metadata: Dict[str, Any]) -> str:
     # Add tags if available
     if "tags" in metadata and metadata["tags"]:
         frontmatter.append("tags:")
-        for tag in metadata["tags"]:
-            # Convert spaces to hyphens (kebab-case) for Obsidian compatibility
-            # Also remove special characters that may cause issues in Obsidian tags
-            import re
-
-            # Replace spaces with hyphens and remove special characters except for alphanumeric, hyphen, and underscore
-            obsidian_tag = re.sub(r'[^\w\-]', '', tag.replace(" ", "-"))
-            # Ensure tag doesn't start with a number (Obsidian requirement)
-            if obsidian_tag and obsidian_tag[0].isdigit():
-                obsidian_tag = f"t{obsidian_tag}"
-            # Skip empty tags
-            if obsidian_tag:
-                frontmatter.append(f'  - "{obsidian_tag}"')
+        # Spaces become hyphens and special characters are dropped so the
+        # tags work in Obsidian; see formatters.tags for the exact rules
+        normalizer = tag_normalizer or DEFAULT_TAG_NORMALIZER
+        for obsidian_tag in normalizer.normalize_all(metadata["tags"]):
+            frontmatter.append(f'  - "{obsidian_tag}"')
+
+    # Add user-defined metadata fields
+    for field in extra_frontmatter_fields(metadata):
+        if field["entries"]:
+            frontmatter.append(f'{field["name"]}:')
+            for entry in field["entries"]:
+                frontmatter.append(f"  - {entry}")
+        else:
+            frontmatter.append(f'{field["name"]}: {field["value"]}')
 
     # Add date
-    current_date = datetime.datetime.now().strftime("%Y-%m-%d")
+    current_date = date or datetime.datetime.now().strftime("%Y-%m-%d")
     frontmatter.append(f"date: {current_date}")
 
     # Add citation placeholder
@@ -70,37 +116,56 @@ def format_summary_as_callout(summary: str) -> str:
     if not summary:
         return ""
 
-    clean_summary = clean_text(summary)
     callout = "> [!summary]\n"
 
     # Add each line of the summary with a ">" prefix
+    for line in callout_lines(summary):
+        callout += f"> {line}\n"
+
+    return callout + "\n"
+
+
+def callout_lines(summary: str) -> List[str]:
+    """
+    Clean the summary and split it into the lines of a callout block.
+
+    Args:
+        summary: The text of the summary
+
+    Returns:
+        The lines to prefix with ">"
+    """
+    clean_summary = clean_text(summary)
+
     # Make sure there is proper spacing around bold markers
     clean_summary = re.sub(r'(\*\*)([^\s])', r'\1 \2', clean_summary)
     clean_summary = re.sub(r'([^\s])(\*\*)', r'\1 \2', clean_summary)
-    
-    # Process each line
-    for line in clean_summary.split("\n"):
-        callout += f"> {line}\n"
 
-    return callout + "\n"
+    return clean_summary.split("\n")
 
 
 def format_obsidian_markdown(
-    notes: List[Dict[str, str]],
-    metadata: Dict[str, Any]
+    notes: Iterable[Dict[str, str]],
+    metadata: Dict[str, Any],
+    tag_normalizer: Optional[TagNormalizer] = None,
+    date: Optional[str] = None,
+    hooks: Optional[ProgressHooks] = None
 ) -> str:
     """
     Format notes as Obsidian-compatible Markdown.
 
     Args:
-        notes: List of note dictionaries
+        notes: Note dictionaries, consumed in one pass
         metadata: Dictionary of metadata extracted from the document
+        tag_normalizer: Optional tag normalizer; the shared one by default
+        date: Export date (YYYY-MM-DD); today by default
+        hooks: Optional progress hooks, told about each formatted note
 
     Returns:
         Obsidian-formatted markdown as a string
     """
     # Start with YAML frontmatter
-    result = format_yaml_frontmatter(metadata)
+    result = format_yaml_frontmatter(metadata, tag_normalizer, date)
 
     # Add summary if available
     if "summary" in metadata and metadata["summary"]:
@@ -110,7 +175,7 @@ def format_obsidian_markdown(
     result += f"# {metadata['title']}\n\n"
 
     # Add all notes
-    for note in notes:
+    for note in track_notes(notes, hooks, "format"):
         clean_content = clean_text(note["note"])
         result += clean_content + "\n\n"
 
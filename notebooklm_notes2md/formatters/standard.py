@@ -2,21 +2,24 @@
 Standard Markdown formatter for NotebookLM notes.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Optional
 
+from notebooklm_notes2md.core.progress import ProgressHooks, track_notes
 from notebooklm_notes2md.utils.text_processing import clean_text
 
 
 def format_standard_markdown(
-    notes: List[Dict[str, str]],
-    metadata: Optional[Dict[str, Any]] = None
+    notes: Iterable[Dict[str, str]],
+    metadata: Optional[Dict[str, Any]] = None,
+    hooks: Optional[ProgressHooks] = None
 ) -> str:
     """
     Format notes as standard Markdown.
 
     Args:
-        notes: List of note dictionaries
+        notes: Note dictionaries, consumed in one pass
         metadata: Optional dictionary of metadata extracted from the document
+        hooks: Optional progress hooks, told about each formatted note
 
     Returns:
         Standard markdown as a string
@@ -28,7 +31,7 @@ def format_standard_markdown(
         result += f"# {metadata['title']}\n\n"
 
     # Add all notes
-    for note in notes:
+    for note in track_notes(notes, hooks, "format"):
         clean_content = clean_text(note["note"])
         result += clean_content + "\n\n"
 
@@ -0,0 +1,94 @@
+"""
+Obsidian tag normalization for NotebookLM key topics.
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+# Anything other than alphanumerics, hyphens and underscores breaks Obsidian tags
+_INVALID_TAG_CHARS = re.compile(r"[^\w\-]")
+
+
+def _normalize_tag(tag: str) -> str:
+    # Replace spaces with hyphens (kebab-case) and drop special characters
+    obsidian_tag = _INVALID_TAG_CHARS.sub("", tag.replace(" ", "-"))
+    # Ensure tag doesn't start with a number (Obsidian requirement)
+    if obsidian_tag and obsidian_tag[0].isdigit():
+        obsidian_tag = f"t{obsidian_tag}"
+    return obsidian_tag
+
+
+class TagNormalizer:
+    """
+    Memoizing converter from key topics to Obsidian-compatible tags.
+
+    Batches of documents tend to share the same key topics, so results are
+    kept in a bounded LRU memo. One instance can be shared across documents.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self._normalize = lru_cache(maxsize=maxsize)(_normalize_tag)
+
+    def normalize(self, tag: str) -> str:
+        """
+        Convert one key topic to an Obsidian tag.
+
+        Args:
+            tag: The key topic text
+
+        Returns:
+            The normalized tag, or an empty string if nothing is left
+        """
+        return self._normalize(tag)
+
+    def normalize_all(self, tags: Iterable[str]) -> List[str]:
+        """
+        Convert a list of key topics, dropping tags that end up empty.
+
+        Args:
+            tags: The key topic texts
+
+        Returns:
+            The non-empty normalized tags in input order
+        """
+        normalize = self._normalize
+        return [tag for tag in map(normalize, tags) if tag]
+
+    def cache_info(self) -> Tuple[int, int, Optional[int], int]:
+        """Return hit/miss statistics of the memo (hits, misses, maxsize, currsize)."""
+        return self._normalize.cache_info()
+
+    def cache_clear(self) -> None:
+        """Empty the memo."""
+        self._normalize.cache_clear()
+
+
+# Shared by every formatter call in the process, so batch runs reuse it
+DEFAULT_TAG_NORMALIZER = TagNormalizer()
+
+
+def normalize_obsidian_tag(tag: str) -> str:
+    """
+    Convert one key topic to an Obsidian tag using the shared memo.
+
+    Args:
+        tag: The key topic text
+
+    Returns:
+        The normalized tag, or an empty string if nothing is left
+    """
+    return DEFAULT_TAG_NORMALIZER.normalize(tag)
+
+
+def normalize_obsidian_tags(tags: Iterable[str]) -> List[str]:
+    """
+    Convert a list of key topics using the shared memo.
+
+    Args:
+        tags: The key topic texts
+
+    Returns:
+        The non-empty normalized tags in input order
+    """
+    return DEFAULT_TAG_NORMALIZER.normalize_all(tags)
@@ -0,0 +1,469 @@
+"""
+Template-driven Markdown formatter for NotebookLM notes.
+
+A document is rendered from four templates: ``frontmatter``, ``callout``
+(only when a summary exists), ``heading`` and ``note`` (once per note).
+Templates use a small syntax:
+
+- ``{{ name }}`` / ``{{ note.title }}`` inserts a value, ``{{ x | json }}``
+  applies a filter (``json``, ``upper``, ``lower``, ``strip``)
+- ``{% if name %}...{% else %}...{% endif %}`` (``not name`` negates)
+- ``{% for item in items %}...{% endfor %}``
+- ``{% raw %}...{% endraw %}`` outputs its content verbatim
+
+Each template is compiled once into a Python function. Template files are
+cached by path and modification time, so a batch of documents never
+re-parses a template.
+"""
+
+import datetime
+import json
+import os
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from notebooklm_notes2md.core.progress import ProgressHooks, track_notes
+from notebooklm_notes2md.formatters.obsidian import callout_lines, extra_frontmatter_fields
+from notebooklm_notes2md.formatters.tags import DEFAULT_TAG_NORMALIZER
+from notebooklm_notes2md.utils.text_processing import clean_text
+
+TEMPLATE_NAMES = ("frontmatter", "callout", "heading", "note")
+TEMPLATE_EXTENSION = ".md"
+
+_TOKEN_RE = re.compile(r"({{.*?}}|{%.*?%})", re.DOTALL)
+_NAME_RE = re.compile(r"^[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*$")
+_STRING_RE = re.compile(r"""^(?:'[^']*'|"[^"]*")$""")
+
+FILTERS: Dict[str, Callable[[Any], Any]] = {
+    "json": lambda value: json.dumps(value, ensure_ascii=False),
+    "upper": lambda value: str(value).upper(),
+    "lower": lambda value: str(value).lower(),
+    "strip": lambda value: str(value).strip(),
+}
+
+RenderFunction = Callable[[Dict[str, Any]], str]
+
+
+class TemplateError(ValueError):
+    """Raised when a template cannot be compiled."""
+
+
+def _lookup(value: Any, attribute: str) -> Any:
+    if isinstance(value, dict):
+        return value.get(attribute)
+    return getattr(value, attribute, None)
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+class _Compiler:
+    """Translates template tokens into the source of a Python function."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.lines: List[str] = []
+        self.indent = 1
+        self.scopes: List[Dict[str, str]] = [{}]
+        self.blocks: List[str] = []
+        # Whether each open block already has its 'else'
+        self.has_else: List[bool] = []
+        self.counter = 0
+
+    def emit(self, line: str) -> None:
+        self.lines.append("    " * self.indent + line)
+
+    def expression(self, source: str) -> str:
+        parts = [part.strip() for part in source.split("|")]
+        base, filters = parts[0], parts[1:]
+        if _STRING_RE.match(base):
+            code = repr(base[1:-1])
+        elif _NAME_RE.match(base):
+            head, *attributes = base.split(".")
+            code = self._resolve(head)
+            for attribute in attributes:
+                code = f"_lookup({code}, {attribute!r})"
+        else:
+            raise TemplateError(f"{self.name}: invalid expression '{source}'")
+        for name in filters:
+            if name not in FILTERS:
+                raise TemplateError(f"{self.name}: unknown filter '{name}'")
+            code = f"_filters[{name!r}]({code})"
+        return code
+
+    def _resolve(self, name: str) -> str:
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return f"_ctx.get({name!r})"
+
+    def statement(self, source: str) -> None:
+        words = source.split()
+        if not words:
+            raise TemplateError(f"{self.name}: empty statement")
+        keyword = words[0]
+        if keyword == "if":
+            condition = " ".join(words[1:])
+            negate = condition.startswith("not ")
+            code = self.expression(condition[4:] if negate else condition)
+            self.emit(f"if {'not ' if negate else ''}{code}:")
+            self.indent += 1
+            self.emit("pass")
+            self.blocks.append("if")
+            self.has_else.append(False)
+        elif keyword == "else":
+            if not self.blocks or self.blocks[-1] != "if":
+                raise TemplateError(f"{self.name}: 'else' outside 'if'")
+            if self.has_else[-1]:
+                raise TemplateError(f"{self.name}: duplicate 'else'")
+            self.has_else[-1] = True
+            self.indent -= 1
+            self.emit("else:")
+            self.indent += 1
+            self.emit("pass")
+        elif keyword == "for":
+            if len(words) < 4 or words[2] != "in" or not words[1].isidentifier():
+                raise TemplateError(f"{self.name}: expected 'for NAME in EXPR'")
+            self.counter += 1
+            local = f"_v{self.counter}"
+            sequence = self.expression(" ".join(words[3:]))
+            self.emit(f"for {local} in ({sequence} or ()):")
+            self.indent += 1
+            self.emit("pass")
+            self.scopes.append({words[1]: local})
+            self.blocks.append("for")
+            self.has_else.append(False)
+        elif keyword in ("endif", "endfor"):
+            expected = keyword[3:]
+            if not self.blocks or self.blocks[-1] != expected:
+                raise TemplateError(f"{self.name}: unexpected '{keyword}'")
+            self.blocks.pop()
+            self.has_else.pop()
+            if expected == "for":
+                self.scopes.pop()
+            self.indent -= 1
+        else:
+            raise TemplateError(f"{self.name}: unknown statement '{keyword}'")
+
+    def compile(self, source: str) -> RenderFunction:
+        self.emit("_out = []")
+        self.emit("_write = _out.append")
+        tokens = _TOKEN_RE.split(source)
+        raw = False
+        for token in tokens:
+            if not token:
+                continue
+            if token.startswith("{%"):
+                statement = token[2:-2].strip()
+                if statement == "endraw" and raw:
+                    raw = False
+                    continue
+                if not raw:
+                    if statement == "raw":
+                        raw = True
+                    else:
+                        self.statement(statement)
+                    continue
+            if token.startswith("{{") and not raw:
+                self.emit(f"_write(_text({self.expression(token[2:-2].strip())}))")
+            else:
+                self.emit(f"_write({token!r})")
+        if raw:
+            raise TemplateError(f"{self.name}: unclosed 'raw'")
+        if self.blocks:
+            raise TemplateError(f"{self.name}: unclosed '{self.blocks[-1]}'")
+        self.emit("return ''.join(_out)")
+
+        code = "def _render(_ctx):\n" + "\n".join(self.lines)
+        namespace: Dict[str, Any] = {
+            "_lookup": _lookup, "_text": _text, "_filters": FILTERS,
+        }
+        try:
+            compiled = compile(code, f"<template {self.name}>", "exec")
+        except SyntaxError as e:
+            # Malformed templates should be caught above; never crash on one
+            raise TemplateError(f"{self.name}: cannot compile ({e.msg})") from e
+        exec(compiled, namespace)
+        return namespace["_render"]
+
+
+class CompiledTemplate:
+    """
+    A compiled template, called with a context dictionary.
+
+    It pickles as its source, so template sets can be sent to worker
+    processes and are compiled again there.
+    """
+
+    __slots__ = ("source", "name", "render")
+
+    def __init__(self, source: str, name: str, render: RenderFunction) -> None:
+        self.source = source
+        self.name = name
+        self.render = render
+
+    def __call__(self, context: Dict[str, Any]) -> str:
+        return self.render(context)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (compile_template, (self.source, self.name))
+
+
+def compile_template(source: str, name: str = "template") -> RenderFunction:
+    """
+    Compile template source into a rendering function.
+
+    Args:
+        source: Template text
+        name: Name used in error messages
+
+    Returns:
+        A callable rendering the template from a context dictionary
+
+    Raises:
+        TemplateError: If the template is malformed
+    """
+    return CompiledTemplate(source, name, _Compiler(name).compile(source))
+
+
+_FILE_CACHE: Dict[str, Tuple[int, RenderFunction]] = {}
+
+
+def load_template(path: str) -> RenderFunction:
+    """
+    Load and compile a template file, reusing it until the file changes.
+
+    Args:
+        path: Path of the template file
+
+    Returns:
+        The compiled rendering function
+    """
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _FILE_CACHE.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, "r", encoding="utf-8") as f:
+        render = compile_template(f.read(), os.path.basename(path))
+    _FILE_CACHE[path] = (mtime, render)
+    return render
+
+
+class TemplateSet(NamedTuple):
+    """The compiled templates making up one output layout."""
+
+    frontmatter: RenderFunction
+    callout: RenderFunction
+    heading: RenderFunction
+    note: RenderFunction
+
+
+BUILTIN_TEMPLATES: Dict[str, Dict[str, str]] = {
+    "standard": {
+        "frontmatter": "",
+        "callout": "",
+        "heading": "{% if has_title %}# {{ title }}\n\n{% endif %}",
+        "note": "{{ note.text }}\n\n",
+    },
+    "obsidian": {
+        "frontmatter": (
+            "---\n"
+            "{% if title %}title: \"{{ title }}\"\n{% endif %}"
+            "{% if tags %}tags:\n"
+            "{% for tag in obsidian_tags %}  - \"{{ tag }}\"\n{% endfor %}"
+            "{% endif %}"
+            "{% for field in extra_fields %}"
+            "{% if field.entries %}{{ field.name }}:\n"
+            "{% for entry in field.entries %}  - {{ entry }}\n{% endfor %}"
+            "{% else %}{{ field.name }}: {{ field.value }}\n{% endif %}"
+            "{% endfor %}"
+            "date: {{ date }}\n"
+            "citekey: {% raw %}{{citekey}}{% endraw %}\n"
+            "status: unread\n"
+            "---\n\n"
+        ),
+        "callout": (
+            "> [!summary]\n"
+            "{% for line in summary_lines %}> {{ line }}\n{% endfor %}\n"
+        ),
+        "heading": "# {{ title }}\n\n",
+        "note": "{{ note.text }}\n\n",
+    },
+}
+
+_BUILTIN_CACHE: Dict[str, TemplateSet] = {}
+
+
+def builtin_template_set(name: str) -> TemplateSet:
+    """
+    Return one of the built-in template sets, compiled once per process.
+
+    Args:
+        name: "standard" or "obsidian"
+
+    Returns:
+        The compiled template set
+    """
+    if name not in _BUILTIN_CACHE:
+        sources = BUILTIN_TEMPLATES[name]
+        _BUILTIN_CACHE[name] = TemplateSet(*(
+            compile_template(sources[part], f"{name}/{part}") for part in TEMPLATE_NAMES
+        ))
+    return _BUILTIN_CACHE[name]
+
+
+def load_template_set(directory: str, base: str = "standard") -> TemplateSet:
+    """
+    Load templates from a directory, falling back to a built-in set.
+
+    The directory may contain ``frontmatter.md``, ``callout.md``,
+    ``heading.md`` and ``note.md``; missing files use the built-in
+    template of ``base``.
+
+    Args:
+        directory: Directory holding the template files
+        base: Built-in template set used for missing files
+
+    Returns:
+        The compiled template set
+    """
+    fallback = builtin_template_set(base)
+    parts = []
+    for part in TEMPLATE_NAMES:
+        path = os.path.join(directory, part + TEMPLATE_EXTENSION)
+        parts.append(load_template(path) if os.path.isfile(path) else getattr(fallback, part))
+    return TemplateSet(*parts)
+
+
+def document_context(
+    metadata: Optional[Dict[str, Any]],
+    date: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Build the template context shared by all templates of a document.
+
+    Args:
+        metadata: Optional metadata dictionary
+        date: Export date; today by default
+
+    Returns:
+        The context dictionary
+    """
+    metadata = metadata or {}
+    summary = metadata.get("summary")
+    return {
+        "metadata": metadata,
+        "title": metadata.get("title"),
+        # An empty title still gets a heading in the standard layout
+        "has_title": "title" in metadata,
+        "tags": metadata.get("tags") or [],
+        "obsidian_tags": DEFAULT_TAG_NORMALIZER.normalize_all(metadata.get("tags") or []),
+        "summary": summary,
+        "summary_lines": callout_lines(summary) if summary else [],
+        "extra_fields": extra_frontmatter_fields(metadata),
+        "date": date or datetime.datetime.now().strftime("%Y-%m-%d"),
+    }
+
+
+def markdown_template_set(
+    format_type: str = "standard",
+    metadata: Optional[Dict[str, Any]] = None,
+    templates: Optional[TemplateSet] = None
+) -> TemplateSet:
+    """
+    Choose the templates matching the Markdown formatter for a format.
+
+    Args:
+        format_type: Format type ("standard" or "obsidian")
+        metadata: Optional metadata dictionary; Obsidian output needs it
+        templates: Custom templates, returned unchanged when given
+
+    Returns:
+        The compiled template set
+    """
+    if templates is not None:
+        return templates
+    obsidian = format_type == "obsidian" and metadata
+    return builtin_template_set("obsidian" if obsidian else "standard")
+
+
+def iter_note_markdown(
+    notes: Iterable[Dict[str, str]],
+    context: Dict[str, Any],
+    templates: TemplateSet,
+    start: int = 1,
+    clean: Callable[[str], str] = clean_text
+) -> Iterator[str]:
+    """
+    Render the note template once per note.
+
+    Args:
+        notes: Note dictionaries
+        context: Document context from ``document_context``
+        templates: The compiled template set
+        start: Index of the first note
+        clean: Cleans each note body; ``clean_text`` by default
+
+    Yields:
+        The Markdown of each note
+    """
+    render_note = templates.note
+    for index, note in enumerate(notes, start):
+        context["note"] = {
+            "title": note["title"],
+            "text": clean(note["note"]),
+            "index": index,
+        }
+        yield render_note(context)
+
+
+def iter_template_markdown(
+    notes: Iterable[Dict[str, str]],
+    metadata: Optional[Dict[str, Any]],
+    templates: TemplateSet,
+    date: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Render a document piece by piece, consuming notes lazily.
+
+    Args:
+        notes: Note dictionaries
+        metadata: Optional metadata dictionary
+        templates: The compiled template set
+        date: Export date; today by default
+
+    Yields:
+        Consecutive parts of the Markdown document
+    """
+    context = document_context(metadata, date)
+    yield templates.frontmatter(context)
+    if context["summary"]:
+        yield templates.callout(context)
+    yield templates.heading(context)
+    yield from iter_note_markdown(notes, context, templates)
+
+
+def format_template_markdown(
+    notes: Iterable[Dict[str, str]],
+    metadata: Optional[Dict[str, Any]],
+    templates: TemplateSet,
+    date: Optional[str] = None,
+    hooks: Optional[ProgressHooks] = None
+) -> str:
+    """
+    Format notes as Markdown using compiled templates.
+
+    Args:
+        notes: Note dictionaries, consumed in one pass
+        metadata: Optional metadata dictionary
+        templates: The compiled template set
+        date: Export date; today by default
+        hooks: Optional progress hooks, told about each formatted note
+
+    Returns:
+        The formatted Markdown as a string
+    """
+    tracked = track_notes(notes, hooks, "format")
+    return "".join(iter_template_markdown(tracked, metadata, templates, date))
@@ -2,11 +2,21 @@
 HTML processing utilities for NotebookLM notes.
 """
 
+import html
 from typing import Any, Generator, List, Optional
 
 from bs4 import BeautifulSoup
 from bs4.element import Comment, Tag
 
+from notebooklm_notes2md.utils.tag_handlers import TagRegistry
+from notebooklm_notes2md.utils.text_processing import remove_references
+
+
+# Handlers of ``drill_into_tag`` and ``drill_into_tag_html``; the default
+# rules are registered below
+MARKDOWN_HANDLERS = TagRegistry()
+HTML_HANDLERS = TagRegistry()
+
 
 def extract_tag_classes(tag: Tag) -> List[str]:
     """
@@ -65,38 +75,76 @@ def drill_into_tag(tag: Any) -> str:
     """
     Recursively extract and format text from a BeautifulSoup tag.
 
+    Tags are rendered by the handlers of ``MARKDOWN_HANDLERS``; register
+    rules there to support new markup.
+
     Args:
         tag: The BeautifulSoup tag to process
 
     Returns:
         Formatted Markdown text
     """
-    if not isinstance(tag, Tag):
-        return ""
+    return MARKDOWN_HANDLERS.render(tag)
+
+
+def drill_into_tag_html(tag: Any) -> str:
+    """
+    Recursively render a BeautifulSoup tag as HTML.
 
-    tag_classes = extract_tag_classes(tag)
+    This is the HTML counterpart of ``drill_into_tag``, driven by
+    ``HTML_HANDLERS``: headings and paragraphs become ``<h2>`` and ``<p>``
+    elements instead of Markdown prefixes. Bullet markers render as
+    nothing; the caller turns the paragraph that follows them into a list
+    item.
 
-    # Handle span elements (leaf nodes with text)
-    if tag.name == "span":
-        return format_span_text(tag.text, tag_classes)
+    Args:
+        tag: The BeautifulSoup tag to process
 
-    # Handle div elements (may contain other elements)
-    elif tag.name == "div":
-        prefix = process_div_prefix(tag_classes)
-        if prefix in ["- "]:  # Special case for bullet points
-            return prefix
+    Returns:
+        HTML fragment
+    """
+    return HTML_HANDLERS.render(tag)
 
-        # Process all children and combine their results
-        texts = prefix
-        for child in getattr(tag, "children", []):
-            texts += drill_into_tag(child)
-        return texts
 
-    # Process any other tag with children
-    texts = ""
-    for child in getattr(tag, "children", []):
-        texts += drill_into_tag(child)
-    return texts
+def _span_text(tag: Tag, registry: TagRegistry) -> str:
+    return tag.text
+
+
+def _span_html(tag: Tag, registry: TagRegistry) -> str:
+    return html.escape(remove_references(tag.text), quote=False)
+
+
+def _span_class(cls: str) -> Any:
+    tag_classes = [cls]
+    return lambda text: format_span_text(text, tag_classes)
+
+
+def _div_class(cls: str) -> Any:
+    prefix = process_div_prefix([cls])
+    return lambda tag, registry: prefix + registry.render_children(tag)
+
+
+def _wrapped(start: str, end: str) -> Any:
+    return lambda tag, registry: f"{start}{registry.render_children(tag)}{end}"
+
+
+# A span is a leaf: its text is taken as is, then formatted by its classes.
+# The Markdown itself comes from format_span_text and process_div_prefix.
+MARKDOWN_HANDLERS.register("span", handler=_span_text)
+MARKDOWN_HANDLERS.register("span", "bold", _span_class("bold"), inline=True)
+MARKDOWN_HANDLERS.register("span", "code", _span_class("code"), inline=True)
+MARKDOWN_HANDLERS.register("div", "heading3", _div_class("heading3"))
+MARKDOWN_HANDLERS.register("div", "paragraph", _div_class("paragraph"))
+# The bullet text is in the paragraph that follows the marker
+_BULLET = process_div_prefix(["bullet"])
+MARKDOWN_HANDLERS.register("div", "bullet", lambda tag, registry: _BULLET)
+
+HTML_HANDLERS.register("span", handler=_span_html)
+HTML_HANDLERS.register("span", "bold", lambda text: f"<strong>{text}</strong>", inline=True)
+HTML_HANDLERS.register("span", "code", lambda text: f"<code>{text}</code>", inline=True)
+HTML_HANDLERS.register("div", "heading3", _wrapped("<h2>", "</h2>"))
+HTML_HANDLERS.register("div", "paragraph", _wrapped("<p>", "</p>"))
+HTML_HANDLERS.register("div", "bullet", lambda tag, registry: "")
 
 
 def is_comment_separator(child: Any) -> bool:
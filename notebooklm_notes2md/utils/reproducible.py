@@ -0,0 +1,101 @@
+"""
+Helpers for reproducible output.
+
+In reproducible mode every timestamp written into an export comes from
+one source date, so identical inputs give identical bytes. The source
+date follows the reproducible-builds convention: ``SOURCE_DATE_EPOCH``
+(seconds since the epoch) when it is set, else the modification time of
+the input file. Outputs whose new bytes equal the file on disk are not
+rewritten, which keeps their modification time for rsync and caches.
+"""
+
+import filecmp
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+SOURCE_DATE_EPOCH = "SOURCE_DATE_EPOCH"
+
+
+def resolve_source_date(input_path: Optional[str] = None) -> int:
+    """
+    Return the source date of a reproducible export.
+
+    Args:
+        input_path: Input file whose modification time is used when
+            ``SOURCE_DATE_EPOCH`` is not set
+
+    Returns:
+        Seconds since the epoch
+
+    Raises:
+        ValueError: If ``SOURCE_DATE_EPOCH`` is not a non-negative integer,
+            or is unset and no input path is given
+    """
+    value = os.environ.get(SOURCE_DATE_EPOCH)
+    if value is not None:
+        if not value.strip().isdigit():
+            raise ValueError(f"{SOURCE_DATE_EPOCH} must be a number of seconds, got {value!r}")
+        return int(value)
+    if input_path is None:
+        raise ValueError(f"{SOURCE_DATE_EPOCH} is not set")
+    return int(os.stat(input_path).st_mtime)
+
+
+def format_source_date(epoch: Optional[float]) -> Optional[str]:
+    """
+    Format a source date as the export date of Markdown frontmatter.
+
+    Args:
+        epoch: Seconds since the epoch, or None
+
+    Returns:
+        The UTC date as YYYY-MM-DD, or None for the current date
+    """
+    if epoch is None:
+        return None
+    return time.strftime("%Y-%m-%d", time.gmtime(epoch))
+
+
+class StagedOutput:
+    """
+    An output file written to a temporary path first.
+
+    Attributes:
+        path: Temporary path to write the output to
+        changed: After the ``stage_output`` block, whether the destination
+            was replaced
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.changed = False
+
+
+@contextmanager
+def stage_output(output_path: str) -> Iterator[StagedOutput]:
+    """
+    Write an output through a temporary file, keeping identical files.
+
+    The block writes to ``staged.path``, a path with the same file name
+    in a temporary directory next to the destination. Afterwards the file
+    replaces the destination, unless the destination already has the same
+    bytes.
+
+    Args:
+        output_path: Destination path
+
+    Yields:
+        The staged output
+    """
+    directory, name = os.path.split(os.path.abspath(output_path))
+    # Same file name: writers derive member names and formats from it
+    with tempfile.TemporaryDirectory(dir=directory) as temp_dir:
+        staged = StagedOutput(os.path.join(temp_dir, name))
+        yield staged
+        if not (os.path.isfile(output_path)
+                and filecmp.cmp(staged.path, output_path, shallow=False)):
+            os.replace(staged.path, output_path)
+            staged.changed = True
@@ -0,0 +1,193 @@
+"""
+Table-driven dispatch of tag handlers for the DOM walker.
+
+A ``TagRegistry`` maps (tag name, class) rules to handlers. The rules that
+apply to a node depend only on its tag name and its class attribute, so
+they are resolved once per unique (name, classes) pair into a dispatch
+table; rendering a node then costs one dictionary lookup however many
+rules are registered.
+
+Two kinds of rules exist:
+
+- Element rules render a node. When several match, the first registered
+  rule with a class beats the rule for the bare tag name; without any
+  match the children of the node are rendered and joined.
+- Inline rules wrap the rendered text, e.g. bold or code spans. All
+  matching inline rules apply, in registration order.
+"""
+
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from bs4.element import Tag
+
+# Renders a node; the registry is passed to render its children
+TagHandler = Callable[[Tag, "TagRegistry"], str]
+
+# Wraps the text rendered for a node
+InlineHandler = Callable[[str], str]
+
+
+class TagRule(NamedTuple):
+    """
+    One registered rule.
+
+    Attributes:
+        name: Tag name the rule applies to
+        cls: Class the tag must have, or None for any tag of that name
+        handler: Element handler, or inline handler if ``inline`` is set
+        inline: Wrap the text of the node instead of rendering it
+    """
+
+    name: str
+    cls: Optional[str]
+    handler: Any
+    inline: bool = False
+
+
+class Dispatch(NamedTuple):
+    """Handlers resolved for one (tag name, classes) pair."""
+
+    handler: Optional[TagHandler]
+    inline: Tuple[InlineHandler, ...]
+
+
+class TagRegistry:
+    """
+    Handlers for the tags of a NotebookLM export, keyed by (name, class).
+
+    Register rules with ``register`` (or the ``handler`` decorator) and
+    render a node with ``render``. Registering a rule clears the dispatch
+    table, which is rebuilt lazily as nodes are rendered.
+    """
+
+    def __init__(self) -> None:
+        self._rules: List[TagRule] = []
+        # Render function per (tag name, classes), built on first use
+        self._table: Dict[Tuple[str, Tuple[str, ...]], Callable[[Tag], str]] = {}
+
+    @property
+    def rules(self) -> Tuple[TagRule, ...]:
+        """Registered rules, in registration order."""
+        return tuple(self._rules)
+
+    def register(
+        self,
+        name: str,
+        cls: Optional[str] = None,
+        handler: Any = None,
+        inline: bool = False
+    ) -> None:
+        """
+        Register a handler for tags with a name and, optionally, a class.
+
+        Args:
+            name: Tag name, e.g. "div"
+            cls: Class the tag must have; None matches any tag of that name
+            handler: ``handler(tag, registry) -> str`` for element rules,
+                ``handler(text) -> str`` for inline rules
+            inline: Wrap the text rendered for the tag instead of
+                rendering it
+
+        Raises:
+            ValueError: If an inline rule has no class
+        """
+        if inline and cls is None:
+            raise ValueError("Inline rules need a class")
+        self._rules.append(TagRule(name, cls, handler, inline))
+        self._table.clear()
+
+    def handler(
+        self,
+        name: str,
+        cls: Optional[str] = None,
+        inline: bool = False
+    ) -> Callable[[Any], Any]:
+        """
+        Decorator form of ``register``.
+
+        Args:
+            name: Tag name
+            cls: Class the tag must have, or None
+            inline: Register an inline rule
+
+        Returns:
+            A decorator registering the function and returning it unchanged
+        """
+        def decorator(function: Any) -> Any:
+            self.register(name, cls, function, inline)
+            return function
+        return decorator
+
+    def resolve(self, name: str, classes: Tuple[str, ...]) -> Dispatch:
+        """
+        Find the handlers for a tag name and class list.
+
+        Args:
+            name: Tag name
+            classes: Classes of the tag, in attribute order
+
+        Returns:
+            The element handler (None to render the children) and the
+            inline handlers
+        """
+        handler = fallback = None
+        inline = []
+        class_set = frozenset(classes)
+        for rule in self._rules:
+            if rule.name != name or (rule.cls is not None and rule.cls not in class_set):
+                continue
+            if rule.inline:
+                inline.append(rule.handler)
+            elif rule.cls is None:
+                fallback = fallback or rule.handler
+            else:
+                handler = handler or rule.handler
+        return Dispatch(handler or fallback, tuple(inline))
+
+    def _compile(self, key: Tuple[str, Tuple[str, ...]]) -> Callable[[Tag], str]:
+        handler, inline = self.resolve(*key)
+        if handler is None:
+            render = self.render_children
+        else:
+            def render(tag: Tag) -> str:
+                return handler(tag, self)
+        if inline:
+            element = render
+
+            def render(tag: Tag) -> str:
+                text = element(tag)
+                for wrap in inline:
+                    text = wrap(text)
+                return text
+        self._table[key] = render
+        return render
+
+    def render(self, tag: Any) -> str:
+        """
+        Render a node and, through its handler, its descendants.
+
+        Args:
+            tag: A BeautifulSoup node; anything but a tag renders as ""
+
+        Returns:
+            The rendered text
+        """
+        if not isinstance(tag, Tag):
+            return ""
+        classes = tag.attrs.get("class")
+        key = (tag.name, tuple(classes) if isinstance(classes, list) else ())
+        render = self._table.get(key) or self._compile(key)
+        return render(tag)
+
+    def render_children(self, tag: Tag) -> str:
+        """
+        Render the children of a tag and join them.
+
+        Args:
+            tag: The tag whose children to render
+
+        Returns:
+            The joined text of the children
+        """
+        render = self.render
+        return "".join([render(child) for child in tag.contents])
@@ -3,15 +3,71 @@ Text processing utilities for NotebookLM notes.
 """
 
 import re
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Pattern, Tuple
 
+# Reference numbers like [1, 2], [3] or [4-6]
+REFERENCE_PATTERN = re.compile(r"\[\s*\d+(?:\s*[-,]\s*\d+)*\s*\]")
 
-def clean_text(text: str) -> str:
+# The same pattern as a group, so that re.split keeps the markers
+_REFERENCE_SPLIT = re.compile(f"({REFERENCE_PATTERN.pattern})")
+
+# Fixes applied by clean_text once the markers are gone, in order. Each
+# replacement is the start or the end of its match, so a fix only deletes.
+_LAYOUT_FIXES: Tuple[Tuple[Pattern[str], str], ...] = (
+    # Fix excessive whitespace between paragraphs
+    (re.compile(r"\n{3,}"), "\n\n"),
+    # Fix inline code formatting
+    (re.compile(r"`\s+"), "`"),
+    (re.compile(r"\s+`"), "`"),
+    # Ensure proper spacing around bold text
+    (re.compile(r"\*\*\s+"), "**"),
+    (re.compile(r"\s+\*\*"), "**"),
+)
+
+
+def remove_references(text: str) -> str:
+    """
+    Remove reference numbers such as ``[1, 2]`` from text.
+
+    Args:
+        text: Note text
+
+    Returns:
+        The text without reference numbers
+    """
+    return REFERENCE_PATTERN.sub("", text)
+
+
+def split_references(text: str) -> List[str]:
+    """
+    Split text at its reference numbers.
+
+    Args:
+        text: Note text
+
+    Returns:
+        Alternating text and reference markers, starting and ending with
+        text: ``"a [1] b"`` gives ``["a ", "[1]", " b"]``
+    """
+    return _REFERENCE_SPLIT.split(text)
+
+
+def clean_text(
+    text: str,
+    references: Optional[Callable[[List[str]], str]] = None,
+    offsets: Optional[List[int]] = None
+) -> str:
     """
     Clean up text by fixing formatting issues and removing references.
 
     Args:
         text: Raw note text
+        references: Optional callback receiving the text split by
+            ``split_references`` and returning it joined, in place of
+            removing the markers; lets a citation index read the markers
+            in the cleaning pass
+        offsets: Optional ascending offsets into the text returned by
+            ``references``, updated in place to index the cleaned text
 
     Returns:
         Cleaned text ready for export
@@ -20,19 +76,46 @@ def clean_text(text: str) -> str:
     text = re.sub(r"-\s*\n", "- ", text)
 
     # Remove reference numbers like [1, 2] or [3]
-    text = re.sub(r"\[\s*\d+(?:\s*[-,]\s*\d+)*\s*\]", "", text)
-
-    # Fix excessive whitespace between paragraphs
-    text = re.sub(r"\n{3,}", "\n\n", text)
-
-    # Fix inline code formatting
-    text = re.sub(r"`\s+", "`", text)
-    text = re.sub(r"\s+`", "`", text)
-
-    # Ensure proper spacing around bold text
-    text = re.sub(r"\*\*\s+", "**", text)
-    text = re.sub(r"\s+\*\*", "**", text)
-
+    if references is None:
+        text = remove_references(text)
+    else:
+        text = references(split_references(text))
+
+    return _fix_layout(text, offsets)
+
+
+def _fix_layout(text: str, offsets: Optional[List[int]] = None) -> str:
+    if not offsets:
+        for pattern, replacement in _LAYOUT_FIXES:
+            text = pattern.sub(replacement, text)
+        return text
+
+    count = len(offsets)
+    for pattern, replacement in _LAYOUT_FIXES:
+        pieces = []
+        position = removed = index = 0
+        kept = len(replacement)
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            if text.startswith(replacement, start):
+                start += kept
+            else:
+                end -= kept
+            # An offset inside or just after deleted characters moves to
+            # where they were
+            while index < count and offsets[index] <= end:
+                offset = offsets[index]
+                offsets[index] = (start if offset > start else offset) - removed
+                index += 1
+            pieces.append(text[position:start])
+            position = end
+            removed += end - start
+        if not pieces:
+            continue
+        pieces.append(text[position:])
+        text = "".join(pieces)
+        for index in range(index, count):
+            offsets[index] -= removed
     return text
 
 
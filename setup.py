@@ -30,6 +30,9 @@ setup(
         "beautifulsoup4>=4.13.0",
         "markdown_pdf>=1.7.0",
     ],
+    extras_require={
+        "msgpack": ["msgpack>=1.0"],
+    },
     entry_points={
         "console_scripts": [
             "notebooklm-export=notebooklm_notes2md.cli.main:main",
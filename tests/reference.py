@@ -0,0 +1,240 @@
+"""
+Frozen reference implementations for differential tests.
+
+These are the parsing, metadata and formatting functions as they were
+before any optimisation, kept verbatim so that faster engines can be
+checked against them. Do not change or speed up this module: it defines
+the expected output. Only update it when the output format changes on
+purpose, in the same commit as the change.
+"""
+
+import datetime
+import re
+from typing import Any, Dict, Generator, List, Optional
+
+from bs4 import BeautifulSoup
+from bs4.element import Comment, Tag
+
+
+def clean_text(text: str) -> str:
+    """Clean up text by fixing formatting issues and removing references."""
+    text = re.sub(r"-\s*\n", "- ", text)
+    text = re.sub(r"\[\s*\d+(?:\s*[-,]\s*\d+)*\s*\]", "", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = re.sub(r"`\s+", "`", text)
+    text = re.sub(r"\s+`", "`", text)
+    text = re.sub(r"\*\*\s+", "**", text)
+    text = re.sub(r"\s+\*\*", "**", text)
+    return text
+
+
+def create_note_from_texts(texts: List[str]) -> Dict[str, str]:
+    """Create a note dictionary from a list of text fragments."""
+    if not texts:
+        return {"title": "Untitled Note", "note": ""}
+    title_line = texts[0].strip()
+    title = re.sub(r"^#+\s*", "", title_line).strip()
+    if not title:
+        title = "Untitled Note"
+    return {"title": title, "note": "\n".join(texts)}
+
+
+def extract_tag_classes(tag: Tag) -> List[str]:
+    """Extract classes from a BeautifulSoup tag safely."""
+    tag_classes_raw = tag.get("class")
+    if isinstance(tag_classes_raw, (list, tuple)):
+        return list(tag_classes_raw)
+    return []
+
+
+def format_span_text(text: str, tag_classes: List[str]) -> str:
+    """Format span text based on its classes."""
+    if "bold" in tag_classes:
+        text = f" **{text}** "
+    if "code" in tag_classes:
+        text = f" `{text}` "
+    return text
+
+
+def process_div_prefix(tag_classes: List[str]) -> str:
+    """Determine prefix for div content based on its classes."""
+    if "heading3" in tag_classes:
+        return "## "
+    elif "paragraph" in tag_classes:
+        return "\n"
+    elif "bullet" in tag_classes:
+        return "- "
+    return ""
+
+
+def drill_into_tag(tag: Any) -> str:
+    """Recursively extract and format text from a BeautifulSoup tag."""
+    if not isinstance(tag, Tag):
+        return ""
+
+    tag_classes = extract_tag_classes(tag)
+
+    if tag.name == "span":
+        return format_span_text(tag.text, tag_classes)
+
+    elif tag.name == "div":
+        prefix = process_div_prefix(tag_classes)
+        if prefix in ["- "]:
+            return prefix
+
+        texts = prefix
+        for child in getattr(tag, "children", []):
+            texts += drill_into_tag(child)
+        return texts
+
+    texts = ""
+    for child in getattr(tag, "children", []):
+        texts += drill_into_tag(child)
+    return texts
+
+
+def inner_childs_with_split(tag: Any) -> Generator[Any, None, None]:
+    """Yield children of a tag, marking HTML comments as separators."""
+    for child in getattr(tag, "children", []):
+        if getattr(child, "string", None) == "" and isinstance(child, Comment):
+            yield ""
+        else:
+            yield child
+
+
+def find_parent_element(soup: BeautifulSoup) -> Optional[Tag]:
+    """Find the parent element containing all notes."""
+    parent = soup.find("labs-tailwind-doc-viewer")
+    if (
+        not parent
+        or not hasattr(parent, "children")
+        or not isinstance(parent, Tag)
+    ):
+        return None
+    return parent
+
+
+def parse_notes(soup: BeautifulSoup) -> List[Dict[str, str]]:
+    """Parse the soup and extract notes as a list of dicts with title and note."""
+    notes: List[Dict[str, str]] = []
+    texts: List[str] = []
+
+    parent = find_parent_element(soup)
+    if not parent:
+        return notes
+
+    for child in getattr(parent, "children", []):
+        if not isinstance(child, Tag):
+            continue
+
+        for inner_child in inner_childs_with_split(child):
+            if not isinstance(inner_child, Tag):
+                if inner_child == "" and texts:
+                    notes.append(create_note_from_texts(texts))
+                    texts = []
+                continue
+
+            text = drill_into_tag(inner_child).strip()
+            if texts and text == "":
+                notes.append(create_note_from_texts(texts))
+                texts = []
+            elif text:
+                texts.append(text)
+                texts.append("\n")
+
+    if texts:
+        notes.append(create_note_from_texts(texts))
+
+    if notes:
+        notes.reverse()
+
+    return notes
+
+
+def extract_metadata(soup: BeautifulSoup) -> Dict[str, Any]:
+    """Extract title, key topics and summary from the NotebookLM HTML."""
+    title_element = soup.select_one('.source-title')
+    if title_element and title_element.text:
+        title = title_element.text.strip()
+    else:
+        title = "Untitled Document"
+
+    topics = []
+    for topic in soup.select('.key-topics-chip .key-topics-text p'):
+        if topic.text.strip():
+            topics.append(topic.text.strip())
+
+    metadata = {"title": title, "tags": topics, "date": None}
+
+    summary_element = soup.select_one('.summary .mat-body-medium p')
+    if summary_element and summary_element.text and summary_element.text.strip():
+        metadata["summary"] = summary_element.text.strip()
+
+    return metadata
+
+
+def format_standard_markdown(
+    notes: List[Dict[str, str]],
+    metadata: Optional[Dict[str, Any]] = None
+) -> str:
+    """Format notes as standard Markdown."""
+    result = ""
+    if metadata and "title" in metadata:
+        result += f"# {metadata['title']}\n\n"
+    for note in notes:
+        clean_content = clean_text(note["note"])
+        result += clean_content + "\n\n"
+    return result
+
+
+def format_yaml_frontmatter(metadata: Dict[str, Any]) -> str:
+    """Create YAML frontmatter for Obsidian markdown from metadata."""
+    frontmatter = ["---"]
+
+    if "title" in metadata and metadata["title"]:
+        frontmatter.append(f'title: "{metadata["title"]}"')
+
+    if "tags" in metadata and metadata["tags"]:
+        frontmatter.append("tags:")
+        for tag in metadata["tags"]:
+            obsidian_tag = re.sub(r'[^\w\-]', '', tag.replace(" ", "-"))
+            if obsidian_tag and obsidian_tag[0].isdigit():
+                obsidian_tag = f"t{obsidian_tag}"
+            if obsidian_tag:
+                frontmatter.append(f'  - "{obsidian_tag}"')
+
+    current_date = datetime.datetime.now().strftime("%Y-%m-%d")
+    frontmatter.append(f"date: {current_date}")
+    frontmatter.append("citekey: {{citekey}}")
+    frontmatter.append("status: unread")
+    frontmatter.append("---")
+    return "\n".join(frontmatter) + "\n\n"
+
+
+def format_summary_as_callout(summary: str) -> str:
+    """Format the summary as an Obsidian callout block."""
+    if not summary:
+        return ""
+
+    clean_summary = clean_text(summary)
+    callout = "> [!summary]\n"
+    clean_summary = re.sub(r'(\*\*)([^\s])', r'\1 \2', clean_summary)
+    clean_summary = re.sub(r'([^\s])(\*\*)', r'\1 \2', clean_summary)
+    for line in clean_summary.split("\n"):
+        callout += f"> {line}\n"
+    return callout + "\n"
+
+
+def format_obsidian_markdown(
+    notes: List[Dict[str, str]],
+    metadata: Dict[str, Any]
+) -> str:
+    """Format notes as Obsidian-compatible Markdown."""
+    result = format_yaml_frontmatter(metadata)
+    if "summary" in metadata and metadata["summary"]:
+        result += format_summary_as_callout(metadata["summary"])
+    result += f"# {metadata['title']}\n\n"
+    for note in notes:
+        clean_content = clean_text(note["note"])
+        result += clean_content + "\n\n"
+    return result
@@ -0,0 +1,190 @@
+"""
+Tests for streaming archive output.
+"""
+
+import io
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+import pymupdf
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.batch.runner import run_batch
+from notebooklm_notes2md.cli.main import main
+from notebooklm_notes2md.exporters.archive import (
+    ArchiveWriter,
+    archive_extension,
+    archive_stem,
+    export_archive,
+    note_member_name,
+)
+from notebooklm_notes2md.formatters.standard import format_standard_markdown
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "full_summary.html")
+
+NOTES = [
+    {"title": "Auction Pricing", "note": "## Auction Pricing\n\nThe **price** [1]"},
+    {"title": "Self-Trading!", "note": "## Self-Trading!\n\nWash `trades`"},
+]
+METADATA = {"title": "Markets", "tags": ["Auction Pricing"], "summary": "About markets"}
+
+
+def read_members(path):
+    """Member names and contents of a .zip or .tar.gz file."""
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            return {name: archive.read(name) for name in archive.namelist()}
+    with tarfile.open(path) as archive:
+        return {
+            member.name: archive.extractfile(member).read()
+            for member in archive.getmembers()
+        }
+
+
+class TestArchiveWriter(unittest.TestCase):
+    """Test member streaming and byte counts."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_paths(self):
+        self.assertEqual(archive_extension("a/B.TAR.GZ"), ".tar.gz")
+        self.assertEqual(archive_extension("notes.md"), None)
+        self.assertEqual(archive_stem("out/notes.tar.gz"), "notes")
+        self.assertEqual(note_member_name(7, "Self-Trading: a *guide*!"),
+                         "notes/0007-self-trading-a-guide.md")
+        self.assertEqual(note_member_name(1, "???"), "notes/0001-note.md")
+
+    def test_byte_counts(self):
+        for extension in (".zip", ".tar.gz"):
+            path = os.path.join(self.temp_dir, "a" + extension)
+            with ArchiveWriter(path, mtime=0) as archive:
+                archive.write("a.md", "é" * 1000)
+                with archive.open("b.bin") as stream:
+                    stream.write(b"x" * 10)
+                    stream.write(b"y")
+            stats = archive.stats()
+            self.assertEqual(stats.members, 2)
+            self.assertEqual(stats.bytes_in, 2011)
+            self.assertEqual(stats.bytes_out, os.path.getsize(path))
+            self.assertEqual(
+                read_members(path), {"a.md": "é".encode() * 1000, "b.bin": b"x" * 10 + b"y"}
+            )
+
+    def test_members_are_append_only(self):
+        path = os.path.join(self.temp_dir, "a.zip")
+        with ArchiveWriter(path) as archive, archive.open("a") as stream:
+            stream.write(b"abc")
+            stream.seek(0)
+            self.assertEqual(stream.tell(), 0)
+            with self.assertRaises(io.UnsupportedOperation):
+                stream.write(b"x")
+            stream.seek(0, io.SEEK_END)
+            stream.write(b"d")
+        self.assertEqual(read_members(path), {"a": b"abcd"})
+
+    def test_not_an_archive(self):
+        with self.assertRaises(ValueError):
+            ArchiveWriter(os.path.join(self.temp_dir, "a.md"))
+
+
+class TestExportArchive(unittest.TestCase):
+    """Test per-note exports into archives."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_markdown_per_note(self):
+        for extension in (".zip", ".tgz"):
+            path = os.path.join(self.temp_dir, "notes" + extension)
+            stats = export_archive(iter(NOTES), path, "obsidian", METADATA)
+            members = read_members(path)
+            self.assertEqual(stats.members, 3)
+            self.assertEqual(sorted(members), [
+                "notes/index.md",
+                "notes/notes/0001-auction-pricing.md",
+                "notes/notes/0002-self-trading.md",
+            ])
+            index = members["notes/index.md"].decode()
+            self.assertTrue(index.startswith("---\ntitle: \"Markets\""))
+            self.assertIn("> [!summary]", index)
+            self.assertIn("- [Self-Trading!](notes/0002-self-trading.md)", index)
+            self.assertEqual(members["notes/notes/0001-auction-pricing.md"].decode(),
+                             "## Auction Pricing\n\nThe**price**\n\n")
+
+    def test_notes_match_single_file(self):
+        path = os.path.join(self.temp_dir, "notes.zip")
+        export_archive(NOTES, path)
+        members = read_members(path)
+        notes = b"".join(members[name] for name in sorted(members) if name != "notes/index.md")
+        self.assertEqual(notes.decode(), format_standard_markdown(NOTES))
+
+    def test_pdf_member(self):
+        path = os.path.join(self.temp_dir, "notes.zip")
+        export_archive(iter(NOTES), path, formats=("pdf", "md"))
+        members = read_members(path)
+        self.assertIn("notes/notes/0002-self-trading.md", members)
+        with pymupdf.open("pdf", members["notes/notes.pdf"]) as doc:
+            self.assertIn("Self-Trading", doc[0].get_text() + doc[-1].get_text())
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            export_archive(NOTES, os.path.join(self.temp_dir, "a.zip"), formats=("epub",))
+
+
+class TestArchiveCli(unittest.TestCase):
+    """Test archive output from the command line and in batches."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_cli(self):
+        output_path = os.path.join(self.temp_dir, "notes.tar.gz")
+        argv = ["notebooklm-export", TEST_FILE, output_path, "--archive-formats", "md,pdf"]
+        with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()) as output:
+            main()
+        self.assertIn("Archive: 3 files", output.getvalue())
+        self.assertIn("notes/notes.pdf", read_members(output_path))
+
+        argv[-1] = "md,epub"
+        with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()), \
+                self.assertRaises(SystemExit):
+            main()
+
+    def test_batch(self):
+        inputs = []
+        for name in ("a", "b"):
+            inputs.append(os.path.join(self.temp_dir, name + ".html"))
+            shutil.copy(TEST_FILE, inputs[-1])
+        output_path = os.path.join(self.temp_dir, "out.zip")
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(run_batch(inputs, output_path, format_type="obsidian"), 0)
+        members = read_members(output_path)
+        self.assertEqual(sorted(members), ["a.md", "b.md"])
+        self.assertTrue(members["a.md"].startswith(b"---\ntitle:"))
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "a.md")))
+
+        with self.assertRaises(ValueError):
+            run_batch(inputs, output_path, workers=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+"""
+Tests for automatic wikilinks of topic and vault note mentions.
+"""
+
+import io
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.cli.main import main
+from notebooklm_notes2md.formatters.autolink import (
+    AutolinkConfig,
+    AutoLinker,
+    TermMatcher,
+    build_autolinker,
+    load_vault_titles,
+    term_matcher,
+)
+from notebooklm_notes2md.utils.text_processing import clean_text
+
+
+def brute_force(terms, text):
+    """Find whole-word, case-insensitive mentions with one regex per term."""
+    matches = set()
+    for index, term in enumerate(terms):
+        pattern = re.compile(r"(?<!\w)" + re.escape(term) + r"(?!\w)", re.IGNORECASE)
+        for start in range(len(text)):
+            match = pattern.match(text, start)
+            if match:
+                matches.add((match.start(), match.end(), index))
+    return matches
+
+
+class TestTermMatcher(unittest.TestCase):
+    """Test the Aho-Corasick automaton."""
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        words = ["he", "she", "his", "hers", "a", "ab", "bab", "abc"]
+        for _ in range(200):
+            terms = rng.sample(words, 4) + [" ".join(rng.sample(words, 2))]
+            text = " ".join(rng.choice(words + ["x", "ha", "sheher"]) for _ in range(30))
+            matcher = TermMatcher(terms)
+            self.assertEqual(set(matcher.find(text)), brute_force(matcher.terms, text))
+
+    def test_whole_words_and_case(self):
+        matcher = TermMatcher(["Market"])
+        self.assertEqual(matcher.find("MARKET, supermarket, markets, market_x"), [(0, 6, 0)])
+
+    def test_duplicate_spellings_keep_first(self):
+        self.assertEqual(TermMatcher(["Game Theory", "game theory", " "]).terms, ["Game Theory"])
+
+    def test_cached_per_term_list(self):
+        self.assertIs(term_matcher(("a", "b")), term_matcher(("a", "b")))
+
+
+class TestAutoLinker(unittest.TestCase):
+    """Test rewriting mentions as wikilinks."""
+
+    def setUp(self):
+        self.linker = AutoLinker([TermMatcher(["Market Simulation", "Market", "Price"])])
+
+    def test_longest_mention_wins(self):
+        self.assertEqual(
+            self.linker.link("A market simulation of the market."),
+            "A [[Market Simulation|market simulation]] of the [[Market|market]].",
+        )
+
+    def test_first_mention_only(self):
+        self.assertEqual(
+            self.linker.link("Price and Price again."),
+            "[[Price]] and Price again.",
+        )
+        link_all = AutoLinker(self.linker.matchers, first_only=False)
+        self.assertEqual(link_all.link("Price and Price."), "[[Price]] and [[Price]].")
+
+    def test_protected_regions_untouched(self):
+        text = (
+            "### Market notes\n"
+            "Use `Price` here, [[Market]] there.\n"
+            "```\nPrice\n```\n"
+            "The Price."
+        )
+        self.assertEqual(self.linker.link(text), text.replace("The Price.", "The [[Price]]."))
+
+    def test_reference_markers_untouched(self):
+        """Test that a numeric vault title does not link citation markers."""
+        linker = AutoLinker([TermMatcher(["2"])])
+        text = "Prices rise [2]. Bids fall [1, 2] and [2-3]."
+        self.assertEqual(linker.link(text), text)
+        self.assertEqual(clean_text(linker.link(text)), clean_text(text))
+        self.assertEqual(linker.link("Figure 2 [2]."), "Figure [[2]] [2].")
+
+    def test_earlier_matcher_wins(self):
+        linker = AutoLinker([TermMatcher(["price"]), TermMatcher(["Price"])])
+        self.assertEqual(linker.link("Price"), "[[price|Price]]")
+
+    def test_build_from_metadata_and_vault(self):
+        config = AutolinkConfig(vault_titles=("Auctions",))
+        linker = build_autolinker(config, {"tags": ["Bidding"]})
+        self.assertEqual(
+            linker.link("Bidding in auctions."),
+            "[[Bidding]] in [[Auctions|auctions]].",
+        )
+        self.assertEqual(build_autolinker(AutolinkConfig(), None).link("Bidding"), "Bidding")
+
+
+class TestAutolinkCli(unittest.TestCase):
+    """Test the --autolink and --vault options."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.vault = os.path.join(self.temp_dir, "vault")
+        os.makedirs(os.path.join(self.vault, "topics"))
+        os.makedirs(os.path.join(self.vault, ".obsidian"))
+        for name in ("topics/Game Theory.md", ".obsidian/Hidden.md", "Index.md", "image.png"):
+            open(os.path.join(self.vault, name), "w").close()
+        self.input_path = os.path.join(self.temp_dir, "notes.html")
+        with open(self.input_path, "w", encoding="utf-8") as f:
+            f.write(
+                '<div class="source-title">Notebook</div>'
+                '<div class="key-topics-chip"><div class="key-topics-text"><p>Auctions</p></div></div>'
+                "<labs-tailwind-doc-viewer><labs-tailwind-structural-element-view-v2>"
+                '<div class="paragraph heading3"><span>Auctions</span></div>'
+                "</labs-tailwind-structural-element-view-v2><labs-tailwind-structural-element-view-v2>"
+                '<div class="paragraph normal"><span>Auctions use game theory.</span></div>'
+                "</labs-tailwind-structural-element-view-v2></labs-tailwind-doc-viewer>"
+            )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def run_main(self, *options):
+        output_path = os.path.join(self.temp_dir, "out.md")
+        argv = ["notebooklm-export", self.input_path, output_path, *options]
+        with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()):
+            main()
+        with open(output_path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_load_vault_titles(self):
+        self.assertEqual(load_vault_titles(self.vault), ("Game Theory", "Index"))
+
+    def test_default_output_unchanged(self):
+        self.assertIn("Auctions use game theory.", self.run_main())
+
+    def test_vault_links(self):
+        content = self.run_main("--vault", self.vault)
+        self.assertIn("[[Auctions]] use [[Game Theory|game theory]].", content)
+        # The note heading is not rewritten
+        self.assertNotIn("# [[", content)
+
+
+if __name__ == "__main__":
+    unittest.main()
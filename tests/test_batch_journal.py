@@ -0,0 +1,130 @@
+"""
+Tests for the batch job journal.
+"""
+
+import io
+import multiprocessing
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.batch import runner
+from notebooklm_notes2md.batch.journal import BatchJournal
+from notebooklm_notes2md.batch.runner import run_batch
+
+
+def _claim_all(journal_path, queue):
+    """Claim and complete every available job (run in a child process)."""
+    with BatchJournal(journal_path) as journal:
+        claimed = []
+        job = journal.claim()
+        while job is not None:
+            claimed.append(job.input_path)
+            journal.complete(job, "hash", 0.0)
+            job = journal.claim()
+    queue.put(claimed)
+
+
+class TestBatchJournal(unittest.TestCase):
+    """Test journal states, retries and claims."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "journal.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_bounded_retries(self):
+        """Test that a failing file is retried up to the attempt limit."""
+        with BatchJournal(self.path, max_attempts=2) as journal:
+            journal.register([("a.html", "a.md")])
+            for attempt in (1, 2):
+                job = journal.claim()
+                self.assertEqual(job.attempt, attempt)
+                journal.fail(job, "boom", 0.0)
+            self.assertIsNone(journal.claim())
+            self.assertEqual(journal.counts()["failed"], 1)
+
+    def test_abandoned_file_is_reclaimed(self):
+        """Test that a file left running by a dead worker can be claimed."""
+        finished = subprocess.Popen([sys.executable, "-c", "pass"])
+        finished.wait()
+        dead_worker = f"{socket.gethostname()}:{finished.pid}"
+        with BatchJournal(self.path, worker=dead_worker) as journal:
+            journal.register([("a.html", "a.md")])
+            self.assertIsNotNone(journal.claim())
+        with BatchJournal(self.path) as journal:
+            job = journal.claim()
+            self.assertEqual(job.attempt, 2)
+
+    def test_concurrent_workers_claim_each_file_once(self):
+        """Test that workers sharing a journal never claim the same file."""
+        with BatchJournal(self.path) as journal:
+            journal.register([(f"{i}.html", f"{i}.md") for i in range(40)])
+
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        workers = [context.Process(target=_claim_all, args=(self.path, queue)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        claimed = [path for _ in workers for path in queue.get(timeout=60)]
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(sorted(claimed), sorted(f"{i}.html" for i in range(40)))
+
+
+class TestJournaledBatch(unittest.TestCase):
+    """Test resuming a batch run."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        source = os.path.join(os.path.dirname(__file__), 'full_summary.html')
+        self.inputs = []
+        for name in ("monday.html", "tuesday.html"):
+            path = os.path.join(self.temp_dir, name)
+            shutil.copy(source, path)
+            self.inputs.append(path)
+        self.journal_path = os.path.join(self.temp_dir, "journal.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _run(self, resume):
+        calls = []
+        convert_file = runner.convert_file
+
+        def record(input_path, *args):
+            calls.append(os.path.basename(input_path))
+            convert_file(input_path, *args)
+
+        with BatchJournal(self.journal_path) as journal, \
+                patch.object(runner, "convert_file", side_effect=record), \
+                redirect_stdout(io.StringIO()):
+            failures = run_batch(self.inputs, self.temp_dir, journal=journal, resume=resume)
+        self.assertEqual(failures, 0)
+        return calls
+
+    def test_resume_skips_finished_files(self):
+        """Test that resuming only converts files that are not done."""
+        self.assertEqual(self._run(resume=False), ["monday.html", "tuesday.html"])
+        self.assertEqual(self._run(resume=True), [])
+
+        with open(self.inputs[1], "a", encoding="utf-8") as f:
+            f.write("\n")
+        self.assertEqual(self._run(resume=True), ["tuesday.html"])
+        self.assertEqual(self._run(resume=False), ["monday.html", "tuesday.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
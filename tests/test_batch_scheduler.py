@@ -0,0 +1,95 @@
+"""
+Tests for the size-aware batch scheduler.
+"""
+
+import io
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.batch.runner import run_batch
+from notebooklm_notes2md.batch.scheduler import (
+    MIB,
+    BatchProgress,
+    FileJob,
+    next_job_index,
+    order_jobs,
+)
+from notebooklm_notes2md.formatters.templates import builtin_template_set
+
+
+def job(name, size_mib):
+    return FileJob(name, name + ".md", size_mib * MIB, size_mib * 20 * MIB, float(size_mib))
+
+
+class TestScheduling(unittest.TestCase):
+    """Test dispatch order and the memory budget."""
+
+    def test_largest_first(self):
+        """Test that larger files are dispatched first, ties in input order."""
+        jobs = [job("a", 1), job("b", 50), job("c", 1), job("d", 10)]
+        self.assertEqual([j.input_path for j in order_jobs(jobs)], ["b", "d", "a", "c"])
+
+    def test_memory_budget(self):
+        """Test that a large job waits while a smaller one fits."""
+        pending = order_jobs([job("big", 50), job("small", 1)])
+        budget = 1200 * MIB
+        self.assertEqual(next_job_index(pending, 0, budget, running=0), 0)
+        # 1000 MiB in use: the 1000 MiB job does not fit, the 20 MiB one does
+        self.assertEqual(next_job_index(pending, 1000 * MIB, budget, running=1), 1)
+        self.assertIsNone(next_job_index(pending, 1190 * MIB, budget, running=1))
+        # A job above the budget still runs when nothing else does
+        self.assertEqual(next_job_index(pending, 0, 10 * MIB, running=0), 0)
+
+    def test_progress(self):
+        """Test the progress line."""
+        progress = BatchProgress([job("a", 2), job("b", 6)])
+        line = progress.update(job("a", 2))
+        self.assertTrue(line.startswith("Progress: 1/2 files, 2.0/8.0 MiB ("))
+        self.assertTrue(line.endswith(" MiB/s)"))
+
+    def test_templates_pickle(self):
+        """Test that template sets can be sent to worker processes."""
+        templates = pickle.loads(pickle.dumps(builtin_template_set("obsidian")))
+        self.assertEqual(templates.heading({"title": "T"}), "# T\n\n")
+
+
+class TestParallelBatch(unittest.TestCase):
+    """Test converting files in worker processes."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        source = os.path.join(os.path.dirname(__file__), 'full_summary.html')
+        self.inputs = []
+        for name in ("a.html", "b.html", "c.html"):
+            path = os.path.join(self.temp_dir, name)
+            shutil.copy(source, path)
+            self.inputs.append(path)
+        self.inputs.append(os.path.join(self.temp_dir, "missing.html"))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_parallel_matches_sequential(self):
+        """Test that worker processes write the same files."""
+        parallel_dir = os.path.join(self.temp_dir, "parallel")
+        os.mkdir(parallel_dir)
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(run_batch(self.inputs, self.temp_dir), 1)
+            self.assertEqual(run_batch(self.inputs, parallel_dir, workers=2), 1)
+
+        for name in ("a.md", "b.md", "c.md"):
+            with open(os.path.join(self.temp_dir, name), encoding="utf-8") as f1, \
+                    open(os.path.join(parallel_dir, name), encoding="utf-8") as f2:
+                self.assertEqual(f2.read(), f1.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+Tests for chunked JSONL export.
+"""
+
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.cli.main import main
+from notebooklm_notes2md.cli.stream import parse_main, render_main
+from notebooklm_notes2md.exporters import chunks
+from notebooklm_notes2md.exporters.chunks import (
+    ChunkOptions,
+    chunk_note,
+    estimate_tokens,
+    iter_chunk_records,
+    write_chunks,
+)
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "full_summary.html")
+
+NOTE = (
+    "## Overview\n\n"
+    "Overview text [1].\n\n"
+    "## Details\n\n"
+    "First detail [2, 3]. Second detail [4].\n\n"
+    "Closing words."
+)
+
+
+def read_records(path):
+    """Return the records of a JSONL file."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestChunkNote(unittest.TestCase):
+    """Test splitting a note into chunks."""
+
+    def test_estimate_tokens(self):
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("abcd"), 1)
+        self.assertEqual(estimate_tokens("abcde"), 2)
+
+    def test_headings_start_chunks(self):
+        result = chunk_note(NOTE)
+        self.assertEqual([chunk.heading for chunk in result], ["Overview", "Details"])
+        self.assertEqual(result[0].text, "## Overview\n\nOverview text.")
+        self.assertEqual(
+            result[1].text,
+            "## Details\n\nFirst detail. Second detail.\n\nClosing words.",
+        )
+        self.assertEqual([chunk.citations for chunk in result], [(1,), (2, 3, 4)])
+
+    def test_text_before_heading(self):
+        result = chunk_note("Intro.\n\n## Part\n\nBody.")
+        self.assertEqual([chunk.heading for chunk in result], [None, "Part"])
+
+    def test_packs_blocks_within_budget(self):
+        text = "\n\n".join(f"Paragraph {index}." for index in range(6))
+        result = chunk_note(text, ChunkOptions(max_tokens=8))
+        for chunk in result:
+            self.assertLessEqual(chunk.tokens, 8)
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result[0].text, "Paragraph 0.\n\nParagraph 1.")
+
+    def test_splits_long_paragraph_at_sentences(self):
+        text = "First sentence here [1]. Second sentence here [2]. Third one [3]."
+        result = chunk_note(text, ChunkOptions(max_tokens=7))
+        self.assertEqual(
+            [(chunk.text, chunk.citations) for chunk in result],
+            [
+                ("First sentence here.", (1,)),
+                ("Second sentence here.", (2,)),
+                ("Third one.", (3,)),
+            ],
+        )
+
+    def test_splits_long_sentence_at_words(self):
+        result = chunk_note("alpha beta gamma delta epsilon", ChunkOptions(max_tokens=4))
+        self.assertEqual([chunk.text for chunk in result], ["alpha beta", "gamma delta", "epsilon"])
+
+    def test_custom_counter(self):
+        options = ChunkOptions(max_tokens=2, count_tokens=lambda text: len(text.split()))
+        result = chunk_note("one two three four five", options)
+        self.assertEqual([chunk.text for chunk in result], ["one two", "three four", "five"])
+
+    def test_empty_note(self):
+        self.assertEqual(chunk_note(""), [])
+
+
+class TestWriteChunks(unittest.TestCase):
+    """Test chunk records and the JSONL file."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_records(self):
+        notes = [{"title": "One", "note": NOTE}, {"title": "Two", "note": "Plain é."}]
+        records = list(iter_chunk_records(notes, {"title": "Doc", "tags": ["a"]}))
+        self.assertEqual([record["id"] for record in records], ["1-0", "1-1", "2-0"])
+        self.assertEqual(records[2], {
+            "id": "2-0", "document": "Doc", "tags": ["a"], "note": 2, "title": "Two",
+            "heading": None, "chunk": 0, "citations": [], "tokens": 2, "text": "Plain é.",
+        })
+
+    def test_write(self):
+        notes = [{"title": f"Note {index}", "note": NOTE} for index in range(5)]
+        path = os.path.join(self.temp_dir, "chunks.jsonl")
+        with patch.object(chunks, "WRITE_BATCH", 3):
+            count = write_chunks(path, iter(notes))
+        self.assertEqual(count, 10)
+        self.assertEqual(read_records(path), list(iter_chunk_records(notes)))
+
+    def test_rejects_empty_budget(self):
+        path = os.path.join(self.temp_dir, "chunks.jsonl")
+        with self.assertRaises(ValueError):
+            write_chunks(path, [], options=ChunkOptions(max_tokens=0))
+
+
+class TestChunkCommands(unittest.TestCase):
+    """Test .jsonl output from the command line."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def run_main(self, *args):
+        argv = ["notebooklm-export", TEST_FILE, *args]
+        with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()) as output:
+            main()
+        return output.getvalue()
+
+    def test_export(self):
+        path = os.path.join(self.temp_dir, "chunks.jsonl")
+        output = self.run_main(path, "--chunk-tokens", "64")
+        self.assertIn("Successfully exported", output)
+        records = read_records(path)
+        self.assertTrue(records)
+        for record in records:
+            self.assertLessEqual(record["tokens"], 64)
+            self.assertNotRegex(record["text"], r"\[\d")
+
+    def test_rejects_empty_budget(self):
+        path = os.path.join(self.temp_dir, "chunks.jsonl")
+        with self.assertRaises(SystemExit):
+            self.run_main(path, "--chunk-tokens", "0")
+        self.assertFalse(os.path.exists(path))
+
+    def test_render_matches_direct_export(self):
+        direct = os.path.join(self.temp_dir, "direct.jsonl")
+        notes_path = os.path.join(self.temp_dir, "notes.jsonl")
+        rendered = os.path.join(self.temp_dir, "rendered.jsonl")
+        self.run_main(direct)
+        with redirect_stdout(io.StringIO()):
+            parse_main([TEST_FILE, "-o", notes_path])
+            render_main([notes_path, rendered])
+        self.assertEqual(read_records(rendered), read_records(direct))
+
+    def test_render_rejects_input_path(self):
+        notes_path = os.path.join(self.temp_dir, "notes.jsonl")
+        with redirect_stdout(io.StringIO()):
+            parse_main([TEST_FILE, "-o", notes_path])
+            with self.assertRaises(SystemExit):
+                render_main([notes_path, notes_path])
+
+
+if __name__ == "__main__":
+    unittest.main()
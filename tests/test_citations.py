@@ -0,0 +1,164 @@
+"""
+Tests for the citation index built from reference numbers.
+"""
+
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.cli.main import export_to_markdown, main
+from notebooklm_notes2md.formatters.citations import (
+    CitationIndex,
+    citation_sidecar_path,
+    expand_marker,
+)
+from notebooklm_notes2md.utils.text_processing import clean_text, split_references
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "full_summary.html")
+
+NOTES = [
+    {"title": "Pricing", "note": "## Pricing\n\nPrices clear daily [1, 2]. Again [2][2-3].\n"},
+    {"title": "Plain", "note": "## Plain\n\nNo sources here."},
+    {"title": "Ranges", "note": "Ranges [5-3] and **bold** [1]"},
+]
+METADATA = {"title": "Markets", "tags": ["Pricing"]}
+
+
+class TestCitationIndex(unittest.TestCase):
+    """Test marker expansion, positions and footnotes."""
+
+    def test_expand_marker(self):
+        self.assertEqual(expand_marker("[1, 2]"), (1, 2))
+        self.assertEqual(expand_marker("[ 4-6, 5 ]"), (4, 5, 6))
+        self.assertEqual(expand_marker("[6-4]"), (4, 5, 6))
+        # Implausible ranges keep their ends only
+        self.assertEqual(expand_marker("[1-99999]"), (1, 99999))
+
+    def test_split_references(self):
+        self.assertEqual(split_references("a [1] b"), ["a ", "[1]", " b"])
+        self.assertEqual(split_references("none"), ["none"])
+
+    def test_text_matches_stripping(self):
+        index = CitationIndex()
+        for note in NOTES:
+            self.assertEqual(index.clean(note["note"]), clean_text(note["note"]))
+
+    def test_positions(self):
+        index = CitationIndex()
+        text = index.clean(NOTES[0]["note"])
+        first = text.index(". Again")
+        last = text.index(".\n", first + 1)
+        self.assertEqual(index.notes[0], {1: [first], 2: [first, last], 3: [last]})
+        index.clean(NOTES[1]["note"])
+        self.assertEqual(index.notes[1], {})
+
+    def test_positions_follow_cleaning(self):
+        """Test that positions index the output after whitespace fixes."""
+        index = CitationIndex()
+        text = index.clean(
+            "The **market**  clears [1]. Prices `rise` fast [2-3].\n\n\n\nLater [4] **too**"
+        )
+        self.assertEqual(text, "The**market**clears . Prices`rise`fast .\n\nLater**too**")
+        cited = {
+            source: [(text[:position][-6:], text[position:][:4]) for position in positions]
+            for source, positions in index.notes[0].items()
+        }
+        self.assertEqual(cited, {
+            1: [("lears ", ". Pr")],
+            2: [("`fast ", ".\n\nL")],
+            3: [("`fast ", ".\n\nL")],
+            4: [("\nLater", "**to")],
+        })
+
+    def test_footnote_positions(self):
+        """Test that with footnotes positions are where the references start."""
+        index = CitationIndex(footnotes=True)
+        text = index.clean("A  `b` [1, 2]. C [2].")
+        self.assertEqual(
+            [text[position:][:7] for position in index.notes[0][2]],
+            ["[^1-1][", "[^1-2]."],
+        )
+        self.assertEqual(index.notes[0][1], index.notes[0][2][:1])
+
+    def test_entries(self):
+        index = CitationIndex(start=3)
+        for note in NOTES:
+            index.clean(note["note"])
+        entries = index.entries([note["title"] for note in NOTES])
+        self.assertEqual([entry["note"] for entry in entries], [3, 5])
+        self.assertEqual(entries[1]["title"], "Ranges")
+        self.assertEqual(sorted(entries[1]["sources"]), ["1", "3", "4", "5"])
+
+    def test_footnotes(self):
+        index = CitationIndex(footnotes=True)
+        text = index.clean(NOTES[0]["note"])
+        self.assertIn("daily [^1-1][^1-2]. Again [^1-2][^1-2][^1-3].", text)
+        self.assertTrue(text.endswith(
+            "\n\n[^1-1]: Source 1\n[^1-2]: Source 2\n[^1-3]: Source 3"
+        ))
+        self.assertEqual(index.clean(NOTES[1]["note"]), clean_text(NOTES[1]["note"]))
+
+
+class TestCitationExport(unittest.TestCase):
+    """Test the citation styles of Markdown export."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_path = os.path.join(self.temp_dir, "notes.md")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def read(self, path=None):
+        with open(path or self.output_path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_strip_is_unchanged(self):
+        export_to_markdown(NOTES, self.output_path, "obsidian", METADATA)
+        stripped = self.read()
+        export_to_markdown(NOTES, self.output_path, "obsidian", METADATA, citations="sidecar")
+        self.assertEqual(self.read(), stripped)
+
+    def test_sidecar(self):
+        export_to_markdown(NOTES, self.output_path, metadata=METADATA, citations="sidecar")
+        sidecar = citation_sidecar_path(self.output_path)
+        self.assertEqual(sidecar, os.path.join(self.temp_dir, "notes.citations.json"))
+        document = json.loads(self.read(sidecar))
+        self.assertEqual(document["title"], "Markets")
+        self.assertEqual([entry["title"] for entry in document["notes"]], ["Pricing", "Ranges"])
+
+    def test_frontmatter(self):
+        export_to_markdown(NOTES, self.output_path, "obsidian", METADATA, citations="frontmatter")
+        content = self.read()
+        frontmatter = content.split("---\n")[1]
+        line = next(line for line in frontmatter.splitlines() if line.startswith("citations: "))
+        field = json.loads(line[len("citations: "):])
+        self.assertEqual(sorted(field), ["1", "3"])
+        self.assertEqual(sorted(field["3"]), ["1", "3", "4", "5"])
+        self.assertIn("# Markets\n\n## Pricing", content)
+
+    def test_cli(self):
+        argv = ["notebooklm-export", TEST_FILE, self.output_path, "--citations", "footnotes"]
+        with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()):
+            main()
+        self.assertIn("[^1-1]: Source 1", self.read())
+
+        for extra in (["--citations", "frontmatter"], ["--citations", "sidecar", "--append"]):
+            argv = ["notebooklm-export", TEST_FILE, self.output_path, *extra]
+            with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()) as output, \
+                    self.assertRaises(SystemExit):
+                main()
+            self.assertIn("Error: --citations", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+"""
+Tests for note fingerprinting and batch deduplication.
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.batch import runner
+from notebooklm_notes2md.batch.runner import run_batch
+from notebooklm_notes2md.cli.batch import batch_main
+from notebooklm_notes2md.core.dedup import (
+    DedupIndex,
+    fingerprint_note,
+    hamming_distance,
+    simhash,
+)
+
+BODY = (
+    "## Auction Pricing\n\nThe daily price is set where the overlap of bids "
+    "and asks maximizes total satisfaction across all buyers and sellers in "
+    "the simulated market, which keeps volume high and prices stable."
+)
+
+
+class TestFingerprinting(unittest.TestCase):
+    """Test content fingerprints."""
+
+    def test_fingerprint_ignores_cleaned_differences(self):
+        """Test that references and whitespace do not change the fingerprint."""
+        first = {"title": "A", "note": BODY}
+        second = {"title": "A", "note": BODY.replace("asks", "asks [1, 2]") + "\n\n\n"}
+        self.assertEqual(fingerprint_note(first), fingerprint_note(second))
+
+    def test_fingerprint_detects_changes(self):
+        """Test that different content gives a different fingerprint."""
+        first = {"title": "A", "note": BODY}
+        second = {"title": "A", "note": BODY.replace("daily", "weekly")}
+        self.assertNotEqual(fingerprint_note(first), fingerprint_note(second))
+
+    def test_simhash_is_close_for_small_edits(self):
+        """Test that a one-word edit keeps signatures close."""
+        edited = BODY.replace("stable", "steady")
+        self.assertLessEqual(hamming_distance(simhash(BODY), simhash(edited)), 10)
+
+
+class TestDedupIndex(unittest.TestCase):
+    """Test the duplicate index."""
+
+    def test_exact_duplicate(self):
+        """Test that an exact duplicate reports the original reference."""
+        index = DedupIndex()
+        self.assertIsNone(index.add({"title": "A", "note": BODY}, "first.md"))
+        duplicate = index.add({"title": "A", "note": BODY}, "second.md")
+        self.assertIsNotNone(duplicate)
+        self.assertEqual(duplicate.ref, "first.md")
+        self.assertTrue(duplicate.exact)
+
+    def test_near_duplicate_requires_opt_in(self):
+        """Test that near duplicates are only found when enabled."""
+        edited = {"title": "A", "note": BODY.replace("stable", "steady")}
+
+        exact_only = DedupIndex()
+        exact_only.add({"title": "A", "note": BODY}, "first.md")
+        self.assertIsNone(exact_only.add(edited, "second.md"))
+
+        near = DedupIndex(near_duplicates=True, max_distance=10)
+        near.add({"title": "A", "note": BODY}, "first.md")
+        duplicate = near.add(edited, "second.md")
+        self.assertIsNotNone(duplicate)
+        self.assertFalse(duplicate.exact)
+
+    def test_find_does_not_register(self):
+        """Test that a lookup leaves the index unchanged."""
+        index = DedupIndex()
+        note = {"title": "A", "note": BODY}
+        self.assertIsNone(index.find(note))
+        self.assertIsNone(index.add(note, "first.md"))
+        self.assertEqual(index.find(note).ref, "first.md")
+
+    def test_save_and_load(self):
+        """Test that a saved index detects duplicates in a later run."""
+        index = DedupIndex(near_duplicates=True)
+        index.add({"title": "A", "note": BODY}, "first.md")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "index.json")
+            index.save(path)
+            reloaded = DedupIndex(near_duplicates=True)
+            reloaded.load(path)
+
+        self.assertEqual(len(reloaded), 1)
+        duplicate = reloaded.add({"title": "A", "note": BODY}, "later.md")
+        self.assertEqual(duplicate.ref, "first.md")
+
+
+class TestBatchDeduplication(unittest.TestCase):
+    """Test deduplication in the batch path."""
+
+    def setUp(self):
+        """Copy the same export twice into a temporary directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        source = os.path.join(os.path.dirname(__file__), 'full_summary.html')
+        self.inputs = []
+        for name in ("monday.html", "tuesday.html"):
+            path = os.path.join(self.temp_dir, name)
+            shutil.copy(source, path)
+            self.inputs.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _run(self, duplicates):
+        with redirect_stdout(io.StringIO()):
+            failures = run_batch(
+                self.inputs, self.temp_dir, ".md",
+                dedup=DedupIndex(), duplicates=duplicates,
+            )
+        self.assertEqual(failures, 0)
+        with open(os.path.join(self.temp_dir, "tuesday.md"), encoding="utf-8") as f:
+            return f.read()
+
+    def test_skip_duplicates(self):
+        """Test that the second export omits notes already exported."""
+        content = self._run("skip")
+        self.assertNotIn("Market Simulation Mechanics", content)
+
+    def test_link_duplicates(self):
+        """Test that the second export links to the first export."""
+        content = self._run("link")
+        self.assertIn("Duplicate of", content)
+        self.assertIn("(monday.md)", content)
+
+    def test_failed_export_is_not_indexed(self):
+        """Test that notes of a failed export are not skipped later."""
+        export_notes = runner.export_notes
+
+        def fail_monday(notes, output_path, *args, **kwargs):
+            if output_path.endswith("monday.md"):
+                raise ValueError("cannot render monday")
+            export_notes(notes, output_path, *args, **kwargs)
+
+        dedup = DedupIndex()
+        with patch.object(runner, "export_notes", fail_monday), \
+                redirect_stdout(io.StringIO()) as output:
+            failures = run_batch(self.inputs, self.temp_dir, ".md", dedup=dedup)
+        self.assertEqual(failures, 1)
+        self.assertIn("Error: cannot render monday", output.getvalue())
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "monday.md")))
+        with open(os.path.join(self.temp_dir, "tuesday.md"), encoding="utf-8") as f:
+            self.assertIn("Market Simulation Mechanics", f.read())
+
+    def test_index_requires_dedup(self):
+        """Test that an index alone is rejected instead of implying skip."""
+        index_path = os.path.join(self.temp_dir, "fingerprints.json")
+        with redirect_stdout(io.StringIO()) as output, self.assertRaises(SystemExit):
+            batch_main([*self.inputs, "-o", self.temp_dir, "--dedup-index", index_path])
+        self.assertIn("--dedup-index requires --dedup", output.getvalue())
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "tuesday.md")))
+
+
+if __name__ == "__main__":
+    unittest.main()
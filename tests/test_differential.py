@@ -0,0 +1,312 @@
+"""
+Differential tests of the parsing and formatting engines.
+
+Random NotebookLM-style exports and texts are generated from fixed seeds
+and every engine (parser backends, parallel and low-memory modes,
+formatters, templates, note streams) must produce byte-identical output
+to the frozen implementations in ``tests/reference.py``.
+
+Environment variables:
+    NOTES2MD_FUZZ_CASES: Number of random cases per test (default 30)
+    NOTES2MD_FUZZ_SEED: First seed, to reproduce a reported failure
+    NOTES2MD_SPEEDUP_REPORT: Write the speedup of each engine over the
+        reference, as JSON, to this path
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import unittest
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import reference
+
+from notebooklm_notes2md.core.parallel_parse import parse_notes_parallel
+from notebooklm_notes2md.core.parser import parse_notes
+from notebooklm_notes2md.core.selection import iter_notes_from_end
+from notebooklm_notes2md.core.shared_notes import SharedNoteStore
+from notebooklm_notes2md.core.stream import open_note_stream, write_note_stream
+from notebooklm_notes2md.extractors.metadata import extract_metadata
+from notebooklm_notes2md.formatters.obsidian import format_obsidian_markdown
+from notebooklm_notes2md.formatters.standard import format_standard_markdown
+from notebooklm_notes2md.formatters.templates import (
+    builtin_template_set,
+    format_template_markdown,
+)
+from notebooklm_notes2md.utils.html_processing import drill_into_tag, drill_into_tag_html
+from notebooklm_notes2md.utils.text_processing import clean_text
+
+CASES = int(os.environ.get("NOTES2MD_FUZZ_CASES", "30"))
+FIRST_SEED = int(os.environ.get("NOTES2MD_FUZZ_SEED", "0"))
+
+# Seconds spent per engine and by the reference it is compared with
+TIMINGS: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0.0])
+
+WORDS = [
+    "price", "bid", "ask", "Équilibre", "naïve", "市场", "📈", "x<y", "a&b",
+    "**", "`", "-", "--", "#", "##", "[1]", "[2, 3]", "[4-6]", "[ 7 ]",
+    "[x]", "*", "_", "\\", "'", '"', ">", "|", "1.", "~~", "http://a.b/c",
+]
+SPACES = [" ", " ", " ", "  ", "\n", "\t", " ", ""]
+
+
+def random_text(rng: random.Random, words: int = 12) -> str:
+    """Text mixing Markdown syntax, references, whitespace and Unicode."""
+    return "".join(rng.choice(WORDS) + rng.choice(SPACES) for _ in range(rng.randint(0, words)))
+
+
+def random_span(rng: random.Random) -> str:
+    classes = rng.choice(["", "bold", "code", "bold code", "code bold", "italic", "bold extra"])
+    text = random_text(rng, 5).replace("&", "&amp;").replace("<", "&lt;")
+    return f'<span class="{classes} ng-star-inserted">{text}</span>'
+
+
+def random_block(rng: random.Random) -> str:
+    """One inner element of a structural element."""
+    kind = rng.random()
+    spans = "".join(random_span(rng) for _ in range(rng.randint(0, 4)))
+    if kind < 0.1:
+        return '<div class="paragraph normal ng-star-inserted"></div>'
+    if kind < 0.2:
+        return f'<div class="paragraph heading3 ng-star-inserted">{spans}</div>'
+    if kind < 0.3:
+        return '<div class="bullet ng-star-inserted"><span>•</span></div>'
+    if kind < 0.35:
+        return "<!---->"
+    if kind < 0.4:
+        # Markup the walker has no rule for
+        return f"<p><b>{spans}</b><a href='#'>{random_text(rng, 2)}</a></p>"
+    if kind < 0.45:
+        return f'<div class="other"><div class="paragraph">{spans}</div>{spans}</div>'
+    return f'<div class="paragraph normal ng-star-inserted">{spans}</div>'
+
+
+def random_export(rng: random.Random) -> str:
+    """An export with a random header and random structural elements."""
+    header = ""
+    if rng.random() < 0.9:
+        header += f'<div class="source-title"> {random_text(rng, 4)} </div>'
+    if rng.random() < 0.7:
+        header += (
+            '<div class="summary"><div class="mat-body-medium">'
+            f"<p>{random_text(rng, 30)}</p></div></div>"
+        )
+    topics = "".join(
+        f'<div class="key-topics-chip"><div class="key-topics-text"><p>{random_text(rng, 3)}</p>'
+        "</div></div>"
+        for _ in range(rng.randint(0, 5))
+    )
+    elements = []
+    for _ in range(rng.randint(0, 40)):
+        blocks = "".join(random_block(rng) for _ in range(rng.randint(0, 4)))
+        separator = "<!---->" if rng.random() < 0.5 else ""
+        elements.append(
+            '<labs-tailwind-structural-element-view-v2 class="ng-star-inserted">'
+            f"{separator}{blocks}{separator}</labs-tailwind-structural-element-view-v2>"
+        )
+        if rng.random() < 0.1:
+            elements.append("\n  ")
+    return (
+        f'<html><body><div class="key-topics">{topics}</div>{header}'
+        '<labs-tailwind-doc-viewer class="ng-star-inserted">'
+        + "".join(elements) + "</labs-tailwind-doc-viewer></body></html>"
+    )
+
+
+def timed(label: str, engine: Callable[[], Any], oracle: Callable[[], Any]) -> Tuple[Any, Any]:
+    """Run an engine and its reference, adding their times to TIMINGS."""
+    start = time.perf_counter()
+    expected = oracle()
+    middle = time.perf_counter()
+    actual = engine()
+    end = time.perf_counter()
+    TIMINGS[label][0] += end - middle
+    TIMINGS[label][1] += middle - start
+    return actual, expected
+
+
+def tearDownModule():
+    path = os.environ.get("NOTES2MD_SPEEDUP_REPORT")
+    if not path:
+        return
+    report = {
+        label: {
+            "engine_seconds": round(engine, 6),
+            "reference_seconds": round(oracle, 6),
+            "speedup": round(oracle / engine, 3) if engine else None,
+        }
+        for label, (engine, oracle) in sorted(TIMINGS.items())
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+class DifferentialTestCase(unittest.TestCase):
+    """Base class running a check over many seeded random cases."""
+
+    def for_each_seed(self, check: Callable[[random.Random], None], cases: int = CASES) -> None:
+        for seed in range(FIRST_SEED, FIRST_SEED + cases):
+            with self.subTest(seed=seed):
+                check(random.Random(seed))
+
+
+class TestTextEngines(DifferentialTestCase):
+    """Test text cleaning against the reference."""
+
+    def test_clean_text(self):
+        def check(rng):
+            text = "\n".join(random_text(rng, 40) for _ in range(rng.randint(1, 8)))
+            actual, expected = timed(
+                "clean_text", lambda: clean_text(text), lambda: reference.clean_text(text)
+            )
+            self.assertEqual(actual, expected)
+        self.for_each_seed(check, CASES * 10)
+
+
+class TestDomEngines(DifferentialTestCase):
+    """Test the DOM walker and the parser backends against the reference."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "export.html")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, html):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(html)
+
+    def test_drill_into_tag(self):
+        def check(rng):
+            soup = BeautifulSoup(random_export(rng), "html.parser")
+            tags = soup.find_all(True)
+            actual, expected = timed(
+                "drill_into_tag",
+                lambda: [drill_into_tag(tag) for tag in tags],
+                lambda: [reference.drill_into_tag(tag) for tag in tags],
+            )
+            self.assertEqual(actual, expected)
+            # The HTML walker must not fail on any markup
+            for tag in tags:
+                drill_into_tag_html(tag)
+        self.for_each_seed(check)
+
+    def test_parser_backends(self):
+        def check(rng):
+            html = random_export(rng)
+            self.write(html)
+            backends = {
+                "parse_notes": lambda: parse_notes(BeautifulSoup(html, "html.parser")),
+                "parse_notes low_memory": lambda: parse_notes(
+                    BeautifulSoup(html, "html.parser"), low_memory=True
+                ),
+                "parse_notes with_html": lambda: [
+                    {"title": note["title"], "note": note["note"]}
+                    for note in parse_notes(BeautifulSoup(html, "html.parser"), with_html=True)
+                ],
+                "iter_notes_from_end": lambda: list(iter_notes_from_end(self.path, 256)),
+                "parse_notes_parallel": lambda: parse_notes_parallel(
+                    self.path, 1, min_chunk_size=1
+                ),
+            }
+            for label, backend in backends.items():
+                actual, expected = timed(
+                    label, backend,
+                    lambda: reference.parse_notes(BeautifulSoup(html, "html.parser")),
+                )
+                self.assertEqual(actual, expected, label)
+        self.for_each_seed(check)
+
+    def test_parallel_workers(self):
+        # Worker processes are slow to start, so only a few cases
+        def check(rng):
+            html = random_export(rng)
+            self.write(html)
+            actual, expected = timed(
+                "parse_notes_parallel 2 workers",
+                lambda: parse_notes_parallel(self.path, 2, min_chunk_size=1),
+                lambda: reference.parse_notes(BeautifulSoup(html, "html.parser")),
+            )
+            self.assertEqual(actual, expected)
+        self.for_each_seed(check, max(CASES // 10, 1))
+
+    def test_metadata(self):
+        def check(rng):
+            html = random_export(rng)
+            actual, expected = timed(
+                "extract_metadata",
+                lambda: extract_metadata(BeautifulSoup(html, "html.parser")),
+                lambda: reference.extract_metadata(BeautifulSoup(html, "html.parser")),
+            )
+            # Intended difference: since the metadata schema, a title of
+            # only whitespace falls back to the default title instead of ""
+            if expected["title"] == "":
+                expected["title"] = "Untitled Document"
+            self.assertEqual(actual, expected)
+        self.for_each_seed(check)
+
+
+class TestFormatterEngines(DifferentialTestCase):
+    """Test the Markdown produced from random exports against the reference."""
+
+    def test_markdown_output(self):
+        def check(rng):
+            soup = BeautifulSoup(random_export(rng), "html.parser")
+            notes = reference.parse_notes(soup)
+            metadata = reference.extract_metadata(soup)
+            standard = reference.format_standard_markdown(notes, metadata)
+            obsidian = reference.format_obsidian_markdown(notes, metadata)
+
+            engines = {
+                "format_standard_markdown": (
+                    lambda: format_standard_markdown(notes, metadata), standard
+                ),
+                "format_obsidian_markdown": (
+                    lambda: format_obsidian_markdown(notes, metadata), obsidian
+                ),
+                "standard templates": (
+                    lambda: format_template_markdown(
+                        notes, metadata, builtin_template_set("standard")
+                    ),
+                    standard,
+                ),
+                "obsidian templates": (
+                    lambda: format_template_markdown(
+                        notes, metadata, builtin_template_set("obsidian")
+                    ),
+                    obsidian,
+                ),
+            }
+            for label, (engine, expected) in engines.items():
+                actual, _ = timed(
+                    label, engine,
+                    lambda: (reference.format_obsidian_markdown if "obsidian" in label
+                             else reference.format_standard_markdown)(notes, metadata),
+                )
+                self.assertEqual(actual, expected, label)
+
+            with SharedNoteStore.create(notes) as store:
+                self.assertEqual(format_obsidian_markdown(store, metadata), obsidian)
+
+            with tempfile.TemporaryDirectory() as temp_dir:
+                path = os.path.join(temp_dir, "notes.jsonl")
+                write_note_stream(path, notes, metadata)
+                with open_note_stream(path) as reader:
+                    streamed = format_standard_markdown(list(reader), reader.metadata)
+                self.assertEqual(streamed, standard)
+        self.for_each_seed(check)
+
+
+if __name__ == "__main__":
+    unittest.main()
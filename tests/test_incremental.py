@@ -0,0 +1,127 @@
+"""
+Tests for append mode (incremental ingestion of new notes).
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+import pymupdf
+from bs4 import BeautifulSoup
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.cli.main import main
+from notebooklm_notes2md.core.incremental import (
+    load_append_state,
+    parse_new_notes,
+    state_for_notes,
+)
+from notebooklm_notes2md.core.parser import parse_notes
+
+HEADER = '<div class="source-title">Notebook</div>'
+
+
+def make_html(titles):
+    """Build an export holding one note per title, newest (last) first."""
+    elements = []
+    for title in reversed(titles):
+        for div in (
+            f'<div class="paragraph heading3"><span>{title}</span></div>',
+            f'<div class="paragraph normal"><span>Body of {title}.</span></div>',
+            '<div class="paragraph normal"></div>',
+        ):
+            elements.append(
+                "<labs-tailwind-structural-element-view-v2>"
+                f"{div}</labs-tailwind-structural-element-view-v2>"
+            )
+    return HEADER + "<labs-tailwind-doc-viewer>" + "".join(elements) + "</labs-tailwind-doc-viewer>"
+
+
+def parse(html):
+    return parse_notes(BeautifulSoup(html, "html.parser"))
+
+
+class TestParseNewNotes(unittest.TestCase):
+    """Test finding the notes added since the last export."""
+
+    def setUp(self):
+        self.old_titles = [f"Note {i}" for i in range(50)]
+        self.state = state_for_notes(parse(make_html(self.old_titles)))
+
+    def test_new_notes_only(self):
+        """Test that only new notes are returned, oldest first."""
+        html = make_html(self.old_titles + ["New A", "New B"])
+        new_notes = parse_new_notes(html, self.state.tail, initial_size=100)
+        self.assertEqual([note["title"] for note in new_notes], ["New A", "New B"])
+        self.assertEqual(new_notes, parse(html)[-2:])
+
+    def test_nothing_new(self):
+        """Test an unchanged export."""
+        self.assertEqual(parse_new_notes(make_html(self.old_titles), self.state.tail), [])
+
+    def test_repeated_last_note_is_new(self):
+        """Test that a new copy of the newest note does not end the walk."""
+        html = make_html(self.old_titles + ["Note 49", "New A"])
+        new_notes = parse_new_notes(html, self.state.tail, initial_size=100)
+        self.assertEqual([note["title"] for note in new_notes], ["Note 49", "New A"])
+
+    def test_edited_notes_are_not_found(self):
+        """Test that an export without the remembered notes needs a full run."""
+        html = make_html(self.old_titles[:-1] + ["Note 49 edited"])
+        self.assertIsNone(parse_new_notes(html, self.state.tail, initial_size=100))
+
+
+class TestAppendCommand(unittest.TestCase):
+    """Test the --append option end to end."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.input_path = os.path.join(self.temp_dir, "notes.html")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _export(self, titles, output_path, *options):
+        with open(self.input_path, "w", encoding="utf-8") as f:
+            f.write(make_html(titles))
+        argv = ["notebooklm-export", self.input_path, output_path, *options]
+        with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()) as out:
+            main()
+        return out.getvalue()
+
+    def test_markdown_append_matches_full_export(self):
+        """Test that appending gives the same file as a full export."""
+        appended = os.path.join(self.temp_dir, "appended.md")
+        full = os.path.join(self.temp_dir, "full.md")
+        titles = [f"Note {i}" for i in range(10)]
+
+        self._export(titles, appended, "--append", "--format", "obsidian")
+        output = self._export(titles + ["New"], appended, "--append", "--format", "obsidian")
+        self.assertIn("appended 1 new notes", output)
+        self._export(titles + ["New"], full, "--format", "obsidian")
+
+        with open(appended, encoding="utf-8") as f1, open(full, encoding="utf-8") as f2:
+            self.assertEqual(f1.read(), f2.read())
+        self.assertEqual(load_append_state(appended).notes, 11)
+
+    def test_pdf_append(self):
+        """Test that new notes are appended as new pages."""
+        output_path = os.path.join(self.temp_dir, "notes.pdf")
+        titles = [f"Note {i}" for i in range(3)]
+        self._export(titles, output_path, "--append")
+        self._export(titles + ["New A", "New B"], output_path, "--append")
+
+        with pymupdf.open(output_path) as doc:
+            self.assertEqual(doc.page_count, 5)
+            self.assertIn("New B", doc[4].get_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Tests for the low-memory parsing mode.
+"""
+
+import os
+import sys
+import unittest
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.core.parser import iter_notes, parse_notes
+from notebooklm_notes2md.extractors.metadata import extract_metadata
+
+
+class TestLowMemoryParse(unittest.TestCase):
+    """Test that releasing the tree does not change the notes."""
+
+    def setUp(self):
+        test_file_path = os.path.join(os.path.dirname(__file__), 'full_summary.html')
+        with open(test_file_path, 'r', encoding='utf-8') as f:
+            self.html = f.read()
+
+    def test_same_notes(self):
+        """Test that both modes produce the same notes and metadata."""
+        soup = BeautifulSoup(self.html, 'html.parser')
+        metadata = extract_metadata(soup)
+        expected = parse_notes(soup)
+
+        soup = BeautifulSoup(self.html, 'html.parser')
+        self.assertEqual(extract_metadata(soup), metadata)
+        self.assertEqual(parse_notes(soup, low_memory=True), expected)
+
+    def test_tree_is_released(self):
+        """Test that processed elements are removed from the tree."""
+        soup = BeautifulSoup(self.html, 'html.parser')
+        parent = soup.find('labs-tailwind-doc-viewer')
+        notes = iter_notes(parent, low_memory=True)
+        next(notes, None)
+        remaining = len(parent.contents)
+        list(notes)
+
+        self.assertLess(remaining, len(BeautifulSoup(self.html, 'html.parser')
+                                       .find('labs-tailwind-doc-viewer').contents))
+        self.assertEqual(parent.contents, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+Tests for merging many NotebookLM exports into one document.
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+import pymupdf
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.cli.main import main
+from notebooklm_notes2md.exporters.merge import (
+    Notebook,
+    contents_markdown,
+    heading_anchor,
+    merge_notebooks,
+    merged_metadata,
+)
+from notebooklm_notes2md.exporters.pdf import PdfOptions
+
+
+def make_html(title, tags, note_titles):
+    """Build an export with a title, key topics and one paragraph per note."""
+    topics = "".join(
+        f'<div class="key-topics-chip"><div class="key-topics-text"><p>{tag}</p></div></div>'
+        for tag in tags
+    )
+    elements = []
+    # Newest notes come first in exports
+    for note_title in reversed(note_titles):
+        elements.append(
+            "<labs-tailwind-structural-element-view-v2>"
+            f'<div class="paragraph heading3"><span>{note_title}</span></div>'
+            f'<div class="paragraph normal"><span>About {note_title}.</span></div>'
+            '<div class="paragraph normal"></div>'
+            "</labs-tailwind-structural-element-view-v2>"
+        )
+    return (
+        f'<div class="source-title">{title}</div>{topics}'
+        "<labs-tailwind-doc-viewer>" + "".join(elements) + "</labs-tailwind-doc-viewer>"
+    )
+
+
+class TestMerge(unittest.TestCase):
+    """Test merged Markdown and PDF output."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.inputs = []
+        for index, (title, tags, notes) in enumerate([
+            ("Auctions", ["Pricing", "Volume"], ["Opening", "Closing"]),
+            ("Manipulation", ["Pricing", "Pumps"], ["Wash trades"]),
+            ("Auctions", [], []),
+        ]):
+            path = os.path.join(self.temp_dir, f"{index}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(make_html(title, tags, notes))
+            self.inputs.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_markdown(self):
+        output_path = os.path.join(self.temp_dir, "all.md")
+        notebooks = merge_notebooks(self.inputs, output_path, title="Markets")
+        self.assertEqual([notebook.titles for notebook in notebooks],
+                         [["Opening", "Closing"], ["Wash trades"], []])
+        with open(output_path, encoding="utf-8") as f:
+            content = f.read()
+        self.assertTrue(content.startswith("# Markets\n\n## Contents\n\n"))
+        self.assertIn("- [Auctions](#auctions) (2 notes)\n  - Opening\n  - Closing\n", content)
+        self.assertIn("- [Auctions](#auctions-1) (0 notes)", content)
+        # Notebooks follow in input order, oldest note first
+        positions = [content.index(text) for text in (
+            "# Auctions\n\n## Opening", "## Closing", "# Manipulation\n\n## Wash trades"
+        )]
+        self.assertEqual(positions, sorted(positions))
+        # No temporary note streams are left behind
+        self.assertEqual(sorted(os.listdir(self.temp_dir)),
+                         ["0.html", "1.html", "2.html", "all.md"])
+
+    def test_obsidian_tags(self):
+        output_path = os.path.join(self.temp_dir, "all.md")
+        merge_notebooks(self.inputs, output_path, "obsidian")
+        with open(output_path, encoding="utf-8") as f:
+            content = f.read()
+        self.assertIn('tags:\n  - "Pricing"\n  - "Volume"\n  - "Pumps"\n', content)
+        self.assertIn("# Merged Notebooks\n", content)
+
+    def test_parallel_matches_serial(self):
+        serial = os.path.join(self.temp_dir, "serial.md")
+        parallel = os.path.join(self.temp_dir, "parallel.md")
+        merge_notebooks(self.inputs, serial)
+        merge_notebooks(self.inputs, parallel, workers=2)
+        with open(serial, encoding="utf-8") as a, open(parallel, encoding="utf-8") as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_pdf_outline(self):
+        for engine in ("markdown", "direct"):
+            output_path = os.path.join(self.temp_dir, engine + ".pdf")
+            merge_notebooks(self.inputs, output_path, pdf_options=PdfOptions(engine=engine))
+            with pymupdf.open(output_path) as doc:
+                toc = [(level, title) for level, title, _ in doc.get_toc()]
+            self.assertEqual(toc, [
+                (1, "Merged Notebooks"), (2, "Contents"),
+                (1, "Auctions"), (2, "Opening"), (2, "Closing"),
+                (1, "Manipulation"), (2, "Wash trades"),
+                (1, "Auctions"),
+            ], engine)
+
+    def test_invalid_output(self):
+        with self.assertRaises(ValueError):
+            merge_notebooks(self.inputs, os.path.join(self.temp_dir, "all.html"))
+
+    def test_cli(self):
+        output_path = os.path.join(self.temp_dir, "all.md")
+        argv = ["notebooklm-export", "merge", *self.inputs, "-o", output_path, "--jobs", "1"]
+        with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()) as output:
+            main()
+        self.assertIn("merged 3 notes from 3 notebooks", output.getvalue())
+
+        argv[2] = os.path.join(self.temp_dir, "missing.html")
+        with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()) as output, \
+                self.assertRaises(SystemExit):
+            main()
+        self.assertIn("Input file not found", output.getvalue())
+
+
+class TestContents(unittest.TestCase):
+    """Test the contents section and heading anchors."""
+
+    def test_anchors(self):
+        seen = {}
+        self.assertEqual(heading_anchor("Price & Volume: 2024!", seen), "price--volume-2024")
+        self.assertEqual(heading_anchor("Price & Volume: 2024", seen), "price--volume-2024-1")
+
+    def test_contents(self):
+        notebooks = [Notebook("a", "a.jsonl", {"title": "Contents", "tags": ["x"]}, ["One"])]
+        self.assertEqual(
+            contents_markdown(notebooks, "Merged"),
+            "## Contents\n\n- [Contents](#contents-1) (1 note)\n  - One\n\n",
+        )
+        self.assertEqual(merged_metadata(notebooks * 2)["tags"], ["x"])
+
+
+if __name__ == "__main__":
+    unittest.main()
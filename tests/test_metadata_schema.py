@@ -0,0 +1,131 @@
+"""
+Tests for the declarative metadata schema.
+"""
+
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.cli.main import main
+from notebooklm_notes2md.extractors.metadata import extract_metadata
+from notebooklm_notes2md.extractors.schema import (
+    DEFAULT_METADATA_SCHEMA,
+    MetadataField,
+    MetadataSchema,
+    parse_field_spec,
+    selector_prefilter,
+)
+from notebooklm_notes2md.formatters.obsidian import format_yaml_frontmatter
+
+EXTRA_HTML = """
+<div class="source-title">Notebook</div>
+<div class="sources">
+  <a class="source-link" href="https://example.com/a">A</a>
+  <a class="source-link" href="https://example.com/b">B</a>
+</div>
+<span class="note-timestamp">2025-06-15</span>
+<span class="note-timestamp">2025-06-16</span>
+"""
+
+
+class TestMetadataSchema(unittest.TestCase):
+    """Test the metadata schema."""
+
+    def setUp(self):
+        """Load the sample export."""
+        test_file_path = os.path.join(os.path.dirname(__file__), 'full_summary.html')
+        with open(test_file_path, 'r', encoding='utf-8') as f:
+            self.soup = BeautifulSoup(f.read(), 'html.parser')
+
+    def test_single_pass_matches_separate_queries(self):
+        """Test that the combined pass finds what per-field queries find."""
+        values = DEFAULT_METADATA_SCHEMA.extract(self.soup)
+        title = self.soup.select_one('.source-title').text.strip()
+        topics = [
+            p.text.strip() for p in self.soup.select('.key-topics-chip .key-topics-text p')
+            if p.text.strip()
+        ]
+        self.assertEqual(values["title"], title)
+        self.assertEqual(values["tags"], topics)
+        self.assertTrue(values["summary"].startswith("This source explores"))
+
+    def test_user_fields(self):
+        """Test that users can add attribute and multi-valued fields."""
+        schema = DEFAULT_METADATA_SCHEMA.extend([
+            parse_field_spec("sources[]=a.source-link@href"),
+            parse_field_spec("created=.note-timestamp"),
+        ])
+        metadata = extract_metadata(BeautifulSoup(EXTRA_HTML, "html.parser"), schema)
+
+        self.assertEqual(metadata["title"], "Notebook")
+        self.assertEqual(metadata["tags"], [])
+        self.assertNotIn("summary", metadata)
+        self.assertEqual(
+            metadata["sources"], ["https://example.com/a", "https://example.com/b"]
+        )
+        self.assertEqual(metadata["created"], "2025-06-15")
+
+    def test_postprocess(self):
+        """Test that post-processing is applied to every value."""
+        schema = MetadataSchema([
+            MetadataField("stamps", ".note-timestamp", many=True, postprocess=str.upper),
+        ])
+        values = schema.extract(BeautifulSoup(EXTRA_HTML.replace("2025", "x"), "html.parser"))
+        self.assertEqual(values["stamps"], ["X-06-15", "X-06-16"])
+
+    def test_user_fields_in_frontmatter(self):
+        """Test that extra fields are written to the Obsidian frontmatter."""
+        frontmatter = format_yaml_frontmatter({
+            "title": "T",
+            "tags": [],
+            "sources": ["https://example.com/a"],
+            "created": "2025-06-15",
+        })
+        self.assertIn('sources:\n  - "https://example.com/a"', frontmatter)
+        self.assertIn('created: "2025-06-15"', frontmatter)
+
+    def test_blank_title_uses_default(self):
+        """Test that a title of only whitespace gives the default title."""
+        soup = BeautifulSoup('<div class="source-title">  </div>', 'html.parser')
+        # Before the schema, this gave an empty title
+        self.assertEqual(extract_metadata(soup)["title"], "Untitled Document")
+
+    def test_parse_field_spec_errors(self):
+        """Test that malformed specifications are rejected."""
+        with self.assertRaises(ValueError):
+            parse_field_spec("no-selector")
+        with self.assertRaises(ValueError):
+            parse_field_spec("=.x")
+        with self.assertRaises(ValueError):
+            parse_field_spec("x=div[[bad")
+
+    def test_cli_rejects_malformed_selector(self):
+        """Test that a bad selector is reported without a traceback."""
+        test_file_path = os.path.join(os.path.dirname(__file__), 'full_summary.html')
+        argv = ["notebooklm-export", test_file_path, "out.md", "--metadata-field", "x=div[[bad"]
+        with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()) as output, \
+                self.assertRaises(SystemExit) as raised:
+            main()
+        self.assertEqual(raised.exception.code, 1)
+        self.assertIn("Error: Invalid selector in metadata field 'x=div[[bad'", output.getvalue())
+
+    def test_selector_prefilter(self):
+        """Test the pre-check derived from the rightmost compound selector."""
+        self.assertEqual(selector_prefilter(".summary .mat-body-medium p"), ("p", frozenset()))
+        self.assertEqual(
+            selector_prefilter("a.source-link"), ("a", frozenset({"source-link"}))
+        )
+        self.assertEqual(selector_prefilter("a[href]"), (None, frozenset()))
+        self.assertEqual(selector_prefilter("#main"), (None, frozenset()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Tests for the note stream format and the parse/render commands.
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.cli.main import export_to_markdown
+from notebooklm_notes2md.cli.stream import parse_main, render_main
+from notebooklm_notes2md.core import stream
+from notebooklm_notes2md.core.stream import (
+    NoteStreamError,
+    open_note_stream,
+    write_note_stream,
+)
+from notebooklm_notes2md.core.parser import parse_notes
+from notebooklm_notes2md.extractors.metadata import extract_metadata
+
+NOTES = [
+    {"title": "First", "note": "First\n\nSome *text* é"},
+    {"title": "Second", "note": "Second\n\n- item\n"},
+]
+METADATA = {"title": "Doc", "tags": ["a b", "c"], "summary": "Short."}
+
+
+class TestNoteStream(unittest.TestCase):
+    """Test writing and reading note streams."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_round_trip(self):
+        """Test that notes and metadata survive a round trip."""
+        path = os.path.join(self.temp_dir, "notes.jsonl")
+        self.assertEqual(write_note_stream(path, iter(NOTES), METADATA), 2)
+
+        with open_note_stream(path) as reader:
+            self.assertEqual(reader.metadata, METADATA)
+            self.assertEqual(list(reader), NOTES)
+            self.assertEqual(reader.count, 2)
+
+    def test_reads_lazily(self):
+        """Test that records are decoded one at a time."""
+        path = os.path.join(self.temp_dir, "notes.jsonl")
+        write_note_stream(path, NOTES, METADATA)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("not json\n")
+
+        with open_note_stream(path) as reader:
+            notes = iter(reader)
+            self.assertEqual(next(notes), NOTES[0])
+            self.assertEqual(next(notes), NOTES[1])
+            with self.assertRaises(NoteStreamError):
+                next(notes)
+
+    def test_rejects_other_files(self):
+        """Test that unknown extensions and foreign files are rejected."""
+        with self.assertRaises(NoteStreamError):
+            write_note_stream(os.path.join(self.temp_dir, "notes.txt"), NOTES)
+
+        path = os.path.join(self.temp_dir, "other.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('{"title": "x"}\n')
+        with self.assertRaises(NoteStreamError):
+            open_note_stream(path)
+
+    @unittest.skipIf(stream.msgpack is None, "msgpack is not installed")
+    def test_msgpack_round_trip(self):
+        """Test the MessagePack encoding."""
+        path = os.path.join(self.temp_dir, "notes.msgpack")
+        write_note_stream(path, NOTES, METADATA)
+        with open_note_stream(path) as reader:
+            self.assertEqual(reader.metadata, METADATA)
+            self.assertEqual(list(reader), NOTES)
+
+
+class TestParseRenderCommands(unittest.TestCase):
+    """Test that parse followed by render matches a direct export."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.source = os.path.join(os.path.dirname(__file__), 'full_summary.html')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_render_matches_direct_export(self):
+        """Test that rendering a note stream gives the single-step output."""
+        notes_path = os.path.join(self.temp_dir, "notes.jsonl")
+        with open(self.source, encoding="utf-8") as f:
+            soup = BeautifulSoup(f.read(), "html.parser")
+
+        for format_type in ("standard", "obsidian"):
+            direct = os.path.join(self.temp_dir, f"direct-{format_type}.md")
+            rendered = os.path.join(self.temp_dir, f"rendered-{format_type}.md")
+            export_to_markdown(parse_notes(soup), direct, format_type, extract_metadata(soup))
+            with redirect_stdout(io.StringIO()):
+                parse_main([self.source, "-o", notes_path])
+                render_main([notes_path, rendered, "--format", format_type])
+
+            with open(direct, encoding="utf-8") as f1, open(rendered, encoding="utf-8") as f2:
+                self.assertEqual(f2.read(), f1.read())
+
+    def test_render_cached_pdf(self):
+        """Test that the PDF cache renders notes read lazily from a stream."""
+        notes_path = os.path.join(self.temp_dir, "notes.jsonl")
+        rendered = os.path.join(self.temp_dir, "rendered.pdf")
+        cache_dir = os.path.join(self.temp_dir, "cache")
+        with redirect_stdout(io.StringIO()) as output:
+            parse_main([self.source, "-o", notes_path])
+            render_main([notes_path, rendered, "--pdf-cache", cache_dir])
+        self.assertIn("Successfully exported", output.getvalue())
+        self.assertTrue(os.path.getsize(rendered) > 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
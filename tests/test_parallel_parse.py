@@ -0,0 +1,116 @@
+"""
+Tests for parsing one export in worker processes.
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.cli.main import main
+from notebooklm_notes2md.core.parallel_parse import parse_notes_parallel, split_points
+from notebooklm_notes2md.core.parser import parse_notes
+from notebooklm_notes2md.core.selection import DOC_VIEWER_TAG, ELEMENT_TAG
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "full_summary.html")
+
+
+def element(div):
+    return f"<labs-tailwind-structural-element-view-v2>{div}</labs-tailwind-structural-element-view-v2>"
+
+
+def make_export(count):
+    """Build an export whose bullets and their text sit in separate elements."""
+    elements = []
+    for index in range(count):
+        elements.append(element(f'<div class="paragraph heading3"><span>Note {index}</span></div>'))
+        for number in range(index % 4 + 1):
+            elements.append(element(
+                '<div class="paragraph normal"><span>Paragraph </span>'
+                f'<span class="bold">{number}</span><span> [1, 2].</span></div>'
+            ))
+        elements.append(element('<div class="bullet normal">•</div>'))
+        elements.append(element('<div class="paragraph normal"><span>A point</span></div>'))
+        elements.append(element('<div class="paragraph normal"></div>'))
+    return (
+        '<div class="source-title">Notebook</div><labs-tailwind-doc-viewer>'
+        + "".join(elements) + "</labs-tailwind-doc-viewer>"
+    )
+
+
+class TestSplitPoints(unittest.TestCase):
+    """Test the byte scan for chunk boundaries."""
+
+    def test_cuts_at_element_starts(self):
+        data = make_export(50).encode("utf-8")
+        ranges = split_points(data, 8, min_chunk_size=1)
+
+        self.assertGreater(len(ranges), 1)
+        self.assertTrue(data[ranges[0][0]:].startswith(DOC_VIEWER_TAG))
+        for start, _ in ranges[1:]:
+            self.assertTrue(data[start:].startswith(ELEMENT_TAG))
+        self.assertEqual([stop for _, stop in ranges[:-1]], [start for start, _ in ranges[1:]])
+        self.assertEqual(ranges[-1][1], len(data))
+
+    def test_minimum_chunk_size(self):
+        data = make_export(50).encode("utf-8")
+        self.assertEqual(len(split_points(data, 8, min_chunk_size=len(data))), 1)
+
+    def test_no_doc_viewer(self):
+        self.assertEqual(split_points(b"<html><body></body></html>", 4), [])
+
+
+class TestParallelParse(unittest.TestCase):
+    """Test that parallel parsing matches the serial parser."""
+
+    def assert_same_notes(self, html, **kwargs):
+        expected = parse_notes(BeautifulSoup(html, "html.parser"), **kwargs)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "notes.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(html)
+            # One chunk per element at the smallest size, so notes span cuts
+            for workers, min_chunk_size in ((1, 1), (2, 1), (2, 4096)):
+                notes = parse_notes_parallel(path, workers, min_chunk_size=min_chunk_size, **kwargs)
+                self.assertEqual(notes, expected)
+
+    def test_fixture(self):
+        with open(TEST_FILE, "r", encoding="utf-8") as f:
+            self.assert_same_notes(f.read())
+
+    def test_synthetic_export(self):
+        self.assert_same_notes(make_export(40))
+
+    def test_with_html(self):
+        self.assert_same_notes(make_export(40), with_html=True)
+        notes = parse_notes(BeautifulSoup(make_export(1), "html.parser"), with_html=True)
+        self.assertIn("<ul><li><p>A point</p></li></ul>", notes[0]["html"])
+
+    def test_empty_file(self):
+        with tempfile.NamedTemporaryFile(suffix=".html") as temp_file:
+            self.assertEqual(parse_notes_parallel(temp_file.name, 2), [])
+
+    def test_cli_option(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            outputs = []
+            for jobs in ("1", "2"):
+                output_path = os.path.join(temp_dir, f"{jobs}.md")
+                argv = ["notebooklm-export", TEST_FILE, output_path,
+                        "--format", "obsidian", "--parse-jobs", jobs]
+                with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()):
+                    main()
+                with open(output_path, "r", encoding="utf-8") as f:
+                    outputs.append(f.read())
+        self.assertEqual(outputs[1], outputs[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
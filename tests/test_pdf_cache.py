@@ -0,0 +1,106 @@
+"""
+Tests for the rendered-section PDF cache.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import pymupdf
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.exporters.pdf import PdfOptions, export_pdf, note_markdown
+from notebooklm_notes2md.exporters.pdf_cache import (
+    SectionCache,
+    export_pdf_cached,
+    iter_groups,
+)
+
+
+def make_notes(count, suffix=""):
+    """Build notes with a top-level heading each."""
+    return [
+        {"title": f"Note {i}", "note": f"# Note {i}\n\nBody of note {i}.{suffix}"}
+        for i in range(count)
+    ]
+
+
+def pdf_content(path):
+    """Return the page count, outline and text of a PDF file."""
+    with pymupdf.open(path) as doc:
+        return doc.page_count, doc.get_toc(), "".join(page.get_text() for page in doc)
+
+
+class TestSectionCache(unittest.TestCase):
+    """Test the rendered-section cache."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        self.output = os.path.join(self.temp_dir.name, "out.pdf")
+        self.options = PdfOptions(chunk_size=2)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _export(self, notes, cache):
+        return export_pdf_cached(note_markdown(notes), self.output, cache, self.options)
+
+    def test_output_matches_uncached_export(self):
+        """Test that cached assembly produces the same pages, outline and text."""
+        notes = make_notes(9)
+        reference = os.path.join(self.temp_dir.name, "reference.pdf")
+        export_pdf(notes, reference)
+
+        cache = SectionCache(self.cache_dir)
+        self._export(notes, cache)
+        self.assertEqual(pdf_content(self.output), pdf_content(reference))
+        self._export(notes, cache)
+        self.assertEqual(pdf_content(self.output), pdf_content(reference))
+
+    def test_rerun_reuses_every_note(self):
+        """Test that a re-run across processes renders nothing."""
+        notes = make_notes(9)
+        self._export(notes, SectionCache(self.cache_dir))
+
+        cache = SectionCache(self.cache_dir)
+        self._export(notes, cache)
+        stats = cache.stats()
+        self.assertEqual(stats.misses, 0)
+        self.assertEqual(stats.notes_rendered, 0)
+        self.assertEqual(stats.notes_reused, 9)
+
+    def test_only_changed_groups_are_rendered(self):
+        """Test that appending a note leaves earlier groups cached."""
+        notes = make_notes(12)
+        self._export(notes, SectionCache(self.cache_dir))
+
+        cache = SectionCache(self.cache_dir)
+        self._export(notes + make_notes(1, " New."), cache)
+        stats = cache.stats()
+        self.assertGreater(stats.notes_reused, 0)
+        self.assertLess(stats.notes_rendered, 13)
+
+    def test_groups_are_content_defined(self):
+        """Test that group boundaries do not shift when notes are prepended."""
+        texts = [note["note"] for note in make_notes(40)]
+        groups = [keys for _, keys in iter_groups(texts, self.options, 4)]
+        shifted = [keys for _, keys in iter_groups(["# Extra"] + texts, self.options, 4)]
+        self.assertEqual(groups[1:], shifted[1:])
+
+    def test_size_cap_evicts_least_recently_used(self):
+        """Test that the cache stays under its cap and counts evictions."""
+        cache = SectionCache(self.cache_dir, max_bytes=1)
+        self._export(make_notes(9), cache)
+        stats = cache.stats()
+        self.assertEqual(stats.entries, 1)
+        self.assertGreater(stats.evictions, 0)
+        files = [name for _, _, names in os.walk(self.cache_dir) for name in names]
+        self.assertEqual(len(files), stats.entries)
+
+
+if __name__ == "__main__":
+    unittest.main()
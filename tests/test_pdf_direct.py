@@ -0,0 +1,128 @@
+"""
+Tests for the direct PDF engine.
+"""
+
+import io
+import os
+import re
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+import pymupdf
+from bs4 import BeautifulSoup
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.cli.main import main
+from notebooklm_notes2md.core.parser import parse_notes
+from notebooklm_notes2md.exporters.pdf import PdfOptions, export_pdf
+from notebooklm_notes2md.exporters.pdf_direct import note_html
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "full_summary.html")
+
+
+def element(div):
+    return f"<labs-tailwind-structural-element-view-v2>{div}</labs-tailwind-structural-element-view-v2>"
+
+
+def make_html(count, paragraphs):
+    """Build an export with headings, bold and code spans and bullets."""
+    elements = []
+    for index in range(count):
+        elements.append(element(f'<div class="paragraph heading3"><span>Note {index}</span></div>'))
+        for number in range(paragraphs * (index + 1)):
+            elements.append(element(
+                '<div class="paragraph normal"><span>Paragraph </span>'
+                f'<span class="bold">{number}</span><span> uses </span>'
+                '<span class="code">x &lt; y</span><span> [1, 2].</span></div>'
+            ))
+        elements.append(element(
+            '<div class="bullet normal">•</div>'
+            '<div class="paragraph normal"><span>A point</span></div>'
+        ))
+        elements.append(element('<div class="paragraph normal"></div>'))
+    return "<labs-tailwind-doc-viewer>" + "".join(elements) + "</labs-tailwind-doc-viewer>"
+
+
+def page_texts(path):
+    """Page texts without whitespace and Markdown leftovers."""
+    with pymupdf.open(path) as doc:
+        return [re.sub(r"[\s*`•◦-]", "", page.get_text()) for page in doc]
+
+
+def joined(texts):
+    return "".join(texts)
+
+
+class TestDirectPdfEngine(unittest.TestCase):
+    """Test that the direct engine matches the markdown_pdf engine."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _export(self, notes, engine, chunk_size=0):
+        path = os.path.join(self.temp_dir.name, f"{engine}-{chunk_size}.pdf")
+        pages, _ = export_pdf(notes, path, PdfOptions(engine=engine, chunk_size=chunk_size))
+        texts = page_texts(path)
+        self.assertEqual(pages, len(texts))
+        return texts
+
+    def assert_parity(self, html):
+        # Page breaks may move by a line: the direct engine keeps the spaces
+        # around bold and code spans that clean_text removes
+        notes = parse_notes(BeautifulSoup(html, "html.parser"), with_html=True)
+        expected = self._export(notes, "markdown")
+        for texts in (self._export(notes, "direct"), self._export(notes, "direct", 2)):
+            self.assertEqual(len(texts), len(expected))
+            self.assertEqual(joined(texts), joined(expected))
+
+    def test_parity_with_markdown_engine(self):
+        """Test page count and page text on notes spanning several pages."""
+        self.assert_parity(make_html(4, 30))
+
+    def test_parity_on_sample_export(self):
+        with open(TEST_FILE, "r", encoding="utf-8") as f:
+            self.assert_parity(f.read())
+
+    def test_html_from_dom(self):
+        notes = parse_notes(BeautifulSoup(make_html(1, 1), "html.parser"), with_html=True)
+        self.assertEqual(
+            notes[0]["html"],
+            "<h2>Note 0</h2>"
+            "<p>Paragraph <strong>0</strong> uses <code>x &lt; y</code> .</p>"
+            "<ul><li><p>A point</p></li></ul>",
+        )
+
+    def test_notes_without_html_use_markdown(self):
+        html = list(note_html([{"title": "T", "note": "## T\n\nSome **bold** [3]"}]))
+        self.assertEqual(html, ["<h2>T</h2>\n<p>Some<strong>bold</strong></p>\n"])
+
+    def test_markup_in_note_text_is_escaped(self):
+        note = {"title": "T", "note": "if a < b & c: <script>alert(1)</script>\n\n<b>x</b>"}
+        self.assertEqual(list(note_html([note])), [
+            "<p>if a &lt; b &amp; c: &lt;script&gt;alert(1)&lt;/script&gt;</p>\n"
+            "<p>&lt;b&gt;x&lt;/b&gt;</p>\n"
+        ])
+
+    def test_cli_engine_option(self):
+        output_path = os.path.join(self.temp_dir.name, "out.pdf")
+        argv = ["notebooklm-export", TEST_FILE, output_path, "--pdf-engine", "direct"]
+        with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()):
+            main()
+        self.assertEqual(len(page_texts(output_path)), 3)
+
+        argv += ["--pdf-cache", self.temp_dir.name]
+        with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                main()
+
+
+if __name__ == "__main__":
+    unittest.main()
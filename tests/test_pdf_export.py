@@ -0,0 +1,81 @@
+"""
+Tests for PDF export.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import pymupdf
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.exporters.pdf import PdfOptions, export_pdf
+
+
+def make_notes(count):
+    """Build notes with a top-level heading each, so the outline is filled."""
+    return [
+        {
+            "title": f"Note {i}",
+            "note": f"# Note {i}\n\nParagraph of note {i} with **bold** text.\n\n"
+                    f"- first point\n- second point [1, 2]",
+        }
+        for i in range(count)
+    ]
+
+
+class TestChunkedPdfExport(unittest.TestCase):
+    """Test that chunked PDF export matches the single-pass export."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.notes = make_notes(7)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _export(self, name, chunk_size):
+        path = os.path.join(self.temp_dir.name, name)
+        export_pdf(self.notes, path, PdfOptions(chunk_size=chunk_size))
+        with pymupdf.open(path) as doc:
+            text = "".join(page.get_text() for page in doc)
+            return doc.page_count, doc.get_toc(simple=True), text
+
+    def test_chunked_matches_single_pass(self):
+        """Test that pages, outline and text are the same in both modes."""
+        single = self._export("single.pdf", 0)
+        chunked = self._export("chunked.pdf", 3)
+
+        self.assertEqual(chunked[0], single[0])
+        self.assertEqual(chunked[1], single[1])
+        self.assertEqual(chunked[2], single[2])
+
+    def test_outline_pages_are_offset_per_chunk(self):
+        """Test that outline entries of later chunks point at their pages."""
+        _, toc, _ = self._export("chunked.pdf", 2)
+        self.assertEqual([entry[1] for entry in toc], [f"Note {i}" for i in range(7)])
+        self.assertEqual([entry[2] for entry in toc], list(range(1, 8)))
+
+    def test_optimize_rewrites_merged_file(self):
+        """Test that an optimized chunked export is not left incremental."""
+        sizes = {}
+        for optimize in (False, True):
+            path = os.path.join(self.temp_dir.name, f"optimize-{optimize}.pdf")
+            export_pdf(self.notes, path, PdfOptions(chunk_size=2, optimize=optimize))
+            with open(path, "rb") as f:
+                data = f.read()
+            sizes[optimize] = len(data)
+            self.assertEqual(data.count(b"%%EOF"), 1 if optimize else 5)
+        self.assertLess(sizes[True], sizes[False])
+
+    def test_no_temporary_files_left(self):
+        """Test that chunk files are removed after the merge."""
+        self._export("chunked.pdf", 2)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["chunked.pdf"])
+
+
+if __name__ == "__main__":
+    unittest.main()
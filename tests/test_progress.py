@@ -0,0 +1,177 @@
+"""
+Tests for progress events and cancellation.
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.cli.main import export_to_markdown, export_to_pdf, main
+from notebooklm_notes2md.core.parser import parse_notes
+from notebooklm_notes2md.core.progress import (
+    ConversionCancelled,
+    ProgressDisplay,
+    ProgressHooks,
+    track_notes,
+)
+from notebooklm_notes2md.exporters.pdf import PdfOptions
+from notebooklm_notes2md.formatters.standard import format_standard_markdown
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "full_summary.html")
+
+NOTES = [
+    {"title": f"Note {index}", "note": f"## Note {index}\n\nBody {index}."}
+    for index in range(5)
+]
+
+
+def recording_hooks():
+    """Return hooks appending every event to a list, and the list."""
+    events = []
+    hooks = ProgressHooks(
+        on_note_parsed=lambda note: events.append(("parsed", note["title"])),
+        on_stage_start=lambda stage, total: events.append(("start", stage, total)),
+        on_stage_end=lambda stage: events.append(("end", stage)),
+        on_notes_done=lambda stage, done: events.append(("done", stage, done)),
+        on_bytes_written=lambda count: events.append(("bytes", count)),
+    )
+    return hooks, events
+
+
+class TestProgressEvents(unittest.TestCase):
+    """Test the events reported by parsing, formatting and rendering."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_no_hooks(self):
+        self.assertIs(track_notes(NOTES, None, "format"), NOTES)
+
+    def test_parse(self):
+        with open(TEST_FILE, encoding="utf-8") as f:
+            html = f.read()
+        hooks, events = recording_hooks()
+        notes = parse_notes(BeautifulSoup(html, "html.parser"), hooks=hooks)
+        self.assertEqual(notes, parse_notes(BeautifulSoup(html, "html.parser")))
+        self.assertEqual(events[0], ("start", "parse", None))
+        self.assertEqual(events[-1], ("end", "parse"))
+        # Parsed newest first, returned oldest first
+        self.assertEqual([event[1] for event in events[1:-1]],
+                         [note["title"] for note in reversed(notes)])
+
+    def test_format(self):
+        hooks, events = recording_hooks()
+        content = format_standard_markdown(NOTES, hooks=hooks)
+        self.assertEqual(content, format_standard_markdown(NOTES))
+        self.assertEqual(events, [("done", "format", done) for done in range(1, 6)])
+
+    def test_markdown_export(self):
+        output_path = os.path.join(self.temp_dir, "notes.md")
+        hooks, events = recording_hooks()
+        export_to_markdown(NOTES, output_path, hooks=hooks)
+        self.assertEqual(events[0], ("start", "format", 5))
+        self.assertEqual(events[-2:], [("bytes", os.path.getsize(output_path)), ("end", "format")])
+
+    def test_pdf_export(self):
+        for options in (PdfOptions(), PdfOptions(chunk_size=2)):
+            output_path = os.path.join(self.temp_dir, "notes.pdf")
+            hooks, events = recording_hooks()
+            with redirect_stdout(io.StringIO()):
+                export_to_pdf(NOTES, output_path, options, hooks)
+            self.assertEqual(events[0], ("start", "render", 5))
+            self.assertEqual(events[-1], ("end", "render"))
+            done = [event[2] for event in events if event[0] == "done"]
+            self.assertEqual(done, [1, 2, 3, 4, 5])
+            written = sum(event[1] for event in events if event[0] == "bytes")
+            self.assertEqual(written, os.path.getsize(output_path), options)
+
+
+class TestCancellation(unittest.TestCase):
+    """Test that cancelled conversions stop without partial output."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_parse(self):
+        html = "<labs-tailwind-doc-viewer>" + "".join(
+            "<labs-tailwind-structural-element-view-v2>"
+            f'<div class="paragraph heading3"><span>Note {index}</span></div>'
+            '<div class="paragraph normal"></div>'
+            "</labs-tailwind-structural-element-view-v2>"
+            for index in range(3)
+        ) + "</labs-tailwind-doc-viewer>"
+        parsed = []
+        hooks = ProgressHooks(on_note_parsed=lambda note: (parsed.append(note), hooks.cancel()))
+        with self.assertRaises(ConversionCancelled):
+            parse_notes(BeautifulSoup(html, "html.parser"), hooks=hooks)
+        self.assertEqual(len(parsed), 1)
+
+    def test_pdf(self):
+        output_path = os.path.join(self.temp_dir, "notes.pdf")
+        hooks = ProgressHooks(on_notes_done=lambda stage, done: done == 3 and hooks.cancel())
+        with self.assertRaises(ConversionCancelled):
+            export_to_pdf(NOTES, output_path, PdfOptions(chunk_size=1), hooks)
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_markdown(self):
+        output_path = os.path.join(self.temp_dir, "notes.md")
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("previous")
+        hooks = ProgressHooks()
+        hooks.cancel()
+        with self.assertRaises(ConversionCancelled):
+            export_to_markdown(NOTES, output_path, hooks=hooks)
+        with open(output_path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "previous")
+
+
+class TestProgressDisplay(unittest.TestCase):
+    """Test the command line progress display."""
+
+    def test_line(self):
+        display = ProgressDisplay(io.StringIO())
+        display.hooks.stage_start("render", 100)
+        display.stage_began = 0.0
+        display.hooks.notes_done("render", 25)
+        display.hooks.bytes_written(2 * 1024 * 1024)
+        self.assertEqual(
+            display.line(now=10.0),
+            "render: 25/100 notes (2.5 notes/s), 2.0 MiB written (0.20 MiB/s), ETA 0:30",
+        )
+        display.hooks.stage_end("render")
+        self.assertTrue(display.stream.getvalue().startswith("render: 25/100 notes"))
+
+    def test_cli(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            output_path = os.path.join(temp_dir, "notes.md")
+            argv = ["notebooklm-export", TEST_FILE, output_path, "--progress"]
+            with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()) as output, \
+                    redirect_stderr(io.StringIO()) as progress:
+                main()
+            self.assertIn("Successfully exported", output.getvalue())
+            lines = progress.getvalue().splitlines()
+            self.assertEqual([line.split(":")[0] for line in lines], ["parse", "format"])
+            self.assertIn("MiB written", lines[1])
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Tests for reproducible output.
+"""
+
+import hashlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+import pymupdf
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.cli.main import export_to_archive, export_to_markdown, export_to_pdf, main
+from notebooklm_notes2md.exporters.pdf import PdfOptions
+from notebooklm_notes2md.utils.reproducible import (
+    SOURCE_DATE_EPOCH,
+    format_source_date,
+    resolve_source_date,
+    stage_output,
+)
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "full_summary.html")
+
+NOTES = [
+    {"title": "Opening", "note": "## Opening\n\nThe auction opens [1]."},
+    {"title": "Closing", "note": "## Closing\n\nThe auction closes."},
+]
+METADATA = {"title": "Auctions", "tags": ["Pricing"]}
+EPOCH = 1700000000
+
+
+def digest(path):
+    with open(path, "rb") as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+class TestSourceDate(unittest.TestCase):
+    """Test the source date and staged writes."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "notes.md")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("notes")
+        os.utime(self.path, (EPOCH, EPOCH))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_resolve(self):
+        with patch.dict(os.environ, {SOURCE_DATE_EPOCH: "1234"}):
+            self.assertEqual(resolve_source_date(self.path), 1234)
+        with patch.dict(os.environ, {SOURCE_DATE_EPOCH: "yesterday"}), \
+                self.assertRaises(ValueError):
+            resolve_source_date(self.path)
+        with patch.dict(os.environ, clear=True):
+            self.assertEqual(resolve_source_date(self.path), EPOCH)
+            with self.assertRaises(ValueError):
+                resolve_source_date()
+
+    def test_format(self):
+        self.assertEqual(format_source_date(EPOCH), "2023-11-14")
+        self.assertIsNone(format_source_date(None))
+
+    def test_stage_output(self):
+        with stage_output(self.path) as staged:
+            self.assertEqual(os.path.basename(staged.path), "notes.md")
+            with open(staged.path, "w", encoding="utf-8") as f:
+                f.write("notes")
+        self.assertFalse(staged.changed)
+        self.assertEqual(os.stat(self.path).st_mtime, EPOCH)
+
+        with stage_output(self.path) as staged:
+            with open(staged.path, "w", encoding="utf-8") as f:
+                f.write("changed")
+        self.assertTrue(staged.changed)
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "changed")
+        self.assertEqual(os.listdir(self.temp_dir), ["notes.md"])
+
+
+class TestReproducibleExport(unittest.TestCase):
+    """Test that exports are byte-identical across runs."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def export_twice(self, name, export):
+        path = os.path.join(self.temp_dir, name)
+        with redirect_stdout(io.StringIO()):
+            export(path)
+            first = digest(path)
+            export(path)
+        self.assertEqual(digest(path), first, name)
+        return path
+
+    def test_markdown(self):
+        path = self.export_twice("notes.md", lambda path: export_to_markdown(
+            NOTES, path, "obsidian", METADATA, source_date=EPOCH,
+        ))
+        with open(path, encoding="utf-8") as f:
+            self.assertIn("date: 2023-11-14\n", f.read())
+
+    def test_pdf(self):
+        for options in (PdfOptions(source_date=EPOCH),
+                        PdfOptions(source_date=EPOCH, chunk_size=1),
+                        PdfOptions(source_date=EPOCH, engine="direct")):
+            path = self.export_twice("notes.pdf", lambda path: export_to_pdf(NOTES, path, options))
+            with pymupdf.open(path) as doc:
+                self.assertEqual(doc.metadata["creationDate"], "D:20231114221320Z")
+
+    def test_archives(self):
+        for name in ("notes.zip", "notes.tar.gz"):
+            self.export_twice(name, lambda path: export_to_archive(
+                NOTES, path, "obsidian", METADATA, formats=("md", "pdf"), source_date=EPOCH,
+            ))
+
+    def test_cli(self):
+        output_path = os.path.join(self.temp_dir, "notes.md")
+        argv = ["notebooklm-export", TEST_FILE, output_path, "--reproducible"]
+        with patch.dict(os.environ, {SOURCE_DATE_EPOCH: str(EPOCH)}), \
+                patch.object(sys, "argv", argv):
+            with redirect_stdout(io.StringIO()):
+                main()
+            with redirect_stdout(io.StringIO()) as output:
+                main()
+            self.assertIn("Unchanged, not rewritten", output.getvalue())
+
+            with patch.object(sys, "argv", argv + ["--append"]), \
+                    redirect_stdout(io.StringIO()) as output, self.assertRaises(SystemExit):
+                main()
+            self.assertIn("Error: --reproducible", output.getvalue())
+
+    def test_batch_archive(self):
+        output_path = os.path.join(self.temp_dir, "notes.tgz")
+        argv = ["notebooklm-export", "batch", TEST_FILE, "-o", output_path, "--reproducible"]
+        with patch.dict(os.environ, {SOURCE_DATE_EPOCH: str(EPOCH)}), \
+                patch.object(sys, "argv", argv):
+            with redirect_stdout(io.StringIO()):
+                main()
+            first = digest(output_path)
+            with redirect_stdout(io.StringIO()):
+                main()
+        self.assertEqual(digest(output_path), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
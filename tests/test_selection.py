@@ -0,0 +1,143 @@
+"""
+Tests for lazy note selection (--limit, --range, --match).
+"""
+
+import io
+import os
+import re
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.cli.main import main
+from notebooklm_notes2md.core import selection
+from notebooklm_notes2md.core.parser import parse_notes
+from notebooklm_notes2md.core.selection import (
+    NoteSelection,
+    iter_notes_from_end,
+    parse_range,
+    select_notes,
+)
+
+
+def make_html(count):
+    """Build an export of numbered notes, newest first."""
+    elements = []
+    for index in range(count - 1, -1, -1):
+        for div in (
+            f'<div class="paragraph heading3"><span>{"Even" if index % 2 == 0 else "Odd"} {index}</span></div>',
+            f'<div class="paragraph normal"><span>Body of note {index}.</span></div>',
+            '<div class="paragraph normal"></div>',
+        ):
+            elements.append(
+                "<labs-tailwind-structural-element-view-v2>"
+                f"{div}</labs-tailwind-structural-element-view-v2>"
+            )
+    return (
+        '<div class="source-title">Notebook</div><labs-tailwind-doc-viewer>'
+        + "".join(elements) + "</labs-tailwind-doc-viewer></div>"
+    )
+
+
+class TestNoteSelection(unittest.TestCase):
+    """Test reading notes from the end of a file."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "notes.html")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(make_html(200))
+        with open(self.path, encoding="utf-8") as f:
+            self.notes = parse_notes(BeautifulSoup(f.read(), "html.parser"))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_matches_parse_notes(self):
+        """Test that reading from the end gives the notes of parse_notes."""
+        for size in (50, 500, 5000, 10 ** 7):
+            self.assertEqual(list(iter_notes_from_end(self.path, size)), self.notes)
+
+        sample = os.path.join(os.path.dirname(__file__), 'full_summary.html')
+        with open(sample, encoding="utf-8") as f:
+            expected = parse_notes(BeautifulSoup(f.read(), "html.parser"))
+        self.assertEqual(list(iter_notes_from_end(sample, 1000)), expected)
+
+    def test_keeps_html(self):
+        """Test that notes read from the end can carry their HTML."""
+        with open(self.path, encoding="utf-8") as f:
+            expected = parse_notes(BeautifulSoup(f.read(), "html.parser"), with_html=True)
+        self.assertEqual(list(iter_notes_from_end(self.path, 500, with_html=True)), expected)
+
+    def test_stops_reading_early(self):
+        """Test that only a small tail is read for the first notes."""
+        sizes = []
+        read_tail = selection._read_tail
+
+        def record(path, size):
+            sizes.append(size)
+            return read_tail(path, size)
+
+        with patch.object(selection, "_read_tail", side_effect=record):
+            notes = list(select_notes(iter_notes_from_end(self.path, 500), NoteSelection(limit=3)))
+
+        self.assertEqual(notes, self.notes[:3])
+        self.assertLess(max(sizes), os.path.getsize(self.path) // 4)
+
+    def test_match_and_range(self):
+        """Test filtering by title, then slicing."""
+        chosen = NoteSelection(match=re.compile(r"^Odd"), start=2, stop=5)
+        notes = list(select_notes(iter(self.notes), chosen))
+        self.assertEqual([note["title"] for note in notes], ["Odd 5", "Odd 7", "Odd 9"])
+
+    def test_parse_range(self):
+        """Test range specifications."""
+        self.assertEqual(parse_range("10:20"), (10, 20))
+        self.assertEqual(parse_range(":5"), (0, 5))
+        self.assertEqual(parse_range("3:"), (3, None))
+        for spec in ("5", "a:b", "5:2", "-1:3"):
+            with self.assertRaises(ValueError, msg=spec):
+                parse_range(spec)
+
+    def test_limit_option(self):
+        """Test the --limit option end to end."""
+        output_path = os.path.join(self.temp_dir, "preview.md")
+        argv = ["notebooklm-export", self.path, output_path, "--limit", "2"]
+        with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()):
+            main()
+        with open(output_path, encoding="utf-8") as f:
+            content = f.read()
+        self.assertTrue(content.startswith("# Notebook\n\n## Even 0"))
+        self.assertIn("## Odd 1", content)
+        self.assertNotIn("Even 2", content)
+
+    def test_selected_site_matches_full_export(self):
+        """Test that selecting every note renders the site like a full export."""
+        sample = os.path.join(os.path.dirname(__file__), 'full_summary.html')
+        outputs = []
+        for name, options in (("full", []), ("selected", ["--limit", "1000"])):
+            output_dir = os.path.join(self.temp_dir, name)
+            os.mkdir(output_dir)
+            argv = ["notebooklm-export", sample, os.path.join(output_dir, "site.html"), *options]
+            with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()):
+                main()
+            files = {}
+            for root, _, names in os.walk(output_dir):
+                for file_name in names:
+                    path = os.path.join(root, file_name)
+                    with open(path, "rb") as f:
+                        files[os.path.relpath(path, output_dir)] = f.read()
+            outputs.append(files)
+        self.assertEqual(outputs[0], outputs[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
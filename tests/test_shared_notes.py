@@ -0,0 +1,116 @@
+"""
+Tests for notes shared between processes through shared memory.
+"""
+
+import multiprocessing
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import pymupdf
+from bs4 import BeautifulSoup
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.core.parser import parse_notes
+from notebooklm_notes2md.core.shared_notes import SharedNoteStore
+from notebooklm_notes2md.exporters.pdf import PdfOptions, export_pdf
+from notebooklm_notes2md.extractors.metadata import extract_metadata
+from notebooklm_notes2md.formatters.obsidian import format_obsidian_markdown
+from notebooklm_notes2md.formatters.standard import format_standard_markdown
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "full_summary.html")
+
+NOTES = [
+    {"title": "Prix d'équilibre", "note": "## Prix d'équilibre\n\nLe **prix** 📈"},
+    {"title": "Untitled Note", "note": ""},
+    {"title": "Code", "note": "Use `bid < ask` [1, 2]\n- point"},
+]
+
+
+def read_in_worker(store, index):
+    """Copy one note out of a store attached in a worker process."""
+    try:
+        return dict(store[index])
+    finally:
+        store.close()
+
+
+class TestSharedNoteStore(unittest.TestCase):
+    """Test the shared memory note store and its views."""
+
+    def test_round_trip(self):
+        with SharedNoteStore.create(NOTES) as store:
+            self.assertEqual(len(store), 3)
+            self.assertEqual(store.fields, ("title", "note"))
+            self.assertEqual([dict(note) for note in store], NOTES)
+            self.assertEqual(store[-1]["title"], "Code")
+            self.assertEqual([note["title"] for note in store[1:]], ["Untitled Note", "Code"])
+            self.assertIsNone(store[0].get("html"))
+            with self.assertRaises(IndexError):
+                store[3]
+
+    def test_fields_shared_by_all_notes(self):
+        notes = [dict(NOTES[0], html="<p>x</p>"), NOTES[1]]
+        with SharedNoteStore.create(notes) as store:
+            self.assertEqual(store.fields, ("title", "note"))
+        with self.assertRaises(ValueError):
+            SharedNoteStore.create(notes, fields=("title", "html"))
+
+    def test_pickles_as_block_name(self):
+        with SharedNoteStore.create(NOTES * 1000) as store:
+            self.assertLess(len(pickle.dumps(store)), 200)
+
+    def test_workers_read_views(self):
+        context = multiprocessing.get_context("spawn")
+        with SharedNoteStore.create(NOTES) as store:
+            with ProcessPoolExecutor(2, mp_context=context) as executor:
+                notes = list(executor.map(read_in_worker, [store] * 3, range(3)))
+        self.assertEqual(notes, NOTES)
+
+    def test_owner_unlinks_block(self):
+        store = SharedNoteStore.create(NOTES)
+        name = store.name
+        store.close()
+        with self.assertRaises(FileNotFoundError):
+            SharedNoteStore.attach(name)
+
+    def test_formatters_accept_views(self):
+        with open(TEST_FILE, "r", encoding="utf-8") as f:
+            soup = BeautifulSoup(f.read(), "html.parser")
+        metadata = extract_metadata(soup)
+        notes = parse_notes(soup)
+        with SharedNoteStore.create(notes) as store:
+            self.assertEqual(format_standard_markdown(store), format_standard_markdown(notes))
+            self.assertEqual(
+                format_obsidian_markdown(store, metadata),
+                format_obsidian_markdown(notes, metadata),
+            )
+
+
+class TestParallelPdfExport(unittest.TestCase):
+    """Test PDF chunks rendered by workers reading shared notes."""
+
+    def test_matches_sequential_export(self):
+        notes = [
+            {"title": f"Note {i}", "note": f"# Note {i}\n\nParagraph **{i}**."}
+            for i in range(5)
+        ]
+        results = []
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for workers in (1, 2):
+                path = os.path.join(temp_dir, f"{workers}.pdf")
+                export_pdf(notes, path, PdfOptions(chunk_size=2, workers=workers))
+                with pymupdf.open(path) as doc:
+                    text = "".join(page.get_text() for page in doc)
+                    results.append((doc.page_count, doc.get_toc(), text))
+        self.assertEqual(results[1], results[0])
+        self.assertEqual([entry[2] for entry in results[1][1]], [1, 2, 3, 4, 5])
+
+
+if __name__ == "__main__":
+    unittest.main()
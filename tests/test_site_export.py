@@ -0,0 +1,158 @@
+"""
+Tests for the static HTML site export.
+"""
+
+import glob
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.cli.main import main
+from notebooklm_notes2md.core.parser import parse_notes
+from notebooklm_notes2md.exporters.site import (
+    SearchIndexBuilder,
+    SiteOptions,
+    export_site,
+    page_file_name,
+    site_assets_dir,
+)
+
+TEST_FILE = os.path.join(os.path.dirname(__file__), "full_summary.html")
+
+
+def read_script(path, callback):
+    """Decode the JSON payload of a shard or search index script."""
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    prefix = callback + "("
+    assert content.startswith(prefix) and content.endswith(");\n")
+    return json.loads(content[len(prefix):-3])
+
+
+def make_notes(count):
+    return [
+        {
+            "title": f"Note {index}",
+            "note": f"## Note {index}\n\nAbout **market** depth: market depth {index}",
+        }
+        for index in range(count)
+    ]
+
+
+class TestSiteExport(unittest.TestCase):
+    """Test the page shards, the search index and the index page."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_path = os.path.join(self.temp_dir.name, "notes.html")
+        self.assets = site_assets_dir(self.output_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_shards(self):
+        count = export_site(iter(make_notes(25)), self.output_path, options=SiteOptions(10))
+        self.assertEqual(count, 25)
+        self.assertEqual(self.assets, os.path.join(self.temp_dir.name, "notes_files"))
+
+        pages = [read_script(os.path.join(self.assets, page_file_name(page)), "notesPage")
+                 for page in (1, 2, 3)]
+        self.assertEqual([page for page, _ in pages], [1, 2, 3])
+        self.assertEqual([len(sections) for _, sections in pages], [10, 10, 5])
+        self.assertIn('id="note-24"', pages[2][1][-1])
+        self.assertIn("<strong>market</strong>", pages[0][1][0])
+
+    def test_index_page(self):
+        metadata = {"title": "A <title>", "summary": "Sum", "tags": ["Market depth"]}
+        export_site(make_notes(3), self.output_path, metadata, SiteOptions(2))
+        with open(self.output_path, encoding="utf-8") as f:
+            soup = BeautifulSoup(f.read(), "html.parser")
+        self.assertEqual(soup.h1.text, "A <title>")
+        self.assertEqual(soup.select_one(".tag")["data-tag"], "Market depth")
+        self.assertIn('"assets": "notes_files/", "pages": 2', soup.script.string)
+        # No note is inlined in the index page
+        self.assertIsNone(soup.select_one(".note"))
+
+    def test_search_index(self):
+        metadata = {"tags": ["market depth", "spread"]}
+        notes = make_notes(3) + [{"title": "Bid-ask Spread", "note": "The spread [1]"}]
+        export_site(notes, self.output_path, metadata)
+        index = read_script(os.path.join(self.assets, "search.js"), "notesSearchIndex")
+        self.assertEqual(index["pageSize"], 100)
+        self.assertEqual(index["titles"][3], "Bid-ask Spread")
+        self.assertEqual(index["terms"]["note"], [0, 1, 2])
+        self.assertEqual(index["terms"]["spread"], [3])
+        self.assertEqual(index["tags"], {"market depth": [0, 1, 2], "spread": [3]})
+
+    def test_search_index_builder(self):
+        builder = SearchIndexBuilder()
+        self.assertEqual(builder.add("Price price Price", ""), 0)
+        self.assertEqual(builder.to_dict(5)["terms"], {"price": [0]})
+
+    def test_stale_shards_removed(self):
+        export_site(make_notes(5), self.output_path, options=SiteOptions(1))
+        export_site(make_notes(2), self.output_path, options=SiteOptions(1))
+        self.assertEqual(len(glob.glob(os.path.join(self.assets, "page-*.js"))), 2)
+
+    def test_invalid_page_size(self):
+        with self.assertRaises(ValueError):
+            export_site([], self.output_path, options=SiteOptions(0))
+
+    def test_html_from_dom(self):
+        with open(TEST_FILE, encoding="utf-8") as f:
+            notes = parse_notes(BeautifulSoup(f.read(), "html.parser"), with_html=True)
+        export_site(notes, self.output_path)
+        _, sections = read_script(os.path.join(self.assets, page_file_name(1)), "notesPage")
+        self.assertEqual(len(sections), len(notes))
+        self.assertIn(notes[0]["html"], sections[0])
+
+    def test_markup_in_note_text_is_escaped(self):
+        """Test that text reading as HTML stays text, with or without a selection."""
+        input_path = os.path.join(self.temp_dir.name, "input.html")
+        with open(input_path, "w", encoding="utf-8") as f:
+            f.write(
+                "<labs-tailwind-doc-viewer>"
+                "<labs-tailwind-structural-element-view-v2>"
+                '<div class="paragraph normal"><span>Run &lt;script&gt;alert(1)&lt;/script&gt;'
+                " if a &amp; b</span></div>"
+                "</labs-tailwind-structural-element-view-v2>"
+                "</labs-tailwind-doc-viewer>"
+            )
+        for options in ([], ["--limit", "1"]):
+            argv = ["notebooklm-export", input_path, self.output_path, *options]
+            with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()):
+                main()
+            _, sections = read_script(os.path.join(self.assets, page_file_name(1)), "notesPage")
+            self.assertNotIn("<script>", sections[0], options)
+            self.assertIn("&lt;script&gt;alert(1)&lt;/script&gt;", sections[0], options)
+
+        notes = [{"title": "T", "note": "<script>alert(1)</script>"}]
+        export_site(notes, self.output_path)
+        _, sections = read_script(os.path.join(self.assets, page_file_name(1)), "notesPage")
+        self.assertNotIn("<script>", sections[0])
+
+    def test_cli(self):
+        argv = ["notebooklm-export", TEST_FILE, self.output_path, "--site-page-size", "2"]
+        with patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()):
+            main()
+        self.assertTrue(os.path.isfile(self.output_path))
+        self.assertTrue(os.path.isfile(os.path.join(self.assets, page_file_name(1))))
+
+        with patch.object(sys, "argv", argv + ["--append"]), \
+                redirect_stdout(io.StringIO()) as output, self.assertRaises(SystemExit):
+            main()
+        self.assertIn("--append", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
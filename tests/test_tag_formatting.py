@@ -10,6 +10,7 @@ import unittest
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from notebooklm_notes2md.formatters.obsidian import format_yaml_frontmatter
+from notebooklm_notes2md.formatters.tags import TagNormalizer
 
 
 class TestTagFormatting(unittest.TestCase):
@@ -65,5 +66,33 @@ class TestTagFormatting(unittest.TestCase):
                      "Mixed case should be preserved in tags")
 
 
+class TestTagNormalizer(unittest.TestCase):
+    """Test the memoizing tag normalizer."""
+
+    def test_normalize_all_matches_frontmatter_rules(self):
+        """Test that the batch API applies the same rules and drops empty tags."""
+        normalizer = TagNormalizer()
+        tags = ["Tag with #special! chars&", "123-numeric-start", "!!!", "SingleWord"]
+        self.assertEqual(
+            normalizer.normalize_all(tags),
+            ["Tag-with-special-chars", "t123-numeric-start", "SingleWord"],
+        )
+
+    def test_repeated_tags_hit_the_memo(self):
+        """Test that normalizing the same tags again is served from the memo."""
+        normalizer = TagNormalizer(maxsize=16)
+        for _ in range(3):
+            normalizer.normalize_all(["Auction Pricing", "Market Manipulation"])
+        info = normalizer.cache_info()
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.hits, 4)
+
+    def test_custom_normalizer_in_frontmatter(self):
+        """Test that a caller-supplied normalizer is used for the frontmatter."""
+        normalizer = TagNormalizer()
+        format_yaml_frontmatter({"title": "T", "tags": ["A tag"]}, normalizer)
+        self.assertEqual(normalizer.cache_info().misses, 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,107 @@
+"""
+Tests for the tag handler registry of the DOM walker.
+"""
+
+import os
+import sys
+import unittest
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.utils.html_processing import (
+    MARKDOWN_HANDLERS,
+    drill_into_tag,
+    drill_into_tag_html,
+)
+from notebooklm_notes2md.utils.tag_handlers import TagRegistry
+
+
+def first_tag(markup):
+    return BeautifulSoup(markup, "html.parser").find(True)
+
+
+def default_registry():
+    """A copy of the Markdown registry that tests can extend."""
+    registry = TagRegistry()
+    for rule in MARKDOWN_HANDLERS.rules:
+        registry.register(*rule)
+    return registry
+
+
+class TestDefaultHandlers(unittest.TestCase):
+    """Test the Markdown and HTML rendering of NotebookLM markup."""
+
+    def test_markdown(self):
+        tag = first_tag(
+            '<div class="paragraph normal"><span>Price </span>'
+            '<span class="bold">bid</span><span class="code bold">x &lt; y</span></div>'
+        )
+        self.assertEqual(drill_into_tag(tag), "\nPrice  **bid**  ` **x < y** ` ")
+        self.assertEqual(drill_into_tag(first_tag('<div class="heading3"><span>T</span></div>')), "## T")
+        self.assertEqual(drill_into_tag(first_tag('<div class="bullet"><span>•</span></div>')), "- ")
+        self.assertEqual(drill_into_tag(first_tag('<p><b><span>x</span></b></p>')), "x")
+
+    def test_html(self):
+        tag = first_tag(
+            '<div class="paragraph"><span>a [1] </span><span class="bold code">&lt;b&gt;</span></div>'
+        )
+        self.assertEqual(drill_into_tag_html(tag), "<p>a  <code><strong>&lt;b&gt;</strong></code></p>")
+        self.assertEqual(drill_into_tag_html(first_tag('<div class="bullet">•</div>')), "")
+
+    def test_class_rule_beats_name_rule(self):
+        # heading3 is registered before paragraph, as the walker checked it first
+        tag = first_tag('<div class="paragraph heading3"><span>T</span></div>')
+        self.assertEqual(drill_into_tag(tag), "## T")
+
+
+class TestTagRegistry(unittest.TestCase):
+    """Test registering handlers for new markup."""
+
+    def test_register_new_markup(self):
+        registry = default_registry()
+        registry.register("span", "italic", lambda text: f"*{text}*", inline=True)
+
+        @registry.handler("div", "numbered")
+        def numbered(tag, registry):
+            return "1. " + registry.render_children(tag)
+
+        tag = first_tag(
+            '<div class="numbered"><span class="italic">a</span><span class="bold">b</span></div>'
+        )
+        self.assertEqual(registry.render(tag), "1. *a* **b** ")
+        # The module registry is unchanged
+        self.assertEqual(drill_into_tag(tag), "a **b** ")
+
+    def test_dispatch_table_per_class_list(self):
+        registry = default_registry()
+        soup = BeautifulSoup(
+            '<div class="paragraph"><span>a</span><span>b</span><span class="bold">c</span></div>'
+            '<div class="paragraph"><span class="bold">d</span></div>',
+            "html.parser",
+        )
+        for tag in soup.find_all("div", recursive=False):
+            registry.render(tag)
+        self.assertEqual(len(registry._table), 3)
+
+        # Registering a rule invalidates the table
+        registry.register("span", "bold", lambda text: text.upper(), inline=True)
+        self.assertEqual(len(registry._table), 0)
+        self.assertEqual(registry.render(soup.find_all("div")[1]), "\n **D** ")
+
+    def test_inline_rule_needs_class(self):
+        with self.assertRaises(ValueError):
+            TagRegistry().register("span", None, str.upper, inline=True)
+
+    def test_unknown_tags_render_children(self):
+        registry = TagRegistry()
+        self.assertEqual(registry.render(first_tag("<td><span>x</span></td>")), "")
+        registry.register("span", handler=lambda tag, registry: tag.text)
+        self.assertEqual(registry.render(first_tag("<td><span>x</span>y</td>")), "x")
+        self.assertEqual(registry.render("plain string"), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
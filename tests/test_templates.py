@@ -0,0 +1,134 @@
+"""
+Tests for the template-driven formatter.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+from bs4 import BeautifulSoup
+
+# Add parent directory to path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notebooklm_notes2md.core.parser import parse_notes
+from notebooklm_notes2md.extractors.metadata import extract_metadata
+from notebooklm_notes2md.formatters.obsidian import format_obsidian_markdown
+from notebooklm_notes2md.formatters.standard import format_standard_markdown
+from notebooklm_notes2md.formatters.templates import (
+    TemplateError,
+    builtin_template_set,
+    compile_template,
+    format_template_markdown,
+    load_template,
+    load_template_set,
+)
+
+
+class TestTemplateCompiler(unittest.TestCase):
+    """Test the template syntax."""
+
+    def test_variables_and_filters(self):
+        """Test value insertion, attribute access and filters."""
+        render = compile_template('{{ note.title | upper }} {{ missing }}{{ "x" | json }}')
+        self.assertEqual(render({"note": {"title": "abc"}}), 'ABC "x"')
+
+    def test_if_else_and_for(self):
+        """Test conditionals and loops, including nested scopes."""
+        render = compile_template(
+            "{% for t in tags %}{% if not t %}-{% else %}[{{ t }}]{% endif %}{% endfor %}"
+            "{% if title %}!{% endif %}"
+        )
+        self.assertEqual(render({"tags": ["a", "", "b"]}), "[a]-[b]")
+
+    def test_raw_block(self):
+        """Test that raw blocks are output verbatim."""
+        render = compile_template("{% raw %}{{citekey}} {% if %}{% endraw %}")
+        self.assertEqual(render({}), "{{citekey}} {% if %}")
+
+    def test_errors(self):
+        """Test that malformed templates are rejected."""
+        for source in ("{% if x %}", "{% endfor %}", "{{ a b }}", "{{ a | nope }}",
+                       "{% while x %}", "{% raw %}",
+                       "{% if x %}a{% else %}b{% else %}c{% endif %}"):
+            with self.assertRaises(TemplateError, msg=source):
+                compile_template(source)
+
+
+class TestTemplateFormatter(unittest.TestCase):
+    """Test formatting documents with templates."""
+
+    def setUp(self):
+        """Load the sample export."""
+        test_file_path = os.path.join(os.path.dirname(__file__), 'full_summary.html')
+        with open(test_file_path, 'r', encoding='utf-8') as f:
+            soup = BeautifulSoup(f.read(), 'html.parser')
+        self.notes = parse_notes(soup)
+        self.metadata = extract_metadata(soup)
+        self.metadata["sources"] = ["https://example.com/a"]
+
+    def test_builtin_templates_match_formatters(self):
+        """Test that built-in templates reproduce the hand-written formatters."""
+        self.assertEqual(
+            format_template_markdown(self.notes, self.metadata, builtin_template_set("obsidian")),
+            format_obsidian_markdown(self.notes, self.metadata),
+        )
+        self.assertEqual(
+            format_template_markdown(self.notes, self.metadata, builtin_template_set("standard")),
+            format_standard_markdown(self.notes, self.metadata),
+        )
+
+    def test_standard_template_with_empty_title(self):
+        """Test that an empty title still gets a heading, as in the formatter."""
+        for metadata in ({"title": ""}, {}):
+            self.assertEqual(
+                format_template_markdown(self.notes, metadata, builtin_template_set("standard")),
+                format_standard_markdown(self.notes, metadata),
+            )
+
+    def test_template_directory_with_fallback(self):
+        """Test that missing template files fall back to the base set."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(os.path.join(temp_dir, "note.md"), "w", encoding="utf-8") as f:
+                f.write("### {{ note.index }}. {{ note.title }}\n\n")
+            templates = load_template_set(temp_dir, "obsidian")
+            markdown = format_template_markdown(self.notes, self.metadata, templates)
+
+        self.assertTrue(markdown.startswith("---\n"))
+        self.assertIn("> [!summary]", markdown)
+        self.assertIn(f"### 1. {self.notes[0]['title']}", markdown)
+
+    def test_academic_example_matches_custom_formatter(self):
+        """Test that the academic template example mirrors the Python example."""
+        root = os.path.join(os.path.dirname(__file__), '..', 'examples')
+        sys.path.insert(0, os.path.abspath(root))
+        from custom_formatter import format_academic_markdown
+
+        templates = load_template_set(os.path.join(root, 'templates', 'academic'))
+        self.assertEqual(
+            format_template_markdown(self.notes, self.metadata, templates),
+            format_academic_markdown(self.notes, self.metadata),
+        )
+
+    def test_template_files_are_cached_until_modified(self):
+        """Test that a template file is compiled once per modification."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "heading.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("# {{ title }}\n")
+            first = load_template(path)
+            self.assertIs(load_template(path), first)
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("## {{ title }}\n")
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            second = load_template(path)
+
+        self.assertIsNot(second, first)
+        self.assertEqual(second({"title": "T"}), "## T\n")
+
+
+if __name__ == "__main__":
+    unittest.main()